@@ -0,0 +1,110 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Dict, Any, Literal
+
+from ..config import settings
+from .. import dependencies
+from ..dependencies import require_admin, get_prefilter
+from . import universal_endpoints
+from ..monitoring.profiler import get_profiler, ProfilerBusyError
+from ..monitoring.metrics import metrics
+from ..monitoring.loop_monitor import get_loop_monitor
+from ..monitoring.memory import build_memory_report
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.post("/profile")
+async def run_profiler(
+    seconds: float = Query(default=10.0, gt=0, le=settings.profiler_max_seconds),
+    interval_ms: float = Query(default=10.0, ge=settings.profiler_min_interval_ms, le=1000),
+    format: Literal["json", "collapsed"] = Query(default="json"),
+    top: int = Query(default=50, ge=1, le=500)
+):
+    """
+    라이브 워커 샘플링 프로파일링
+    - 서비스 중단 없이 지정 시간 동안 모든 스레드의 스택 샘플링
+    - format=collapsed: flamegraph.pl / speedscope 에 바로 넣을 수 있는 텍스트
+    - format=json: 스레드 분류별 비율 + 상위 스택
+    - 동시에 하나만 실행 가능 (실행 중이면 409)
+    """
+    profiler = get_profiler()
+    try:
+        result = await profiler.profile(seconds=seconds, interval=interval_ms / 1000.0)
+    except ProfilerBusyError:
+        raise HTTPException(status_code=409, detail="Profiler is already running")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if format == "collapsed":
+        return PlainTextResponse(result.to_collapsed_text())
+    return result.to_dict(top=top)
+
+@router.get("/profile/status", response_model=Dict[str, Any])
+async def profiler_status():
+    """프로파일러 실행 상태"""
+    profiler = get_profiler()
+    return {
+        "running": profiler.is_running,
+        "max_seconds": profiler.max_seconds,
+        "min_interval_ms": profiler.min_interval * 1000
+    }
+
+@router.get("/metrics")
+async def get_metrics(format: Literal["prometheus", "json"] = Query(default="prometheus")):
+    """
+    프로세스 메트릭
+    - format=prometheus: Prometheus text exposition (스크레이프용)
+    - format=json: JSON 스냅샷
+    """
+    if format == "json":
+        return metrics.snapshot()
+    return PlainTextResponse(metrics.render_prometheus())
+
+@router.get("/event-loop", response_model=Dict[str, Any])
+async def event_loop_status():
+    """이벤트 루프 lag 통계 + 최근 블로킹 호출 스택"""
+    return get_loop_monitor().get_stats()
+
+@router.get("/memory", response_model=Dict[str, Any])
+async def memory_report(sample_size: int = Query(default=None, ge=1, le=1000)):
+    """
+    인메모리 구조체별 메모리 사용량 추정
+    - 구조체별 플레이어 수, 추정 총 바이트, 플레이어당 p50/p99 바이트
+    - 무작위 샘플 플레이어만 측정하므로 근사값
+    """
+    return build_memory_report(sample_size or settings.memory_report_sample_size)
+
+@router.get("/prefilter", response_model=Dict[str, Any])
+async def prefilter_stats():
+    """인그레스 사전 필터 통계 (차단 목록 크기, 거절 집계, 상위 거절 플레이어)"""
+    prefilter = get_prefilter()
+    if prefilter is None:
+        return {"enabled": False}
+    return {"enabled": True, **prefilter.get_stats()}
+
+@router.get("/rehydration", response_model=Dict[str, Any])
+async def rehydration_stats():
+    """Redis 윈도우 복원 통계 (파이프라인 수, 묶인 키 수, 부정 캐시 적중, 복원된 액션 수)"""
+    engines = {
+        "legacy": dependencies._anti_cheat_engine,
+        "universal": universal_endpoints._universal_engine
+    }
+    return {
+        name: engine.get_rehydration_stats() if engine is not None else {"initialized": False}
+        for name, engine in engines.items()
+    }
+
+@router.get("/dual-write", response_model=Dict[str, Any])
+async def dual_write_report(
+    hours: int = Query(default=24, ge=1, le=24 * 30),
+    settle_seconds: float = Query(default=60.0, ge=0, le=3600)
+):
+    """
+    기존 엔진 → TimescaleDB 이중 기록 일관성 보고서
+    - safe_to_flip: 백필 완료 + 검증 통과, 큐 / 저널 비어 있음, 거부 행 없음, 워터마크 이후 시간대별 행 수 일치
+    - blockers: 전환을 막는 사유 목록
+    """
+    writer = await dependencies.get_dual_writer()
+    if writer is None:
+        return {"enabled": False}
+    return {"enabled": True, **await writer.consistency_report(hours=hours, settle_seconds=settle_seconds)}
@@ -1,18 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from datetime import datetime, timedelta
 import time
 import json
 
 from ..core.anti_cheat import AntiCheatEngine, PlayerAction, ViolationType
 from ..models.database import Player, Violation, PlayerAction as DBPlayerAction, BanHistory
-from ..dependencies import get_db, get_anti_cheat_engine
+from ..core.prefilter import IngressPreFilter, SOURCE_LEGACY
+from ..dependencies import get_db, get_anti_cheat_engine, get_prefilter, get_dual_writer
 from ..schemas import (
     PlayerActionCreate, ViolationResponse, PlayerRiskResponse,
     BanPlayerRequest, PlayerStatsResponse
 )
 
+# 이중 기록 라이터는 켜져 있을 때만 get_dual_writer() 에서 import (asyncpg 의존).
+# FastAPI 는 의존성 파라미터의 타입 힌트를 실행 시 평가하므로 라우트 파라미터에는 타입을 달지 않음
+if TYPE_CHECKING:
+    from ..core.dual_write import TimescaleDualWriter
+
 router = APIRouter()
 
 @router.post("/action", response_model=Dict[str, Any])
@@ -20,14 +27,24 @@ async def submit_player_action(
     action_data: PlayerActionCreate,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    anti_cheat: AntiCheatEngine = Depends(get_anti_cheat_engine)
+    anti_cheat: AntiCheatEngine = Depends(get_anti_cheat_engine),
+    prefilter: Optional[IngressPreFilter] = Depends(get_prefilter),
+    dual_writer=Depends(get_dual_writer)
 ):
     """
     Submit a player action for anti-cheat analysis.
     
     This endpoint receives game actions and processes them through
-    the anti-cheat engine to detect violations.
+    the anti-cheat engine to detect violations. Banned players and
+    flooding clients are rejected by the pre-filter before analysis.
+    When dual-write is enabled, committed rows are also queued for
+    TimescaleDB (no extra latency on this path).
     """
+    if prefilter:
+        verdict = prefilter.check(action_data.player_id)
+        if verdict:
+            return JSONResponse(status_code=verdict.status_code, content=verdict.to_dict())
+    
     try:
         # Validate metadata size to prevent DoS attacks
         if action_data.metadata and len(str(action_data.metadata)) > 10000:
@@ -90,10 +107,24 @@ async def submit_player_action(
             db.rollback()
             raise HTTPException(status_code=500, detail="Failed to save action data")
         
+        # Mirror committed rows to TimescaleDB (queue only, written in background)
+        if dual_writer:
+            dual_writer.submit_action(
+                action.player_id, action.action_type, action.timestamp, action.value, action.metadata
+            )
+            for violation in violations:
+                dual_writer.submit_violation(
+                    violation.player_id, violation.violation_type.value, violation.timestamp,
+                    violation.severity, violation.details
+                )
+            dual_writer.submit_player(
+                action.player_id, action.timestamp, player.risk_score, username=action_data.username
+            )
+        
         # Check if player should be banned
         should_ban, ban_reason = await anti_cheat.should_ban_player(action.player_id)
         if should_ban and not player.is_banned:
-            background_tasks.add_task(ban_player_task, player.id, ban_reason, db)
+            background_tasks.add_task(ban_player_task, player.id, ban_reason, db, dual_writer)
         
         return {
             "action_processed": True,
@@ -174,7 +205,9 @@ async def get_player_violations(
 async def ban_player(
     player_id: str,
     ban_request: BanPlayerRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    prefilter: Optional[IngressPreFilter] = Depends(get_prefilter),
+    dual_writer=Depends(get_dual_writer)
 ):
     """Manually ban a player."""
     player = db.query(Player).filter(Player.id == player_id).first()
@@ -201,12 +234,19 @@ async def ban_player(
     db.add(ban_record)
     db.commit()
     
+    if prefilter:
+        prefilter.mark_banned(player_id, SOURCE_LEGACY)
+    if dual_writer:
+        dual_writer.submit_player(player_id, time.time(), is_banned=True, ban_reason=ban_request.reason)
+    
     return {"message": f"Player {player_id} has been banned", "reason": ban_request.reason}
 
 @router.post("/player/{player_id}/unban")
 async def unban_player(
     player_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    prefilter: Optional[IngressPreFilter] = Depends(get_prefilter),
+    dual_writer=Depends(get_dual_writer)
 ):
     """Unban a player."""
     player = db.query(Player).filter(Player.id == player_id).first()
@@ -233,6 +273,11 @@ async def unban_player(
     
     db.commit()
     
+    if prefilter:
+        prefilter.mark_unbanned(player_id, SOURCE_LEGACY)
+    if dual_writer:
+        dual_writer.submit_player(player_id, time.time(), is_banned=False)
+    
     return {"message": f"Player {player_id} has been unbanned"}
 
 @router.get("/violations/recent", response_model=List[ViolationResponse])
@@ -295,7 +340,7 @@ async def get_overview_stats(
         "violation_breakdown": {vt: count for vt, count in violation_types}
     }
 
-async def ban_player_task(player_id: str, reason: str, db: Session):
+async def ban_player_task(player_id: str, reason: str, db: Session, dual_writer: Optional["TimescaleDualWriter"] = None):
     """Background task to ban a player."""
     player = db.query(Player).filter(Player.id == player_id).first()
     if player and not player.is_banned:
@@ -312,4 +357,10 @@ async def ban_player_task(player_id: str, reason: str, db: Session):
         )
         
         db.add(ban_record)
-        db.commit()
\ No newline at end of file
+        db.commit()
+        
+        prefilter = get_prefilter()
+        if prefilter:
+            prefilter.mark_banned(player_id, SOURCE_LEGACY)
+        if dual_writer:
+            dual_writer.submit_player(player_id, time.time(), is_banned=True, ban_reason=reason)
\ No newline at end of file
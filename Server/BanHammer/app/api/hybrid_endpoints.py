@@ -0,0 +1,121 @@
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import JSONResponse
+from typing import Optional, Dict, Any
+from datetime import datetime
+import asyncio
+import time
+
+from ..core.anti_cheat import PlayerAction
+from ..core.hybrid_anti_cheat import HybridAntiCheatEngine
+from ..core.prefilter import IngressPreFilter, SOURCE_LEGACY
+from ..dependencies import get_hybrid_engine, get_prefilter
+from ..models.database import Player, BanHistory
+from ..schemas import PlayerActionCreate
+
+router = APIRouter()
+
+@router.post("/action", response_model=Dict[str, Any])
+async def submit_player_action_hybrid(
+    action_data: PlayerActionCreate,
+    background_tasks: BackgroundTasks,
+    engine: HybridAntiCheatEngine = Depends(get_hybrid_engine),
+    prefilter: Optional[IngressPreFilter] = Depends(get_prefilter)
+):
+    """
+    메모리 → Redis → DB 계층형 엔진으로 액션 분석
+    - 활성 플레이어는 메모리에서 바로 탐지, DB 저장은 write-behind 배치
+    - 차단/플러딩 플레이어는 사전 필터에서 즉시 거절
+    """
+    if prefilter:
+        verdict = prefilter.check(action_data.player_id)
+        if verdict:
+            return JSONResponse(status_code=verdict.status_code, content=verdict.to_dict())
+
+    try:
+        if action_data.metadata and len(str(action_data.metadata)) > 10000:
+            raise HTTPException(status_code=400, detail="Metadata too large")
+
+        action = PlayerAction(
+            player_id=action_data.player_id,
+            action_type=action_data.action_type,
+            timestamp=time.time(),
+            value=action_data.value,
+            metadata=action_data.metadata or {}
+        )
+
+        violations = await engine.analyze_action(action)
+        current_risk_score = await engine.get_player_risk_score(action.player_id)
+
+        should_ban, ban_reason = await engine.should_ban_player(action.player_id)
+        if should_ban:
+            background_tasks.add_task(auto_ban_player_task, action.player_id, ban_reason, engine)
+
+        return {
+            "action_processed": True,
+            "violations_detected": len(violations),
+            "current_risk_score": current_risk_score,
+            "should_review": current_risk_score > 5.0,
+            "violations": [
+                {
+                    "type": v.violation_type.value,
+                    "severity": v.severity,
+                    "details": v.details
+                } for v in violations
+            ]
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+@router.get("/player/{player_id}/risk", response_model=Dict[str, Any])
+async def get_player_risk_hybrid(
+    player_id: str,
+    engine: HybridAntiCheatEngine = Depends(get_hybrid_engine)
+):
+    """플레이어 위험도 조회 (메모리 → Redis → DB 순서)"""
+    try:
+        risk_score = await engine.get_player_risk_score(player_id)
+        return {
+            "player_id": player_id,
+            "risk_score": risk_score,
+            "should_review": risk_score > 5.0
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Risk query failed: {str(e)}")
+
+@router.get("/stats")
+async def get_hybrid_stats(
+    engine: HybridAntiCheatEngine = Depends(get_hybrid_engine)
+):
+    """계층별 적중률, 승격/강등 속도, write-behind 대기열 현황"""
+    return engine.get_stats()
+
+# 백그라운드 태스크
+async def auto_ban_player_task(player_id: str, reason: str, engine: HybridAntiCheatEngine):
+    """자동 차단 (대기 중인 write-behind 행을 먼저 반영해 플레이어 행이 존재하도록 함)"""
+    await engine.flush()
+    banned = await asyncio.to_thread(_ban_player, engine, player_id, reason)
+    if banned:
+        prefilter = get_prefilter()
+        if prefilter:
+            prefilter.mark_banned(player_id, SOURCE_LEGACY)
+
+def _ban_player(engine: HybridAntiCheatEngine, player_id: str, reason: str) -> bool:
+    with engine.session_factory() as db:
+        player = db.query(Player).filter(Player.id == player_id).first()
+        if not player or player.is_banned:
+            return False
+
+        player.is_banned = True
+        player.ban_reason = reason
+        player.ban_timestamp = datetime.now()
+        db.add(BanHistory(
+            player_id=player_id,
+            ban_type="automatic",
+            ban_reason=reason,
+            banned_by="system"
+        ))
+        db.commit()
+        return True
@@ -5,7 +5,9 @@ import asyncio
 import logging
 
 from ..ml.training_pipeline import ModelTrainingPipeline, MLAntiCheatEngine
+from ..ml.model_host import RF_MODEL_FILE, get_model_host
 from ..ml.models import ModelPrediction
+from ..config import settings
 from ..dependencies import get_db
 from ..schemas import PlayerActionCreate
 
@@ -21,11 +23,11 @@ def get_training_pipeline() -> ModelTrainingPipeline:
     """훈련 파이프라인 인스턴스 반환"""
     global _training_pipeline
     if _training_pipeline is None:
-        _training_pipeline = ModelTrainingPipeline()
+        _training_pipeline = ModelTrainingPipeline(settings.ml_model_dir)
     return _training_pipeline
 
 def get_ml_engine() -> MLAntiCheatEngine:
-    """ML 엔진 인스턴스 반환"""
+    """ML 엔진 인스턴스 반환 (모델 / 특징 버퍼는 다른 엔진과 공유하는 ModelHost 사용)"""
     global _ml_engine
     if _ml_engine is None:
         _ml_engine = MLAntiCheatEngine()
@@ -46,6 +48,8 @@ async def train_all_models(
             logger.info("모델 훈련 시작...")
             results = await pipeline.train_all_models(db, retrain=retrain)
             logger.info(f"모델 훈련 완료: {results}")
+            # 이 워커의 공유 모델 호스트에 새 모델 반영 (다른 워커는 재시작 시 반영)
+            get_model_host().reload()
             return results
         except Exception as e:
             logger.error(f"모델 훈련 실패: {e}")
@@ -162,15 +166,15 @@ async def get_model_performance():
 async def get_feature_importance():
     """특징 중요도 분석"""
     try:
-        pipeline = get_training_pipeline()
+        rf_model = get_model_host().ensemble_model.rf_model
         
-        if not pipeline.rf_model.is_trained:
+        if not rf_model.is_trained:
             raise HTTPException(status_code=404, detail="Random Forest 모델이 훈련되지 않았습니다.")
         
         # 특징 중요도 추출
         feature_importance = dict(zip(
-            pipeline.rf_model.feature_names,
-            pipeline.rf_model.model.feature_importances_
+            rf_model.feature_names,
+            rf_model.model.feature_importances_
         ))
         
         # 중요도 순으로 정렬
@@ -206,7 +210,8 @@ async def train_random_forest_only(
                 return {"error": "훈련 데이터 부족"}
             
             metrics = pipeline.rf_model.train(labeled_data)
-            pipeline.rf_model.save_model("models/random_forest.pkl")
+            pipeline.rf_model.save_model(str(pipeline.model_save_dir / RF_MODEL_FILE))
+            get_model_host().reload()
             
             logger.info(f"Random Forest 훈련 완료: {metrics}")
             return metrics
@@ -225,7 +230,7 @@ async def get_player_features(
 ):
     """플레이어의 현재 특징 확인 (디버깅용)"""
     try:
-        features = ml_engine.feature_buffer.get_features(player_id)
+        features = ml_engine.get_player_features(player_id)
         
         if features is None:
             raise HTTPException(status_code=404, detail="플레이어 데이터가 없습니다.")
@@ -234,11 +239,12 @@ async def get_player_features(
         from dataclasses import asdict
         features_dict = asdict(features)
         
+        buffered = ml_engine.buffered_actions(player_id)
         return {
             "player_id": player_id,
             "features": features_dict,
-            "recent_actions_count": len(ml_engine.feature_buffer.player_buffers.get(player_id, [])),
-            "buffer_status": "active" if player_id in ml_engine.feature_buffer.player_buffers else "inactive"
+            "recent_actions_count": buffered or 0,
+            "buffer_status": "active" if buffered is not None else "inactive"
         }
         
     except Exception as e:
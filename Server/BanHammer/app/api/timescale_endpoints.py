@@ -1,11 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import JSONResponse
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+import math
 import time
 import asyncio
 
 from ..core.timescale_anti_cheat import TimescaleAntiCheatEngine, PlayerAction
-from ..dependencies import get_timescale_engine
+from ..core.admission import PoolSaturatedError
+from ..core.summary_buffer import decayed_risk_sql
+from ..core.behavior_profile import BEHAVIOR_PROFILE_SQL, merge_behavior_profile
+from ..core.prefilter import IngressPreFilter, SOURCE_TIMESCALE
+from ..dependencies import get_timescale_engine, get_prefilter
 from ..schemas import (
     PlayerActionCreate, ViolationResponse, PlayerRiskResponse,
     BanPlayerRequest, PlayerStatsResponse
@@ -13,18 +19,35 @@ from ..schemas import (
 
 router = APIRouter()
 
+
+def overloaded_response(error: PoolSaturatedError) -> JSONResponse:
+    """커넥션 풀 포화 시 503 + Retry-After (reject 모드)"""
+    retry_after = max(1, math.ceil(error.retry_after))
+    return JSONResponse(
+        status_code=503,
+        content={"error": "overloaded", "reason": error.reason, "retry_after": retry_after},
+        headers={"Retry-After": str(retry_after)}
+    )
+
 @router.post("/action", response_model=Dict[str, Any])
 async def submit_player_action_ts(
     action_data: PlayerActionCreate,
     background_tasks: BackgroundTasks,
-    ts_engine: TimescaleAntiCheatEngine = Depends(get_timescale_engine)
+    ts_engine: TimescaleAntiCheatEngine = Depends(get_timescale_engine),
+    prefilter: Optional[IngressPreFilter] = Depends(get_prefilter)
 ):
     """
     TimescaleDB 기반 대용량 플레이어 액션 분석
     - 5천만명+ 지원
     - 메모리 사용량 최소화
     - 실시간 SQL 집계 분석
+    - 차단/플러딩 플레이어는 사전 필터에서 즉시 거절
     """
+    if prefilter:
+        verdict = prefilter.check(action_data.player_id)
+        if verdict:
+            return JSONResponse(status_code=verdict.status_code, content=verdict.to_dict())
+    
     try:
         # 입력 검증
         if action_data.metadata and len(str(action_data.metadata)) > 10000:
@@ -64,6 +87,8 @@ async def submit_player_action_ts(
             ]
         }
     
+    except PoolSaturatedError as e:
+        return overloaded_response(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
@@ -78,7 +103,7 @@ async def get_player_risk_ts(
         risk_score = await ts_engine.get_player_risk_score(player_id)
         
         # 최근 위반 사항 조회 (SQL 직접 쿼리)
-        async with ts_engine.connection_pool.acquire() as conn:
+        async with ts_engine.admission.acquire() as conn:
             recent_violations = await conn.fetch("""
                 SELECT violation_type, severity, time, details
                 FROM violations_ts
@@ -111,6 +136,8 @@ async def get_player_risk_ts(
             ]
         )
     
+    except PoolSaturatedError as e:
+        return overloaded_response(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Risk query failed: {str(e)}")
 
@@ -151,71 +178,33 @@ async def get_player_behavior_analysis(
     hours: int = 6,
     ts_engine: TimescaleAntiCheatEngine = Depends(get_timescale_engine)
 ):
-    """플레이어 행동 패턴 상세 분석"""
+    """플레이어 행동 패턴 상세 분석 (1시간 행동 프로필 집계뷰 병합, 원시 행 스캔 없음)"""
+    if hours < 1:
+        raise HTTPException(status_code=400, detail="hours must be >= 1")
+    
     try:
         async with ts_engine.connection_pool.acquire() as conn:
-            # 시간대별 활동 패턴
-            hourly_pattern = await conn.fetch("""
-                SELECT 
-                    date_trunc('hour', time) as hour_bucket,
-                    action_type,
-                    COUNT(*) as action_count,
-                    AVG(value) as avg_value,
-                    STDDEV(value) as value_stddev
-                FROM player_actions_ts
-                WHERE player_id = $1 
-                    AND time >= NOW() - INTERVAL '{} hours'
-                GROUP BY hour_bucket, action_type
-                ORDER BY hour_bucket DESC
-            """.format(hours), player_id)
-            
-            # 액션 타입별 통계
-            action_stats = await conn.fetch("""
-                SELECT 
-                    action_type,
-                    COUNT(*) as total_count,
-                    AVG(value) as avg_value,
-                    MAX(value) as max_value,
-                    PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY value) as p95_value
-                FROM player_actions_ts
-                WHERE player_id = $1
-                    AND time >= NOW() - INTERVAL '{} hours'
-                GROUP BY action_type
-                ORDER BY total_count DESC
-            """.format(hours), player_id)
-            
-            # 타이밍 분석 (봇 탐지용)
-            timing_analysis = await conn.fetchrow("""
-                WITH intervals AS (
-                    SELECT 
-                        action_type,
-                        EXTRACT(EPOCH FROM (time - LAG(time) OVER (PARTITION BY action_type ORDER BY time))) as interval_sec
-                    FROM player_actions_ts
-                    WHERE player_id = $1
-                        AND time >= NOW() - INTERVAL '{} hours'
-                )
-                SELECT 
-                    COUNT(*) as total_intervals,
-                    AVG(interval_sec) as avg_interval,
-                    STDDEV(interval_sec) as interval_stddev,
-                    MIN(interval_sec) as min_interval,
-                    MAX(interval_sec) as max_interval
-                FROM intervals
-                WHERE interval_sec IS NOT NULL
-                    AND interval_sec BETWEEN 0.1 AND 3600
-            """.format(hours), player_id)
+            rows = await conn.fetch(BEHAVIOR_PROFILE_SQL, player_id, hours)
+        
+        profile = merge_behavior_profile(rows)
+        hourly_pattern = profile["hourly_pattern"]
+        action_stats = profile["action_statistics"]
+        timing_analysis = profile["timing_analysis"]
+        hourly_buckets = {row["hour_bucket"] for row in hourly_pattern}
         
         return {
             "player_id": player_id,
             "analysis_period_hours": hours,
-            "hourly_pattern": [dict(row) for row in hourly_pattern],
-            "action_statistics": [dict(row) for row in action_stats],
-            "timing_analysis": dict(timing_analysis) if timing_analysis else {},
+            "hourly_pattern": hourly_pattern,
+            "action_statistics": action_stats,
+            "timing_analysis": timing_analysis,
             "risk_indicators": {
-                "perfect_timing": timing_analysis['interval_stddev'] < 0.1 if timing_analysis else False,
-                "high_frequency": len(hourly_pattern) > hours * 0.8,  # 80% 이상 시간대 활동
-                "value_anomalies": any(row['value_stddev'] and row['value_stddev'] > row['avg_value'] * 2 
-                                     for row in action_stats if row['value_stddev'])
+                "perfect_timing": timing_analysis["interval_stddev"] is not None
+                                  and timing_analysis["interval_stddev"] < 0.1,
+                "high_frequency": len(hourly_buckets) > hours * 0.8,  # 80% 이상 시간대 활동
+                "value_anomalies": any(row['value_stddev'] and row['avg_value'] is not None
+                                       and row['value_stddev'] > row['avg_value'] * 2
+                                       for row in action_stats)
             }
         }
     
@@ -226,10 +215,14 @@ async def get_player_behavior_analysis(
 async def ban_player_ts(
     player_id: str,
     ban_request: BanPlayerRequest,
-    ts_engine: TimescaleAntiCheatEngine = Depends(get_timescale_engine)
+    ts_engine: TimescaleAntiCheatEngine = Depends(get_timescale_engine),
+    prefilter: Optional[IngressPreFilter] = Depends(get_prefilter)
 ):
     """플레이어 차단 (TimescaleDB)"""
     try:
+        # 아직 반영되지 않은 신규 플레이어 요약 행이 있으면 먼저 반영
+        await ts_engine.flush_player_summaries()
+        
         async with ts_engine.connection_pool.acquire() as conn:
             # 플레이어 존재 확인
             player_exists = await conn.fetchval("""
@@ -249,6 +242,9 @@ async def ban_player_ts(
                 WHERE player_id = $1
             """, player_id, ban_request.reason)
             
+            if prefilter:
+                prefilter.mark_banned(player_id, SOURCE_TIMESCALE)
+            
             return {
                 "message": f"Player {player_id} has been banned",
                 "reason": ban_request.reason,
@@ -261,7 +257,8 @@ async def ban_player_ts(
 @router.post("/player/{player_id}/unban") 
 async def unban_player_ts(
     player_id: str,
-    ts_engine: TimescaleAntiCheatEngine = Depends(get_timescale_engine)
+    ts_engine: TimescaleAntiCheatEngine = Depends(get_timescale_engine),
+    prefilter: Optional[IngressPreFilter] = Depends(get_prefilter)
 ):
     """플레이어 차단 해제"""
     try:
@@ -278,6 +275,9 @@ async def unban_player_ts(
             if result == "UPDATE 0":
                 raise HTTPException(status_code=404, detail="Player not found or not banned")
             
+            if prefilter:
+                prefilter.mark_unbanned(player_id, SOURCE_TIMESCALE)
+            
             return {"message": f"Player {player_id} has been unbanned"}
     
     except Exception as e:
@@ -330,19 +330,19 @@ async def get_overview_stats_ts(
                 SELECT COUNT(*) FROM player_summary WHERE is_banned = true
             """)
             
-            # 고위험 플레이어 수  
-            high_risk_count = await conn.fetchval("""
-                SELECT COUNT(*) FROM player_summary WHERE current_risk_score > 5.0
-            """)
+            # 고위험 플레이어 수 (반감기 감쇠 적용)
+            high_risk_count = await conn.fetchval(f"""
+                SELECT COUNT(*) FROM player_summary WHERE {decayed_risk_sql("$1")} > 5.0
+            """, ts_engine.risk_half_life)
             
-            # 시간대별 액션 추이 (연속 집계뷰 사용)
+            # 시간대별 액션 추이 (1시간 연속 집계뷰 사용)
             hourly_trend = await conn.fetch("""
                 SELECT 
                     bucket,
                     SUM(total_actions) as actions,
                     COUNT(DISTINCT player_id) as active_players
-                FROM action_stats_1min
-                WHERE bucket >= NOW() - INTERVAL '24 hours'
+                FROM player_activity_1hour
+                WHERE bucket >= time_bucket('1 hour', NOW() - INTERVAL '24 hours')
                 GROUP BY bucket
                 ORDER BY bucket DESC
                 LIMIT 24
@@ -394,10 +394,13 @@ async def get_performance_stats(
             return {
                 "table_sizes": [dict(row) for row in table_sizes],
                 "recent_chunks": [dict(row) for row in chunk_info],
-                "cache_stats": {
-                    "cached_players": len(ts_engine.player_cache),
-                    "max_cache_size": ts_engine.max_cache_size
-                }
+                "cache_stats": ts_engine.player_cache.get_stats(),
+                "ingest_buffer": ts_engine.ingest_buffer.get_stats() if ts_engine.ingest_buffer else None,
+                "hot_window": ts_engine.hot_window.get_stats() if ts_engine.hot_window else None,
+                "rate_counter": ts_engine.rate_counter.get_stats() if ts_engine.rate_counter else None,
+                "summary_buffer": ts_engine.summary_buffer.get_stats() if ts_engine.summary_buffer else None,
+                "detector_scheduler": ts_engine.detector_scheduler.get_stats() if ts_engine.detector_scheduler else None,
+                "admission": ts_engine.get_admission_stats()
             }
     
     except Exception as e:
@@ -407,6 +410,8 @@ async def get_performance_stats(
 async def auto_ban_player_task(player_id: str, reason: str, ts_engine: TimescaleAntiCheatEngine):
     """자동 차단 백그라운드 태스크"""
     try:
+        await ts_engine.flush_player_summaries()
+        
         async with ts_engine.connection_pool.acquire() as conn:
             await conn.execute("""
                 UPDATE player_summary
@@ -416,6 +421,10 @@ async def auto_ban_player_task(player_id: str, reason: str, ts_engine: Timescale
                     updated_at = NOW()
                 WHERE player_id = $1
             """, player_id, f"자동 차단: {reason}")
+        
+        prefilter = get_prefilter()
+        if prefilter:
+            prefilter.mark_banned(player_id, SOURCE_TIMESCALE)
             
         logger.info(f"자동 차단 완료: {player_id} - {reason}")
     
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List, Optional
 import time
@@ -8,7 +9,8 @@ from pydantic import BaseModel
 from ..core.universal_anti_cheat import UniversalAntiCheatEngine, UniversalPlayerAction
 from ..core.game_profiles import GameProfile, GameGenre, ActionDefinition, DetectionRule, ActionCategory
 from ..plugins.plugin_system import PluginManager
-from ..dependencies import get_db
+from ..core.prefilter import IngressPreFilter
+from ..dependencies import get_db, get_prefilter, get_redis_client, rehydration_options
 from ..models.database import Player, Violation, PlayerAction as DBPlayerAction
 
 logger = logging.getLogger(__name__)
@@ -19,11 +21,12 @@ router = APIRouter()
 _universal_engine = None
 _plugin_manager = None
 
-def get_universal_engine() -> UniversalAntiCheatEngine:
+async def get_universal_engine() -> UniversalAntiCheatEngine:
     """범용 치팅 탐지 엔진 인스턴스 반환"""
     global _universal_engine
     if _universal_engine is None:
-        _universal_engine = UniversalAntiCheatEngine()
+        redis_client = await get_redis_client()
+        _universal_engine = UniversalAntiCheatEngine(redis_client=redis_client, **rehydration_options())
     return _universal_engine
 
 def get_plugin_manager() -> PluginManager:
@@ -152,9 +155,16 @@ async def submit_universal_action(
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     engine: UniversalAntiCheatEngine = Depends(get_universal_engine),
-    plugin_manager: PluginManager = Depends(get_plugin_manager)
+    plugin_manager: PluginManager = Depends(get_plugin_manager),
+    prefilter: Optional[IngressPreFilter] = Depends(get_prefilter)
 ):
     """범용 플레이어 액션 제출 및 분석"""
+    # 사전 필터 (차단/플러딩 플레이어는 플러그인·엔진 분석 생략)
+    if prefilter:
+        verdict = prefilter.check(action_data.player_id, game_id=action_data.game_id)
+        if verdict:
+            return JSONResponse(status_code=verdict.status_code, content=verdict.to_dict())
+    
     # UniversalPlayerAction 생성
     action = UniversalPlayerAction(
         player_id=action_data.player_id,
@@ -412,12 +422,12 @@ async def get_game_analytics(
     # 기본 통계
     total_players = db.query(Player).join(DBPlayerAction).filter(
         DBPlayerAction.timestamp >= cutoff_date,
-        DBPlayerAction.metadata.like(f'%"game_id": "{game_id}"%')
+        DBPlayerAction.action_metadata.like(f'%"game_id": "{game_id}"%')
     ).distinct().count()
     
     total_actions = db.query(DBPlayerAction).filter(
         DBPlayerAction.timestamp >= cutoff_date,
-        DBPlayerAction.metadata.like(f'%"game_id": "{game_id}"%')
+        DBPlayerAction.action_metadata.like(f'%"game_id": "{game_id}"%')
     ).count()
     
     total_violations = db.query(Violation).filter(
@@ -0,0 +1,170 @@
+"""
+asyncpg 커넥션 풀 진입 제어
+- 풀 대기열 길이 제한: max_waiters 를 넘는 요청은 대기하지 않고 즉시 거절
+- 요청별 대기 기한: 기한 내에 커넥션을 얻지 못하면 거절 (acquire 대기열이 무한히 쌓이지 않도록)
+- 요청 전체 기한: 커넥션 대기 + 쿼리 합계. 남은 시간을 쿼리마다 timeout= 으로 전달 (초과 시 asyncio.TimeoutError)
+- 포화 지표: 사용 중 / 유휴 커넥션, 대기 수, 거절·타임아웃 횟수, 대기 시간 백분위
+- 거절 시 PoolSaturatedError → 엔진은 인메모리 탐지로 강등하거나 503 (Retry-After) 응답
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+import asyncpg
+
+REASON_QUEUE_FULL = "queue_full"
+REASON_TIMEOUT = "timeout"
+
+
+class PoolSaturatedError(Exception):
+    """커넥션 풀 포화로 요청을 받을 수 없음"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"connection pool saturated ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class DeadlineConnection:
+    """
+    요청 기한의 남은 시간을 쿼리마다 timeout= 으로 전달하는 커넥션 래퍼
+    (그 외 속성은 원래 커넥션으로 위임, 기한이 지나면 쿼리를 보내지 않고 asyncio.TimeoutError)
+    """
+
+    __slots__ = ("_conn", "_expires_at")
+
+    def __init__(self, conn: asyncpg.Connection, expires_at: float):
+        self._conn = conn
+        self._expires_at = expires_at
+
+    def remaining(self) -> float:
+        remaining = self._expires_at - time.monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError("request deadline exceeded")
+        return remaining
+
+    async def execute(self, query: str, *args) -> str:
+        return await self._conn.execute(query, *args, timeout=self.remaining())
+
+    async def executemany(self, command: str, args: Iterable) -> None:
+        return await self._conn.executemany(command, args, timeout=self.remaining())
+
+    async def fetch(self, query: str, *args):
+        return await self._conn.fetch(query, *args, timeout=self.remaining())
+
+    async def fetchrow(self, query: str, *args):
+        return await self._conn.fetchrow(query, *args, timeout=self.remaining())
+
+    async def fetchval(self, query: str, *args, column: int = 0):
+        return await self._conn.fetchval(query, *args, column=column, timeout=self.remaining())
+
+    def __getattr__(self, name: str):
+        return getattr(self._conn, name)
+
+
+class PoolAdmissionController:
+    """
+    커넥션 획득 진입 제어
+    - max_waiters: 동시에 커넥션을 기다릴 수 있는 최대 요청 수
+    - acquire_timeout: 기본 커넥션 대기 기한 (초)
+    - retry_after: 거절 응답에 실을 재시도 권장 시간 (초)
+    - request_timeout: 요청 전체 기한 (초, 커넥션 대기 포함). None 이면 쿼리는 풀의 command_timeout 만 적용
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        max_waiters: int = 200,
+        acquire_timeout: float = 0.2,
+        retry_after: float = 1.0,
+        request_timeout: Optional[float] = None
+    ):
+        self.pool = pool
+        self.max_waiters = max_waiters
+        self.acquire_timeout = acquire_timeout
+        self.retry_after = retry_after
+        self.request_timeout = request_timeout
+
+        self._waiting = 0
+        self._wait_samples: deque = deque(maxlen=2048)
+
+        # 통계
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.timeouts = 0
+        self.deadline_exceeded = 0
+        self.max_waiting_seen = 0
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    @asynccontextmanager
+    async def acquire(self, timeout: Optional[float] = None) -> AsyncIterator[asyncpg.Connection]:
+        """
+        기한 내 커넥션 획득 (실패 시 PoolSaturatedError)
+        request_timeout 이 있으면 남은 기한을 쿼리에 전달하는 DeadlineConnection 을 반환
+        """
+        if self._waiting >= self.max_waiters:
+            self.rejected_queue_full += 1
+            raise PoolSaturatedError(REASON_QUEUE_FULL, self.retry_after)
+
+        expires_at = None
+        if self.request_timeout:
+            expires_at = time.monotonic() + self.request_timeout
+            timeout = self.request_timeout if timeout is None else min(timeout, self.request_timeout)
+        timeout = self.acquire_timeout if timeout is None else min(timeout, self.acquire_timeout)
+        if timeout <= 0:
+            self.timeouts += 1
+            raise PoolSaturatedError(REASON_TIMEOUT, self.retry_after)
+
+        self._waiting += 1
+        self.max_waiting_seen = max(self.max_waiting_seen, self._waiting)
+        started = time.perf_counter()
+        try:
+            conn = await self.pool.acquire(timeout=timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise PoolSaturatedError(REASON_TIMEOUT, self.retry_after)
+        finally:
+            self._waiting -= 1
+            self._wait_samples.append(time.perf_counter() - started)
+
+        self.admitted += 1
+        try:
+            yield conn if expires_at is None else DeadlineConnection(conn, expires_at)
+        except asyncio.TimeoutError:
+            self.deadline_exceeded += 1
+            raise
+        finally:
+            await self.pool.release(conn)
+
+    def _wait_percentile(self, ratio: float) -> float:
+        if not self._wait_samples:
+            return 0.0
+        values = sorted(self._wait_samples)
+        return values[min(len(values) - 1, int(len(values) * ratio))] * 1000
+
+    def get_stats(self) -> Dict[str, Any]:
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        return {
+            "pool_size": size,
+            "pool_max_size": self.pool.get_max_size(),
+            "in_use": size - idle,
+            "idle": idle,
+            "waiting": self._waiting,
+            "max_waiters": self.max_waiters,
+            "max_waiting_seen": self.max_waiting_seen,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "timeouts": self.timeouts,
+            "deadline_exceeded": self.deadline_exceeded,
+            "acquire_wait_p50_ms": round(self._wait_percentile(0.50), 2),
+            "acquire_wait_p99_ms": round(self._wait_percentile(0.99), 2),
+            "acquire_timeout_ms": self.acquire_timeout * 1000,
+            "request_timeout_ms": self.request_timeout * 1000 if self.request_timeout else None
+        }
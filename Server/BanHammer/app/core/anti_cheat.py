@@ -7,11 +7,12 @@ from enum import Enum
 import numpy as np
 from collections import defaultdict, deque
 import redis.asyncio as redis
-import json
 import logging
 
 from ..ml.training_pipeline import MLAntiCheatEngine
 from ..ml.models import ModelPrediction
+from .rehydration import RedisWindowRehydrator
+from .state_codec import ActionRecord, encode_action_record
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +40,15 @@ class ViolationRecord:
     details: Dict[str, Any] = field(default_factory=dict)
 
 class AntiCheatEngine:
-    def __init__(self, redis_client: Optional[redis.Redis] = None, enable_ml: bool = True):
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        enable_ml: bool = True,
+        rehydrate_from_redis: bool = True,
+        rehydration_concurrency: int = 8,
+        rehydration_batch_size: int = 64,
+        rehydration_negative_ttl: float = 300.0
+    ):
         self.redis = redis_client
         self.enable_ml = enable_ml
         
@@ -76,8 +85,19 @@ class AntiCheatEngine:
         self.violation_scores: Dict[str, float] = defaultdict(float)
         self.player_stats: Dict[str, Dict] = defaultdict(dict)
         
+        # 재시작 후 첫 조회 시 Redis 액션 리스트에서 윈도우 복원
+        self.rehydrator: Optional[RedisWindowRehydrator] = None
+        if redis_client and rehydrate_from_redis:
+            self.rehydrator = RedisWindowRehydrator(
+                redis_client,
+                max_actions=1000,
+                max_concurrency=rehydration_concurrency,
+                batch_size=rehydration_batch_size,
+                negative_ttl=rehydration_negative_ttl
+            )
+        
         # Memory management settings - 현실적인 수치로 변경
-        self.max_players_in_memory = 100000  # Maximum players to keep in memory (10만명 = ~7.5GB)
+        self.max_players_in_memory = 100000  # Maximum players to keep in memory (플레이어당 실측치는 /api/admin/memory 참고)
         self.cleanup_interval = 600  # Cleanup every 10 minutes  
         self.last_cleanup = time.time()
         
@@ -90,6 +110,9 @@ class AntiCheatEngine:
         # Check memory usage and cleanup if needed
         await self._check_memory_usage()
         
+        # 메모리에 윈도우가 없으면 Redis 에서 복원 (재시작 / 메모리 정리 이후)
+        await self._ensure_window(action.player_id)
+        
         # Store action
         self.player_actions[action.player_id].append(action)
         
@@ -332,24 +355,53 @@ class AntiCheatEngine:
         
         return violations
 
+    async def _ensure_window(self, player_id: str):
+        """플레이어 윈도우가 비어 있으면 Redis 리스트에서 오래된 순으로 채움"""
+        if not self.rehydrator or self.player_actions.get(player_id):
+            return
+        records = await self.rehydrator.fetch(f"player_actions:{player_id}")
+        if not records:
+            return
+        window = self.player_actions[player_id]
+        if window:
+            return  # 대기 중 다른 요청이 먼저 채움
+        window.extend(
+            PlayerAction(
+                player_id=player_id,
+                action_type=record.action_type,
+                timestamp=record.timestamp,
+                value=float(record.value or 0.0),
+                metadata=record.metadata
+            )
+            for record in records
+        )
+
+    def get_rehydration_stats(self) -> Dict[str, Any]:
+        return self.rehydrator.get_stats() if self.rehydrator else {"enabled": False}
+
     async def _store_action_redis(self, action: PlayerAction):
         if not self.redis:
             return
             
         key = f"player_actions:{action.player_id}"
-        action_data = {
-            "action_type": action.action_type,
-            "timestamp": action.timestamp,
-            "value": action.value,
-            "metadata": action.metadata
-        }
-        
-        # Store in Redis with expiration
-        await self.redis.lpush(key, json.dumps(action_data))
-        await self.redis.ltrim(key, 0, 999)  # Keep last 1000 actions
-        await self.redis.expire(key, 86400)  # Expire after 24 hours
+        record = encode_action_record(ActionRecord(
+            action_type=action.action_type,
+            timestamp=action.timestamp,
+            value=action.value,
+            metadata=action.metadata
+        ))
+        
+        # Store in Redis with expiration (single round trip)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.lpush(key, record)
+        pipe.ltrim(key, 0, 999)  # Keep last 1000 actions
+        pipe.expire(key, 86400)  # Expire after 24 hours
+        await pipe.execute()
+        if self.rehydrator:
+            self.rehydrator.forget(key)
 
     async def get_player_risk_score(self, player_id: str) -> float:
+        await self._ensure_window(player_id)
         base_score = self.violation_scores.get(player_id, 0.0)
         
         # Decay score over time
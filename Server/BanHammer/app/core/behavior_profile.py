@@ -0,0 +1,137 @@
+"""
+플레이어 행동 프로필 병합
+- player_behavior_1hour 연속 집계뷰의 (시간, 액션 타입, 값 구간) 버킷을 합산해 행동 분석 결과 생성
+- 평균 / 표준편차는 개수·합·제곱합 모멘트로 계산 (원시 행 스캔 없음)
+- 백분위는 로그 스케일 값 구간의 누적 개수로 근사: 구간 내부는 실제 최소~최대 사이 선형 보간
+- 조회 비용은 (시간 수 × 액션 타입 × 값 구간) 에 비례하고 플레이어 활동량과 무관
+"""
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+# 분석 구간: 현재 시간 버킷 포함 최근 $2 개 버킷
+BEHAVIOR_PROFILE_SQL = """
+SELECT
+    bucket, action_type, value_bin,
+    action_count, value_sum, value_sum_sq, value_min, value_max,
+    interval_count, interval_sum, interval_sum_sq, interval_min, interval_max
+FROM player_behavior_1hour
+WHERE player_id = $1
+    AND bucket >= time_bucket('1 hour', NOW()) - make_interval(hours => $2 - 1)
+"""
+
+
+@dataclass
+class Moments:
+    """개수 / 합 / 제곱합 / 최소 / 최대 (버킷끼리 합산 가능)"""
+    count: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+    def add(self, count: int, total: float, total_sq: float,
+            minimum: Optional[float], maximum: Optional[float]):
+        if not count:
+            return
+        self.count += count
+        self.total += total or 0.0
+        self.total_sq += total_sq or 0.0
+        if minimum is not None and (self.minimum is None or minimum < self.minimum):
+            self.minimum = minimum
+        if maximum is not None and (self.maximum is None or maximum > self.maximum):
+            self.maximum = maximum
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    @property
+    def stddev(self) -> Optional[float]:
+        """표본 표준편차 (SQL STDDEV 와 동일하게 1개 이하면 None)"""
+        if self.count < 2:
+            return None
+        variance = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+def approximate_percentile(bins: Mapping[int, Moments], ratio: float) -> Optional[float]:
+    """값 구간별 개수로 백분위 근사 (구간 내부는 최소~최대 선형 보간)"""
+    total = sum(m.count for m in bins.values())
+    if not total:
+        return None
+
+    target = ratio * (total - 1)
+    seen = 0
+    for value_bin in sorted(bins):
+        moments = bins[value_bin]
+        if seen + moments.count > target:
+            if moments.count == 1 or moments.minimum == moments.maximum:
+                return moments.minimum
+            position = (target - seen) / (moments.count - 1)
+            return moments.minimum + (moments.maximum - moments.minimum) * min(position, 1.0)
+        seen += moments.count
+    return bins[max(bins)].maximum
+
+
+def merge_behavior_profile(rows: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    집계뷰 행 → 행동 분석 결과
+    - hourly_pattern: 시간 버킷 × 액션 타입별 개수 / 평균 / 표준편차 (최신순)
+    - action_statistics: 액션 타입별 개수 / 평균 / 표준편차 / 최대 / 근사 p95 (개수 내림차순)
+    - timing_analysis: 같은 액션 타입 연속 간격(0.1~3600초)의 개수 / 평균 / 표준편차 / 최소 / 최대
+    """
+    hourly: Dict[Tuple[datetime, str], Moments] = defaultdict(Moments)
+    per_type: Dict[str, Moments] = defaultdict(Moments)
+    value_bins: Dict[str, Dict[int, Moments]] = defaultdict(lambda: defaultdict(Moments))
+    intervals = Moments()
+
+    for row in rows:
+        value = (row['action_count'], row['value_sum'], row['value_sum_sq'], row['value_min'], row['value_max'])
+        hourly[(row['bucket'], row['action_type'])].add(*value)
+        per_type[row['action_type']].add(*value)
+        value_bins[row['action_type']][row['value_bin']].add(*value)
+        intervals.add(
+            row['interval_count'], row['interval_sum'], row['interval_sum_sq'],
+            row['interval_min'], row['interval_max']
+        )
+
+    hourly_pattern = [
+        {
+            "hour_bucket": bucket,
+            "action_type": action_type,
+            "action_count": moments.count,
+            "avg_value": moments.mean,
+            "value_stddev": moments.stddev
+        }
+        for (bucket, action_type), moments in sorted(hourly.items(), key=lambda item: item[0][0], reverse=True)
+    ]
+
+    action_statistics = [
+        {
+            "action_type": action_type,
+            "total_count": moments.count,
+            "avg_value": moments.mean,
+            "value_stddev": moments.stddev,
+            "max_value": moments.maximum,
+            "p95_value": approximate_percentile(value_bins[action_type], 0.95)
+        }
+        for action_type, moments in sorted(per_type.items(), key=lambda item: item[1].count, reverse=True)
+    ]
+
+    timing_analysis = {
+        "total_intervals": intervals.count,
+        "avg_interval": intervals.mean,
+        "interval_stddev": intervals.stddev,
+        "min_interval": intervals.minimum,
+        "max_interval": intervals.maximum
+    }
+
+    return {
+        "hourly_pattern": hourly_pattern,
+        "action_statistics": action_statistics,
+        "timing_analysis": timing_analysis
+    }
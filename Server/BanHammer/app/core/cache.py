@@ -0,0 +1,130 @@
+"""
+재사용 가능한 LRU + TTL 캐시
+- OrderedDict 기반 O(1) get / put / invalidate
+- 용량 초과 시 가장 오래 사용되지 않은 항목 축출, 만료된 항목은 조회 시 제거
+- hit / miss / eviction / expiration / invalidation 통계 제공
+- 단일 이벤트 루프(스레드)에서 사용하는 것을 전제로 잠금 없음
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class LRUTTLCache(Generic[K, V]):
+    """
+    크기 제한 + 항목별 TTL 캐시
+    - max_size: 최대 항목 수
+    - ttl_seconds: 기본 TTL (None 이면 만료 없음)
+    - clock: 테스트/시뮬레이션용 시계 주입 (기본 time.monotonic)
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl_seconds: Optional[float] = 300.0,
+        name: str = "cache",
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self._clock = clock
+
+        # key -> (value, expires_at)
+        self._entries: "OrderedDict[K, Tuple[V, Optional[float]]]" = OrderedDict()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        """만료 여부와 무관하게 저장되어 있는지 (통계/LRU 순서에 영향 없음)"""
+        return key in self._entries
+
+    def get(self, key: K, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at is not None and self._clock() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: K, value: V, ttl_seconds: Optional[float] = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = self._clock() + ttl if ttl is not None else None
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (value, expires_at)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: K) -> bool:
+        """항목 제거 (점수 변경 등 원본 데이터가 바뀌었을 때 호출)"""
+        if self._entries.pop(key, _MISSING) is _MISSING:
+            return False
+        self.invalidations += 1
+        return True
+
+    def invalidate_many(self, keys: Iterable[K]) -> int:
+        return sum(1 for key in keys if self.invalidate(key))
+
+    def clear(self):
+        self._entries.clear()
+
+    def purge_expired(self) -> int:
+        """만료된 항목 일괄 정리 (주기적 정리 태스크용, O(n))"""
+        now = self._clock()
+        expired = [
+            key for key, (_, expires_at) in self._entries.items()
+            if expires_at is not None and now >= expires_at
+        ]
+        for key in expired:
+            del self._entries[key]
+        self.expirations += len(expired)
+        return len(expired)
+
+    @property
+    def entries(self) -> Dict[K, Tuple[V, Optional[float]]]:
+        """메모리 리포트용 읽기 전용 뷰"""
+        return self._entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
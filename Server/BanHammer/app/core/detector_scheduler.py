@@ -0,0 +1,258 @@
+"""
+탐지기 실행 주기 스케줄러
+- 비싼 탐지기(24시간 활동, 30분 타이밍 분산 등)를 매 액션마다 실행하지 않고 탐지기별 주기로 실행
+- 주기 종류: 매 액션 / N 액션마다 / 플레이어별 T 초마다 / 백그라운드 스윕
+- 상태는 (탐지기, 액션 타입) 단위: 액션 타입별 입력을 쓰는 탐지기(타이밍)는 타입마다 주기를 따로 셈
+- 실행하지 않은 액션은 판정 생략 (같은 입력으로 위반을 반복 기록하지 않음), 스윕 결과는 다음 액션에서 한 번만 판정
+- 최근 위반이 발생한 플레이어(위험도 상승)는 주기를 자동으로 좁힘
+- 탐지기별 실행/생략 횟수 통계 제공
+"""
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .cache import LRUTTLCache
+
+CADENCE_ALWAYS = "always"
+CADENCE_SWEEP = "sweep"
+
+# (탐지기, 액션 타입) - 플레이어 단위 탐지기는 액션 타입 None
+StateKey = Tuple[str, Optional[str]]
+
+
+@dataclass(frozen=True)
+class DetectorCadence:
+    """
+    탐지기 실행 주기
+    - every_n_actions: N 번째 액션마다 실행
+    - every_seconds: 플레이어별 마지막 실행 후 T 초가 지나면 실행
+    - sweep: 요청 경로에서는 실행하지 않고 백그라운드 스윕 결과만 사용 (결과가 없으면 1회 실행)
+    둘 다 지정하면 먼저 도달한 조건에서 실행
+    """
+    every_n_actions: Optional[int] = None
+    every_seconds: Optional[float] = None
+    sweep: bool = False
+
+    @classmethod
+    def parse(cls, spec: str) -> "DetectorCadence":
+        """'always' | 'sweep' | '<N>' (액션 수) | '<T>s' (초)"""
+        spec = spec.strip().lower()
+        if spec == CADENCE_ALWAYS:
+            return cls(every_n_actions=1)
+        if spec == CADENCE_SWEEP:
+            return cls(sweep=True)
+        if spec.endswith("s"):
+            return cls(every_seconds=float(spec[:-1]))
+        return cls(every_n_actions=max(1, int(spec)))
+
+    def describe(self) -> str:
+        if self.sweep:
+            return CADENCE_SWEEP
+        parts = []
+        if self.every_n_actions:
+            parts.append(CADENCE_ALWAYS if self.every_n_actions == 1 else f"every {self.every_n_actions} actions")
+        if self.every_seconds:
+            parts.append(f"every {self.every_seconds:g}s")
+        return " / ".join(parts)
+
+
+def parse_cadences(spec: str) -> Dict[str, DetectorCadence]:
+    """'timing=30s,sequence=5,activity=sweep' 형식의 설정 문자열 파싱"""
+    cadences = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        cadences[name.strip()] = DetectorCadence.parse(value)
+    return cadences
+
+
+class _PlayerSchedule:
+    """플레이어 한 명의 (탐지기, 액션 타입)별 실행 상태"""
+
+    __slots__ = ("actions_since", "last_run", "unjudged", "hot_until")
+
+    def __init__(self):
+        self.actions_since: Dict[StateKey, int] = {}
+        self.last_run: Dict[StateKey, float] = {}
+        # 아직 판정하지 않은 스윕 결과
+        self.unjudged: Dict[StateKey, Any] = {}
+        self.hot_until = 0.0
+
+
+class DetectorPlan:
+    """한 액션에 대한 실행 계획 (due 인 탐지기만 실제로 계산)"""
+
+    __slots__ = ("_scheduler", "_state", "_due", "_now", "_action_type")
+
+    def __init__(self, scheduler: Optional["DetectorScheduler"], state: Optional[_PlayerSchedule],
+                 due: Optional[Set[str]], now: float, action_type: Optional[str] = None):
+        self._scheduler = scheduler
+        self._state = state
+        self._due = due
+        self._now = now
+        self._action_type = action_type
+
+    @classmethod
+    def always(cls) -> "DetectorPlan":
+        """스케줄러 미사용 시: 모든 탐지기를 매번 실행"""
+        return cls(None, None, None, 0.0)
+
+    def due(self, detector: str) -> bool:
+        return self._due is None or detector in self._due
+
+    def ran(self, detector: str):
+        """이번 액션에서 실행(및 판정)했음을 기록"""
+        if self._state is None:
+            return
+        key = self._scheduler._key(detector, self._action_type)
+        self._state.last_run[key] = self._now
+        self._state.actions_since[key] = 0
+        self._state.unjudged.pop(key, None)
+        self._scheduler._runs[detector] += 1
+
+    def take_sweep_result(self, detector: str) -> Any:
+        """아직 판정하지 않은 스윕 결과 (한 번만 반환, 없으면 None)"""
+        if self._state is None:
+            return None
+        return self._state.unjudged.pop(self._scheduler._key(detector, self._action_type), None)
+
+
+class DetectorScheduler:
+    """
+    탐지기별 주기 관리
+    - cadences: 탐지기 이름 → 주기 (등록되지 않은 탐지기는 매 액션 실행)
+    - tighten_factor: 위험도 상승 플레이어의 주기 축소 배율
+    - hot_seconds: 위반 발생 후 주기 축소를 유지하는 시간
+    - sweep_interval: 백그라운드 스윕 주기 (초)
+    - max_players: 상태를 유지하는 최대 플레이어 수 (LRU)
+    - per_action_type: 액션 타입별로 주기를 따로 세는 탐지기 (나머지는 플레이어 단위)
+    """
+
+    def __init__(
+        self,
+        cadences: Dict[str, DetectorCadence],
+        per_action_type: Iterable[str] = (),
+        tighten_factor: float = 4.0,
+        hot_seconds: float = 600.0,
+        sweep_interval: float = 60.0,
+        max_players: int = 100000,
+        state_ttl_seconds: float = 3600.0
+    ):
+        self.cadences = cadences
+        self.per_action_type = frozenset(per_action_type)
+        self.tighten_factor = max(1.0, tighten_factor)
+        self.hot_seconds = hot_seconds
+        self.sweep_interval = sweep_interval
+        self._players: LRUTTLCache[str, _PlayerSchedule] = LRUTTLCache(
+            max_size=max_players, ttl_seconds=state_ttl_seconds, name="detector_scheduler.players"
+        )
+
+        # 백그라운드 스윕 대상 (마지막 스윕 이후 활동한 플레이어)
+        self._sweep_candidates: Set[str] = set()
+        self._has_sweep = any(cadence.sweep for cadence in cadences.values())
+
+        # 통계
+        self._runs: Dict[str, int] = defaultdict(int)
+        self._skips: Dict[str, int] = defaultdict(int)
+        self._sweep_runs: Dict[str, int] = defaultdict(int)
+        self.sweeps = 0
+
+    @property
+    def sweep_detectors(self) -> List[str]:
+        return [name for name, cadence in self.cadences.items() if cadence.sweep]
+
+    def _key(self, detector: str, action_type: Optional[str]) -> StateKey:
+        return detector, action_type if detector in self.per_action_type else None
+
+    def plan(self, player_id: str, action_type: Optional[str] = None, now: Optional[float] = None) -> DetectorPlan:
+        """이번 액션에서 실행할 탐지기 결정 (액션 카운트 증가 포함)"""
+        now = now or time.time()
+        state = self._players.get(player_id)
+        if state is None:
+            state = _PlayerSchedule()
+            self._players.put(player_id, state)
+
+        hot = now < state.hot_until
+        due = set()
+        for detector, cadence in self.cadences.items():
+            key = self._key(detector, action_type)
+            count = state.actions_since.get(key, 0) + 1
+            state.actions_since[key] = count
+            if self._is_due(key, cadence, state, count, now, hot):
+                due.add(detector)
+            else:
+                self._skips[detector] += 1
+
+        if self._has_sweep:
+            self._sweep_candidates.add(player_id)
+        return DetectorPlan(self, state, due, now, action_type)
+
+    def _is_due(self, key: StateKey, cadence: DetectorCadence, state: _PlayerSchedule,
+                count: int, now: float, hot: bool) -> bool:
+        last_run = state.last_run.get(key)
+        if last_run is None:
+            return True  # 첫 실행 (또는 상태 축출 후)
+
+        if cadence.sweep:
+            # 스윕 결과 사용. 위험도 상승 플레이어는 스윕을 기다리지 않고 요청 경로에서 좁힌 주기로 실행
+            return hot and now - last_run >= self.sweep_interval / self.tighten_factor
+
+        factor = self.tighten_factor if hot else 1.0
+        if cadence.every_n_actions and count >= max(1, int(cadence.every_n_actions / factor)):
+            return True
+        if cadence.every_seconds and now - last_run >= cadence.every_seconds / factor:
+            return True
+        return False
+
+    def note_violations(self, player_id: str, severity: float, now: Optional[float] = None):
+        """위반 발생 시 해당 플레이어 주기 축소 (위험도 상승)"""
+        if severity <= 0:
+            return
+        state = self._players.get(player_id)
+        if state is not None:
+            state.hot_until = (now or time.time()) + self.hot_seconds
+
+    # ===== 백그라운드 스윕 =====
+
+    def take_sweep_candidates(self) -> List[str]:
+        candidates = list(self._sweep_candidates)
+        self._sweep_candidates = set()
+        return candidates
+
+    def store_sweep_results(self, detector: str, results: Dict[str, Any], players: Iterable[str],
+                            default: Any = None, now: Optional[float] = None):
+        """스윕 결과 반영 (결과 행이 없는 플레이어는 default 로 기록, 스윕 탐지기는 플레이어 단위)"""
+        now = now or time.time()
+        key = self._key(detector, None)
+        for player_id in players:
+            state = self._players.get(player_id)
+            if state is None:
+                continue
+            state.unjudged[key] = results.get(player_id, default)
+            state.last_run[key] = now
+            state.actions_since[key] = 0
+            self._sweep_runs[detector] += 1
+        self.sweeps += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        detectors = {}
+        for name, cadence in self.cadences.items():
+            runs = self._runs[name]
+            skips = self._skips[name]
+            detectors[name] = {
+                "cadence": cadence.describe(),
+                "inline_runs": runs,
+                "sweep_runs": self._sweep_runs[name],
+                "skipped": skips,
+                "skip_ratio": round(skips / (runs + skips), 4) if runs + skips else 0.0
+            }
+        return {
+            "detectors": detectors,
+            "tracked_players": len(self._players),
+            "pending_sweep_players": len(self._sweep_candidates),
+            "sweeps": self.sweeps,
+            "tighten_factor": self.tighten_factor
+        }
@@ -0,0 +1,545 @@
+"""
+기존 엔진(/api/action) → TimescaleDB 이중 기록 (무중단 전환용)
+- 요청 경로에서는 메모리 큐에 넣기만 함 (await 없음, DB 왕복 없음)
+- 백그라운드 라이터가 COPY 배치로 player_actions_ts / violations_ts 적재, player_summary 는 UPSERT
+- 큐가 가득 차면 로컬 저널 파일로 넘김 (요청을 막거나 행을 버리지 않음) → DB 가 따라잡으면 저널부터 재생
+- DB 장애 / 테이블 미생성 등 일시 오류는 배치를 되돌려 놓고 지수 백오프 재시도
+- 행 자체가 잘못된 경우만 거부 파일에 기록 (유실 대신 보관)
+- 워터마크: 이중 기록 시작 시각. 이보다 이전 행은 마이그레이션(--until-watermark)이, 이후 행은 라이터가 담당
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import asyncpg
+
+from .ingest_buffer import ACTION_COLUMNS, fill_batch_intervals
+from ..models.database import PlayerAction as DBPlayerAction, Violation
+
+logger = logging.getLogger(__name__)
+
+# 대상 DB 의 전환 상태 (워터마크, 백필 완료 / 검증 결과) - 마이그레이션 스크립트와 공유
+CREATE_STATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS dual_write_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+"""
+
+SET_STATE_SQL = """
+INSERT INTO dual_write_state (key, value, updated_at) VALUES ($1, $2, NOW())
+ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = NOW()
+"""
+
+WATERMARK_KEY = "watermark"  # epoch 초 (문자열)
+BACKFILL_DONE_KEY = "backfill_completed_at"
+BACKFILL_VERIFIED_KEY = "backfill_verified"  # "true" / "false"
+
+VIOLATION_COLUMNS = ["time", "player_id", "violation_type", "severity", "details", "resolved"]
+
+# $4(위험도) / $5(차단 여부) 가 NULL 이면 해당 값은 그대로 유지 (차단 이벤트가 활동 시각을 바꾸지 않도록)
+# 저널 재생이 메모리 큐보다 늦게 적재될 수 있으므로 위험도 / 차단 상태는 이벤트 시각($3)이 더 최신일 때만 반영
+# (차단 상태 기준 시각은 ban_updated_at, 이중 기록 이전 행은 ban_timestamp)
+_BAN_IS_NEWER = (
+    "$5::boolean IS NOT NULL AND $3::timestamptz >= COALESCE("
+    "GREATEST(player_summary.ban_updated_at, player_summary.ban_timestamp), '-infinity'::timestamptz)"
+)
+
+PLAYER_UPSERT_SQL = f"""
+INSERT INTO player_summary (
+    player_id, username, last_activity, current_risk_score, risk_updated_at,
+    is_banned, ban_reason, ban_timestamp, ban_updated_at
+)
+VALUES ($1, $2, $3, COALESCE($4, 0.0), $3, COALESCE($5, FALSE), $6, $7, CASE WHEN $5::boolean IS NULL THEN NULL ELSE $3::timestamptz END)
+ON CONFLICT (player_id) DO UPDATE SET
+    username = COALESCE(EXCLUDED.username, player_summary.username),
+    last_activity = CASE WHEN $4::double precision IS NULL THEN player_summary.last_activity
+        ELSE GREATEST(player_summary.last_activity, EXCLUDED.last_activity) END,
+    current_risk_score = CASE WHEN $4::double precision IS NOT NULL AND EXCLUDED.risk_updated_at >= player_summary.risk_updated_at
+        THEN EXCLUDED.current_risk_score ELSE player_summary.current_risk_score END,
+    risk_updated_at = CASE WHEN $4::double precision IS NULL THEN player_summary.risk_updated_at
+        ELSE GREATEST(player_summary.risk_updated_at, EXCLUDED.risk_updated_at) END,
+    is_banned = CASE WHEN {_BAN_IS_NEWER} THEN $5 ELSE player_summary.is_banned END,
+    ban_reason = CASE WHEN {_BAN_IS_NEWER} THEN $6 ELSE player_summary.ban_reason END,
+    ban_timestamp = CASE WHEN {_BAN_IS_NEWER} THEN $7 ELSE player_summary.ban_timestamp END,
+    ban_updated_at = CASE WHEN {_BAN_IS_NEWER} THEN $3::timestamptz ELSE player_summary.ban_updated_at END,
+    updated_at = NOW()
+"""
+
+# 큐 / 저널 행: (종류, epoch 초, player_id, ...) - JSON 한 줄로 그대로 저널에 기록
+# a: (action_type, value, metadata_json, interval_sec) - interval_sec 은 적재 시 배치 안에서 / 대상 DB 트리거가 계산 (None, 이전 저널은 값 유지)
+# v: (violation_type, severity, details_json)
+# p: (username, risk_score, is_banned, ban_reason)
+Row = Tuple[Any, ...]
+
+# 재시도하면 해결되는 오류 (연결 / 풀 / 스키마 미생성) - 그 외 Postgres 오류는 행 단위로 격리
+_TRANSIENT_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.InterfaceError,
+    asyncpg.exceptions.PostgresConnectionError,
+    asyncpg.exceptions.UndefinedTableError,
+    asyncpg.exceptions.AdminShutdownError,
+)
+
+
+def _to_time(epoch: float) -> datetime:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+def _merge_player_rows(previous: Optional[Row], row: Row) -> Row:
+    if previous is None:
+        return row
+    older, newer = (previous, row) if previous[1] <= row[1] else (row, previous)
+    banned = newer[5] is not None
+    return (
+        "p", newer[1], newer[2],
+        newer[3] if newer[3] is not None else older[3],
+        newer[4] if newer[4] is not None else older[4],
+        newer[5] if banned else older[5],
+        newer[6] if banned else older[6]
+    )
+
+
+class TimescaleDualWriter:
+    """
+    TimescaleDB 이중 기록 라이터
+    - max_queue_rows: 메모리 큐 상한 (넘치면 저널 파일로)
+    - batch_rows: 트랜잭션 1회당 최대 행 수
+    - flush_interval: 최대 대기 시간 (초)
+    - spill_path: 저널 파일 경로 (재생 중 파일은 .replay, 거부 행은 .rejected)
+    - session_factory: 일관성 보고서에서 기존 DB 집계에 사용
+    """
+
+    def __init__(
+        self,
+        timescale_url: str,
+        session_factory: Optional[Callable] = None,
+        max_queue_rows: int = 50000,
+        batch_rows: int = 1000,
+        flush_interval: float = 0.05,
+        spill_path: str = "./dual_write_spill.jsonl",
+        pool_size: int = 4,
+        max_backoff: float = 5.0
+    ):
+        self.timescale_url = timescale_url
+        self.session_factory = session_factory
+        self.max_queue_rows = max_queue_rows
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.replay_path = f"{spill_path}.replay"
+        self.rejected_path = f"{spill_path}.rejected"
+        self.pool_size = pool_size
+        self.max_backoff = max_backoff
+
+        # 이 프로세스에서 이중 기록을 켠 시각 → 대상 DB 에 워터마크가 없으면 이 값으로 기록
+        self.enabled_at = time.time()
+        self.watermark: Optional[float] = None
+
+        self._queue: Deque[Row] = deque()
+        self._spill_file = None
+        self._journal_rows = 0  # 아직 적재되지 않은 저널 행 수 (spill + replay)
+
+        self._pool: Optional[asyncpg.Pool] = None
+        self._wakeup = asyncio.Event()
+        self._drain_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        # 통계
+        self.rows_enqueued = 0
+        self.rows_spilled = 0
+        self.rows_written = 0
+        self.rows_below_watermark = 0
+        self.rows_rejected = 0
+        self.batches_written = 0
+        self.write_errors = 0
+        self.last_error: Optional[str] = None
+        self.last_batch_ms = 0.0
+        self.last_write_at: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # 요청 경로 (동기, 논블로킹)
+    # ------------------------------------------------------------------
+
+    def submit_action(self, player_id: str, action_type: str, timestamp: float, value: float, metadata: Optional[Dict[str, Any]]):
+        self._enqueue(("a", timestamp, player_id, action_type, value or 0.0, json.dumps(metadata) if metadata else None, None))
+
+    def submit_violation(self, player_id: str, violation_type: str, timestamp: float, severity: float, details: Optional[Dict[str, Any]]):
+        self._enqueue(("v", timestamp, player_id, violation_type, severity, json.dumps(details) if details else None))
+
+    def submit_player(
+        self,
+        player_id: str,
+        timestamp: float,
+        risk_score: Optional[float] = None,
+        username: Optional[str] = None,
+        is_banned: Optional[bool] = None,
+        ban_reason: Optional[str] = None
+    ):
+        """플레이어 요약 갱신 (None 인 값은 대상에서 그대로 유지)"""
+        self._enqueue(("p", timestamp, player_id, username, risk_score, is_banned, ban_reason))
+
+    def _enqueue(self, row: Row):
+        if self._closed:
+            # 종료 중 들어온 행도 버리지 않고 저널로
+            self._spill([row])
+            return
+        self.rows_enqueued += 1
+        if len(self._queue) >= self.max_queue_rows:
+            # backpressure: 요청을 막지 않고 디스크로 넘김 (저널은 큐보다 늦게 적재될 수 있음 → 플레이어 행은 UPSERT 가 이벤트 시각으로 판정)
+            self._spill([row])
+        else:
+            self._queue.append(row)
+            if len(self._queue) >= self.batch_rows:
+                self._wakeup.set()
+
+    def _spill(self, rows: List[Row]):
+        if self._spill_file is None:
+            self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+        for row in rows:
+            self._spill_file.write(json.dumps(row, separators=(",", ":")) + "\n")
+        # 버퍼에만 남은 행은 비정상 종료 시 유실되므로 넘길 때마다 디스크까지 기록
+        self._spill_file.flush()
+        os.fsync(self._spill_file.fileno())
+        self.rows_spilled += len(rows)
+        self._journal_rows += len(rows)
+
+    # ------------------------------------------------------------------
+    # 백그라운드 라이터
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._task is None:
+            self._journal_rows = self._count_journal_rows()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        backoff = self.flush_interval
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.drain()
+                backoff = self.flush_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 배치는 큐 / 저널에 남아 있음 → 백오프 후 재시도
+                self.write_errors += 1
+                self.last_error = str(e)
+                backoff = min(max(backoff * 2, 0.1), self.max_backoff)
+                logger.warning(f"이중 기록 적재 실패, {backoff:.1f}초 후 재시도: {e}")
+
+    async def _ensure_ready(self):
+        """풀 생성 + 워터마크 확정 (여러 워커가 동시에 켜져도 가장 먼저 기록된 값 사용)"""
+        if self._pool is None:
+            self._pool = await asyncpg.create_pool(self.timescale_url, min_size=1, max_size=self.pool_size)
+        if self.watermark is None:
+            async with self._pool.acquire() as conn:
+                await conn.execute(CREATE_STATE_TABLE_SQL)
+                await conn.execute(
+                    "INSERT INTO dual_write_state (key, value) VALUES ($1, $2) ON CONFLICT (key) DO NOTHING",
+                    WATERMARK_KEY, repr(self.enabled_at)
+                )
+                value = await conn.fetchval("SELECT value FROM dual_write_state WHERE key = $1", WATERMARK_KEY)
+            self.watermark = float(value)
+            logger.info(f"이중 기록 워터마크: {_to_time(self.watermark).isoformat()}")
+
+    async def drain(self):
+        """메모리 큐 → 저널 순서로 적재 (실패 시 예외, 미적재 행은 그대로 보존)"""
+        async with self._drain_lock:
+            await self._ensure_ready()
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_rows, len(self._queue)))]
+                try:
+                    await self._write_batch(batch)
+                except BaseException:
+                    self._queue.extendleft(reversed(batch))
+                    raise
+            if self._journal_rows:
+                await self._replay_journal()
+
+    async def _replay_journal(self):
+        """
+        저널 재생: spill 파일을 .replay 로 넘긴 뒤 배치 단위 적재
+        - 커밋된 위치를 .offset 파일에 기록 → 중간에 재시작해도 이어서 재생 (중복 없음)
+        """
+        if not os.path.exists(self.replay_path):
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+            if not os.path.exists(self.spill_path):
+                self._journal_rows = 0
+                return
+            os.replace(self.spill_path, self.replay_path)
+
+        offset_path = f"{self.replay_path}.offset"
+        offset = 0
+        if os.path.exists(offset_path):
+            with open(offset_path, "r", encoding="utf-8") as f:
+                offset = int(f.read().strip() or 0)
+
+        while True:
+            batch, next_offset = await asyncio.to_thread(self._read_journal, offset)
+            if not batch:
+                break
+            await self._write_batch(batch)
+            offset = next_offset
+            with open(offset_path, "w", encoding="utf-8") as f:
+                f.write(str(offset))
+            self._journal_rows = max(0, self._journal_rows - len(batch))
+
+        os.remove(self.replay_path)
+        if os.path.exists(offset_path):
+            os.remove(offset_path)
+        if not os.path.exists(self.spill_path):
+            self._journal_rows = 0
+
+    def _read_journal(self, offset: int) -> Tuple[List[Row], int]:
+        rows = []
+        with open(self.replay_path, "r", encoding="utf-8") as f:
+            f.seek(offset)
+            while len(rows) < self.batch_rows:
+                line = f.readline()
+                if not line:
+                    break
+                if not line.endswith("\n"):
+                    # 마지막 줄이 덜 기록된 상태 (비정상 종료) → 복구 불가한 조각만 거부 파일로
+                    self._reject([("partial", line)], "truncated journal line")
+                    offset = f.tell()
+                    break
+                rows.append(tuple(json.loads(line)))
+                offset = f.tell()
+        return rows, offset
+
+    def _count_journal_rows(self) -> int:
+        count = 0
+        for path in (self.spill_path, self.replay_path):
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    count += sum(1 for _ in f)
+        return count
+
+    async def _write_batch(self, batch: List[Row]):
+        started = time.perf_counter()
+        actions, violations, players = [], [], {}
+        for row in batch:
+            kind, timestamp = row[0], row[1]
+            if kind == "p":
+                # 같은 배치 안의 플레이어 갱신은 하나로 합침 (필드별로 가장 최신의 non-None 값)
+                players[row[2]] = _merge_player_rows(players.get(row[2]), row)
+                continue
+            if timestamp < self.watermark:
+                # 워터마크 이전 행은 백필이 기존 DB 에서 가져감 (이중 적재 방지)
+                self.rows_below_watermark += 1
+                continue
+            if kind == "a":
+                actions.append((_to_time(timestamp), row[2], row[3], row[4], row[5], row[6]))
+            elif kind == "v":
+                violations.append((_to_time(timestamp), row[2], row[3], row[4], row[5], False))
+
+        actions = fill_batch_intervals(actions)
+        player_args = [
+            (player_id, username, _to_time(timestamp), risk_score, is_banned,
+             ban_reason if is_banned else None, _to_time(timestamp) if is_banned else None)
+            for _, timestamp, player_id, username, risk_score, is_banned, ban_reason in players.values()
+        ]
+
+        async with self._pool.acquire() as conn:
+            try:
+                async with conn.transaction():
+                    if actions:
+                        await conn.copy_records_to_table("player_actions_ts", records=actions, columns=ACTION_COLUMNS)
+                    if violations:
+                        await conn.copy_records_to_table("violations_ts", records=violations, columns=VIOLATION_COLUMNS)
+                    if player_args:
+                        await conn.executemany(PLAYER_UPSERT_SQL, player_args)
+            except _TRANSIENT_ERRORS:
+                raise
+            except asyncpg.PostgresError as e:
+                # 잘못된 행 하나 때문에 배치 전체가 막히지 않도록 행 단위로 격리
+                logger.warning(f"이중 기록 배치 실패 ({len(batch)}행), 행 단위 재시도: {e}")
+                await self._write_rows_individually(conn, actions, violations, player_args)
+
+        self.rows_written += len(actions) + len(violations) + len(player_args)
+        self.batches_written += 1
+        self.last_batch_ms = (time.perf_counter() - started) * 1000
+        self.last_write_at = time.time()
+
+    async def _write_rows_individually(self, conn: asyncpg.Connection, actions, violations, player_args):
+        statements = (
+            [(f"INSERT INTO player_actions_ts ({', '.join(ACTION_COLUMNS)}) VALUES ($1, $2, $3, $4, $5, $6)", r) for r in actions]
+            + [(f"INSERT INTO violations_ts ({', '.join(VIOLATION_COLUMNS)}) VALUES ($1, $2, $3, $4, $5, $6)", r) for r in violations]
+            + [(PLAYER_UPSERT_SQL, r) for r in player_args]
+        )
+        for sql, args in statements:
+            try:
+                await conn.execute(sql, *args)
+            except _TRANSIENT_ERRORS:
+                raise
+            except asyncpg.PostgresError as e:
+                self._reject([args], str(e))
+
+    def _reject(self, rows: List[Any], reason: str):
+        self.rows_rejected += len(rows)
+        logger.error(f"이중 기록 행 거부 ({len(rows)}행, {self.rejected_path} 에 보관): {reason}")
+        with open(self.rejected_path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps({"reason": reason, "row": row}, default=str) + "\n")
+
+    async def close(self, timeout: float = 5.0):
+        """중지: 남은 행을 적재 시도하고, 실패하면 저널에 남겨 다음 시작 시 재생"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._closed = True
+        try:
+            await asyncio.wait_for(self.drain(), timeout=timeout)
+        except Exception as e:
+            logger.warning(f"이중 기록 종료 중 적재 실패, {len(self._queue)}행 저널에 보관: {e}")
+        if self._queue:
+            self._spill(list(self._queue))
+            self._queue.clear()
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    # ------------------------------------------------------------------
+    # 상태 / 일관성 보고서
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        oldest = self._queue[0][1] if self._queue else None
+        return {
+            "watermark": _to_time(self.watermark).isoformat() if self.watermark else None,
+            "queued_rows": len(self._queue),
+            "journal_rows": self._journal_rows,
+            "journal_bytes": sum(os.path.getsize(p) for p in (self.spill_path, self.replay_path) if os.path.exists(p)),
+            "queue_lag_seconds": round(time.time() - oldest, 3) if oldest else 0.0,
+            "rows_enqueued": self.rows_enqueued,
+            "rows_spilled": self.rows_spilled,
+            "rows_written": self.rows_written,
+            "rows_below_watermark": self.rows_below_watermark,
+            "rows_rejected": self.rows_rejected,
+            "batches_written": self.batches_written,
+            "write_errors": self.write_errors,
+            "last_error": self.last_error,
+            "last_batch_ms": round(self.last_batch_ms, 2),
+            "last_write_at": _to_time(self.last_write_at).isoformat() if self.last_write_at else None
+        }
+
+    async def consistency_report(self, hours: int = 24, settle_seconds: float = 60.0) -> Dict[str, Any]:
+        """
+        전환 가능 여부 판단용 보고서
+        - 백필: 마이그레이션(--until-watermark) 완료 / 검증 결과
+        - 라이터: 큐 / 저널이 비었는지, 거부 행이 없는지
+        - 실시간 구간: 워터마크 이후 최근 hours 시간을 시간 단위로 기존 DB 와 TimescaleDB 행 수 비교
+          (settle_seconds 이내 행은 아직 적재 중일 수 있어 제외)
+        """
+        stats = self.get_stats()
+        blockers: List[str] = []
+        try:
+            await self._ensure_ready()
+        except Exception as e:
+            return {"safe_to_flip": False, "blockers": [f"TimescaleDB 연결 실패: {e}"], "writer": stats}
+
+        async with self._pool.acquire() as conn:
+            state = {row['key']: row['value'] for row in await conn.fetch("SELECT key, value FROM dual_write_state")}
+
+        window_end = time.time() - settle_seconds
+        window_start = max(self.watermark, window_end - hours * 3600)
+        hourly: List[Dict[str, Any]] = []
+        if window_end > window_start:
+            target = await self._count_target_hourly(window_start, window_end)
+            legacy = await asyncio.to_thread(self._count_legacy_hourly, window_start, window_end)
+            for hour in sorted(set(target) | set(legacy)):
+                legacy_counts = legacy.get(hour, (0, 0))
+                target_counts = target.get(hour, (0, 0))
+                hourly.append({
+                    "hour": _to_time(hour * 3600).isoformat(),
+                    "actions": {"legacy": legacy_counts[0], "timescale": target_counts[0]},
+                    "violations": {"legacy": legacy_counts[1], "timescale": target_counts[1]},
+                    "match": legacy_counts == target_counts
+                })
+
+        mismatched = [h for h in hourly if not h["match"]]
+        if BACKFILL_DONE_KEY not in state:
+            blockers.append("백필 미완료 (migrate_to_timescaledb.py --until-watermark)")
+        elif state.get(BACKFILL_VERIFIED_KEY) != "true":
+            blockers.append("백필 검증 실패 또는 미실행")
+        if stats["queued_rows"] or stats["journal_rows"]:
+            blockers.append(f"미적재 행 존재 (큐 {stats['queued_rows']}, 저널 {stats['journal_rows']})")
+        if self.rows_rejected:
+            blockers.append(f"거부된 행 {self.rows_rejected}개 ({self.rejected_path})")
+        if mismatched:
+            blockers.append(f"실시간 구간 {len(mismatched)}개 시간대 행 수 불일치")
+
+        return {
+            "safe_to_flip": not blockers,
+            "blockers": blockers,
+            "watermark": stats["watermark"],
+            "backfill": {
+                "completed_at": state.get(BACKFILL_DONE_KEY),
+                "verified": state.get(BACKFILL_VERIFIED_KEY) == "true"
+            },
+            "writer": stats,
+            "live_window": {
+                "start": _to_time(window_start).isoformat(),
+                "end": _to_time(window_end).isoformat(),
+                "hours_compared": len(hourly),
+                "mismatched_hours": mismatched
+            },
+            "note": "다른 워커가 아직 이중 기록 없이 실행 중이면 해당 요청은 실시간 구간 불일치로 나타남"
+        }
+
+    async def _count_target_hourly(self, start: float, end: float) -> Dict[int, Tuple[int, int]]:
+        counts: Dict[int, List[int]] = {}
+        async with self._pool.acquire() as conn:
+            for index, table in enumerate(("player_actions_ts", "violations_ts")):
+                rows = await conn.fetch(f"""
+                    SELECT floor(EXTRACT(EPOCH FROM time) / 3600)::bigint AS hour, COUNT(*) AS n
+                    FROM {table}
+                    WHERE time >= to_timestamp($1) AND time < to_timestamp($2)
+                    GROUP BY 1
+                """, start, end)
+                for row in rows:
+                    counts.setdefault(row['hour'], [0, 0])[index] = row['n']
+        return {hour: tuple(values) for hour, values in counts.items()}
+
+    def _count_legacy_hourly(self, start: float, end: float) -> Dict[int, Tuple[int, int]]:
+        """기존 DB 는 시간대별 COUNT (timestamp 인덱스 사용, DB 종류와 무관한 쿼리)"""
+        counts: Dict[int, Tuple[int, int]] = {}
+        with self.session_factory() as db:
+            for hour in range(int(start // 3600), int(end // 3600) + 1):
+                lo = datetime.fromtimestamp(max(hour * 3600, start))
+                hi = datetime.fromtimestamp(min((hour + 1) * 3600, end))
+                if lo >= hi:
+                    continue
+                actions = db.query(DBPlayerAction).filter(
+                    DBPlayerAction.timestamp >= lo, DBPlayerAction.timestamp < hi
+                ).count()
+                violations = db.query(Violation).filter(
+                    Violation.timestamp >= lo, Violation.timestamp < hi
+                ).count()
+                if actions or violations:
+                    counts[hour] = (actions, violations)
+        return counts
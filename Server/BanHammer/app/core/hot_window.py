@@ -0,0 +1,267 @@
+"""
+활성 플레이어 핫 윈도우 캐시
+- 플레이어별 최근 N개 액션을 압축 배열(array)로 보관: 시각(float64) + 액션 타입 코드(uint16)
+- 쓰기 경로에서 바로 채우고, 캐시 미스 시 DB에서 최근 구간을 한 번만 로드 (lazy hydration)
+- 반복 시퀀스 / 완벽한 타이밍 탐지기는 이 캐시로 메모리 내에서 계산 (DB 는 장기 구간 탐지 전용)
+- 전체 크기는 메모리 예산(바이트)으로 제한하고 LRU 로 축출
+"""
+
+import asyncio
+import bisect
+import math
+import sys
+import time
+import logging
+from array import array
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 타이밍 / 시퀀스 탐지 구간 (기존 SQL 탐지기와 동일)
+TIMING_WINDOW_SECONDS = 30 * 60
+SEQUENCE_WINDOW_SECONDS = 20 * 60
+TIMING_MIN_INTERVAL = 0.1
+TIMING_MAX_INTERVAL = 300.0
+
+# 액션 타입 문자열 → 코드 (프로세스 전역, 액션 타입 종류는 소수)
+_type_codes: Dict[str, int] = {}
+_type_names: List[str] = []
+
+
+def intern_action_type(action_type: str) -> int:
+    code = _type_codes.get(action_type)
+    if code is None:
+        if len(_type_names) >= 0xFFFF:
+            raise ValueError("too many distinct action types for hot window cache")
+        code = len(_type_names)
+        action_type = sys.intern(action_type)
+        _type_codes[action_type] = code
+        _type_names.append(action_type)
+    return code
+
+
+class PlayerWindow:
+    """
+    플레이어 한 명의 최근 액션 (시간순 정렬)
+    - dropped_until: 개수 상한으로 밀려난 액션 중 가장 최근 시각 (이후 구간만 완전함)
+    """
+
+    __slots__ = ("times", "codes", "dropped_until")
+
+    def __init__(self):
+        self.times = array("d")
+        self.codes = array("H")
+        self.dropped_until = 0.0
+
+    def add(self, timestamp: float, action_type: str, max_actions: int):
+        code = intern_action_type(action_type)
+        if not self.times or timestamp >= self.times[-1]:
+            self.times.append(timestamp)
+            self.codes.append(code)
+        else:
+            # 늦게 도착한 액션은 정렬 위치에 삽입
+            index = bisect.bisect_right(self.times, timestamp)
+            self.times.insert(index, timestamp)
+            self.codes.insert(index, code)
+
+        overflow = len(self.times) - max_actions
+        if overflow > 0:
+            self.dropped_until = max(self.dropped_until, self.times[overflow - 1])
+            del self.times[:overflow]
+            del self.codes[:overflow]
+
+    def complete_since(self, cutoff: float) -> bool:
+        """cutoff 이후 액션을 상한 때문에 잃지 않았는지 (False 면 탐지는 SQL 로 계산해야 함)"""
+        return self.dropped_until < cutoff
+
+    def trim_before(self, cutoff: float):
+        """cutoff 이전 액션 제거"""
+        index = bisect.bisect_left(self.times, cutoff)
+        if index:
+            del self.times[:index]
+            del self.codes[:index]
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.times.buffer_info()[1] * self.times.itemsize
+            + self.codes.buffer_info()[1] * self.codes.itemsize
+        )
+
+    def timing_stats(self, action_type: str, now: float) -> Tuple[int, float, Optional[float]]:
+        """같은 타입 액션 간격의 (개수, 표본 표준편차, 평균) - 최근 30분, 0.1~300초 간격만"""
+        code = _type_codes.get(action_type)
+        if code is None:
+            return 0, 0.0, None
+
+        start = bisect.bisect_left(self.times, now - TIMING_WINDOW_SECONDS)
+        intervals = []
+        previous = None
+        for i in range(start, len(self.times)):
+            if self.codes[i] != code:
+                continue
+            current = self.times[i]
+            if previous is not None:
+                interval = current - previous
+                if TIMING_MIN_INTERVAL <= interval <= TIMING_MAX_INTERVAL:
+                    intervals.append(interval)
+            previous = current
+
+        count = len(intervals)
+        if count == 0:
+            return 0, 0.0, None
+        mean = sum(intervals) / count
+        if count < 2:
+            return count, 0.0, mean
+        variance = sum((x - mean) ** 2 for x in intervals) / (count - 1)
+        return count, math.sqrt(variance), mean
+
+    def top_sequence(self, now: float) -> Tuple[Optional[str], int]:
+        """최근 20분 액션의 연속 3개 패턴 중 최다 반복 패턴"""
+        start = bisect.bisect_left(self.times, now - SEQUENCE_WINDOW_SECONDS)
+        codes = self.codes[start:]
+        if len(codes) < 3:
+            return None, 0
+
+        counts = Counter(zip(codes, codes[1:], codes[2:]))
+        (a, b, c), count = counts.most_common(1)[0]
+        return f"{_type_names[a]}-{_type_names[b]}-{_type_names[c]}", count
+
+
+class HotWindowCache:
+    """
+    플레이어별 PlayerWindow 의 LRU 캐시
+    - max_actions_per_player: 플레이어당 보관 액션 수 상한
+    - memory_budget_bytes: 전체 배열 바이트 상한 (초과 시 가장 오래 사용되지 않은 플레이어부터 축출)
+    - horizon_seconds: 보관 구간 (이보다 오래된 액션은 접근 시 정리)
+    """
+
+    # 배열 데이터 외 플레이어당 고정 비용 추정 (PlayerWindow + array 헤더 2개 + OrderedDict 엔트리 + 키)
+    PER_PLAYER_OVERHEAD = 320
+
+    def __init__(
+        self,
+        max_actions_per_player: int = 512,
+        memory_budget_bytes: int = 64 * 1024 * 1024,
+        horizon_seconds: float = TIMING_WINDOW_SECONDS
+    ):
+        self.max_actions_per_player = max_actions_per_player
+        self.memory_budget_bytes = memory_budget_bytes
+        self.horizon_seconds = horizon_seconds
+
+        self._windows: "OrderedDict[str, PlayerWindow]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._hydrating: Dict[str, asyncio.Future] = {}
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.hydrations = 0
+        self.hydration_failures = 0
+        self.evictions = 0
+        self.truncated_fallbacks = 0
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._windows
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    @property
+    def windows(self) -> Dict[str, PlayerWindow]:
+        """메모리 리포트용 읽기 전용 뷰"""
+        return self._windows
+
+    async def ensure(self, player_id: str, loader) -> bool:
+        """
+        플레이어 윈도우가 없으면 loader() 로 최근 액션을 로드
+        loader: async () -> Iterable[(timestamp, action_type)]
+        동시 미스는 하나의 로드를 공유. 로드 실패 시 False (빈 윈도우로 시작하지 않음)
+        """
+        if player_id in self._windows:
+            self.hits += 1
+            self._windows.move_to_end(player_id)
+            return True
+
+        self.misses += 1
+        pending = self._hydrating.get(player_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._hydrating[player_id] = future
+        try:
+            rows = await loader()
+            window = PlayerWindow()
+            for timestamp, action_type in sorted(rows):
+                window.add(timestamp, action_type, self.max_actions_per_player)
+            if player_id not in self._windows:
+                self._windows[player_id] = window
+                self._account(player_id)
+            self.hydrations += 1
+            future.set_result(True)
+            return True
+        except Exception as e:
+            self.hydration_failures += 1
+            logger.warning(f"핫 윈도우 로드 실패 (player={player_id}): {e}")
+            future.set_result(False)
+            return False
+        except BaseException:
+            # 취소 등: 같은 로드를 기다리는 요청은 SQL 경로로 진행하도록 실패로 완료 후 전파
+            future.set_result(False)
+            raise
+        finally:
+            del self._hydrating[player_id]
+
+    def record(self, player_id: str, timestamp: float, action_type: str):
+        """쓰기 경로에서 액션 반영 (로드되지 않은 플레이어는 무시 - 다음 미스 때 DB 에서 로드)"""
+        window = self._windows.get(player_id)
+        if window is None:
+            return
+        window.add(timestamp, action_type, self.max_actions_per_player)
+        window.trim_before(time.time() - self.horizon_seconds)
+        self._windows.move_to_end(player_id)
+        self._account(player_id)
+
+    def get(self, player_id: str) -> Optional[PlayerWindow]:
+        return self._windows.get(player_id)
+
+    def discard(self, player_id: str):
+        if self._windows.pop(player_id, None) is not None:
+            self._bytes -= self._sizes.pop(player_id, 0)
+
+    def _account(self, player_id: str):
+        """플레이어 크기 갱신 후 예산 초과분 LRU 축출"""
+        size = self._windows[player_id].nbytes + self.PER_PLAYER_OVERHEAD
+        self._bytes += size - self._sizes.get(player_id, 0)
+        self._sizes[player_id] = size
+
+        while self._bytes > self.memory_budget_bytes and len(self._windows) > 1:
+            evicted, _ = self._windows.popitem(last=False)
+            self._bytes -= self._sizes.pop(evicted, 0)
+            self.evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "players": len(self._windows),
+            "estimated_bytes": self._bytes,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "max_actions_per_player": self.max_actions_per_player,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "hydrations": self.hydrations,
+            "hydration_failures": self.hydration_failures,
+            "evictions": self.evictions,
+            "truncated_fallbacks": self.truncated_fallbacks,
+            "action_types": len(_type_names)
+        }
+
+
+def rows_to_window_input(rows: Iterable[Tuple[datetime, str]]) -> List[Tuple[float, str]]:
+    """DB 행 (time, action_type) → (epoch 초, action_type)"""
+    return [(row[0].timestamp(), row[1]) for row in rows]
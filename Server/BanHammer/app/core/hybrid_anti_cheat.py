@@ -1,188 +1,479 @@
+"""
+하이브리드 안티치트 엔진 (메모리 → Redis → DB 계층형 저장소)
+- 메모리: 최근 활성 플레이어 상태 (OrderedDict LRU, O(1) 승격 / 강등)
+- Redis: 메모리에서 밀려난 플레이어 스냅샷 (바이너리 코덱, TTL)
+- DB: 액션 / 위반 / 위험도 영구 저장 (비동기 write-behind 배치, 요청 경로에서 커밋하지 않음)
+- 탐지기: 기존 엔진과 동일한 규칙 (빈도 / 값 제한, 완벽한 타이밍, 연속 활동, 값 이상치, 반복 시퀀스)
+- 계층별 적중률, 승격 / 강등 속도, write-behind 대기열 통계 제공
+"""
+
 import asyncio
-import time
 import json
+import time
+import logging
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
 import redis.asyncio as redis
-import logging
 from sqlalchemy.orm import Session
 
 from .anti_cheat import PlayerAction, ViolationRecord, ViolationType
-from ..dependencies import get_db
+from .state_codec import (
+    DEFAULT_COMPRESS_MIN_BYTES,
+    ActionTuple,
+    CodecError,
+    PlayerSnapshot,
+    decode_snapshot,
+    encode_snapshot
+)
+from .summary_buffer import decay_risk, half_life_seconds
 from ..models.database import Player, PlayerAction as DBPlayerAction, Violation
 
 logger = logging.getLogger(__name__)
 
+REDIS_KEY_PREFIX = "player:"
+
+TIER_MEMORY = "memory"
+TIER_REDIS = "redis"
+TIER_DB = "db"
+TIER_NEW = "new"
+
+
+class PlayerState:
+    """메모리 계층의 플레이어 상태 (액션은 (시각, 타입, 값) 튜플, 최근 max_actions 개)"""
+
+    __slots__ = ("player_id", "actions", "risk_score", "risk_updated_at", "total_actions", "total_violations")
+
+    def __init__(self, player_id: str, max_actions: int, snapshot: Optional[PlayerSnapshot] = None):
+        self.player_id = player_id
+        snapshot = snapshot or PlayerSnapshot()
+        self.actions: Deque[ActionTuple] = deque(snapshot.actions, maxlen=max_actions)
+        self.risk_score = snapshot.risk_score
+        self.risk_updated_at = snapshot.risk_updated_at or time.time()
+        self.total_actions = snapshot.total_actions
+        self.total_violations = snapshot.total_violations
+
+    def current_risk(self, half_life: float, now: Optional[float] = None) -> float:
+        now = now or time.time()
+        return decay_risk(self.risk_score, now - self.risk_updated_at, half_life)
+
+    def add_risk(self, severity: float, half_life: float, now: Optional[float] = None):
+        now = now or time.time()
+        self.risk_score = self.current_risk(half_life, now) + severity
+        self.risk_updated_at = now
+
+    def to_snapshot(self) -> PlayerSnapshot:
+        return PlayerSnapshot(
+            risk_score=self.risk_score,
+            risk_updated_at=self.risk_updated_at,
+            total_actions=self.total_actions,
+            total_violations=self.total_violations,
+            actions=list(self.actions)
+        )
+
+
+class _RateWindow:
+    """최근 window 초 동안의 초당 발생률 (1초 버킷)"""
+
+    def __init__(self, window: int = 60):
+        self.window = window
+        self._buckets: Deque[List[int]] = deque()
+
+    def add(self, count: int = 1, now: Optional[float] = None):
+        second = int(now or time.time())
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += count
+        else:
+            self._buckets.append([second, count])
+        self._prune(second)
+
+    def _prune(self, second: int):
+        while self._buckets and self._buckets[0][0] <= second - self.window:
+            self._buckets.popleft()
+
+    def rate(self, now: Optional[float] = None) -> float:
+        self._prune(int(now or time.time()))
+        return sum(count for _, count in self._buckets) / self.window
+
+
 class HybridAntiCheatEngine:
     """
-    하이브리드 안티치트 엔진:
-    - 메모리: 최근 활성 플레이어 (1만명)
-    - Redis: 중간 캐시 (100만명, 1시간 TTL)  
-    - DB: 영구 저장소 (모든 데이터)
+    하이브리드 안티치트 엔진
+    - session_factory: DB 세션 생성 함수 (write-behind / 로드는 스레드에서 실행)
+    - max_memory_players: 메모리 계층 최대 플레이어 수 (초과 시 LRU 로 Redis 강등)
+    - max_actions: 플레이어당 메모리에 유지하는 최근 액션 수
+    - redis_ttl: Redis 스냅샷 TTL (초)
+    - write_interval: write-behind flush 주기 (초)
+    - max_pending_rows: write-behind 대기 행 상한 (도달 시 즉시 flush)
+    - risk_half_life_hours: 위험도 반감기 (0 이면 감쇠 없음)
+    - snapshot_compress_min_bytes: 이 크기 이상의 Redis 스냅샷은 zlib 압축 (0 이면 압축 안 함)
     """
-    
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        redis_client: Optional[redis.Redis] = None,
+        max_memory_players: int = 10000,
+        max_actions: int = 200,
+        redis_ttl: int = 3600,
+        write_interval: float = 0.2,
+        max_pending_rows: int = 5000,
+        risk_half_life_hours: float = 24.0,
+        snapshot_compress_min_bytes: int = DEFAULT_COMPRESS_MIN_BYTES
+    ):
+        self.session_factory = session_factory
         self.redis = redis_client
-        
-        # 메모리 레이어 (최근 활성 플레이어만)
-        self.memory_players = {}  # 최대 10,000명
-        self.max_memory_players = 10000
-        
-        # Redis 레이어 설정
-        self.redis_ttl = 3600  # 1시간
-        
-        # 기본 설정
+        self.max_memory_players = max_memory_players
+        self.max_actions = max_actions
+        self.redis_ttl = redis_ttl
+        self.write_interval = write_interval
+        self.max_pending_rows = max_pending_rows
+        self.risk_half_life = half_life_seconds(risk_half_life_hours)
+        self.snapshot_compress_min_bytes = snapshot_compress_min_bytes
+
+        # 메모리 계층 (LRU: 가장 오래 사용되지 않은 플레이어가 앞쪽)
+        self.memory_players: "OrderedDict[str, PlayerState]" = OrderedDict()
+        # 강등 대기 / 기록 중 (아직 Redis 에 기록되지 않은 상태, 재요청 시 그대로 승격)
+        self._demoting: Dict[str, PlayerState] = {}
+        self._demoting_inflight: Dict[str, PlayerState] = {}
+        # 동시 로드 중복 방지
+        self._loading: Dict[str, asyncio.Future] = {}
+
+        # write-behind 대기열
+        self._pending_actions: List[Dict[str, Any]] = []
+        self._pending_violations: List[Dict[str, Any]] = []
+        self._pending_players: Dict[str, Tuple[float, float]] = {}  # player_id → (위험도, 마지막 활동)
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._writer_task: Optional[asyncio.Task] = None
+
+        # 탐지 설정 (기존 엔진과 동일)
         self.rate_limits = {
             "reward_collection": {"max_per_minute": 10, "max_value_per_minute": 1000},
             "resource_gather": {"max_per_minute": 30, "max_value_per_minute": 500},
             "level_progress": {"max_per_minute": 3, "max_value_per_minute": 100},
+            "purchase": {"max_per_minute": 5, "max_value_per_minute": 10000}
         }
-    
-    async def analyze_action(self, action: PlayerAction, db: Session) -> List[ViolationRecord]:
-        """액션 분석 - 3단계 레이어 활용"""
+        self.behavior_window = 300
+        self.anomaly_threshold = 2.5
+        self.bot_detection_patterns = {
+            "perfect_timing": 0.05,
+            "identical_sequences": 5,
+            "continuous_activity": 3600
+        }
+        self.auto_ban_threshold = 8.0
+
+        # 통계
+        self.tier_hits: Dict[str, int] = defaultdict(int)
+        self.redis_errors = 0
+        self.redis_decode_errors = 0
+        self.snapshots_written = 0
+        self.snapshot_bytes_written = 0
+        self.promotions = 0
+        self.demotions = 0
+        self._promotion_rate = _RateWindow()
+        self._demotion_rate = _RateWindow()
+        self.rows_written = 0
+        self.write_batches = 0
+        self.failed_batches = 0
+        self.rows_dropped = 0
+        self.last_batch_ms = 0.0
+
+    def start(self):
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._write_behind_loop())
+
+    # ===== 분석 =====
+
+    async def analyze_action(self, action: PlayerAction) -> List[ViolationRecord]:
+        """액션 분석 (상태 조회 → 메모리 반영 → 탐지 → write-behind 적재)"""
+        state = await self._get_state(action.player_id)
+        state.actions.append((action.timestamp, action.action_type, action.value))
+        state.total_actions += 1
+
         violations = []
-        player_id = action.player_id
-        
-        # 1. 메모리에서 플레이어 데이터 확인
-        player_data = await self._get_player_data(player_id, db)
-        
-        # 2. 액션 저장 (DB는 비동기로)
-        await self._store_action(action, db)
-        
-        # 3. 실시간 분석 (메모리 데이터 기반)
-        violations.extend(await self._check_rate_limits(action, player_data))
-        violations.extend(await self._analyze_behavior(action, player_data))
-        
-        # 4. 플레이어 데이터 업데이트
-        await self._update_player_data(player_id, action, violations)
-        
+        violations.extend(self._check_rate_limits(action, state))
+        violations.extend(self._analyze_behavior(action, state))
+        violations.extend(self._detect_anomalies(action, state))
+        violations.extend(self._detect_bot_behavior(action, state))
+
+        for violation in violations:
+            state.add_risk(violation.severity, self.risk_half_life)
+        state.total_violations += len(violations)
+
+        self._enqueue_writes(action, violations, state)
         return violations
-    
-    async def _get_player_data(self, player_id: str, db: Session) -> Dict:
-        """3단계 레이어에서 플레이어 데이터 조회"""
-        
-        # 1단계: 메모리 확인
-        if player_id in self.memory_players:
-            self.memory_players[player_id]['last_access'] = time.time()
-            return self.memory_players[player_id]
-        
-        # 2단계: Redis 확인
-        if self.redis:
+
+    async def get_player_risk_score(self, player_id: str) -> float:
+        state = await self._get_state(player_id)
+        return min(state.current_risk(self.risk_half_life), 10.0)
+
+    async def should_ban_player(self, player_id: str) -> Tuple[bool, str]:
+        risk_score = await self.get_player_risk_score(player_id)
+        if risk_score >= self.auto_ban_threshold:
+            return True, f"자동 차단 - 위험도 {risk_score:.1f}"
+        return False, ""
+
+    # ===== 계층 조회 / 승격 / 강등 =====
+
+    async def _get_state(self, player_id: str) -> PlayerState:
+        """메모리 → 강등 대기 → Redis → DB 순서로 조회 후 메모리로 승격"""
+        state = self.memory_players.get(player_id)
+        if state is not None:
+            self.memory_players.move_to_end(player_id)
+            self.tier_hits[TIER_MEMORY] += 1
+            return state
+
+        state = self._demoting.pop(player_id, None) or self._demoting_inflight.get(player_id)
+        if state is not None:
+            self.tier_hits[TIER_MEMORY] += 1
+            self._admit(state)
+            return state
+
+        loading = self._loading.get(player_id)
+        if loading is not None:
+            return await asyncio.shield(loading)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[player_id] = future
+        try:
+            state = await self._load_state(player_id)
+            # 로드 중에 다른 요청이 먼저 승격시켰다면 그 상태를 사용
+            existing = self.memory_players.get(player_id)
+            if existing is not None:
+                state = existing
+            else:
+                self._admit(state)
+            future.set_result(state)
+            return state
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 경고가 남지 않도록 조회 처리
+            raise
+        finally:
+            del self._loading[player_id]
+
+    async def _load_state(self, player_id: str) -> PlayerState:
+        snapshot = await self._load_from_redis(player_id)
+        if snapshot is not None:
+            self.tier_hits[TIER_REDIS] += 1
+            self.promotions += 1
+            self._promotion_rate.add()
+            return PlayerState(player_id, self.max_actions, snapshot)
+
+        snapshot = await asyncio.to_thread(self._load_from_db, player_id)
+        if snapshot is not None:
+            self.tier_hits[TIER_DB] += 1
+            return PlayerState(player_id, self.max_actions, snapshot)
+
+        self.tier_hits[TIER_NEW] += 1
+        return PlayerState(player_id, self.max_actions)
+
+    def _admit(self, state: PlayerState):
+        """메모리 계층에 추가 (초과분은 LRU 순서로 강등 대기열로 이동, O(1))"""
+        self.memory_players[state.player_id] = state
+        self.memory_players.move_to_end(state.player_id)
+        while len(self.memory_players) > self.max_memory_players:
+            _, evicted = self.memory_players.popitem(last=False)
+            self._demote(evicted)
+
+    def _demote(self, state: PlayerState):
+        self._demoting[state.player_id] = state
+        self.demotions += 1
+        self._demotion_rate.add()
+        if len(self._demoting) >= self.max_pending_rows:
+            self._wakeup.set()
+
+    async def _load_from_redis(self, player_id: str) -> Optional[PlayerSnapshot]:
+        if not self.redis:
+            return None
+        try:
+            raw = await self.redis.get(REDIS_KEY_PREFIX + player_id)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Redis 조회 실패: {e}")
+            return None
+        if raw is None:
+            return None
+        try:
+            return decode_snapshot(raw)
+        except CodecError as e:
+            self.redis_decode_errors += 1
+            logger.warning(f"Redis 스냅샷 디코딩 실패 (player={player_id}): {e}")
+            return None
+
+    def _load_from_db(self, player_id: str) -> Optional[PlayerSnapshot]:
+        """DB 에서 위험도 + 최근 1시간 액션 로드 (스레드에서 실행)"""
+        with self.session_factory() as db:
+            player = db.query(Player).filter(Player.id == player_id).first()
+            if player is None:
+                return None
+
+            one_hour_ago = datetime.now() - timedelta(hours=1)
+            rows = db.query(
+                DBPlayerAction.timestamp, DBPlayerAction.action_type, DBPlayerAction.value
+            ).filter(
+                DBPlayerAction.player_id == player_id,
+                DBPlayerAction.timestamp >= one_hour_ago
+            ).order_by(DBPlayerAction.timestamp.desc()).limit(self.max_actions).all()
+
+            last_activity = player.last_activity.timestamp() if player.last_activity else time.time()
+            return PlayerSnapshot(
+                risk_score=player.risk_score or 0.0,
+                risk_updated_at=last_activity,
+                actions=[(row.timestamp.timestamp(), row.action_type, row.value or 0.0) for row in reversed(rows)]
+            )
+
+    # ===== write-behind =====
+
+    def _enqueue_writes(self, action: PlayerAction, violations: List[ViolationRecord], state: PlayerState):
+        self._pending_actions.append({
+            "player_id": action.player_id,
+            "action_type": action.action_type,
+            "timestamp": datetime.fromtimestamp(action.timestamp),
+            "value": action.value,
+            # 매핑 키는 컬럼명이 아니라 속성명 (PlayerAction.action_metadata → "metadata" 컬럼)
+            "action_metadata": json.dumps(action.metadata) if action.metadata else None
+        })
+        for violation in violations:
+            self._pending_violations.append({
+                "player_id": violation.player_id,
+                "violation_type": violation.violation_type.value,
+                "severity": violation.severity,
+                "timestamp": datetime.fromtimestamp(violation.timestamp),
+                "details": json.dumps(violation.details, default=str) if violation.details else None
+            })
+        self._pending_players[action.player_id] = (state.current_risk(self.risk_half_life), action.timestamp)
+
+        if len(self._pending_actions) + len(self._pending_violations) >= self.max_pending_rows:
+            self._wakeup.set()
+
+    async def _write_behind_loop(self):
+        while True:
             try:
-                redis_data = await self.redis.get(f"player:{player_id}")
-                if redis_data:
-                    data = json.loads(redis_data)
-                    # 메모리로 승격 (자주 사용되는 플레이어)
-                    await self._promote_to_memory(player_id, data)
-                    return data
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.write_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
             except Exception as e:
-                logger.warning(f"Redis 조회 실패: {e}")
-        
-        # 3단계: DB에서 로드
-        return await self._load_from_db(player_id, db)
-    
-    async def _promote_to_memory(self, player_id: str, data: Dict):
-        """Redis → 메모리 승격"""
-        # 메모리 공간 확보
-        if len(self.memory_players) >= self.max_memory_players:
-            await self._evict_from_memory()
-        
-        data['last_access'] = time.time()
-        self.memory_players[player_id] = data
-        
-    async def _evict_from_memory(self):
-        """메모리에서 오래된 플레이어 제거"""
-        if not self.memory_players:
+                logger.error(f"하이브리드 write-behind 실패: {e}")
+
+    async def flush(self):
+        """대기 행은 DB 로, 강등 대기 상태는 Redis 로 일괄 반영 (DB 먼저: 강등된 플레이어를 DB 에서 다시 로드해도 누락 없음)"""
+        async with self._flush_lock:
+            await self._flush_rows()
+            await self._flush_demotions()
+
+    async def _flush_demotions(self):
+        if not self._demoting:
             return
-            
-        # 가장 오래 사용되지 않은 25% 제거
-        sorted_players = sorted(
-            self.memory_players.items(),
-            key=lambda x: x[1].get('last_access', 0)
-        )
-        
-        evict_count = max(1, len(sorted_players) // 4)
-        
-        for player_id, data in sorted_players[:evict_count]:
-            # Redis로 강등
-            if self.redis:
-                try:
-                    await self.redis.setex(
-                        f"player:{player_id}", 
-                        self.redis_ttl, 
-                        json.dumps(data)
-                    )
-                except Exception as e:
-                    logger.warning(f"Redis 저장 실패: {e}")
-            
-            del self.memory_players[player_id]
-    
-    async def _load_from_db(self, player_id: str, db: Session) -> Dict:
-        """DB에서 플레이어 데이터 로드"""
-        # 최근 1시간 액션만 로드 (성능 최적화)
-        one_hour_ago = datetime.now() - timedelta(hours=1)
-        
-        actions = db.query(DBPlayerAction).filter(
-            DBPlayerAction.player_id == player_id,
-            DBPlayerAction.timestamp >= one_hour_ago
-        ).order_by(DBPlayerAction.timestamp.desc()).limit(100).all()
-        
-        violations = db.query(Violation).filter(
-            Violation.player_id == player_id,
-            Violation.timestamp >= one_hour_ago
-        ).all()
-        
-        data = {
-            'player_id': player_id,
-            'actions': [self._action_to_dict(a) for a in actions],
-            'violations': [self._violation_to_dict(v) for v in violations],
-            'risk_score': 0.0,
-            'last_access': time.time(),
-            'loaded_at': time.time()
-        }
-        
-        # 메모리에 캐시
-        await self._promote_to_memory(player_id, data)
-        
-        return data
-    
-    async def _store_action(self, action: PlayerAction, db: Session):
-        """액션을 DB에 비동기 저장"""
+        demoting, self._demoting = self._demoting, {}
+        if not self.redis:
+            return  # Redis 없이 운영 시 DB 가 유일한 하위 계층
+
+        # 기록 중에도 재요청되면 메모리에서 바로 승격되도록 유지
+        self._demoting_inflight = demoting
         try:
-            db_action = DBPlayerAction(
-                player_id=action.player_id,
-                action_type=action.action_type,
-                timestamp=datetime.fromtimestamp(action.timestamp),
-                value=action.value
-            )
-            db_action.set_metadata(action.metadata)
-            db.add(db_action)
-            db.commit()
-            
+            pipe = self.redis.pipeline(transaction=False)
+            written_bytes = 0
+            for player_id, state in demoting.items():
+                encoded = encode_snapshot(state.to_snapshot(), self.snapshot_compress_min_bytes)
+                written_bytes += len(encoded)
+                pipe.setex(REDIS_KEY_PREFIX + player_id, self.redis_ttl, encoded)
+            await pipe.execute()
+            self.snapshots_written += len(demoting)
+            self.snapshot_bytes_written += written_bytes
         except Exception as e:
-            db.rollback()
-            logger.error(f"액션 저장 실패: {e}")
-    
-    async def _check_rate_limits(self, action: PlayerAction, player_data: Dict) -> List[ViolationRecord]:
-        """속도 제한 검사 (메모리 데이터 기반)"""
-        violations = []
-        
-        if action.action_type not in self.rate_limits:
-            return violations
-        
-        limits = self.rate_limits[action.action_type]
+            # 스냅샷 유실 시 다음 조회에서 DB 로부터 다시 로드됨
+            self.redis_errors += 1
+            logger.warning(f"Redis 강등 실패 ({len(demoting)}명): {e}")
+        finally:
+            self._demoting_inflight = {}
+
+    async def _flush_rows(self):
+        if not (self._pending_actions or self._pending_violations or self._pending_players):
+            return
+        actions, self._pending_actions = self._pending_actions, []
+        violations, self._pending_violations = self._pending_violations, []
+        players, self._pending_players = self._pending_players, {}
+
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._write_rows, actions, violations, players)
+        except Exception as e:
+            self.failed_batches += 1
+            # 대기열 상한 안에서 다음 flush 에 재시도
+            if len(actions) + len(violations) + len(self._pending_actions) <= self.max_pending_rows * 2:
+                self._pending_actions = actions + self._pending_actions
+                self._pending_violations = violations + self._pending_violations
+                for player_id, value in players.items():
+                    self._pending_players.setdefault(player_id, value)
+            else:
+                self.rows_dropped += len(actions) + len(violations)
+            logger.error(f"하이브리드 DB 배치 저장 실패 ({len(actions)}행): {e}")
+            return
+
+        self.write_batches += 1
+        self.rows_written += len(actions) + len(violations)
+        self.last_batch_ms = (time.perf_counter() - started) * 1000
+
+    def _write_rows(self, actions: List[Dict[str, Any]], violations: List[Dict[str, Any]],
+                    players: Dict[str, Tuple[float, float]]):
+        """한 트랜잭션으로 플레이어 / 액션 / 위반 일괄 저장 (스레드에서 실행)"""
+        with self.session_factory() as db:
+            existing = {
+                row[0] for row in db.query(Player.id).filter(Player.id.in_(list(players))).all()
+            } if players else set()
+
+            db.bulk_insert_mappings(Player, [
+                {
+                    "id": player_id,
+                    "username": player_id,
+                    "risk_score": risk_score,
+                    "last_activity": datetime.fromtimestamp(last_activity)
+                }
+                for player_id, (risk_score, last_activity) in players.items() if player_id not in existing
+            ])
+            db.bulk_update_mappings(Player, [
+                {
+                    "id": player_id,
+                    "risk_score": risk_score,
+                    "last_activity": datetime.fromtimestamp(last_activity)
+                }
+                for player_id, (risk_score, last_activity) in players.items() if player_id in existing
+            ])
+            db.bulk_insert_mappings(DBPlayerAction, actions)
+            db.bulk_insert_mappings(Violation, violations)
+            db.commit()
+
+    # ===== 탐지기 =====
+
+    def _check_rate_limits(self, action: PlayerAction, state: PlayerState) -> List[ViolationRecord]:
+        """속도 / 값 제한 (최근 1분, 같은 액션 타입)"""
+        limits = self.rate_limits.get(action.action_type)
+        if limits is None:
+            return []
+
         current_time = time.time()
         minute_ago = current_time - 60
-        
-        # 최근 1분간 같은 타입 액션 확인
-        recent_actions = [
-            a for a in player_data.get('actions', [])
-            if a['action_type'] == action.action_type 
-            and a['timestamp'] >= minute_ago
-        ]
-        
-        if len(recent_actions) > limits["max_per_minute"]:
+        count = 0
+        total_value = 0.0
+        for timestamp, action_type, value in reversed(state.actions):
+            if timestamp < minute_ago:
+                break
+            if action_type == action.action_type:
+                count += 1
+                total_value += value
+
+        violations = []
+        if count > limits["max_per_minute"]:
             violations.append(ViolationRecord(
                 player_id=action.player_id,
                 violation_type=ViolationType.RATE_LIMIT_EXCEEDED,
@@ -190,101 +481,201 @@ class HybridAntiCheatEngine:
                 timestamp=current_time,
                 details={
                     "action_type": action.action_type,
-                    "frequency": len(recent_actions),
+                    "frequency": count,
                     "limit": limits["max_per_minute"]
                 }
             ))
-        
+        if total_value > limits["max_value_per_minute"]:
+            violations.append(ViolationRecord(
+                player_id=action.player_id,
+                violation_type=ViolationType.RATE_LIMIT_EXCEEDED,
+                severity=3.0,
+                timestamp=current_time,
+                details={
+                    "action_type": action.action_type,
+                    "total_value": total_value,
+                    "limit": limits["max_value_per_minute"]
+                }
+            ))
         return violations
-    
-    async def _analyze_behavior(self, action: PlayerAction, player_data: Dict) -> List[ViolationRecord]:
-        """행동 패턴 분석"""
+
+    def _analyze_behavior(self, action: PlayerAction, state: PlayerState) -> List[ViolationRecord]:
+        """완벽한 타이밍 (최근 5분) + 연속 활동 (보관 중인 전체 액션)"""
         violations = []
-        actions = player_data.get('actions', [])
-        
-        if len(actions) < 10:
-            return violations
-        
-        # 봇 탐지 로직 (기존과 동일)
-        # ... 구현 생략 (기존 anti_cheat.py의 로직 재사용)
-        
+        current_time = time.time()
+        window_start = current_time - self.behavior_window
+        recent = [a for a in state.actions if a[0] >= window_start]
+
+        if len(recent) >= 10 and action.action_type in ("resource_gather", "reward_collection"):
+            same_type = [a[0] for a in recent if a[1] == action.action_type]
+            if len(same_type) >= 5:
+                variance = float(np.var(np.diff(same_type)))
+                if variance < self.bot_detection_patterns["perfect_timing"]:
+                    violations.append(ViolationRecord(
+                        player_id=action.player_id,
+                        violation_type=ViolationType.BOT_DETECTED,
+                        severity=4.0,
+                        timestamp=current_time,
+                        details={
+                            "pattern": "perfect_timing",
+                            "variance": variance,
+                            "threshold": self.bot_detection_patterns["perfect_timing"]
+                        }
+                    ))
+
+        if len(state.actions) >= 50:
+            timestamps = [a[0] for a in state.actions]
+            time_span = timestamps[-1] - timestamps[0]
+            if time_span > self.bot_detection_patterns["continuous_activity"]:
+                max_gap = float(np.max(np.diff(timestamps)))
+                if max_gap < 300:  # 5분 이상 쉰 적이 없음
+                    violations.append(ViolationRecord(
+                        player_id=action.player_id,
+                        violation_type=ViolationType.SUSPICIOUS_BEHAVIOR,
+                        severity=3.5,
+                        timestamp=current_time,
+                        details={
+                            "pattern": "continuous_activity",
+                            "duration_hours": time_span / 3600,
+                            "max_break_seconds": max_gap
+                        }
+                    ))
         return violations
-    
-    async def _update_player_data(self, player_id: str, action: PlayerAction, violations: List[ViolationRecord]):
-        """플레이어 데이터 업데이트"""
-        if player_id not in self.memory_players:
-            return
-        
-        # 액션 추가
-        action_dict = self._action_to_dict_from_object(action)
-        self.memory_players[player_id]['actions'].insert(0, action_dict)
-        
-        # 최대 100개 액션만 메모리에 유지
-        self.memory_players[player_id]['actions'] = \
-            self.memory_players[player_id]['actions'][:100]
-        
-        # 위험도 점수 업데이트
-        for violation in violations:
-            self.memory_players[player_id]['risk_score'] += violation.severity
-        
-        self.memory_players[player_id]['last_access'] = time.time()
-    
-    def _action_to_dict(self, db_action: DBPlayerAction) -> Dict:
-        """DB 액션을 딕셔너리로 변환"""
-        return {
-            'action_type': db_action.action_type,
-            'timestamp': db_action.timestamp.timestamp(),
-            'value': db_action.value,
-            'metadata': db_action.get_metadata()
-        }
-    
-    def _action_to_dict_from_object(self, action: PlayerAction) -> Dict:
-        """액션 객체를 딕셔너리로 변환"""
-        return {
-            'action_type': action.action_type,
-            'timestamp': action.timestamp,
-            'value': action.value,
-            'metadata': action.metadata
-        }
-    
-    def _violation_to_dict(self, violation: Violation) -> Dict:
-        """DB 위반을 딕셔너리로 변환"""
+
+    def _detect_anomalies(self, action: PlayerAction, state: PlayerState) -> List[ViolationRecord]:
+        """같은 액션 타입 양수 값 대비 z-score 이상치"""
+        if action.value <= 0:
+            return []
+
+        values = [a[2] for a in state.actions if a[1] == action.action_type and a[2] > 0]
+        if len(values) < 10:
+            return []
+
+        mean_value = float(np.mean(values))
+        std_value = float(np.std(values))
+        if std_value <= 0:
+            return []
+
+        z_score = abs((action.value - mean_value) / std_value)
+        if z_score <= self.anomaly_threshold:
+            return []
+
+        return [ViolationRecord(
+            player_id=action.player_id,
+            violation_type=ViolationType.ANOMALY_DETECTED,
+            severity=min(z_score, 5.0),
+            timestamp=time.time(),
+            details={
+                "z_score": z_score,
+                "action_value": action.value,
+                "mean_value": mean_value,
+                "std_value": std_value
+            }
+        )]
+
+    def _detect_bot_behavior(self, action: PlayerAction, state: PlayerState) -> List[ViolationRecord]:
+        """최근 20개 액션의 반복 시퀀스 (길이 3~5, 가장 많이 반복된 하나만 보고)"""
+        recent = [a[1] for a in list(state.actions)[-20:]]
+        if len(recent) < 10:
+            return []
+
+        counts: Dict[Tuple[str, ...], int] = defaultdict(int)
+        for length in (3, 4, 5):
+            for i in range(len(recent) - length + 1):
+                counts[tuple(recent[i:i + length])] += 1
+
+        sequence, repetitions = max(counts.items(), key=lambda item: item[1])
+        if repetitions < self.bot_detection_patterns["identical_sequences"]:
+            return []
+
+        return [ViolationRecord(
+            player_id=action.player_id,
+            violation_type=ViolationType.BOT_DETECTED,
+            severity=3.0,
+            timestamp=time.time(),
+            details={
+                "pattern": "identical_sequences",
+                "sequence": list(sequence),
+                "repetitions": repetitions
+            }
+        )]
+
+    # ===== 정리 / 통계 =====
+
+    async def cleanup_old_data(self, idle_seconds: float = 3600):
+        """1시간 이상 사용되지 않은 플레이어를 Redis 로 강등 (LRU 앞쪽부터, 활성 플레이어에서 중단)"""
+        cutoff = time.time() - idle_seconds
+        while self.memory_players:
+            player_id, state = next(iter(self.memory_players.items()))
+            last_action = state.actions[-1][0] if state.actions else 0.0
+            if last_action >= cutoff:
+                break
+            del self.memory_players[player_id]
+            self._demote(state)
+        await self.flush()
+        logger.info(f"메모리 정리 완료. 활성 플레이어: {len(self.memory_players)}")
+
+    async def close(self):
+        """write-behind 중지, 메모리 상태는 Redis 로 강등 후 남은 행 저장"""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+
+        while self.memory_players:
+            _, state = self.memory_players.popitem(last=False)
+            self._demote(state)
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = sum(self.tier_hits.values())
+
+        def ratio(tier: str) -> float:
+            return round(self.tier_hits[tier] / lookups, 4) if lookups else 0.0
+
         return {
-            'violation_type': violation.violation_type,
-            'severity': violation.severity,
-            'timestamp': violation.timestamp.timestamp(),
-            'details': violation.get_details()
+            "tiers": {
+                TIER_MEMORY: {
+                    "players": len(self.memory_players),
+                    "max_players": self.max_memory_players,
+                    "hits": self.tier_hits[TIER_MEMORY],
+                    "hit_ratio": ratio(TIER_MEMORY)
+                },
+                TIER_REDIS: {
+                    "enabled": self.redis is not None,
+                    "hits": self.tier_hits[TIER_REDIS],
+                    "hit_ratio": ratio(TIER_REDIS),
+                    "errors": self.redis_errors,
+                    "decode_errors": self.redis_decode_errors,
+                    "ttl_seconds": self.redis_ttl,
+                    "snapshots_written": self.snapshots_written,
+                    "avg_snapshot_bytes": round(self.snapshot_bytes_written / self.snapshots_written, 1)
+                    if self.snapshots_written else 0.0
+                },
+                TIER_DB: {
+                    "hits": self.tier_hits[TIER_DB],
+                    "hit_ratio": ratio(TIER_DB),
+                    "new_players": self.tier_hits[TIER_NEW]
+                }
+            },
+            "lookups": lookups,
+            "promotions": self.promotions,
+            "demotions": self.demotions,
+            "promotions_per_sec": round(self._promotion_rate.rate(), 3),
+            "demotions_per_sec": round(self._demotion_rate.rate(), 3),
+            "pending_demotions": len(self._demoting),
+            "write_behind": {
+                "pending_actions": len(self._pending_actions),
+                "pending_violations": len(self._pending_violations),
+                "pending_players": len(self._pending_players),
+                "rows_written": self.rows_written,
+                "batches": self.write_batches,
+                "failed_batches": self.failed_batches,
+                "rows_dropped": self.rows_dropped,
+                "last_batch_ms": round(self.last_batch_ms, 2),
+                "interval_ms": self.write_interval * 1000
+            }
         }
-    
-    async def get_player_risk_score(self, player_id: str, db: Session) -> float:
-        """플레이어 위험도 조회"""
-        player_data = await self._get_player_data(player_id, db)
-        return player_data.get('risk_score', 0.0)
-    
-    async def cleanup_old_data(self):
-        """정기적인 정리"""
-        current_time = time.time()
-        
-        # 메모리에서 1시간 이상 사용되지 않은 플레이어 제거
-        old_players = [
-            pid for pid, data in self.memory_players.items()
-            if current_time - data.get('last_access', 0) > 3600
-        ]
-        
-        for player_id in old_players:
-            data = self.memory_players[player_id]
-            
-            # Redis로 이동
-            if self.redis:
-                try:
-                    await self.redis.setex(
-                        f"player:{player_id}",
-                        self.redis_ttl,
-                        json.dumps(data)
-                    )
-                except Exception as e:
-                    logger.warning(f"Redis 저장 실패: {e}")
-            
-            del self.memory_players[player_id]
-        
-        logger.info(f"메모리 정리 완료. 활성 플레이어: {len(self.memory_players)}")
\ No newline at end of file
@@ -0,0 +1,245 @@
+"""
+player_actions_ts 마이크로 배치 적재 버퍼
+- 동시 요청들의 액션을 모아 asyncpg 바이너리 COPY(copy_records_to_table)로 일괄 저장
+- flush 조건: flush_interval 경과 또는 max_batch_rows 도달
+- 배치 실패 시 행 단위 INSERT ... ON CONFLICT DO NOTHING 으로 재시도 (오류 격리)
+- 커넥션 획득 실패 등 배치 전체 실패 시 배치를 대기열 앞에 되돌리고 백오프 후 재시도
+  (대기 행이 max_pending_rows 를 넘으면 가장 오래된 행부터 버리고 rows_dropped 로 집계)
+- 아직 저장되지 않은 행은 플레이어별 오버레이로 조회 가능 (탐지기의 read-your-writes 용)
+"""
+
+import asyncio
+import time
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# (time, player_id, action_type, value, metadata_json, interval_sec)
+ActionRecord = Tuple[datetime, str, str, float, Optional[str], Optional[float]]
+
+ACTION_COLUMNS = ["time", "player_id", "action_type", "value", "metadata", "interval_sec"]
+
+# interval_sec 트리거(set_action_interval)의 직전 행 조회 범위 (초)
+INTERVAL_LOOKBACK_SECONDS = 3600.0
+
+
+def fill_batch_intervals(batch: List[ActionRecord]) -> List[ActionRecord]:
+    """
+    같은 배치 안에 직전 행(같은 플레이어 / 액션 타입)이 있는 행의 interval_sec 을 미리 채움
+    - 트리거는 값이 비어 있는 행만 조회하므로 (플레이어, 액션 타입)별 배치 첫 행만 인덱스 조회
+    - 간격이 0 이거나 조회 범위를 넘는 행은 트리거 판단에 맡김 (NULL 유지)
+    """
+    filled = list(batch)
+    previous: Dict[Tuple[str, str], datetime] = {}
+    for index in sorted(range(len(batch)), key=lambda i: batch[i][0]):
+        record = batch[index]
+        key = (record[1], record[2])
+        last_time = previous.get(key)
+        previous[key] = record[0]
+        if record[5] is None and last_time is not None:
+            gap = (record[0] - last_time).total_seconds()
+            if 0 < gap <= INTERVAL_LOOKBACK_SECONDS:
+                filled[index] = record[:5] + (gap,)
+    return filled
+
+
+class ActionIngestBuffer:
+    """
+    액션 마이크로 배치 버퍼
+    - max_batch_rows: 한 번에 COPY 할 최대 행 수
+    - flush_interval: 최대 대기 시간 (초)
+    - max_pending_rows: 이 이상 쌓이면 add() 호출자가 flush 완료를 기다림 (backpressure)
+    - max_backoff: 배치 전체 실패 시 재시도 간격 상한 (초)
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        table: str = "player_actions_ts",
+        max_batch_rows: int = 1000,
+        flush_interval: float = 0.01,
+        max_pending_rows: int = 50000,
+        max_backoff: float = 5.0
+    ):
+        self.pool = pool
+        self.table = table
+        self.max_batch_rows = max_batch_rows
+        self.flush_interval = flush_interval
+        self.max_pending_rows = max_pending_rows
+        self.max_backoff = max_backoff
+
+        self._pending: List[ActionRecord] = []
+        # 플레이어별 미저장 행 (time, action_type, value) - 추가 순서 유지
+        self._overlay: Dict[str, List[Tuple[datetime, str, float]]] = defaultdict(list)
+
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._backoff = flush_interval
+        self._retry_at = 0.0  # 배치 전체 실패 후 다음 재시도 시각 (monotonic)
+
+        # 통계
+        self.rows_flushed = 0
+        self.batches_flushed = 0
+        self.fallback_batches = 0
+        self.rows_dropped = 0
+        self.write_errors = 0
+        self.last_batch_ms = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def add(self, record: ActionRecord):
+        """액션 적재 요청 (즉시 오버레이에 반영)"""
+        if self._closed:
+            raise RuntimeError("ingest buffer is closed")
+
+        self._pending.append(record)
+        self._overlay[record[1]].append((record[0], record[2], record[3]))
+
+        if len(self._pending) >= self.max_batch_rows:
+            self._wakeup.set()
+        if len(self._pending) >= self.max_pending_rows:
+            # 적재가 유입을 따라가지 못하면 호출자를 늦춰 메모리 증가 방지
+            # (DB 장애로 재시도 대기 중이면 요청마다 재시도하지 않고 가장 오래된 행을 버림)
+            if time.monotonic() >= self._retry_at:
+                try:
+                    await self.flush()
+                except Exception as e:
+                    logger.error(f"액션 배치 적재 실패 (대기 {len(self._pending)}행): {e}")
+            self._drop_overflow()
+
+    def get_pending(self, player_id: str) -> List[Tuple[datetime, str, float]]:
+        """플레이어의 미저장 행 (탐지 쿼리 오버레이용)"""
+        rows = self._overlay.get(player_id)
+        return list(rows) if rows else []
+
+    @property
+    def pending_rows(self) -> int:
+        return len(self._pending)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(self._backoff, self._retry_at - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if time.monotonic() < self._retry_at:
+                continue
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"액션 배치 적재 실패 (대기 {len(self._pending)}행), {self._backoff:.1f}초 후 재시도: {e}")
+
+    async def flush(self):
+        """
+        대기 중인 행을 max_batch_rows 단위로 저장
+        배치 전체 실패 시 배치를 대기열 앞에 되돌리고(오버레이 유지) 예외 전파
+        """
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:self.max_batch_rows]
+                del self._pending[:len(batch)]
+                try:
+                    await self._write_batch(batch)
+                except BaseException as e:
+                    self._pending[:0] = batch
+                    if isinstance(e, Exception):
+                        self.write_errors += 1
+                        self._backoff = min(max(self._backoff * 2, 0.1), self.max_backoff)
+                        self._retry_at = time.monotonic() + self._backoff
+                    raise
+                self._release_overlay(batch)
+                self._backoff = self.flush_interval
+                self._retry_at = 0.0
+
+    def _drop_overflow(self):
+        """대기 행이 상한을 넘으면 가장 오래된 행부터 버림 (오버레이에서도 제거)"""
+        overflow = len(self._pending) - self.max_pending_rows
+        if overflow <= 0:
+            return
+        dropped = self._pending[:overflow]
+        del self._pending[:overflow]
+        self._release_overlay(dropped)
+        self.rows_dropped += overflow
+        logger.error(f"액션 적재 대기열 초과로 {overflow}행 유실")
+
+    async def _write_batch(self, batch: List[ActionRecord]):
+        started = time.perf_counter()
+        records = fill_batch_intervals(batch)
+        async with self.pool.acquire() as conn:
+            try:
+                await conn.copy_records_to_table(self.table, records=records, columns=ACTION_COLUMNS)
+            except Exception as e:
+                # 배치 중 한 행(중복 키 등) 때문에 전체가 실패한 경우 행 단위로 격리
+                logger.warning(f"COPY 배치 실패 ({len(batch)}행), 행 단위 재시도: {e}")
+                self.fallback_batches += 1
+                await self._write_rows_individually(conn, records)
+        self.batches_flushed += 1
+        self.rows_flushed += len(batch)
+        self.last_batch_ms = (time.perf_counter() - started) * 1000
+
+    async def _write_rows_individually(self, conn: asyncpg.Connection, batch: List[ActionRecord]):
+        for record in batch:
+            try:
+                await conn.execute(f"""
+                    INSERT INTO {self.table} (time, player_id, action_type, value, metadata, interval_sec)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    ON CONFLICT DO NOTHING
+                """, *record)
+            except Exception as e:
+                self.rows_dropped += 1
+                logger.error(f"액션 행 저장 실패 (player={record[1]}): {e}")
+
+    def _release_overlay(self, batch: List[ActionRecord]):
+        """저장 완료된 행을 오버레이에서 제거 (플레이어별 가장 오래된 행부터)"""
+        counts: Dict[str, int] = defaultdict(int)
+        for record in batch:
+            counts[record[1]] += 1
+        for player_id, count in counts.items():
+            rows = self._overlay.get(player_id)
+            if rows is None:
+                continue
+            del rows[:count]
+            if not rows:
+                del self._overlay[player_id]
+
+    async def close(self):
+        """백그라운드 태스크 중지 후 남은 행 모두 저장"""
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            self.rows_dropped += len(self._pending)
+            logger.error(f"종료 시 액션 배치 적재 실패 ({len(self._pending)}행 유실): {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pending_rows": len(self._pending),
+            "overlay_players": len(self._overlay),
+            "rows_flushed": self.rows_flushed,
+            "batches_flushed": self.batches_flushed,
+            "fallback_batches": self.fallback_batches,
+            "rows_dropped": self.rows_dropped,
+            "write_errors": self.write_errors,
+            "last_batch_ms": round(self.last_batch_ms, 2),
+            "max_batch_rows": self.max_batch_rows,
+            "flush_interval_ms": self.flush_interval * 1000
+        }
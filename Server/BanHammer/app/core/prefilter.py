@@ -0,0 +1,232 @@
+"""
+인그레스 사전 필터
+- 차단된 플레이어 / 명백한 플러딩 클라이언트를 엔진 파이프라인 이전에 거절
+- 차단 목록: players.is_banned + player_summary.is_banned 주기적 폴링 + 이 프로세스의 차단/해제 즉시 반영
+- 플러딩: 플레이어별 고정 윈도우 카운터 (O(1))
+- 범용 API 플레이어는 게임별 ID 이므로 (game_id, player_id) 키로 구분 (전역 차단 목록과 섞이지 않음)
+- 거절 건은 전체 분석 대신 집계 카운터 + 샘플링 로그만 남김
+"""
+
+import asyncio
+import random
+import time
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+REASON_BANNED = "banned"
+REASON_FLOOD = "flood"
+
+SOURCE_LEGACY = "legacy"
+SOURCE_TIMESCALE = "timescale"
+
+# 전역 플레이어는 player_id, 범용 API 플레이어는 (game_id, player_id)
+PlayerKey = Union[str, Tuple[str, str]]
+
+
+def player_key(player_id: str, game_id: Optional[str] = None) -> PlayerKey:
+    return player_id if game_id is None else (game_id, player_id)
+
+
+@dataclass
+class PreFilterVerdict:
+    """사전 필터 거절 결과"""
+    player_id: str
+    reason: str
+    retry_after: Optional[float] = None
+    game_id: Optional[str] = None
+
+    @property
+    def status_code(self) -> int:
+        return 403 if self.reason == REASON_BANNED else 429
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "action_processed": False,
+            "rejected": True,
+            "reason": self.reason,
+            "player_id": self.player_id
+        }
+        if self.game_id is not None:
+            result["game_id"] = self.game_id
+        if self.retry_after is not None:
+            result["retry_after"] = round(self.retry_after, 3)
+        return result
+
+
+class IngressPreFilter:
+    """
+    엔진 앞단의 경량 필터
+    - flood_max_actions: flood_window_seconds 동안 허용되는 플레이어별 최대 액션 수
+    - sync_interval: 차단 목록 폴링 주기 (초)
+    - record_sample_rate: 거절 건 중 개별 로그로 남길 비율
+    """
+
+    def __init__(
+        self,
+        flood_max_actions: int = 50,
+        flood_window_seconds: float = 1.0,
+        sync_interval: float = 30.0,
+        record_sample_rate: float = 0.01,
+        max_tracked_players: int = 200000
+    ):
+        self.flood_max_actions = flood_max_actions
+        self.flood_window_seconds = flood_window_seconds
+        self.sync_interval = sync_interval
+        self.record_sample_rate = record_sample_rate
+        self.max_tracked_players = max_tracked_players
+
+        # 소스별 차단 목록 (폴링 시 소스 단위로 교체)
+        self._banned: Dict[str, Set[PlayerKey]] = {SOURCE_LEGACY: set(), SOURCE_TIMESCALE: set()}
+
+        # 플레이어별 [윈도우 시작 시각, 카운트]
+        self._flood_windows: Dict[PlayerKey, List[float]] = {}
+
+        # 거절 집계
+        self._rejections: Dict[str, int] = defaultdict(int)
+        self._top_offenders: Dict[PlayerKey, int] = defaultdict(int)
+        self._last_sync: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def check(self, player_id: str, now: Optional[float] = None,
+              game_id: Optional[str] = None) -> Optional[PreFilterVerdict]:
+        """통과 시 None, 거절 시 판정 반환 (game_id: 범용 API 의 게임별 플레이어)"""
+        key = player_key(player_id, game_id)
+        if self._is_banned_key(key):
+            return self._reject(key, REASON_BANNED)
+
+        now = now or time.monotonic()
+        window = self._flood_windows.get(key)
+        if window is None or now - window[0] >= self.flood_window_seconds:
+            if window is None and len(self._flood_windows) >= self.max_tracked_players:
+                self._prune_windows(now)
+            self._flood_windows[key] = [now, 1]
+            return None
+
+        window[1] += 1
+        if window[1] > self.flood_max_actions:
+            retry_after = self.flood_window_seconds - (now - window[0])
+            return self._reject(key, REASON_FLOOD, retry_after)
+        return None
+
+    def is_banned(self, player_id: str, game_id: Optional[str] = None) -> bool:
+        return self._is_banned_key(player_key(player_id, game_id))
+
+    def _is_banned_key(self, key: PlayerKey) -> bool:
+        return any(key in banned for banned in self._banned.values())
+
+    def mark_banned(self, player_id: str, source: str, game_id: Optional[str] = None):
+        """이 프로세스에서 차단한 플레이어 즉시 반영"""
+        self._banned.setdefault(source, set()).add(player_key(player_id, game_id))
+
+    def mark_unbanned(self, player_id: str, source: str, game_id: Optional[str] = None):
+        """이 프로세스에서 차단 해제한 플레이어 즉시 반영"""
+        self._banned.get(source, set()).discard(player_key(player_id, game_id))
+
+    def _reject(self, key: PlayerKey, reason: str, retry_after: Optional[float] = None) -> PreFilterVerdict:
+        """거절 집계 + 샘플링 로그"""
+        game_id, player_id = key if isinstance(key, tuple) else (None, key)
+        self._rejections[reason] += 1
+        self._top_offenders[key] += 1
+        if len(self._top_offenders) > 10000:
+            # 상위 100명만 유지
+            top = sorted(self._top_offenders.items(), key=lambda x: -x[1])[:100]
+            self._top_offenders = defaultdict(int, top)
+
+        if random.random() < self.record_sample_rate:
+            logger.info(
+                f"사전 필터 거절 (샘플): player={player_id} game={game_id} reason={reason} "
+                f"total_{reason}={self._rejections[reason]}"
+            )
+        return PreFilterVerdict(player_id=player_id, reason=reason, retry_after=retry_after, game_id=game_id)
+
+    def _prune_windows(self, now: float):
+        """만료된 플러딩 윈도우 정리"""
+        expired = [
+            key for key, window in self._flood_windows.items()
+            if now - window[0] >= self.flood_window_seconds
+        ]
+        for key in expired:
+            del self._flood_windows[key]
+
+    # ===== 차단 목록 동기화 =====
+
+    async def start(self):
+        if self._task is not None:
+            return
+        await self.sync_banned()
+        self._task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            await self.sync_banned()
+            self._prune_windows(time.monotonic())
+
+    async def sync_banned(self):
+        """두 저장소의 차단 목록 폴링 (실패한 소스는 이전 목록 유지)"""
+        try:
+            self._banned[SOURCE_LEGACY] = await asyncio.to_thread(self._load_legacy_banned)
+            self._last_sync[SOURCE_LEGACY] = time.time()
+        except Exception as e:
+            logger.warning(f"차단 목록 동기화 실패 (legacy): {e}")
+
+        try:
+            banned = await self._load_timescale_banned()
+            if banned is not None:
+                self._banned[SOURCE_TIMESCALE] = banned
+                self._last_sync[SOURCE_TIMESCALE] = time.time()
+        except Exception as e:
+            logger.warning(f"차단 목록 동기화 실패 (timescale): {e}")
+
+    @staticmethod
+    def _load_legacy_banned() -> Set[str]:
+        from ..dependencies import get_sql_engine
+
+        with get_sql_engine().connect() as conn:
+            rows = conn.execute(text("SELECT id FROM players WHERE is_banned = :banned"), {"banned": True})
+            return {row[0] for row in rows}
+
+    @staticmethod
+    async def _load_timescale_banned() -> Optional[Set[str]]:
+        """TimescaleDB 엔진이 초기화된 경우에만 조회"""
+        from .. import dependencies
+
+        ts_engine = dependencies._timescale_engine
+        if ts_engine is None or ts_engine.connection_pool is None:
+            return None
+        async with ts_engine.connection_pool.acquire() as conn:
+            rows = await conn.fetch("SELECT player_id FROM player_summary WHERE is_banned = true")
+        return {row["player_id"] for row in rows}
+
+    def get_stats(self) -> Dict[str, Any]:
+        top = sorted(self._top_offenders.items(), key=lambda x: -x[1])[:10]
+        return {
+            "banned_players": {source: len(banned) for source, banned in self._banned.items()},
+            "tracked_flood_windows": len(self._flood_windows),
+            "rejections": dict(self._rejections),
+            "top_offenders": [
+                {"game_id": k[0], "player_id": k[1], "rejections": c} if isinstance(k, tuple)
+                else {"player_id": k, "rejections": c}
+                for k, c in top
+            ],
+            "last_sync": dict(self._last_sync),
+            "flood_limit": {
+                "max_actions": self.flood_max_actions,
+                "window_seconds": self.flood_window_seconds
+            }
+        }
@@ -0,0 +1,109 @@
+"""
+Redis 슬라이딩 윈도우 빈도 카운터 (TimescaleDB 빈도 제한의 빠른 계층)
+- (플레이어, 액션 타입)별 현재 분 / 직전 분의 횟수·값 합계를 Redis 해시에 보관
+- 적재 시 Lua 스크립트로 원자적으로 갱신하고 같은 호출에서 1분 슬라이딩 값을 반환
+- 계산식은 SQL 경로(action_stats_1min 현재 버킷 + 직전 버킷 × 남은 비율)와 동일
+- Redis 오류 시 None 반환 + 일정 시간 비활성화 → 호출자는 SQL 경로로 폴백
+"""
+
+import time
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] = 카운터 해시
+# ARGV[1] = 액션 분 버킷, ARGV[2] = 액션 값, ARGV[3] = 현재 시각(초), ARGV[4] = TTL(초)
+# 해시 필드: m(현재 분), c/v(현재 분 횟수/합계), pc/pv(직전 분 횟수/합계)
+# 반환: {슬라이딩 횟수, 슬라이딩 합계} (Lua 숫자는 정수로 잘리므로 문자열로 반환)
+SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[3])
+local now_minute = math.floor(now / 60)
+local action_minute = tonumber(ARGV[1])
+local value = tonumber(ARGV[2])
+
+local state = redis.call('HMGET', KEYS[1], 'm', 'c', 'v', 'pc', 'pv')
+local minute = tonumber(state[1]) or now_minute
+local c = tonumber(state[2]) or 0
+local v = tonumber(state[3]) or 0
+local pc = tonumber(state[4]) or 0
+local pv = tonumber(state[5]) or 0
+
+-- 현재 분 기준으로 버킷 이동
+if now_minute == minute + 1 then
+    pc, pv, c, v = c, v, 0, 0
+elseif now_minute > minute + 1 then
+    pc, pv, c, v = 0, 0, 0, 0
+end
+
+-- 이번 액션 반영 (직전 분보다 오래된 액션은 윈도우 밖이므로 무시)
+if action_minute >= now_minute then
+    c = c + 1
+    v = v + value
+elseif action_minute == now_minute - 1 then
+    pc = pc + 1
+    pv = pv + value
+end
+
+redis.call('HSET', KEYS[1], 'm', now_minute, 'c', c, 'v', v, 'pc', pc, 'pv', pv)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+
+local weight = 1 - (now - now_minute * 60) / 60
+return {tostring(c + pc * weight), tostring(v + pv * weight)}
+"""
+
+
+class RedisRateCounter:
+    """
+    Lua 스크립트 기반 플레이어/액션 타입별 1분 빈도 카운터
+    - failure_cooldown: Redis 오류 후 SQL 폴백을 유지하는 시간 (초)
+    """
+
+    def __init__(self, redis_client, key_prefix: str = "ts:rate", failure_cooldown: float = 5.0):
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self.failure_cooldown = failure_cooldown
+        self.ttl_seconds = 180  # 직전 분까지만 필요하므로 여유 있게 3분
+
+        self._script = redis_client.register_script(SLIDING_WINDOW_LUA)
+        self._disabled_until = 0.0
+
+        # 통계
+        self.updates = 0
+        self.failures = 0
+        self.fallbacks = 0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._disabled_until
+
+    async def record(self, player_id: str, action_type: str, timestamp: float, value: float) -> Optional[Tuple[int, float]]:
+        """액션 반영 후 (1분 횟수, 1분 값 합계) 반환. 사용 불가 시 None"""
+        if not self.available:
+            self.fallbacks += 1
+            return None
+
+        try:
+            count, total = await self._script(
+                keys=[f"{self.key_prefix}:{player_id}:{action_type}"],
+                args=[int(timestamp // 60), value, time.time(), self.ttl_seconds]
+            )
+        except Exception as e:
+            self.failures += 1
+            self.fallbacks += 1
+            self._disabled_until = time.monotonic() + self.failure_cooldown
+            logger.warning(f"Redis 빈도 카운터 실패, {self.failure_cooldown}초간 SQL 폴백: {e}")
+            return None
+
+        self.updates += 1
+        # SQL 경로와 동일하게 횟수는 반올림
+        return int(round(float(count))), float(total)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "available": self.available,
+            "updates": self.updates,
+            "failures": self.failures,
+            "fallbacks": self.fallbacks,
+            "failure_cooldown_seconds": self.failure_cooldown
+        }
@@ -0,0 +1,165 @@
+"""
+재시작 후 인메모리 액션 윈도우 지연 복원 (Redis 액션 리스트 → deque)
+- 플레이어를 처음 조회할 때만 복원 (시작 시 전체 로드 없음)
+- 같은 키에 대한 동시 요청은 하나의 조회로 합침
+- 짧은 시간에 몰린 요청은 한 번의 파이프라인 LRANGE 로 묶어 전송 (batch_size 단위)
+- 동시에 실행되는 파이프라인 수를 세마포어로 제한 → 재시작 직후 요청 폭주가 Redis 로 그대로 전달되지 않음
+- 비어 있는 키는 부정 캐시에 기록해 신규 플레이어 조회마다 Redis 를 다시 치지 않음
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List
+
+import redis.asyncio as redis
+
+from .cache import LRUTTLCache
+from .state_codec import ActionRecord, CodecError, decode_action_record
+
+logger = logging.getLogger(__name__)
+
+
+class RedisWindowRehydrator:
+    """
+    Redis 리스트(LPUSH 로 최신순 저장) → 오래된 순 ActionRecord 목록
+    - max_actions: 키당 읽을 최대 항목 수 (인메모리 deque 크기와 맞출 것)
+    - max_concurrency: 동시에 실행할 파이프라인 수
+    - batch_size: 파이프라인 하나에 담을 최대 키 수
+    - negative_ttl: 빈 키를 다시 조회하지 않을 시간 (초)
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        max_actions: int = 1000,
+        max_concurrency: int = 8,
+        batch_size: int = 64,
+        negative_ttl: float = 300.0,
+        max_negative_keys: int = 100000
+    ):
+        self.redis = redis_client
+        self.max_actions = max_actions
+        self.batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._negative: LRUTTLCache[str, bool] = LRUTTLCache(
+            max_size=max_negative_keys, ttl_seconds=negative_ttl, name="rehydration_negative"
+        )
+
+        # 조회 대기 중(아직 파이프라인에 실리지 않은) 키 / 진행 중인 키
+        self._queued: Dict[str, asyncio.Future] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._dispatch_scheduled = False
+        self._tasks = set()
+
+        # 통계
+        self.requests = 0
+        self.coalesced = 0
+        self.negative_hits = 0
+        self.pipelines = 0
+        self.keys_loaded = 0
+        self.records_loaded = 0
+        self.decode_errors = 0
+        self.errors = 0
+        self.last_pipeline_ms = 0.0
+
+    async def fetch(self, key: str) -> List[ActionRecord]:
+        """키의 액션을 오래된 순으로 반환 (없거나 Redis 오류 시 빈 목록)"""
+        self.requests += 1
+        if self._negative.get(key):
+            self.negative_hits += 1
+            return []
+
+        future = self._queued.get(key) or self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._queued[key] = future
+        if not self._dispatch_scheduled:
+            # 같은 루프 턴에 들어온 요청을 모아서 한 번에 전송
+            self._dispatch_scheduled = True
+            asyncio.get_running_loop().call_soon(self._dispatch)
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        self._dispatch_scheduled = False
+        while self._queued:
+            keys = []
+            for key in self._queued:
+                keys.append(key)
+                if len(keys) >= self.batch_size:
+                    break
+            batch = {key: self._queued.pop(key) for key in keys}
+            self._inflight.update(batch)
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: Dict[str, asyncio.Future]):
+        try:
+            async with self._semaphore:
+                started = time.perf_counter()
+                pipe = self.redis.pipeline(transaction=False)
+                for key in batch:
+                    pipe.lrange(key, 0, self.max_actions - 1)
+                results = await pipe.execute()
+                self.pipelines += 1
+                self.last_pipeline_ms = (time.perf_counter() - started) * 1000
+
+            for (key, future), raw_items in zip(batch.items(), results):
+                records = self._decode(key, raw_items)
+                if records:
+                    self.keys_loaded += 1
+                    self.records_loaded += len(records)
+                else:
+                    self._negative.put(key, True)
+                if not future.done():
+                    future.set_result(records)
+        except Exception as e:
+            # 복원 실패는 치명적이지 않음: 빈 윈도우로 시작 (부정 캐시에는 기록하지 않아 다음 조회에서 재시도)
+            self.errors += 1
+            logger.warning(f"Redis 윈도우 복원 실패 ({len(batch)}개 키): {e}")
+            for future in batch.values():
+                if not future.done():
+                    future.set_result([])
+        finally:
+            # 취소된 경우에도 기다리는 요청이 멈추지 않도록 빈 결과로 완료
+            for key, future in batch.items():
+                self._inflight.pop(key, None)
+                if not future.done():
+                    future.set_result([])
+
+    def _decode(self, key: str, raw_items: List[bytes]) -> List[ActionRecord]:
+        records = []
+        for raw in reversed(raw_items or []):
+            try:
+                records.append(decode_action_record(raw))
+            except CodecError as e:
+                self.decode_errors += 1
+                logger.debug(f"액션 레코드 디코딩 실패 (key={key}): {e}")
+        return records
+
+    def forget(self, key: str):
+        """키에 새 액션이 기록됨 → 부정 캐시 무효화"""
+        self._negative.invalidate(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "negative_hits": self.negative_hits,
+            "negative_cache_size": len(self._negative),
+            "pipelines": self.pipelines,
+            "avg_keys_per_pipeline": round(
+                (self.requests - self.coalesced - self.negative_hits) / self.pipelines, 2
+            ) if self.pipelines else 0.0,
+            "keys_loaded": self.keys_loaded,
+            "records_loaded": self.records_loaded,
+            "decode_errors": self.decode_errors,
+            "errors": self.errors,
+            "queued": len(self._queued),
+            "inflight": len(self._inflight),
+            "last_pipeline_ms": round(self.last_pipeline_ms, 2)
+        }
@@ -0,0 +1,336 @@
+"""
+플레이어 상태 바이너리 코덱 (Redis 저장용)
+- JSON 대신 고정 레이아웃 struct + 배열로 인코딩: 필드 이름 반복 없음, 실수는 8바이트 그대로
+- 스냅샷: 액션 타입 문자열은 한 번만 기록하고 액션에는 인덱스(uint16)만 저장,
+  액션 시각은 기준 시각 대비 밀리초 오프셋(uint32), 큰 스냅샷은 zlib 압축
+- 액션 레코드 (Redis 리스트 항목): 알려진 액션 타입은 1바이트 코드로 저장
+- 첫 바이트는 포맷 태그 (형식이 바뀌어도 이전 버전 항목을 읽을 수 있도록)
+- '{' 로 시작하는 항목은 이전 JSON 형식으로 읽음 → 기존 키는 만료/재기록 시 자연스럽게 전환
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# 포맷 태그 (첫 바이트, JSON 의 '{' = 0x7B 와 겹치지 않아야 함)
+SNAPSHOT_VERSION = 1
+SNAPSHOT_ZLIB = 2  # 태그 + zlib(버전 1 스냅샷)
+ACTION_RECORD_VERSION = 0x10
+
+_JSON_PREFIX = 0x7B
+
+# 압축 여부 판단 기준 (이보다 작은 스냅샷은 압축 이득보다 CPU 비용이 큼)
+DEFAULT_COMPRESS_MIN_BYTES = 512
+_ZLIB_LEVEL = 1
+
+# version, risk_score, risk_updated_at, total_actions, total_violations, 타입 수, 액션 수, 기준 시각
+_SNAPSHOT_HEADER = struct.Struct("<BddIIHHd")
+
+_MAX_OFFSET_MS = 0xFFFFFFFF
+
+# (timestamp, action_type, value)
+ActionTuple = Tuple[float, str, float]
+
+
+# 액션 레코드 헤더: 태그, 플래그, 액션 타입 코드 (0 = 문자열 직접 기록), timestamp, value
+_ACTION_HEADER = struct.Struct("<BBBdd")
+_LENGTH = struct.Struct("<I")
+
+_HAS_METADATA = 0x01
+_HAS_SESSION = 0x02
+_HAS_CLIENT_INFO = 0x04
+_HAS_JSON_VALUE = 0x08  # 숫자가 아닌 값 (범용 엔진의 value: Any)
+
+# 액션 타입 코드 테이블 - 이미 저장된 항목의 의미가 바뀌므로 뒤에 추가만 할 것 (순서 변경/삭제 금지)
+ACTION_TYPE_CODES: Tuple[str, ...] = (
+    # 기본 엔진 빈도 제한 대상
+    "reward_collection", "resource_gather", "level_progress", "purchase",
+    # 게임 프로파일 (game_profiles.py)
+    "kill_monster", "gain_exp", "level_up", "acquire_item", "trade_item",
+    "complete_quest", "move_location", "use_skill", "join_guild", "pvp_battle",
+    "auto_battle", "collect_reward", "upgrade_equipment", "summon_hero",
+    "complete_stage", "claim_daily", "spend_currency", "idle_farming",
+    "player_kill", "headshot", "move_position", "fire_weapon", "reload_weapon",
+    "match_result", "accuracy_shot", "idle_income", "prestige",
+    "upgrade_building", "collect_offline", "watch_ad", "purchase_boost",
+    "play_card", "win_match", "earn_coins", "open_pack", "craft_card",
+    "rank_change", "solve_puzzle", "use_hint", "complete_level", "earn_stars",
+    "buy_moves", "solve_time",
+)
+_CODE_BY_ACTION_TYPE = {name: code for code, name in enumerate(ACTION_TYPE_CODES, start=1)}
+
+
+class CodecError(ValueError):
+    """디코딩할 수 없는 항목 (알 수 없는 버전 / 손상된 데이터)"""
+
+
+@dataclass
+class PlayerSnapshot:
+    """계층 간 이동하는 플레이어 상태"""
+    risk_score: float = 0.0
+    risk_updated_at: float = 0.0
+    total_actions: int = 0
+    total_violations: int = 0
+    actions: List[ActionTuple] = field(default_factory=list)
+
+
+@dataclass
+class ActionRecord:
+    """Redis 액션 리스트 항목 (session_id / client_info / 숫자가 아닌 value 는 범용 엔진만 사용)"""
+    action_type: str
+    timestamp: float
+    value: Any = 0.0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    session_id: Optional[str] = None
+    client_info: Optional[Dict[str, Any]] = None
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def encode_snapshot(snapshot: PlayerSnapshot, compress_min_bytes: int = 0) -> bytes:
+    """
+    스냅샷 → 바이트 (액션당 14바이트 + 타입 테이블)
+    - compress_min_bytes > 0 이고 결과가 그 이상이면 zlib 압축 (더 작아질 때만)
+    """
+    raw = _encode_snapshot_raw(snapshot)
+    if compress_min_bytes and len(raw) >= compress_min_bytes:
+        compressed = bytes((SNAPSHOT_ZLIB,)) + zlib.compress(raw, _ZLIB_LEVEL)
+        if len(compressed) < len(raw):
+            return compressed
+    return raw
+
+
+def _encode_snapshot_raw(snapshot: PlayerSnapshot) -> bytes:
+    type_index = {}
+    type_names: List[str] = []
+    base = snapshot.actions[0][0] if snapshot.actions else 0.0
+
+    offsets = array("I")
+    codes = array("H")
+    values = array("d")
+    for timestamp, action_type, value in snapshot.actions:
+        code = type_index.get(action_type)
+        if code is None:
+            code = type_index[action_type] = len(type_names)
+            type_names.append(action_type)
+        offsets.append(min(max(int(round((timestamp - base) * 1000)), 0), _MAX_OFFSET_MS))
+        codes.append(code)
+        values.append(value)
+
+    parts = [_SNAPSHOT_HEADER.pack(
+        SNAPSHOT_VERSION,
+        snapshot.risk_score,
+        snapshot.risk_updated_at,
+        snapshot.total_actions,
+        snapshot.total_violations,
+        len(type_names),
+        len(values),
+        base
+    )]
+    for name in type_names:
+        parts.append(_pack_short_text(name))
+    parts.append(_little_endian(offsets))
+    parts.append(_little_endian(codes))
+    parts.append(_little_endian(values))
+    return b"".join(parts)
+
+
+def decode_snapshot(data: bytes) -> PlayerSnapshot:
+    """바이트 → 스냅샷 (압축 / 이전 JSON 형식 포함)"""
+    if not data:
+        raise CodecError("empty snapshot")
+    if data[0] == _JSON_PREFIX:
+        return _snapshot_from_json(data)
+    if data[0] == SNAPSHOT_ZLIB:
+        try:
+            data = zlib.decompress(data[1:])
+        except zlib.error as e:
+            raise CodecError(f"corrupt compressed snapshot: {e}") from e
+        if not data or data[0] != SNAPSHOT_VERSION:
+            raise CodecError("compressed payload is not a snapshot")
+    if data[0] != SNAPSHOT_VERSION:
+        raise CodecError(f"unsupported snapshot version: {data[:1]!r}")
+    try:
+        (_, risk_score, risk_updated_at, total_actions, total_violations,
+         type_count, action_count, base) = _SNAPSHOT_HEADER.unpack_from(data)
+        position = _SNAPSHOT_HEADER.size
+
+        type_names = []
+        for _ in range(type_count):
+            length = data[position]
+            type_names.append(data[position + 1:position + 1 + length].decode("utf-8"))
+            position += 1 + length
+
+        offsets = _from_little_endian("I", data[position:position + 4 * action_count])
+        position += 4 * action_count
+        codes = _from_little_endian("H", data[position:position + 2 * action_count])
+        position += 2 * action_count
+        values = _from_little_endian("d", data[position:position + 8 * action_count])
+        if len(values) != action_count:
+            raise CodecError("truncated snapshot")
+
+        actions = [
+            (base + offset / 1000.0, type_names[code], value)
+            for offset, code, value in zip(offsets, codes, values)
+        ]
+    except (struct.error, IndexError, UnicodeDecodeError, ValueError) as e:
+        raise CodecError(f"corrupt snapshot: {e}") from e
+
+    return PlayerSnapshot(
+        risk_score=risk_score,
+        risk_updated_at=risk_updated_at,
+        total_actions=total_actions,
+        total_violations=total_violations,
+        actions=actions
+    )
+
+
+def _snapshot_from_json(data: bytes) -> PlayerSnapshot:
+    """이전 하이브리드 엔진이 기록한 JSON 스냅샷 (액션은 최신순 딕셔너리 목록)"""
+    try:
+        payload = json.loads(data)
+        actions = sorted(
+            (float(a['timestamp']), str(a['action_type']), float(a.get('value') or 0.0))
+            for a in payload.get('actions', [])
+        )
+        return PlayerSnapshot(
+            risk_score=float(payload.get('risk_score', 0.0)),
+            risk_updated_at=float(payload.get('last_access', 0.0)),
+            total_actions=len(actions),
+            total_violations=len(payload.get('violations', [])),
+            actions=actions
+        )
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise CodecError(f"corrupt legacy JSON snapshot: {e}") from e
+
+
+def _pack_json(value: Any) -> bytes:
+    encoded = json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+    return _LENGTH.pack(len(encoded)) + encoded
+
+
+def _pack_short_text(text: str) -> bytes:
+    """길이 1바이트 + UTF-8 (255바이트 초과분은 문자 경계에서 잘라 디코딩 가능한 상태 유지)"""
+    encoded = text.encode("utf-8")
+    if len(encoded) > 255:
+        encoded = encoded[:255].decode("utf-8", "ignore").encode("utf-8")
+    return bytes((len(encoded),)) + encoded
+
+
+def encode_action_record(record: ActionRecord) -> bytes:
+    """
+    액션 레코드 → 바이트
+    - 헤더 19바이트 + (알 수 없는 타입명) + (메타데이터 / 세션 / 클라이언트 정보가 있을 때만)
+    - 메타데이터는 임의 구조라 압축 JSON 으로 유지 (빈 딕셔너리는 기록하지 않음)
+    """
+    flags = 0
+    numeric_value = record.value
+    if not isinstance(numeric_value, (int, float)) or isinstance(numeric_value, bool):
+        flags |= _HAS_JSON_VALUE
+        numeric_value = 0.0
+    if record.metadata:
+        flags |= _HAS_METADATA
+    if record.session_id:
+        flags |= _HAS_SESSION
+    if record.client_info:
+        flags |= _HAS_CLIENT_INFO
+
+    code = _CODE_BY_ACTION_TYPE.get(record.action_type, 0)
+    parts = [_ACTION_HEADER.pack(ACTION_RECORD_VERSION, flags, code, record.timestamp, numeric_value)]
+    if code == 0:
+        parts.append(_pack_short_text(record.action_type))
+    if flags & _HAS_SESSION:
+        parts.append(_pack_short_text(record.session_id))
+    if flags & _HAS_JSON_VALUE:
+        parts.append(_pack_json(record.value))
+    if flags & _HAS_METADATA:
+        parts.append(_pack_json(record.metadata))
+    if flags & _HAS_CLIENT_INFO:
+        parts.append(_pack_json(record.client_info))
+    return b"".join(parts)
+
+
+def decode_action_record(data: bytes) -> ActionRecord:
+    """바이트 → 액션 레코드 (이전 JSON 항목 포함)"""
+    if not data:
+        raise CodecError("empty action record")
+    if data[0] == _JSON_PREFIX:
+        return _action_record_from_json(data)
+    if data[0] != ACTION_RECORD_VERSION:
+        raise CodecError(f"unsupported action record version: {data[:1]!r}")
+
+    try:
+        _, flags, code, timestamp, value = _ACTION_HEADER.unpack_from(data)
+        position = _ACTION_HEADER.size
+
+        def read_text() -> str:
+            nonlocal position
+            length = data[position]
+            text = data[position + 1:position + 1 + length].decode("utf-8")
+            position += 1 + length
+            return text
+
+        def read_json() -> Any:
+            nonlocal position
+            (length,) = _LENGTH.unpack_from(data, position)
+            position += _LENGTH.size
+            if position + length > len(data):
+                raise CodecError("truncated action record")
+            payload = json.loads(data[position:position + length])
+            position += length
+            return payload
+
+        if code == 0:
+            action_type = read_text()
+        else:
+            action_type = ACTION_TYPE_CODES[code - 1]
+        session_id = read_text() if flags & _HAS_SESSION else None
+        if flags & _HAS_JSON_VALUE:
+            value = read_json()
+        metadata = read_json() if flags & _HAS_METADATA else {}
+        client_info = read_json() if flags & _HAS_CLIENT_INFO else None
+    except (struct.error, IndexError, UnicodeDecodeError, ValueError) as e:
+        if isinstance(e, CodecError):
+            raise
+        raise CodecError(f"corrupt action record: {e}") from e
+
+    return ActionRecord(
+        action_type=action_type,
+        timestamp=timestamp,
+        value=value,
+        metadata=metadata,
+        session_id=session_id,
+        client_info=client_info
+    )
+
+
+def _action_record_from_json(data: bytes) -> ActionRecord:
+    try:
+        payload = json.loads(data)
+        return ActionRecord(
+            action_type=str(payload['action_type']),
+            timestamp=float(payload['timestamp']),
+            value=payload.get('value'),
+            metadata=payload.get('metadata') or {},
+            session_id=payload.get('session_id'),
+            client_info=payload.get('client_info')
+        )
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise CodecError(f"corrupt legacy JSON action record: {e}") from e
@@ -0,0 +1,253 @@
+"""
+player_summary 델타 배치 버퍼
+- 액션마다 UPSERT 하는 대신 플레이어별 델타(액션 수, 위반 수, 위험도 증가분, 마지막 활동)를 메모리에 누적
+- flush_interval 마다 unnest 배열 기반 다중 행 UPSERT 한 번으로 반영 (핫 로우 잠금 경합 / WAL 감소)
+- 행 잠금 순서를 고정하기 위해 player_id 정렬 후 적재 (여러 워커 동시 flush 시 교착 방지)
+- 아직 반영되지 않은 델타(대기 + 적재 중)는 get_pending 으로 조회해 읽기 결과에 합산
+- 위험도는 risk_updated_at 시점 값으로 저장하고 읽기/쓰기 시 반감기만큼 감쇠
+- 일일 카운터는 counter_day 가 오늘(UTC)이 아니면 0 부터 다시 집계 (야간 전체 UPDATE 불필요)
+"""
+
+import asyncio
+import math
+import time
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# 일일 카운터 기준 날짜 (UTC)
+COUNTER_DAY_SQL = "(NOW() AT TIME ZONE 'UTC')::date"
+
+
+def decayed_risk_sql(half_life_param: str, table: str = "player_summary") -> str:
+    """현재 시점으로 감쇠한 위험도 식 (half_life_param: 반감기(초) 바인딩 파라미터)"""
+    # 지수는 1000 반감기로 제한 (float8 언더플로 오류 방지, 0.5^1000 은 사실상 0)
+    return (
+        f"({table}.current_risk_score * power(0.5, LEAST(GREATEST(EXTRACT(EPOCH FROM NOW() - "
+        f"COALESCE({table}.risk_updated_at, {table}.updated_at, NOW()))::float8, 0) / {half_life_param}::float8, 1000)))"
+    )
+
+
+def today_counter_sql(column: str, table: str = "player_summary") -> str:
+    """오늘 날짜 버킷의 카운터 값 (날짜가 지났으면 0)"""
+    return f"(CASE WHEN {table}.counter_day = {COUNTER_DAY_SQL} THEN {table}.{column} ELSE 0 END)"
+
+
+def half_life_seconds(half_life_hours: float) -> float:
+    """반감기 설정값(시간) → SQL 파라미터(초). 0 이하이면 감쇠 없음 (무한대)"""
+    return half_life_hours * 3600.0 if half_life_hours > 0 else math.inf
+
+
+def decay_risk(score: float, elapsed_seconds: float, half_life: float) -> float:
+    """파이썬 측 감쇠 (캐시된 값에 적용)"""
+    if elapsed_seconds <= 0 or math.isinf(half_life):
+        return score
+    return score * 0.5 ** (elapsed_seconds / half_life)
+
+
+_SUMMARY_CONFLICT_SET = f"""
+    last_activity = GREATEST(player_summary.last_activity, EXCLUDED.last_activity),
+    current_risk_score = {decayed_risk_sql("$6")} + EXCLUDED.current_risk_score,
+    risk_updated_at = NOW(),
+    total_actions_today = {today_counter_sql("total_actions_today")} + EXCLUDED.total_actions_today,
+    total_violations_today = {today_counter_sql("total_violations_today")} + EXCLUDED.total_violations_today,
+    counter_day = {COUNTER_DAY_SQL},
+    updated_at = NOW()
+"""
+
+SUMMARY_UPSERT_SQL = f"""
+INSERT INTO player_summary (
+    player_id, last_activity, current_risk_score, risk_updated_at,
+    total_actions_today, total_violations_today, counter_day, updated_at
+)
+SELECT d.player_id, d.last_activity, d.risk_delta, NOW(), d.actions, d.violations, {COUNTER_DAY_SQL}, NOW()
+FROM unnest($1::text[], $2::timestamptz[], $3::float8[], $4::int[], $5::int[])
+    AS d(player_id, last_activity, risk_delta, actions, violations)
+ON CONFLICT (player_id) DO UPDATE SET{_SUMMARY_CONFLICT_SET}"""
+
+# 액션 1건 즉시 반영 (배치 버퍼 미사용 시)
+SUMMARY_UPSERT_ONE_SQL = f"""
+INSERT INTO player_summary (
+    player_id, last_activity, current_risk_score, risk_updated_at,
+    total_actions_today, total_violations_today, counter_day, updated_at
+) VALUES ($1, $2, $3, NOW(), $4, $5, {COUNTER_DAY_SQL}, NOW())
+ON CONFLICT (player_id) DO UPDATE SET{_SUMMARY_CONFLICT_SET}"""
+
+
+@dataclass
+class SummaryDelta:
+    """플레이어 한 명의 미반영 요약 델타"""
+    actions: int = 0
+    violations: int = 0
+    risk_delta: float = 0.0
+    last_activity: Optional[datetime] = None
+
+    def merge(self, other: "SummaryDelta"):
+        self.actions += other.actions
+        self.violations += other.violations
+        self.risk_delta += other.risk_delta
+        if other.last_activity is not None and (
+            self.last_activity is None or other.last_activity > self.last_activity
+        ):
+            self.last_activity = other.last_activity
+
+
+class SummaryDeltaBuffer:
+    """
+    player_summary 델타 누적 + 주기적 다중 행 UPSERT
+    - flush_interval: flush 주기 (초)
+    - max_pending_players: 이 이상 쌓이면 즉시 flush 요청
+    - on_flushed: 반영 완료된 player_id 목록 콜백 (엔진 캐시 무효화용)
+    - risk_half_life: 위험도 반감기 (초, math.inf 이면 감쇠 없음)
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        flush_interval: float = 1.0,
+        max_pending_players: int = 50000,
+        on_flushed: Optional[Callable[[Iterable[str]], None]] = None,
+        risk_half_life: float = math.inf
+    ):
+        self.pool = pool
+        self.flush_interval = flush_interval
+        self.max_pending_players = max_pending_players
+        self.on_flushed = on_flushed
+        self.risk_half_life = risk_half_life
+
+        self._pending: Dict[str, SummaryDelta] = {}
+        self._inflight: Dict[str, SummaryDelta] = {}
+
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.deltas_added = 0
+        self.rows_flushed = 0
+        self.batches_flushed = 0
+        self.failed_batches = 0
+        self.last_batch_ms = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def add(self, player_id: str, last_activity: datetime, risk_delta: float, violations: int):
+        """액션 1건의 요약 델타 누적 (I/O 없음)"""
+        delta = self._pending.get(player_id)
+        if delta is None:
+            delta = self._pending[player_id] = SummaryDelta()
+        delta.actions += 1
+        delta.violations += violations
+        delta.risk_delta += risk_delta
+        if delta.last_activity is None or last_activity > delta.last_activity:
+            delta.last_activity = last_activity
+
+        self.deltas_added += 1
+        if len(self._pending) >= self.max_pending_players:
+            self._wakeup.set()
+
+    def get_pending(self, player_id: str) -> Optional[SummaryDelta]:
+        """DB 에 아직 반영되지 않은 델타 (대기 + 적재 중 합산)"""
+        pending = self._pending.get(player_id)
+        inflight = self._inflight.get(player_id)
+        if pending is None and inflight is None:
+            return None
+        merged = SummaryDelta()
+        for delta in (inflight, pending):
+            if delta is not None:
+                merged.merge(delta)
+        return merged
+
+    @property
+    def pending_players(self) -> int:
+        return len(self._pending)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"플레이어 요약 flush 실패: {e}")
+
+    async def flush(self):
+        """대기 중인 델타 전체를 한 번의 UPSERT 로 반영 (실패 시 다음 flush 에 재시도)"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+
+            self._inflight, self._pending = self._pending, {}
+            player_ids = sorted(self._inflight)
+            deltas = [self._inflight[p] for p in player_ids]
+            started = time.perf_counter()
+            try:
+                async with self.pool.acquire() as conn:
+                    await conn.execute(
+                        SUMMARY_UPSERT_SQL,
+                        player_ids,
+                        [d.last_activity for d in deltas],
+                        [d.risk_delta for d in deltas],
+                        [d.actions for d in deltas],
+                        [d.violations for d in deltas],
+                        self.risk_half_life
+                    )
+            except BaseException as e:
+                # 적재 실패 / 취소 시 적재 중이던 델타를 대기 델타에 다시 합쳐 유실 방지
+                self._requeue_inflight()
+                if not isinstance(e, Exception):
+                    raise
+                self.failed_batches += 1
+                logger.error(f"플레이어 요약 UPSERT 실패 ({len(player_ids)}명, 재시도 예정): {e}")
+                return
+            finally:
+                self._inflight = {}
+
+            self.batches_flushed += 1
+            self.rows_flushed += len(player_ids)
+            self.last_batch_ms = (time.perf_counter() - started) * 1000
+
+            if self.on_flushed is not None:
+                self.on_flushed(player_ids)
+
+    def _requeue_inflight(self):
+        """적재 중이던 델타를 대기 델타에 병합"""
+        for player_id, delta in self._inflight.items():
+            current = self._pending.get(player_id)
+            if current is not None:
+                delta.merge(current)
+            self._pending[player_id] = delta
+
+    async def close(self):
+        """백그라운드 태스크 중지 후 남은 델타 반영"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pending_players": len(self._pending),
+            "inflight_players": len(self._inflight),
+            "deltas_added": self.deltas_added,
+            "rows_flushed": self.rows_flushed,
+            "batches_flushed": self.batches_flushed,
+            "failed_batches": self.failed_batches,
+            "coalescing_ratio": round(self.deltas_added / self.rows_flushed, 2) if self.rows_flushed else 0.0,
+            "last_batch_ms": round(self.last_batch_ms, 2),
+            "flush_interval_ms": self.flush_interval * 1000
+        }
@@ -3,16 +3,219 @@ import asyncpg
 import time
 import json
 import logging
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
 
 from .anti_cheat import ViolationType, ViolationRecord
+from .ingest_buffer import ActionIngestBuffer, ActionRecord
+from .rate_counter import RedisRateCounter
+from .summary_buffer import (
+    SUMMARY_UPSERT_ONE_SQL, SummaryDeltaBuffer, decay_risk, decayed_risk_sql, half_life_seconds
+)
+from .cache import LRUTTLCache
+from .admission import REASON_TIMEOUT, PoolAdmissionController, PoolSaturatedError
+from .detector_scheduler import DetectorCadence, DetectorPlan, DetectorScheduler
+from .hot_window import HotWindowCache, TIMING_WINDOW_SECONDS, rows_to_window_input
 from ..models.timescale_models import PlayerActionTimeseries, ViolationTimeseries, PlayerSummary
 
 logger = logging.getLogger(__name__)
 
+# 스케줄러로 주기를 조절하는 탐지기 이름
+DETECTOR_TIMING = "timing"
+DETECTOR_SEQUENCE = "sequence"
+DETECTOR_ACTIVITY = "activity"
+SWEEP_CAPABLE_DETECTORS = {DETECTOR_ACTIVITY}
+
+# 커넥션 풀 포화 시 동작: 인메모리 탐지로 강등 / 503 거절
+OVERLOAD_DEGRADE = "degrade"
+OVERLOAD_REJECT = "reject"
+
+# 빈도/이상치/활동 탐지는 연속 집계뷰(action_stats_1min, player_activity_1hour)의 버킷을 읽는다
+# - 두 뷰 모두 real-time 집계(materialized_only = false)라 미구체화 구간은 원시 데이터로 자동 보충
+# - 헤비 플레이어도 버킷 수(최대 61개 / 25개)만 읽으므로 쿼리 비용이 원시 행 수와 무관
+# - 1분 빈도는 현재 버킷 + 직전 버킷 가중합으로 슬라이딩 윈도우를 근사
+#   (직전 버킷 가중치 = 현재 분에서 남은 비율)
+_RATE_WEIGHT_SQL = """
+    SELECT
+        time_bucket('1 minute', NOW()) AS current_bucket,
+        (1 - EXTRACT(EPOCH FROM (NOW() - time_bucket('1 minute', NOW()))) / 60.0)::float8 AS prev_weight
+"""
+
+# 모든 탐지기 입력을 한 번에 조회하는 단일 라운드트립 쿼리 (결과는 항상 1행, 임계값 판정은 Python)
+# - $1 player_id, $2 action_type
+# - new_rows: 아직 테이블 스냅샷에 보이지 않는 이번 액션(들). 각 탐지 윈도우에 UNION ALL 로 합쳐
+#   기존 "저장 후 조회"와 같은 결과를 만든다
+_RATE_ANOMALY_CTES = """
+minute_buckets AS (
+    SELECT bucket, action_count, total_value, positive_count, positive_sum, positive_sum_sq
+    FROM action_stats_1min
+    WHERE player_id = $1
+        AND action_type = $2
+        AND bucket >= time_bucket('1 minute', NOW() - INTERVAL '1 hour')
+    UNION ALL
+    SELECT
+        time_bucket('1 minute', time),
+        1,
+        value,
+        CASE WHEN value > 0 THEN 1 ELSE 0 END,
+        CASE WHEN value > 0 THEN value ELSE 0 END,
+        CASE WHEN value > 0 THEN value * value ELSE 0 END
+    FROM new_rows
+    WHERE action_type = $2
+),
+rate_window AS (""" + _RATE_WEIGHT_SQL + """),
+rate AS (
+    SELECT
+        COALESCE(SUM(CASE WHEN b.bucket = w.current_bucket THEN b.action_count
+                          ELSE b.action_count * w.prev_weight END), 0)::float8 AS rate_count,
+        COALESCE(SUM(CASE WHEN b.bucket = w.current_bucket THEN b.total_value
+                          ELSE b.total_value * w.prev_weight END), 0)::float8 AS rate_total_value
+    FROM rate_window w
+    LEFT JOIN minute_buckets b ON b.bucket >= w.current_bucket - INTERVAL '1 minute'
+),
+anomaly AS (
+    SELECT
+        COALESCE(SUM(positive_count), 0)::bigint AS anomaly_sample_count,
+        (SUM(positive_sum) / NULLIF(SUM(positive_count), 0))::float8 AS anomaly_mean_value,
+        CASE WHEN SUM(positive_count) > 1 THEN
+            SQRT(GREATEST(
+                (SUM(positive_sum_sq) - SUM(positive_sum) ^ 2 / SUM(positive_count)) / (SUM(positive_count) - 1),
+                0
+            ))::float8
+        END AS anomaly_std_value
+    FROM minute_buckets
+),
+"""
+
+# 단기 구간(20~30분) 타이밍/시퀀스 탐지 - 핫 윈도우 캐시가 있으면 메모리에서 계산하므로 생략
+_SHORT_WINDOW_CTES = """
+same_type AS (
+    SELECT time
+    FROM player_actions_ts
+    WHERE player_id = $1
+        AND action_type = $2
+        AND time >= NOW() - INTERVAL '30 minutes'
+    UNION ALL
+    SELECT time FROM new_rows
+    WHERE action_type = $2
+        AND time >= NOW() - INTERVAL '30 minutes'
+),
+action_intervals AS (
+    SELECT EXTRACT(EPOCH FROM (time - LAG(time) OVER (ORDER BY time))) AS interval_seconds
+    FROM same_type
+),
+timing AS (
+    SELECT
+        COUNT(*) AS interval_count,
+        COALESCE(STDDEV(interval_seconds), 0) AS timing_variance,
+        AVG(interval_seconds) AS avg_interval
+    FROM action_intervals
+    WHERE interval_seconds IS NOT NULL
+        AND interval_seconds BETWEEN 0.1 AND 300
+),
+sequence_actions AS (
+    SELECT action_type,
+           LAG(action_type, 1) OVER (ORDER BY time) AS prev1,
+           LAG(action_type, 2) OVER (ORDER BY time) AS prev2
+    FROM (
+        SELECT time, action_type
+        FROM player_actions_ts
+        WHERE player_id = $1
+            AND time >= NOW() - INTERVAL '20 minutes'
+        UNION ALL
+        SELECT time, action_type FROM new_rows
+        WHERE time >= NOW() - INTERVAL '20 minutes'
+    ) recent
+),
+top_pattern AS (
+    SELECT CONCAT(prev2, '-', prev1, '-', action_type) AS pattern, COUNT(*) AS pattern_count
+    FROM sequence_actions
+    WHERE prev2 IS NOT NULL
+    GROUP BY 1
+    ORDER BY pattern_count DESC
+    LIMIT 1
+),
+"""
+
+_ACTIVITY_CTE = """
+activity AS (
+    SELECT COUNT(DISTINCT bucket) AS active_hours
+    FROM (
+        SELECT bucket
+        FROM player_activity_1hour
+        WHERE player_id = $1
+            AND bucket >= time_bucket('1 hour', NOW() - INTERVAL '24 hours')
+        UNION ALL
+        SELECT time_bucket('1 hour', time) FROM new_rows
+    ) active
+),
+"""
+
+
+# 직접 저장 모드: 데이터 변경 CTE 로 저장하고 RETURNING 결과를 new_rows 로 사용
+# ($3 time, $4 value, $5 metadata)
+_INSERTED_NEW_ROWS = """
+WITH new_rows AS (
+    INSERT INTO player_actions_ts (time, player_id, action_type, value, metadata, interval_sec)
+    VALUES ($3, $1, $2, $4, $5, $6)
+    RETURNING time, action_type, value
+),
+"""
+
+# 배치 적재 모드: 적재 버퍼의 미저장 행(오버레이)을 배열로 전달
+# ($3 times[], $4 action_types[], $5 values[]) - 이미 COPY 된 행은 (player_id, time) 으로 중복 제거
+_BUFFERED_NEW_ROWS = """
+WITH new_rows AS (
+    SELECT p.time, p.action_type, p.value
+    FROM unnest($3::timestamptz[], $4::text[], $5::float8[]) AS p(time, action_type, value)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM player_actions_ts a
+        WHERE a.player_id = $1 AND a.time = p.time
+    )
+),
+"""
+
+
+@lru_cache(maxsize=None)
+def detection_sql(buffered: bool, short_windows: bool, activity: bool) -> str:
+    """
+    단일 라운드트립 탐지 쿼리 조합
+    - buffered: 배치 적재 오버레이(True) / CTE 내 직접 INSERT(False)
+    - short_windows: 타이밍/시퀀스 CTE 포함 여부 (핫 윈도우 사용 시 또는 스케줄상 생략 시 제외)
+    - activity: 24시간 활동 CTE 포함 여부 (스케줄상 생략 시 제외)
+    빈도/이상치는 항상 포함
+    """
+    ctes = _RATE_ANOMALY_CTES
+    columns = [
+        "rate.rate_count", "rate.rate_total_value",
+        "anomaly.anomaly_sample_count", "anomaly.anomaly_mean_value", "anomaly.anomaly_std_value"
+    ]
+    joins = ["FROM rate", "CROSS JOIN anomaly"]
+
+    if short_windows:
+        ctes += _SHORT_WINDOW_CTES
+        columns += [
+            "timing.interval_count", "timing.timing_variance", "timing.avg_interval",
+            "top_pattern.pattern", "top_pattern.pattern_count"
+        ]
+        joins.append("CROSS JOIN timing")
+    if activity:
+        ctes += _ACTIVITY_CTE
+        columns.append("activity.active_hours")
+        joins.append("CROSS JOIN activity")
+    if short_windows:
+        joins.append("LEFT JOIN top_pattern ON TRUE")
+
+    # 마지막 CTE 뒤의 쉼표 제거
+    ctes = ctes.rstrip().rstrip(",")
+    new_rows = _BUFFERED_NEW_ROWS if buffered else _INSERTED_NEW_ROWS
+    return new_rows + ctes + "\nSELECT\n    " + ",\n    ".join(columns) + "\n" + "\n".join(joins) + "\n"
+
+
 @dataclass
 class PlayerAction:
     player_id: str
@@ -29,11 +232,97 @@ class TimescaleAntiCheatEngine:
     - 실시간 SQL 집계 쿼리 기반 탐지
     """
     
-    def __init__(self, db_url: str, redis_client=None):
+    def __init__(
+        self,
+        db_url: str,
+        redis_client=None,
+        combined_detection: bool = True,
+        ingest_batching: bool = True,
+        ingest_batch_rows: int = 1000,
+        ingest_flush_interval: float = 0.01,
+        hot_window_enabled: bool = True,
+        hot_window_max_actions: int = 512,
+        hot_window_memory_bytes: int = 64 * 1024 * 1024,
+        redis_rate_counters: bool = False,
+        summary_batching: bool = True,
+        summary_flush_interval: float = 1.0,
+        risk_half_life_hours: float = 24.0,
+        detector_cadences: Optional[Dict[str, DetectorCadence]] = None,
+        detector_sweep_interval: float = 60.0,
+        pool_min_size: int = 10,
+        pool_max_size: int = 50,
+        command_timeout: float = 60.0,
+        admission_max_waiters: int = 200,
+        admission_timeout: float = 0.2,
+        request_timeout: Optional[float] = None,
+        overload_mode: str = OVERLOAD_DEGRADE,
+        overload_retry_after: float = 1.0
+    ):
         self.db_url = db_url
         self.redis = redis_client
         self.connection_pool = None
         
+        # 커넥션 풀 크기 및 진입 제어 (대기열 길이 / 요청별 대기 기한)
+        if overload_mode not in (OVERLOAD_DEGRADE, OVERLOAD_REJECT):
+            raise ValueError(f"unknown overload_mode: {overload_mode}")
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.command_timeout = command_timeout
+        self.admission_max_waiters = admission_max_waiters
+        self.admission_timeout = admission_timeout
+        self.request_timeout = request_timeout
+        self.overload_mode = overload_mode
+        self.overload_retry_after = overload_retry_after
+        self.admission: Optional[PoolAdmissionController] = None
+        self.degraded_actions = 0
+        self.degraded_unsaved_violations = 0
+        
+        # True: 저장 + 탐지를 단일 쿼리로 처리 / False: 탐지기별 개별 쿼리 (비교·디버깅용)
+        self.combined_detection = combined_detection
+        
+        # COPY 기반 마이크로 배치 적재 (단일 쿼리 경로에서만 사용)
+        self.ingest_batching = ingest_batching
+        self.ingest_batch_rows = ingest_batch_rows
+        self.ingest_flush_interval = ingest_flush_interval
+        self.ingest_buffer: Optional[ActionIngestBuffer] = None
+        
+        # player_summary 델타 배치 UPSERT (액션마다 UPSERT 하는 대신 주기적으로 한 번에 반영)
+        self.summary_batching = summary_batching
+        self.summary_flush_interval = summary_flush_interval
+        self.summary_buffer: Optional[SummaryDeltaBuffer] = None
+        
+        # 위험도 반감기 (초, 0 이하 설정은 감쇠 없음)
+        self.risk_half_life = half_life_seconds(risk_half_life_hours)
+        
+        # 탐지기별 실행 주기 (None 이면 모든 탐지기를 매 액션 실행)
+        self.detector_scheduler: Optional[DetectorScheduler] = None
+        self._sweep_task: Optional[asyncio.Task] = None
+        if detector_cadences:
+            unsupported = [
+                name for name, cadence in detector_cadences.items()
+                if cadence.sweep and name not in SWEEP_CAPABLE_DETECTORS
+            ]
+            if unsupported:
+                raise ValueError(f"sweep cadence is not supported for detectors: {unsupported}")
+            self.detector_scheduler = DetectorScheduler(
+                detector_cadences,
+                per_action_type={DETECTOR_TIMING},
+                sweep_interval=detector_sweep_interval
+            )
+        
+        # Redis 1분 빈도 카운터 (빈도 제한을 Postgres 없이 판정, 실패 시 SQL 폴백)
+        self.rate_counter: Optional[RedisRateCounter] = None
+        if redis_rate_counters and redis_client is not None:
+            self.rate_counter = RedisRateCounter(redis_client)
+        
+        # 활성 플레이어 최근 액션 캐시 (타이밍/시퀀스 탐지를 메모리에서 처리)
+        self.hot_window: Optional[HotWindowCache] = None
+        if hot_window_enabled:
+            self.hot_window = HotWindowCache(
+                max_actions_per_player=hot_window_max_actions,
+                memory_budget_bytes=hot_window_memory_bytes
+            )
+        
         # 기본 설정
         self.rate_limits = {
             "reward_collection": {"max_per_minute": 10, "max_value_per_minute": 1000},
@@ -49,252 +338,595 @@ class TimescaleAntiCheatEngine:
         self.bot_timing_threshold = 0.05  # 5% 분산 이하면 봇 의심
         self.auto_ban_threshold = 8.0
         
-        # 소량 캐시 (최근 활성 플레이어 요약 정보만)
-        self.player_cache = {}  # 최대 1만명
-        self.max_cache_size = 10000
+        # 소량 캐시 (최근 활성 플레이어 위험도, 조회 시각과 함께 저장해 읽을 때 감쇠)
+        self.player_cache: LRUTTLCache[str, Tuple[float, float]] = LRUTTLCache(
+            max_size=10000, ttl_seconds=300, name="timescale.player_risk"
+        )
     
     async def init_connection_pool(self):
         """비동기 DB 연결 풀 초기화"""
         self.connection_pool = await asyncpg.create_pool(
             self.db_url,
-            min_size=10,
-            max_size=50,
-            command_timeout=60
+            min_size=self.pool_min_size,
+            max_size=self.pool_max_size,
+            command_timeout=self.command_timeout
         )
+        self.admission = PoolAdmissionController(
+            self.connection_pool,
+            max_waiters=self.admission_max_waiters,
+            acquire_timeout=self.admission_timeout,
+            retry_after=self.overload_retry_after,
+            request_timeout=self.request_timeout
+        )
+        
+        if self.combined_detection and self.ingest_batching:
+            self.ingest_buffer = ActionIngestBuffer(
+                self.connection_pool,
+                max_batch_rows=self.ingest_batch_rows,
+                flush_interval=self.ingest_flush_interval
+            )
+            self.ingest_buffer.start()
+        
+        if self.summary_batching:
+            self.summary_buffer = SummaryDeltaBuffer(
+                self.connection_pool,
+                flush_interval=self.summary_flush_interval,
+                risk_half_life=self.risk_half_life,
+                on_flushed=self._invalidate_cached_players
+            )
+            self.summary_buffer.start()
+        
+        if self.detector_scheduler is not None and self.detector_scheduler.sweep_detectors:
+            self._sweep_task = asyncio.create_task(self._detector_sweep_loop())
+        
         logger.info("TimescaleDB 연결 풀 초기화 완료")
     
     async def analyze_action(self, action: PlayerAction) -> List[ViolationRecord]:
-        """대용량 실시간 액션 분석"""
+        """
+        대용량 실시간 액션 분석
+        커넥션 풀 포화 시: degrade 모드는 인메모리 탐지로 처리, reject 모드는 PoolSaturatedError 전파
+        """
         violations = []
         
         try:
-            async with self.connection_pool.acquire() as conn:
-                # 1. 액션 저장 (비동기)
-                await self._store_action_async(conn, action)
+            # 빈도 제한은 Redis 카운터로 먼저 판정 (None 이면 SQL 집계 사용)
+            rate = await self._record_rate(action)
+            
+            try:
+                async with self.admission.acquire() as conn:
+                    # 0. 핫 윈도우 준비 (미스 시 이번 액션 저장 전에 DB 에서 로드) 후 이번 액션 반영
+                    in_memory = await self._prepare_hot_window(conn, action)
+                
+                    if self.combined_detection:
+                        # 1+2. 액션 저장과 모든 탐지기 입력 조회를 단일 라운드트립으로 처리
+                        violations.extend(await self._detect_combined_sql(conn, action, in_memory, rate))
+                    else:
+                        # 1. 액션 저장 (비동기)
+                        await self._store_action_async(conn, action)
+                    
+                        # 2. 실시간 치팅 탐지 (SQL 집계)
+                        if rate is not None:
+                            violations.extend(self._evaluate_rate_limits(action, *rate))
+                        else:
+                            violations.extend(await self._check_rate_limits_sql(conn, action))
+                        violations.extend(await self._detect_anomalies_sql(conn, action))
+                        violations.extend(await self._detect_bot_behavior_sql(conn, action, in_memory))
                 
-                # 2. 실시간 치팅 탐지 (SQL 집계)
-                violations.extend(await self._check_rate_limits_sql(conn, action))
-                violations.extend(await self._detect_anomalies_sql(conn, action))
-                violations.extend(await self._detect_bot_behavior_sql(conn, action))
+                    # 3. 위반 사항 저장
+                    if violations:
+                        await self._store_violations_async(conn, violations)
                 
-                # 3. 위반 사항 저장
-                if violations:
-                    await self._store_violations_async(conn, violations)
+                    # 4. 플레이어 요약 정보 업데이트
+                    await self._update_player_summary(conn, action, violations)
                 
-                # 4. 플레이어 요약 정보 업데이트
-                await self._update_player_summary(conn, action, violations)
+                    # 5. 위험도가 바뀌었으면 캐시 무효화 + 탐지 주기 축소
+                    if violations:
+                        self._invalidate_cached_players([action.player_id])
+                        if self.detector_scheduler is not None:
+                            self.detector_scheduler.note_violations(
+                                action.player_id, sum(v.severity for v in violations)
+                            )
                 
+            except PoolSaturatedError:
+                if self.overload_mode == OVERLOAD_REJECT:
+                    raise
+                violations = await self._analyze_in_memory(action, rate)
+                
+        except PoolSaturatedError:
+            raise
+        except asyncio.TimeoutError:
+            # 요청 기한 초과 (쿼리는 취소됨, 통계는 admission.deadline_exceeded)
+            logger.warning(f"액션 분석 기한 초과 (player={action.player_id})")
         except Exception as e:
             logger.error(f"액션 분석 중 오류: {e}")
             
         return violations
     
-    async def _store_action_async(self, conn: asyncpg.Connection, action: PlayerAction):
-        """액션을 TimescaleDB에 고속 저장"""
-        await conn.execute("""
-            INSERT INTO player_actions_ts (time, player_id, action_type, value, metadata)
-            VALUES ($1, $2, $3, $4, $5)
-        """, 
+    async def _analyze_in_memory(self, action: PlayerAction,
+                                 rate: Optional[Tuple[int, float]]) -> List[ViolationRecord]:
+        """
+        풀 포화 시 강등 경로 (커넥션 없이 처리)
+        - Redis 빈도 카운터 / 이미 로드된 핫 윈도우로만 탐지
+        - 액션과 요약 델타는 버퍼에 적재 (버퍼가 없으면 저장 생략), 위반 기록은 저장하지 않고 집계만
+        """
+        self.degraded_actions += 1
+        violations = []
+        if rate is not None:
+            violations.extend(self._evaluate_rate_limits(action, *rate))
+        
+        if self.hot_window is not None and action.player_id in self.hot_window:
+            self.hot_window.record(action.player_id, action.timestamp, action.action_type)
+            timing, sequence = self._short_window_in_memory(action, True, True)
+            if timing is not None:
+                violations.extend(self._evaluate_timing(action, *timing))
+            if sequence is not None:
+                violations.extend(self._evaluate_sequence(action, *sequence))
+        
+        if self.ingest_buffer is not None:
+            await self.ingest_buffer.add(self._to_record(action))
+        if self.summary_buffer is not None:
+            self.summary_buffer.add(
+                action.player_id,
+                datetime.fromtimestamp(action.timestamp),
+                sum(v.severity for v in violations),
+                len(violations)
+            )
+        
+        if violations:
+            self.degraded_unsaved_violations += len(violations)
+            self._invalidate_cached_players([action.player_id])
+            if self.detector_scheduler is not None:
+                self.detector_scheduler.note_violations(action.player_id, sum(v.severity for v in violations))
+        return violations
+    
+    async def _record_rate(self, action: PlayerAction) -> Optional[Tuple[int, float]]:
+        """Redis 카운터에 액션 반영 후 1분 (횟수, 값 합계). 카운터 미사용/장애 시 None"""
+        if self.rate_counter is None or action.action_type not in self.rate_limits:
+            return None
+        return await self.rate_counter.record(
+            action.player_id, action.action_type, action.timestamp, action.value
+        )
+    
+    async def _prepare_hot_window(self, conn: asyncpg.Connection, action: PlayerAction) -> bool:
+        """핫 윈도우 사용 가능 여부 (로드 실패 시 타이밍/시퀀스는 SQL 로 계산)"""
+        if self.hot_window is None:
+            return False
+        
+        ready = await self.hot_window.ensure(
+            action.player_id,
+            lambda: self._load_hot_window(conn, action.player_id)
+        )
+        if not ready:
+            return False
+        self.hot_window.record(action.player_id, action.timestamp, action.action_type)
+        # 30분 안에 상한을 넘긴 플레이어는 윈도우가 잘려 있으므로 SQL 로 계산
+        window = self.hot_window.get(action.player_id)
+        if window is None or not window.complete_since(time.time() - TIMING_WINDOW_SECONDS):
+            self.hot_window.truncated_fallbacks += 1
+            return False
+        return True
+    
+    async def _load_hot_window(self, conn: asyncpg.Connection, player_id: str) -> List[Tuple[float, str]]:
+        """
+        최근 30분 액션 로드 (DB + 배치 버퍼의 미저장 행)
+        상한보다 1개 더 조회해 구간이 잘렸는지 윈도우가 알 수 있게 함 (PlayerWindow.dropped_until)
+        """
+        # 조회 중 flush 되는 행을 놓치지 않도록 조회 전후 오버레이를 모두 포함
+        before = self.ingest_buffer.get_pending(player_id) if self.ingest_buffer else []
+        rows = await conn.fetch("""
+            SELECT time, action_type
+            FROM player_actions_ts
+            WHERE player_id = $1
+                AND time >= NOW() - make_interval(secs => $2)
+            ORDER BY time DESC
+            LIMIT $3
+        """, player_id, float(TIMING_WINDOW_SECONDS), self.hot_window.max_actions_per_player + 1)
+        after = self.ingest_buffer.get_pending(player_id) if self.ingest_buffer else []
+        
+        # 같은 시각의 서로 다른 액션은 모두 유지하고, 여러 출처에 겹쳐 있는 행(조회 중 flush)은 한 번만 계산
+        merged = Counter(rows_to_window_input(rows))
+        for pending in (before, after):
+            merged |= Counter((pending_time.timestamp(), action_type) for pending_time, action_type, _ in pending)
+        return list(merged.elements())
+    
+    async def _detect_combined_sql(self, conn: asyncpg.Connection, action: PlayerAction,
+                                   in_memory: bool = False,
+                                   rate: Optional[Tuple[int, float]] = None) -> List[ViolationRecord]:
+        """액션 저장 + 전체 탐지기 입력을 한 행으로 조회 후 임계값 판정"""
+        record = self._to_record(action)
+        plan = self._plan_detectors(action)
+        need_timing, need_sequence, need_activity = self._due_detectors(plan, action)
+        
+        # 핫 윈도우가 있으면 타이밍/시퀀스는 메모리에서, 스케줄상 생략되는 탐지기는 쿼리에서 제외
+        sql_short_windows = not in_memory and (need_timing or need_sequence)
+        sql = detection_sql(self.ingest_buffer is not None, sql_short_windows, need_activity)
+        
+        if self.ingest_buffer is not None:
+            # 저장은 배치 버퍼에 맡기고, 미저장 행은 오버레이로 탐지 쿼리에 전달
+            await self.ingest_buffer.add(record)
+            pending = self.ingest_buffer.get_pending(action.player_id)
+            row = await conn.fetchrow(
+                sql,
+                action.player_id,
+                action.action_type,
+                [p[0] for p in pending],
+                [p[1] for p in pending],
+                [p[2] for p in pending]
+            )
+        else:
+            row = await conn.fetchrow(
+                sql,
+                action.player_id,
+                action.action_type,
+                record[0],
+                action.value,
+                record[4],
+                record[5]
+            )
+        
+        violations = []
+        if rate is not None:
+            violations.extend(self._evaluate_rate_limits(action, *rate))
+        else:
+            # 슬라이딩 윈도우 근사값이므로 빈도는 정수로 반올림
+            violations.extend(self._evaluate_rate_limits(
+                action, int(round(row['rate_count'])), row['rate_total_value']
+            ))
+        violations.extend(self._evaluate_anomaly(
+            action, row['anomaly_sample_count'], row['anomaly_mean_value'], row['anomaly_std_value']
+        ))
+        
+        timing = sequence = None
+        if sql_short_windows:
+            timing = (row['interval_count'], row['timing_variance'], row['avg_interval'])
+            sequence = (row['pattern'], row['pattern_count'])
+        elif in_memory:
+            timing, sequence = self._short_window_in_memory(action, need_timing, need_sequence)
+        active_hours = row['active_hours'] if need_activity else None
+        
+        violations.extend(self._evaluate_scheduled(plan, action, timing, sequence, active_hours))
+        return violations
+    
+    # ===== 탐지기 스케줄 =====
+    
+    def _plan_detectors(self, action: PlayerAction) -> DetectorPlan:
+        if self.detector_scheduler is None:
+            return DetectorPlan.always()
+        return self.detector_scheduler.plan(action.player_id, action.action_type)
+    
+    async def _detector_sweep_loop(self):
+        """스윕 주기 탐지기를 최근 활동 플레이어 대상으로 일괄 계산"""
+        scheduler = self.detector_scheduler
+        while True:
+            await asyncio.sleep(scheduler.sweep_interval)
+            try:
+                await self.run_detector_sweep()
+            except Exception as e:
+                logger.error(f"탐지기 스윕 실패: {e}")
+    
+    async def run_detector_sweep(self):
+        """마지막 스윕 이후 활동한 플레이어의 24시간 활동 시간 일괄 조회"""
+        scheduler = self.detector_scheduler
+        players = scheduler.take_sweep_candidates()
+        if not players or DETECTOR_ACTIVITY not in scheduler.sweep_detectors:
+            return
+        
+        async with self.connection_pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT player_id, COUNT(DISTINCT bucket) AS active_hours
+                FROM player_activity_1hour
+                WHERE player_id = ANY($1::text[])
+                    AND bucket >= time_bucket('1 hour', NOW() - INTERVAL '24 hours')
+                GROUP BY player_id
+            """, players)
+        scheduler.store_sweep_results(
+            DETECTOR_ACTIVITY,
+            {row['player_id']: row['active_hours'] for row in rows},
+            players,
+            default=0
+        )
+    
+    @staticmethod
+    def _due_detectors(plan: DetectorPlan, action: PlayerAction) -> Tuple[bool, bool, bool]:
+        """(timing, sequence, activity) 실행 여부 (타이밍 주기는 액션 타입별)"""
+        return plan.due(DETECTOR_TIMING), plan.due(DETECTOR_SEQUENCE), plan.due(DETECTOR_ACTIVITY)
+    
+    def _evaluate_scheduled(self, plan: DetectorPlan, action: PlayerAction,
+                            timing: Optional[Tuple], sequence: Optional[Tuple],
+                            active_hours: Optional[int]) -> List[ViolationRecord]:
+        """
+        이번에 계산한 입력만 임계값 판정 (생략한 탐지기는 판정하지 않아 같은 위반을 반복 기록하지 않음)
+        스윕으로 계산된 활동 시간은 다음 액션에서 한 번 판정
+        """
+        if timing is not None:
+            plan.ran(DETECTOR_TIMING)
+        if sequence is not None:
+            plan.ran(DETECTOR_SEQUENCE)
+        if active_hours is not None:
+            plan.ran(DETECTOR_ACTIVITY)
+        else:
+            active_hours = plan.take_sweep_result(DETECTOR_ACTIVITY)
+        
+        violations = []
+        if timing is not None:
+            violations.extend(self._evaluate_timing(action, *timing))
+        if sequence is not None:
+            violations.extend(self._evaluate_sequence(action, *sequence))
+        if active_hours is not None:
+            violations.extend(self._evaluate_activity(action, active_hours))
+        return violations
+    
+    def _short_window_in_memory(self, action: PlayerAction, need_timing: bool,
+                                need_sequence: bool) -> Tuple[Optional[Tuple], Optional[Tuple]]:
+        """핫 윈도우로 완벽한 타이밍 / 반복 시퀀스 입력 계산 (DB 조회 없음)"""
+        window = self.hot_window.get(action.player_id)
+        if window is None:
+            return None, None
+        
+        now = time.time()
+        timing = window.timing_stats(action.action_type, now) if need_timing else None
+        sequence = window.top_sequence(now) if need_sequence else None
+        return timing, sequence
+    
+    def _to_record(self, action: PlayerAction) -> ActionRecord:
+        """player_actions_ts 행 튜플 (COPY / INSERT 공용, 액션당 한 번만 호출)"""
+        return (
             datetime.fromtimestamp(action.timestamp),
             action.player_id,
-            action.action_type, 
+            action.action_type,
             action.value,
-            json.dumps(action.metadata) if action.metadata else None
+            json.dumps(action.metadata) if action.metadata else None,
+            None  # interval_sec: 적재 시 DB 트리거가 계산 (여러 서버 프로세스가 같은 플레이어를 적재해도 일관)
         )
     
+    async def _store_action_async(self, conn: asyncpg.Connection, action: PlayerAction):
+        """액션을 TimescaleDB에 고속 저장 (개별 쿼리 경로 - 항상 직접 INSERT)"""
+        await conn.execute("""
+            INSERT INTO player_actions_ts (time, player_id, action_type, value, metadata, interval_sec)
+            VALUES ($1, $2, $3, $4, $5, $6)
+        """, *self._to_record(action))
+    
     async def _check_rate_limits_sql(self, conn: asyncpg.Connection, action: PlayerAction) -> List[ViolationRecord]:
         """SQL 집계로 속도 제한 검사 - 초고속"""
-        violations = []
-        
         if action.action_type not in self.rate_limits:
-            return violations
+            return []
         
-        limits = self.rate_limits[action.action_type]
-        
-        # 1분간 액션 횟수와 총합을 한 번의 쿼리로 조회
+        # 1분 빈도/총합 (연속 집계뷰의 현재 + 직전 버킷 가중합)
         result = await conn.fetchrow("""
+            WITH rate_window AS (""" + _RATE_WEIGHT_SQL + """)
+            SELECT 
+                COALESCE(SUM(CASE WHEN b.bucket = w.current_bucket THEN b.action_count
+                                  ELSE b.action_count * w.prev_weight END), 0)::float8 as action_count,
+                COALESCE(SUM(CASE WHEN b.bucket = w.current_bucket THEN b.total_value
+                                  ELSE b.total_value * w.prev_weight END), 0)::float8 as total_value
+            FROM rate_window w
+            LEFT JOIN action_stats_1min b
+                ON b.player_id = $1
+                AND b.action_type = $2
+                AND b.bucket >= w.current_bucket - INTERVAL '1 minute'
+        """, action.player_id, action.action_type)
+        
+        return self._evaluate_rate_limits(action, int(round(result['action_count'])), result['total_value'])
+    
+    async def _detect_anomalies_sql(self, conn: asyncpg.Connection, action: PlayerAction) -> List[ViolationRecord]:
+        """SQL 기반 통계적 이상치 탐지"""
+        if action.value <= 0:
+            return []
+        
+        # 최근 1시간 동안의 같은 액션 타입 통계 (1분 버킷의 양수 값 개수/합/제곱합으로 계산)
+        stats = await conn.fetchrow("""
             SELECT 
-                COUNT(*) as action_count,
-                COALESCE(SUM(value), 0) as total_value
-            FROM player_actions_ts 
+                COALESCE(SUM(positive_count), 0)::bigint as sample_count,
+                (SUM(positive_sum) / NULLIF(SUM(positive_count), 0))::float8 as mean_value,
+                CASE WHEN SUM(positive_count) > 1 THEN
+                    SQRT(GREATEST(
+                        (SUM(positive_sum_sq) - SUM(positive_sum) ^ 2 / SUM(positive_count)) / (SUM(positive_count) - 1),
+                        0
+                    ))::float8
+                END as std_value
+            FROM action_stats_1min
             WHERE player_id = $1 
                 AND action_type = $2 
-                AND time >= NOW() - INTERVAL '1 minute'
+                AND bucket >= time_bucket('1 minute', NOW() - INTERVAL '1 hour')
         """, action.player_id, action.action_type)
         
+        return self._evaluate_anomaly(action, stats['sample_count'], stats['mean_value'], stats['std_value'])
+    
+    async def _detect_bot_behavior_sql(self, conn: asyncpg.Connection, action: PlayerAction,
+                                       in_memory: bool = False) -> List[ViolationRecord]:
+        """SQL 기반 봇 행동 패턴 탐지 (스케줄상 생략되는 탐지기는 판정 생략)"""
+        plan = self._plan_detectors(action)
+        need_timing, need_sequence, need_activity = self._due_detectors(plan, action)
+        
+        # 1+2. 타이밍 / 시퀀스 (핫 윈도우가 있으면 메모리에서 계산)
+        if in_memory:
+            timing, sequence = self._short_window_in_memory(action, need_timing, need_sequence)
+        else:
+            timing, sequence = await self._short_window_sql(conn, action, need_timing, need_sequence)
+        
+        # 3. 24시간 연속 활동 탐지 (1시간 연속 집계뷰)
+        active_hours = None
+        if need_activity:
+            active_hours = await conn.fetchval("""
+                SELECT COUNT(DISTINCT bucket) as active_hours
+                FROM player_activity_1hour
+                WHERE player_id = $1 
+                    AND bucket >= time_bucket('1 hour', NOW() - INTERVAL '24 hours')
+            """, action.player_id)
+        
+        return self._evaluate_scheduled(plan, action, timing, sequence, active_hours)
+    
+    async def _short_window_sql(self, conn: asyncpg.Connection, action: PlayerAction,
+                                need_timing: bool = True,
+                                need_sequence: bool = True) -> Tuple[Optional[Tuple], Optional[Tuple]]:
+        """SQL 기반 완벽한 타이밍 / 반복 시퀀스 입력 조회"""
+        timing = sequence = None
+        
+        # 1. 완벽한 타이밍 간격 탐지 (Window Function 사용)
+        if need_timing:
+            timing_stats = await conn.fetchrow("""
+                WITH action_intervals AS (
+                    SELECT 
+                        EXTRACT(EPOCH FROM (time - LAG(time) OVER (ORDER BY time))) as interval_seconds
+                    FROM player_actions_ts
+                    WHERE player_id = $1 
+                        AND action_type = $2
+                        AND time >= NOW() - INTERVAL '30 minutes'
+                    ORDER BY time
+                )
+                SELECT 
+                    COUNT(*) as interval_count,
+                    COALESCE(STDDEV(interval_seconds), 0) as timing_variance,
+                    AVG(interval_seconds) as avg_interval
+                FROM action_intervals
+                WHERE interval_seconds IS NOT NULL 
+                    AND interval_seconds BETWEEN 0.1 AND 300
+            """, action.player_id, action.action_type)
+            timing = (timing_stats['interval_count'], timing_stats['timing_variance'], timing_stats['avg_interval'])
+        
+        # 2. 반복 시퀀스 패턴 탐지
+        if need_sequence:
+            sequence_stats = await conn.fetchrow("""
+                WITH recent_actions AS (
+                    SELECT action_type,
+                           LAG(action_type, 1) OVER (ORDER BY time) as prev1,
+                           LAG(action_type, 2) OVER (ORDER BY time) as prev2
+                    FROM player_actions_ts
+                    WHERE player_id = $1 
+                        AND time >= NOW() - INTERVAL '20 minutes'
+                    ORDER BY time
+                ),
+                patterns AS (
+                    SELECT CONCAT(prev2, '-', prev1, '-', action_type) as pattern
+                    FROM recent_actions
+                    WHERE prev2 IS NOT NULL
+                )
+                SELECT pattern, COUNT(*) as pattern_count
+                FROM patterns
+                GROUP BY pattern
+                ORDER BY pattern_count DESC
+                LIMIT 1
+            """, action.player_id)
+            sequence = (sequence_stats['pattern'], sequence_stats['pattern_count']) if sequence_stats else (None, 0)
+        
+        return timing, sequence
+    
+    # ===== 임계값 판정 (단일 쿼리 / 개별 쿼리 경로 공용) =====
+    
+    def _evaluate_rate_limits(self, action: PlayerAction, action_count: int, total_value: float) -> List[ViolationRecord]:
+        """1분 빈도/값 제한 판정"""
+        violations = []
+        limits = self.rate_limits.get(action.action_type)
+        if not limits:
+            return violations
+        
         current_time = time.time()
         
         # 빈도 제한 검사
-        if result['action_count'] > limits["max_per_minute"]:
+        if action_count > limits["max_per_minute"]:
             violations.append(ViolationRecord(
                 player_id=action.player_id,
                 violation_type=ViolationType.RATE_LIMIT_EXCEEDED,
-                severity=2.0 + (result['action_count'] - limits["max_per_minute"]) * 0.1,
+                severity=2.0 + (action_count - limits["max_per_minute"]) * 0.1,
                 timestamp=current_time,
                 details={
                     "action_type": action.action_type,
-                    "frequency": result['action_count'],
+                    "frequency": action_count,
                     "limit": limits["max_per_minute"]
                 }
             ))
         
         # 값 제한 검사  
-        if result['total_value'] > limits["max_value_per_minute"]:
+        if total_value > limits["max_value_per_minute"]:
             violations.append(ViolationRecord(
                 player_id=action.player_id,
                 violation_type=ViolationType.RATE_LIMIT_EXCEEDED,
-                severity=3.0 + (result['total_value'] - limits["max_value_per_minute"]) / limits["max_value_per_minute"],
+                severity=3.0 + (total_value - limits["max_value_per_minute"]) / limits["max_value_per_minute"],
                 timestamp=current_time,
                 details={
                     "action_type": action.action_type,
-                    "total_value": result['total_value'],
+                    "total_value": total_value,
                     "limit": limits["max_value_per_minute"]
                 }
             ))
         
         return violations
     
-    async def _detect_anomalies_sql(self, conn: asyncpg.Connection, action: PlayerAction) -> List[ViolationRecord]:
-        """SQL 기반 통계적 이상치 탐지"""
-        violations = []
+    def _evaluate_anomaly(self, action: PlayerAction, sample_count: int,
+                          mean_value: Optional[float], std_value: Optional[float]) -> List[ViolationRecord]:
+        """z-score 이상치 판정"""
+        if action.value <= 0 or sample_count < 10 or not std_value or std_value <= 0:
+            return []
         
-        if action.value <= 0:
-            return violations
+        z_score = abs((action.value - mean_value) / std_value)
+        if z_score <= self.anomaly_threshold:
+            return []
         
-        # 최근 1시간 동안의 같은 액션 타입 통계 조회
-        stats = await conn.fetchrow("""
-            SELECT 
-                COUNT(*) as sample_count,
-                AVG(value) as mean_value,
-                STDDEV(value) as std_value
-            FROM player_actions_ts
-            WHERE player_id = $1 
-                AND action_type = $2 
-                AND value > 0
-                AND time >= NOW() - INTERVAL '1 hour'
-        """, action.player_id, action.action_type)
-        
-        if stats['sample_count'] >= 10 and stats['std_value'] > 0:
-            z_score = abs((action.value - stats['mean_value']) / stats['std_value'])
-            
-            if z_score > self.anomaly_threshold:
-                violations.append(ViolationRecord(
-                    player_id=action.player_id,
-                    violation_type=ViolationType.ANOMALY_DETECTED,
-                    severity=min(z_score, 5.0),
-                    timestamp=time.time(),
-                    details={
-                        "z_score": float(z_score),
-                        "action_value": action.value,
-                        "mean_value": float(stats['mean_value']),
-                        "std_value": float(stats['std_value'])
-                    }
-                ))
-        
-        return violations
+        return [ViolationRecord(
+            player_id=action.player_id,
+            violation_type=ViolationType.ANOMALY_DETECTED,
+            severity=min(z_score, 5.0),
+            timestamp=time.time(),
+            details={
+                "z_score": float(z_score),
+                "action_value": action.value,
+                "mean_value": float(mean_value),
+                "std_value": float(std_value)
+            }
+        )]
     
-    async def _detect_bot_behavior_sql(self, conn: asyncpg.Connection, action: PlayerAction) -> List[ViolationRecord]:
-        """SQL 기반 봇 행동 패턴 탐지"""
-        violations = []
-        current_time = time.time()
-        
-        # 1. 완벽한 타이밍 간격 탐지 (Window Function 사용)
-        timing_stats = await conn.fetchrow("""
-            WITH action_intervals AS (
-                SELECT 
-                    EXTRACT(EPOCH FROM (time - LAG(time) OVER (ORDER BY time))) as interval_seconds
-                FROM player_actions_ts
-                WHERE player_id = $1 
-                    AND action_type = $2
-                    AND time >= NOW() - INTERVAL '30 minutes'
-                ORDER BY time
-            )
-            SELECT 
-                COUNT(*) as interval_count,
-                COALESCE(STDDEV(interval_seconds), 0) as timing_variance,
-                AVG(interval_seconds) as avg_interval
-            FROM action_intervals
-            WHERE interval_seconds IS NOT NULL 
-                AND interval_seconds BETWEEN 0.1 AND 300
-        """, action.player_id, action.action_type)
-        
-        if (timing_stats['interval_count'] > 10 and 
-            timing_stats['timing_variance'] < self.bot_timing_threshold):
-            violations.append(ViolationRecord(
-                player_id=action.player_id,
-                violation_type=ViolationType.BOT_DETECTED,
-                severity=4.0,
-                timestamp=current_time,
-                details={
-                    "pattern": "perfect_timing",
-                    "variance": float(timing_stats['timing_variance']),
-                    "intervals": timing_stats['interval_count'],
-                    "avg_interval": float(timing_stats['avg_interval'])
-                }
-            ))
+    def _evaluate_timing(self, action: PlayerAction, interval_count: int,
+                         timing_variance: float, avg_interval: Optional[float]) -> List[ViolationRecord]:
+        """완벽한 타이밍 간격 판정"""
+        if interval_count <= 10 or timing_variance >= self.bot_timing_threshold:
+            return []
         
-        # 2. 반복 시퀀스 패턴 탐지  
-        sequence_stats = await conn.fetchrow("""
-            WITH recent_actions AS (
-                SELECT action_type,
-                       LAG(action_type, 1) OVER (ORDER BY time) as prev1,
-                       LAG(action_type, 2) OVER (ORDER BY time) as prev2
-                FROM player_actions_ts
-                WHERE player_id = $1 
-                    AND time >= NOW() - INTERVAL '20 minutes'
-                ORDER BY time
-            ),
-            patterns AS (
-                SELECT CONCAT(prev2, '-', prev1, '-', action_type) as pattern
-                FROM recent_actions
-                WHERE prev2 IS NOT NULL
-            )
-            SELECT pattern, COUNT(*) as pattern_count
-            FROM patterns
-            GROUP BY pattern
-            ORDER BY pattern_count DESC
-            LIMIT 1
-        """, action.player_id)
-        
-        if sequence_stats and sequence_stats['pattern_count'] > 5:
-            violations.append(ViolationRecord(
-                player_id=action.player_id,
-                violation_type=ViolationType.BOT_DETECTED,
-                severity=3.5,
-                timestamp=current_time,
-                details={
-                    "pattern": "repeated_sequence",
-                    "sequence": sequence_stats['pattern'],
-                    "repetitions": sequence_stats['pattern_count']
-                }
-            ))
-        
-        # 3. 24시간 연속 활동 탐지
-        activity_stats = await conn.fetchrow("""
-            WITH hourly_activity AS (
-                SELECT date_trunc('hour', time) as hour_bucket
-                FROM player_actions_ts
-                WHERE player_id = $1 
-                    AND time >= NOW() - INTERVAL '24 hours'
-                GROUP BY hour_bucket
-            )
-            SELECT COUNT(*) as active_hours
-            FROM hourly_activity
-        """, action.player_id)
+        return [ViolationRecord(
+            player_id=action.player_id,
+            violation_type=ViolationType.BOT_DETECTED,
+            severity=4.0,
+            timestamp=time.time(),
+            details={
+                "pattern": "perfect_timing",
+                "variance": float(timing_variance),
+                "intervals": interval_count,
+                "avg_interval": float(avg_interval)
+            }
+        )]
+    
+    def _evaluate_sequence(self, action: PlayerAction, pattern: Optional[str],
+                           pattern_count: Optional[int]) -> List[ViolationRecord]:
+        """반복 시퀀스 판정"""
+        if not pattern or not pattern_count or pattern_count <= 5:
+            return []
         
-        if activity_stats['active_hours'] >= 20:  # 24시간 중 20시간 이상 활동
-            violations.append(ViolationRecord(
-                player_id=action.player_id,
-                violation_type=ViolationType.SUSPICIOUS_BEHAVIOR,
-                severity=3.0,
-                timestamp=current_time,
-                details={
-                    "pattern": "excessive_activity",
-                    "active_hours": activity_stats['active_hours']
-                }
-            ))
+        return [ViolationRecord(
+            player_id=action.player_id,
+            violation_type=ViolationType.BOT_DETECTED,
+            severity=3.5,
+            timestamp=time.time(),
+            details={
+                "pattern": "repeated_sequence",
+                "sequence": pattern,
+                "repetitions": pattern_count
+            }
+        )]
+    
+    def _evaluate_activity(self, action: PlayerAction, active_hours: int) -> List[ViolationRecord]:
+        """24시간 연속 활동 판정"""
+        if active_hours < 20:  # 24시간 중 20시간 이상 활동
+            return []
         
-        return violations
+        return [ViolationRecord(
+            player_id=action.player_id,
+            violation_type=ViolationType.SUSPICIOUS_BEHAVIOR,
+            severity=3.0,
+            timestamp=time.time(),
+            details={
+                "pattern": "excessive_activity",
+                "active_hours": active_hours
+            }
+        )]
     
     async def _store_violations_async(self, conn: asyncpg.Connection, violations: List[ViolationRecord]):
         """위반 사항 배치 저장"""
@@ -317,49 +949,81 @@ class TimescaleAntiCheatEngine:
         """, values)
     
     async def _update_player_summary(self, conn: asyncpg.Connection, action: PlayerAction, violations: List[ViolationRecord]):
-        """플레이어 요약 정보 업데이트 (UPSERT)"""
+        """플레이어 요약 정보 업데이트 (배치 버퍼 사용 시 델타 누적, 아니면 즉시 UPSERT)"""
         violation_score = sum(v.severity for v in violations)
         
-        await conn.execute("""
-            INSERT INTO player_summary (
-                player_id, last_activity, current_risk_score,
-                total_actions_today, total_violations_today, updated_at
-            ) VALUES ($1, $2, $3, 1, $4, NOW())
-            ON CONFLICT (player_id) DO UPDATE SET
-                last_activity = $2,
-                current_risk_score = player_summary.current_risk_score + $3,
-                total_actions_today = player_summary.total_actions_today + 1,
-                total_violations_today = player_summary.total_violations_today + $4,
-                updated_at = NOW()
-        """, 
+        if self.summary_buffer is not None:
+            self.summary_buffer.add(
+                action.player_id,
+                datetime.fromtimestamp(action.timestamp),
+                violation_score,
+                len(violations)
+            )
+            return
+        
+        await conn.execute(
+            SUMMARY_UPSERT_ONE_SQL,
             action.player_id,
             datetime.fromtimestamp(action.timestamp),
             violation_score,
-            len(violations)
+            1,
+            len(violations),
+            self.risk_half_life
         )
     
     async def get_player_risk_score(self, player_id: str) -> float:
-        """플레이어 위험도 조회 (캐시 우선)"""
-        # 1. 캐시 확인
-        if player_id in self.player_cache:
-            cache_entry = self.player_cache[player_id]
-            if time.time() - cache_entry['cached_at'] < 300:  # 5분 캐시
-                return cache_entry['risk_score']
+        """플레이어 위험도 조회 (캐시 우선, 반감기 감쇠 적용, 미반영 요약 델타 합산)"""
+        # 1. 캐시 확인 (캐시에는 DB 에 반영된 값과 조회 시각만 저장, 5분 TTL)
+        cached = self.player_cache.get(player_id)
+        if cached is not None:
+            score, as_of = cached
+            return decay_risk(score, time.time() - as_of, self.risk_half_life) + self._pending_risk_delta(player_id)
         
         # 2. DB 조회
-        async with self.connection_pool.acquire() as conn:
-            result = await conn.fetchrow("""
-                SELECT current_risk_score
-                FROM player_summary
-                WHERE player_id = $1
-            """, player_id)
-            
-            risk_score = result['current_risk_score'] if result else 0.0
-            
-            # 3. 캐시 업데이트
-            self._update_cache(player_id, {'risk_score': risk_score})
-            
-            return risk_score
+        flushes_before = self.summary_buffer.batches_flushed if self.summary_buffer else 0
+        try:
+            async with self.admission.acquire() as conn:
+                result = await conn.fetchrow(f"""
+                    SELECT {decayed_risk_sql("$2")} AS current_risk_score
+                    FROM player_summary
+                    WHERE player_id = $1
+                """, player_id, self.risk_half_life)
+        except (PoolSaturatedError, asyncio.TimeoutError) as e:
+            if self.overload_mode == OVERLOAD_REJECT:
+                raise self._as_saturated(e)
+            # 강등: 미반영 델타만으로 추정 (캐시에 저장하지 않음)
+            return self._pending_risk_delta(player_id)
+        
+        risk_score = result['current_risk_score'] if result else 0.0
+        
+        # 3. 캐시 업데이트 (조회 중 flush 가 끝났다면 조회값이 이미 낡았을 수 있으므로 저장 생략)
+        flushes_after = self.summary_buffer.batches_flushed if self.summary_buffer else 0
+        if flushes_before == flushes_after:
+            self.player_cache.put(player_id, (risk_score, time.time()))
+        
+        return risk_score + self._pending_risk_delta(player_id)
+    
+    def _as_saturated(self, error: Exception) -> PoolSaturatedError:
+        """요청 기한 초과도 reject 모드에서는 503 (Retry-After) 으로 응답"""
+        if isinstance(error, PoolSaturatedError):
+            return error
+        return PoolSaturatedError(REASON_TIMEOUT, self.overload_retry_after)
+    
+    def _pending_risk_delta(self, player_id: str) -> float:
+        """아직 player_summary 에 반영되지 않은 위험도 증가분"""
+        if self.summary_buffer is None:
+            return 0.0
+        delta = self.summary_buffer.get_pending(player_id)
+        return delta.risk_delta if delta else 0.0
+    
+    def _invalidate_cached_players(self, player_ids: Iterable[str]):
+        """요약 정보가 바뀐 플레이어의 캐시 제거"""
+        self.player_cache.invalidate_many(player_ids)
+    
+    async def flush_player_summaries(self):
+        """대기 중인 요약 델타 즉시 반영 (차단 등 player_summary 를 직접 갱신하기 전에 호출)"""
+        if self.summary_buffer is not None:
+            await self.summary_buffer.flush()
     
     async def should_ban_player(self, player_id: str) -> Tuple[bool, str]:
         """자동 차단 여부 결정"""
@@ -368,43 +1032,47 @@ class TimescaleAntiCheatEngine:
         if risk_score >= self.auto_ban_threshold:
             return True, f"자동 차단 - 위험도 {risk_score:.1f}"
         
-        # 최근 심각한 위반 검사
-        async with self.connection_pool.acquire() as conn:
-            critical_violations = await conn.fetchval("""
-                SELECT COUNT(*)
-                FROM violations_ts
-                WHERE player_id = $1
-                    AND severity >= 4.0
-                    AND time >= NOW() - INTERVAL '1 hour'
-            """, player_id)
-            
-            if critical_violations >= 3:
-                return True, f"심각한 위반 {critical_violations}회 탐지"
+        # 최근 심각한 위반 검사 (풀 포화 시 강등 모드는 생략)
+        try:
+            async with self.admission.acquire() as conn:
+                critical_violations = await conn.fetchval("""
+                    SELECT COUNT(*)
+                    FROM violations_ts
+                    WHERE player_id = $1
+                        AND severity >= 4.0
+                        AND time >= NOW() - INTERVAL '1 hour'
+                """, player_id)
+        except (PoolSaturatedError, asyncio.TimeoutError) as e:
+            if self.overload_mode == OVERLOAD_REJECT:
+                raise self._as_saturated(e)
+            return False, ""
+        
+        if critical_violations >= 3:
+            return True, f"심각한 위반 {critical_violations}회 탐지"
         
         return False, ""
     
-    def _update_cache(self, player_id: str, data: Dict):
-        """캐시 업데이트 (LRU 방식)"""
-        if len(self.player_cache) >= self.max_cache_size:
-            # 가장 오래된 항목 제거
-            oldest_key = min(self.player_cache.keys(), 
-                           key=lambda k: self.player_cache[k]['cached_at'])
-            del self.player_cache[oldest_key]
-        
-        data['cached_at'] = time.time()
-        self.player_cache[player_id] = data
+    def get_admission_stats(self) -> Dict[str, Any]:
+        """커넥션 풀 포화 지표 + 강등 처리 현황"""
+        stats = self.admission.get_stats() if self.admission else {}
+        stats.update({
+            "overload_mode": self.overload_mode,
+            "degraded_actions": self.degraded_actions,
+            "degraded_unsaved_violations": self.degraded_unsaved_violations
+        })
+        return stats
     
     async def get_system_stats(self) -> Dict[str, Any]:
         """시스템 통계 조회"""
         async with self.connection_pool.acquire() as conn:
-            # 오늘의 전체 통계
+            # 오늘의 전체 통계 (1시간 연속 집계뷰)
             today_stats = await conn.fetchrow("""
                 SELECT 
                     COUNT(DISTINCT player_id) as active_players,
-                    COUNT(*) as total_actions,
-                    AVG(value) as avg_action_value
-                FROM player_actions_ts
-                WHERE time >= CURRENT_DATE
+                    COALESCE(SUM(total_actions), 0) as total_actions,
+                    SUM(total_value) / NULLIF(SUM(total_actions), 0) as avg_action_value
+                FROM player_activity_1hour
+                WHERE bucket >= CURRENT_DATE
             """)
             
             # 위반 통계
@@ -430,19 +1098,25 @@ class TimescaleAntiCheatEngine:
     async def cleanup_old_data(self):
         """정기 정리 (TimescaleDB 자동 정책 사용)"""
         # TimescaleDB의 retention policy가 자동으로 처리
-        # 캐시만 정리
-        current_time = time.time()
-        expired_keys = [
-            k for k, v in self.player_cache.items()
-            if current_time - v['cached_at'] > 3600  # 1시간 만료
-        ]
-        
-        for key in expired_keys:
-            del self.player_cache[key]
+        # 캐시만 정리 (만료 항목)
+        self.player_cache.purge_expired()
         
         logger.info(f"캐시 정리 완료. 활성 캐시: {len(self.player_cache)}")
     
     async def close(self):
-        """연결 풀 정리"""
+        """적재/요약 버퍼 flush 후 연결 풀 정리"""
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self._sweep_task = None
+        if self.summary_buffer:
+            await self.summary_buffer.close()
+            self.summary_buffer = None
+        if self.ingest_buffer:
+            await self.ingest_buffer.close()
+            self.ingest_buffer = None
         if self.connection_pool:
             await self.connection_pool.close()
\ No newline at end of file
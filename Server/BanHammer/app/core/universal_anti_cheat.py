@@ -7,12 +7,13 @@ from enum import Enum
 import numpy as np
 from collections import defaultdict, deque
 import redis.asyncio as redis
-import json
 import logging
 
 from .game_profiles import GameProfile, GameProfileManager, ActionDefinition, DetectionRule
 from ..ml.training_pipeline import MLAntiCheatEngine
 from ..ml.models import ModelPrediction
+from .rehydration import RedisWindowRehydrator
+from .state_codec import ActionRecord, encode_action_record
 
 logger = logging.getLogger(__name__)
 
@@ -329,7 +330,15 @@ class DynamicRuleEngine:
 class UniversalAntiCheatEngine:
     """범용 치팅 탐지 엔진"""
     
-    def __init__(self, redis_client: Optional[redis.Redis] = None, enable_ml: bool = True):
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        enable_ml: bool = True,
+        rehydrate_from_redis: bool = True,
+        rehydration_concurrency: int = 8,
+        rehydration_batch_size: int = 64,
+        rehydration_negative_ttl: float = 300.0
+    ):
         self.redis = redis_client
         self.enable_ml = enable_ml
         
@@ -356,6 +365,17 @@ class UniversalAntiCheatEngine:
         # 위험도 점수 (게임별)
         self.violation_scores: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
         
+        # 재시작 후 첫 조회 시 Redis 액션 리스트에서 윈도우 복원
+        self.rehydrator: Optional[RedisWindowRehydrator] = None
+        if redis_client and rehydrate_from_redis:
+            self.rehydrator = RedisWindowRehydrator(
+                redis_client,
+                max_actions=1000,
+                max_concurrency=rehydration_concurrency,
+                batch_size=rehydration_batch_size,
+                negative_ttl=rehydration_negative_ttl
+            )
+        
     async def analyze_action(self, action: UniversalPlayerAction) -> List[UniversalViolation]:
         """범용 액션 분석"""
         violations = []
@@ -381,7 +401,8 @@ class UniversalAntiCheatEngine:
             )
             violations.append(violation)
         
-        # 액션 저장
+        # 액션 저장 (메모리에 윈도우가 없으면 Redis 에서 먼저 복원)
+        await self._ensure_window(action.game_id, action.player_id)
         self.player_actions[action.game_id][action.player_id].append(action)
         
         # Redis에 저장 (옵션)
@@ -414,7 +435,9 @@ class UniversalAntiCheatEngine:
                     'metadata': action.metadata
                 }
                 
-                ml_prediction = await self.ml_engine.analyze_player_ml(action.player_id, action_dict)
+                ml_prediction = await self.ml_engine.analyze_player_ml(
+                    action.player_id, action_dict, game_id=action.game_id
+                )
                 
                 if ml_prediction and ml_prediction.prediction > 0.7:
                     ml_violation = UniversalViolation(
@@ -445,6 +468,7 @@ class UniversalAntiCheatEngine:
     
     async def get_player_risk_score(self, game_id: str, player_id: str) -> float:
         """플레이어 위험도 점수 조회"""
+        await self._ensure_window(game_id, player_id)
         base_score = self.violation_scores.get(game_id, {}).get(player_id, 0.0)
         
         # 시간에 따른 점수 감쇠
@@ -497,25 +521,59 @@ class UniversalAntiCheatEngine:
         """등록된 게임 목록"""
         return self.profile_manager.list_profiles()
     
+    async def _ensure_window(self, game_id: str, player_id: str):
+        """플레이어 윈도우가 비어 있으면 Redis 리스트에서 오래된 순으로 채움"""
+        if not self.rehydrator:
+            return
+        game_actions = self.player_actions.get(game_id)
+        if game_actions and game_actions.get(player_id):
+            return
+        records = await self.rehydrator.fetch(f"universal_actions:{game_id}:{player_id}")
+        if not records:
+            return
+        window = self.player_actions[game_id][player_id]
+        if window:
+            return  # 대기 중 다른 요청이 먼저 채움
+        window.extend(
+            UniversalPlayerAction(
+                player_id=player_id,
+                game_id=game_id,
+                action_type=record.action_type,
+                timestamp=record.timestamp,
+                value=record.value,
+                metadata=record.metadata,
+                session_id=record.session_id,
+                client_info=record.client_info or {}
+            )
+            for record in records
+        )
+
+    def get_rehydration_stats(self) -> Dict[str, Any]:
+        return self.rehydrator.get_stats() if self.rehydrator else {"enabled": False}
+
     async def _store_action_redis(self, action: UniversalPlayerAction):
         """Redis에 액션 저장"""
         if not self.redis:
             return
             
         key = f"universal_actions:{action.game_id}:{action.player_id}"
-        action_data = {
-            "action_type": action.action_type,
-            "timestamp": action.timestamp,
-            "value": action.value,
-            "metadata": action.metadata,
-            "session_id": action.session_id,
-            "client_info": action.client_info
-        }
+        record = encode_action_record(ActionRecord(
+            action_type=action.action_type,
+            timestamp=action.timestamp,
+            value=action.value,
+            metadata=action.metadata,
+            session_id=action.session_id,
+            client_info=action.client_info
+        ))
         
         try:
-            await self.redis.lpush(key, json.dumps(action_data, default=str))
-            await self.redis.ltrim(key, 0, 999)  # 최근 1000개만 유지
-            await self.redis.expire(key, 86400)  # 24시간 만료
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.lpush(key, record)
+            pipe.ltrim(key, 0, 999)  # 최근 1000개만 유지
+            pipe.expire(key, 86400)  # 24시간 만료
+            await pipe.execute()
+            if self.rehydrator:
+                self.rehydrator.forget(key)
         except Exception as e:
             logger.error(f"Redis 저장 오류: {e}")
     
@@ -1,11 +1,16 @@
+from __future__ import annotations
+
 import numpy as np
-import pandas as pd
-from typing import List, Dict, Any, Tuple, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Hashable, Tuple, Optional
 from collections import deque, defaultdict
 from datetime import datetime, timedelta
 import logging
 from dataclasses import dataclass
 
+# pandas 는 첫 특징 추출 시 import (워커 시작 시간 단축)
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -60,6 +65,8 @@ class FeatureExtractor:
         if not player_actions:
             return PlayerFeatures(player_id="unknown")
         
+        import pandas as pd
+        
         df = pd.DataFrame(player_actions)
         player_id = df['player_id'].iloc[0] if 'player_id' in df else "unknown"
         
@@ -79,6 +86,8 @@ class FeatureExtractor:
     def _extract_temporal_features(self, df: pd.DataFrame, features: PlayerFeatures) -> PlayerFeatures:
         """시간 관련 특징 추출"""
         if 'timestamp' in df.columns:
+            import pandas as pd
+            
             timestamps = pd.to_datetime(df['timestamp'])
             
             # 세션 지속 시간
@@ -206,6 +215,8 @@ class FeatureExtractor:
         if not sequence:
             return 0.0
         
+        import pandas as pd
+        
         counts = pd.Series(sequence).value_counts()
         probabilities = counts / len(sequence)
         
@@ -240,6 +251,8 @@ class AdvancedFeatureExtractor(FeatureExtractor):
         if not player_actions:
             return np.zeros((sequence_length, 5))
         
+        import pandas as pd
+        
         df = pd.DataFrame(player_actions)
         
         # 수치형 특징들 추출
@@ -285,6 +298,8 @@ class AdvancedFeatureExtractor(FeatureExtractor):
         
         try:
             if isinstance(timestamp, str):
+                import pandas as pd
+                
                 dt = pd.to_datetime(timestamp)
             else:
                 dt = timestamp
@@ -305,11 +320,11 @@ class AdvancedFeatureExtractor(FeatureExtractor):
         return min(complexity, 1.0)
 
 class RealTimeFeatureBuffer:
-    """실시간 특징 추출을 위한 버퍼"""
+    """실시간 특징 추출을 위한 버퍼 (키: 플레이어 ID, ModelHost 에서는 (game_id, player_id))"""
     
     def __init__(self, buffer_size: int = 1000):
         self.buffer_size = buffer_size
-        self.player_buffers: Dict[str, deque] = defaultdict(lambda: deque(maxlen=buffer_size))
+        self.player_buffers: Dict[Hashable, deque] = defaultdict(lambda: deque(maxlen=buffer_size))
         self.feature_extractor = FeatureExtractor()
     
     def add_action(self, player_id: str, action_data: Dict[str, Any]):
@@ -340,6 +355,8 @@ class RealTimeFeatureBuffer:
     
     def cleanup_old_data(self, hours_threshold: int = 24):
         """오래된 데이터 정리"""
+        import pandas as pd
+        
         cutoff_time = datetime.now() - timedelta(hours=hours_threshold)
         
         for player_id in list(self.player_buffers.keys()):
@@ -0,0 +1,139 @@
+"""
+프로세스당 하나의 ML 모델 호스트
+
+- 기본 / 범용 엔진과 /api/ml 이 각자 MLAntiCheatEngine 을 만들면서 같은 모델을 여러 번 로드하고
+  같은 플레이어의 특징 버퍼가 엔진마다 따로 쌓이던 문제를 해결
+- 모델(앙상블)은 여기서 한 번만 로드하고, 엔진들은 읽기 전용 핸들로 사용
+- 특징 버퍼는 하나이며 (game_id, player_id) 로 키잉
+- 노드 단위 공유: gunicorn --preload 로 마스터에서 미리 로드하면 fork 된 워커들이 copy-on-write 로 공유
+"""
+
+import gc
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .feature_engineering import AdvancedFeatureExtractor, PlayerFeatures, RealTimeFeatureBuffer
+from .models import EnsembleCheatDetector, ModelPrediction
+
+logger = logging.getLogger(__name__)
+
+# 게임 구분이 없는 경로(/api, /api/ml)에서 쓰는 게임 ID
+DEFAULT_GAME_ID = "default"
+
+CNN_MODEL_FILE = "cnn_model.h5"
+RF_MODEL_FILE = "random_forest.pkl"
+
+
+class ModelHost:
+    """모델 로드 + (게임, 플레이어) 단일 특징 버퍼"""
+
+    def __init__(self, model_dir: str = "models", buffer_size: int = 1000):
+        self.model_dir = Path(model_dir)
+        self.feature_buffer = RealTimeFeatureBuffer(buffer_size=buffer_size)
+        self.advanced_extractor = AdvancedFeatureExtractor()
+        self.load_count = 0
+        self.ensemble_model = self._load_ensemble()
+
+    def _load_ensemble(self) -> EnsembleCheatDetector:
+        """저장된 모델들 로드 (파일이 있는 모델만 - 없으면 sklearn / TensorFlow 는 import 되지 않음)"""
+        ensemble = EnsembleCheatDetector()
+        try:
+            rf_path = self.model_dir / RF_MODEL_FILE
+            if rf_path.exists():
+                ensemble.rf_model.load_model(str(rf_path))
+        except Exception as e:
+            logger.warning(f"Random Forest 모델 로드 실패: {e}")
+
+        try:
+            if (self.model_dir / CNN_MODEL_FILE).exists():
+                ensemble.cnn_model.load_model(str(self.model_dir / "cnn_model"))
+        except Exception as e:
+            logger.warning(f"CNN 모델 로드 실패: {e}")
+
+        self.load_count += 1
+        return ensemble
+
+    def reload(self) -> None:
+        """재훈련 후 모델 다시 로드 (새 앙상블을 다 읽은 뒤 참조만 교체 → 진행 중인 예측은 이전 모델 사용)"""
+        ensemble = self._load_ensemble()
+        # 회귀 모델의 플레이어별 누적 잔차는 모델 파일이 아니라 런타임 상태이므로 이어받음
+        ensemble.regression_model.player_residuals = self.ensemble_model.regression_model.player_residuals
+        self.ensemble_model = ensemble
+        logger.info(f"ML 모델 재로드 완료: {self.get_model_status()}")
+
+    @staticmethod
+    def buffer_key(game_id: Optional[str], player_id: str) -> Tuple[str, str]:
+        return (game_id or DEFAULT_GAME_ID, player_id)
+
+    def get_features(self, game_id: Optional[str], player_id: str) -> Optional[PlayerFeatures]:
+        return self.feature_buffer.get_features(self.buffer_key(game_id, player_id))
+
+    def buffered_actions(self, game_id: Optional[str], player_id: str) -> Optional[int]:
+        """버퍼에 쌓인 액션 수 (버퍼가 없으면 None)"""
+        buffer = self.feature_buffer.player_buffers.get(self.buffer_key(game_id, player_id))
+        return None if buffer is None else len(buffer)
+
+    async def analyze(
+        self, game_id: Optional[str], player_id: str, action_data: Dict[str, Any]
+    ) -> Optional[ModelPrediction]:
+        """행동을 버퍼에 추가하고 앙상블 예측"""
+        key = self.buffer_key(game_id, player_id)
+        self.feature_buffer.add_action(key, action_data)
+
+        features = self.feature_buffer.get_features(key)
+        if not features:
+            return None
+
+        player_data = list(self.feature_buffer.player_buffers[key])
+        sequence_data = self.advanced_extractor.extract_cnn_features(player_data)
+
+        # 예측 도중 reload() 로 교체되더라도 시작한 모델로 끝까지 계산
+        ensemble = self.ensemble_model
+        try:
+            return ensemble.predict(features, player_data, sequence_data)
+        except Exception as e:
+            logger.error(f"ML 예측 중 오류: {e}")
+            return None
+
+    def get_model_status(self) -> Dict[str, bool]:
+        """모델 상태 확인"""
+        return {
+            'random_forest': self.ensemble_model.rf_model.is_trained,
+            'regression': self.ensemble_model.regression_model.is_trained,
+            'cnn': self.ensemble_model.cnn_model.is_trained
+        }
+
+
+# 프로세스당 하나의 모델 호스트
+_model_host: Optional[ModelHost] = None
+
+
+def get_model_host() -> ModelHost:
+    """모델 호스트 인스턴스 반환 (첫 호출 시 모델 로드)"""
+    global _model_host
+    if _model_host is None:
+        from ..config import settings
+        _model_host = ModelHost(
+            model_dir=settings.ml_model_dir,
+            buffer_size=settings.ml_feature_buffer_size,
+        )
+    return _model_host
+
+
+def preload_model_host() -> Optional[ModelHost]:
+    """
+    fork 전에 마스터 프로세스에서 모델 로드 (gunicorn --preload + UvicornWorker)
+
+    워커들은 로드된 모델 메모리를 copy-on-write 로 공유. uvicorn --workers 는 워커를 spawn 하므로
+    효과 없음. TensorFlow 는 초기화 후 fork 하면 안전하지 않아 CNN 모델이 있으면 생략.
+    """
+    from ..config import settings
+
+    if (Path(settings.ml_model_dir) / CNN_MODEL_FILE).exists():
+        logger.warning("CNN 모델이 있어 ML 모델 사전 로드를 생략합니다 (TensorFlow 는 fork 이후 안전하지 않음)")
+        return None
+    host = get_model_host()
+    # 이후 GC 가 사전 로드된 객체 헤더를 건드려 공유 페이지가 복사되지 않도록 고정
+    gc.freeze()
+    return host
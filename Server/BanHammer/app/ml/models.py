@@ -1,22 +1,17 @@
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestClassifier, IsolationForest
-from sklearn.linear_model import LinearRegression, Ridge
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.metrics import accuracy_score, precision_recall_fscore_support, confusion_matrix
-import tensorflow as tf
-from tensorflow import keras
-from tensorflow.keras import layers
-import joblib
 import logging
-from typing import Dict, List, Tuple, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 import os
 from datetime import datetime, timedelta
 
 from .feature_engineering import PlayerFeatures, FeatureExtractor
 
+# sklearn / TensorFlow / joblib 은 실제로 훈련·로드할 때만 import
+# (워커마다 수 초의 import 시간과 수백 MB 의 RSS 를 쓰지 않도록)
+if TYPE_CHECKING:
+    from tensorflow import keras
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -44,17 +39,26 @@ class CheatDetectionRandomForest:
     """랜덤 포레스트 기반 치팅 탐지 모델 (95% 정확도 목표)"""
     
     def __init__(self, n_estimators: int = 100, random_state: int = 42):
+        self.n_estimators = n_estimators
+        self.random_state = random_state
+        self.model = None  # 훈련 / 로드 시 생성
+        self.scaler = None
+        self.feature_names = []
+        self.is_trained = False
+    
+    def _build_estimators(self):
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import StandardScaler
+        
         self.model = RandomForestClassifier(
-            n_estimators=n_estimators,
+            n_estimators=self.n_estimators,
             max_depth=10,
             min_samples_split=5,
             min_samples_leaf=2,
-            random_state=random_state,
+            random_state=self.random_state,
             class_weight='balanced'  # 불균형 데이터 대응
         )
         self.scaler = StandardScaler()
-        self.feature_names = []
-        self.is_trained = False
         
     def prepare_features(self, features: PlayerFeatures) -> np.ndarray:
         """PlayerFeatures를 모델 입력 형태로 변환"""
@@ -99,6 +103,11 @@ class CheatDetectionRandomForest:
         if not training_data:
             raise ValueError("훈련 데이터가 없습니다.")
         
+        from sklearn.model_selection import train_test_split, cross_val_score
+        from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+        
+        self._build_estimators()
+        
         # 특징과 라벨 분리
         X_list = []
         y_list = []
@@ -194,11 +203,15 @@ class CheatDetectionRandomForest:
             'feature_names': self.feature_names,
             'is_trained': self.is_trained
         }
+        import joblib
+        
         joblib.dump(model_data, filepath)
         logger.info(f"모델이 {filepath}에 저장되었습니다.")
     
     def load_model(self, filepath: str):
         """모델 로드"""
+        import joblib
+        
         model_data = joblib.load(filepath)
         self.model = model_data['model']
         self.scaler = model_data['scaler']
@@ -210,8 +223,8 @@ class ResourcePredictionModel:
     """회귀 기반 자원 축적 예측 모델 - 잔차 분석으로 미세한 치팅 탐지"""
     
     def __init__(self):
-        self.model = Ridge(alpha=1.0)  # 정규화된 선형 회귀
-        self.scaler = StandardScaler()
+        self.model = None  # 훈련 시 생성 (Ridge)
+        self.scaler = None
         self.is_trained = False
         self.player_residuals = {}  # 플레이어별 누적 잔차
         self.residual_threshold = 2.0  # 이상 잔차 임계값
@@ -221,6 +234,8 @@ class ResourcePredictionModel:
         if len(player_data) < 2:
             return np.array([]), np.array([])
         
+        import pandas as pd
+        
         features = []
         targets = []
         
@@ -266,6 +281,12 @@ class ResourcePredictionModel:
         X = np.vstack(all_features)
         y = np.hstack(all_targets)
         
+        from sklearn.linear_model import Ridge
+        from sklearn.preprocessing import StandardScaler
+        
+        self.model = Ridge(alpha=1.0)  # 정규화된 선형 회귀
+        self.scaler = StandardScaler()
+        
         # 정규화
         X_scaled = self.scaler.fit_transform(X)
         
@@ -356,8 +377,11 @@ class CNNCheatDetector:
         self.model = None
         self.is_trained = False
         
-    def build_model(self) -> keras.Model:
+    def build_model(self) -> "keras.Model":
         """CNN 모델 구축"""
+        from tensorflow import keras
+        from tensorflow.keras import layers
+        
         model = keras.Sequential([
             # 1D Convolutional layers
             layers.Conv1D(filters=32, kernel_size=3, activation='relu', 
@@ -393,6 +417,8 @@ class CNNCheatDetector:
     def train(self, X_sequences: np.ndarray, y_labels: np.ndarray, 
               validation_split: float = 0.2, epochs: int = 50) -> Dict[str, Any]:
         """CNN 모델 훈련"""
+        from tensorflow import keras
+        
         self.model = self.build_model()
         
         # 조기 종료 콜백
@@ -448,6 +474,8 @@ class CNNCheatDetector:
     def save_model(self, filepath: str):
         """모델 저장"""
         if self.model:
+            import joblib
+            
             self.model.save(f"{filepath}.h5")
             
             # 메타데이터 저장
@@ -462,6 +490,9 @@ class CNNCheatDetector:
     
     def load_model(self, filepath: str):
         """모델 로드"""
+        import joblib
+        from tensorflow import keras
+        
         self.model = keras.models.load_model(f"{filepath}.h5")
         
         metadata = joblib.load(f"{filepath}_metadata.pkl")
@@ -1,5 +1,4 @@
 import numpy as np
-import pandas as pd
 from typing import List, Dict, Tuple, Any, Optional
 import asyncio
 import logging
@@ -15,7 +14,7 @@ from .models import (
 from .feature_engineering import (
     FeatureExtractor, AdvancedFeatureExtractor, PlayerFeatures, RealTimeFeatureBuffer
 )
-from ..dependencies import get_db
+from .model_host import DEFAULT_GAME_ID, ModelHost, get_model_host
 from ..models.database import Player, PlayerAction, Violation
 from sqlalchemy.orm import Session
 
@@ -284,65 +283,37 @@ class ModelTrainingPipeline:
             logger.warning(f"CNN 모델 로드 실패: {e}")
 
 class MLAntiCheatEngine:
-    """머신러닝 기반 치팅 탐지 엔진"""
+    """머신러닝 기반 치팅 탐지 엔진 - 프로세스 공유 ModelHost 의 핸들 (모델 / 특징 버퍼는 호스트에 하나만 존재)"""
     
-    def __init__(self, model_dir: str = "models"):
-        self.model_dir = Path(model_dir)
-        self.ensemble_model = EnsembleCheatDetector()
-        self.feature_buffer = RealTimeFeatureBuffer()
-        self.feature_extractor = FeatureExtractor()
-        self.advanced_extractor = AdvancedFeatureExtractor()
-        
-        # 모델 로드
-        self._load_models()
+    def __init__(self, game_id: str = DEFAULT_GAME_ID, model_host: Optional[ModelHost] = None):
+        self.game_id = game_id
+        self.host = model_host or get_model_host()
     
-    def _load_models(self):
-        """저장된 모델들 로드"""
-        try:
-            rf_path = self.model_dir / "random_forest.pkl"
-            if rf_path.exists():
-                self.ensemble_model.rf_model.load_model(str(rf_path))
-        except Exception as e:
-            logger.warning(f"Random Forest 모델 로드 실패: {e}")
-        
-        try:
-            cnn_path = self.model_dir / "cnn_model"
-            if (self.model_dir / "cnn_model.h5").exists():
-                self.ensemble_model.cnn_model.load_model(str(cnn_path))
-        except Exception as e:
-            logger.warning(f"CNN 모델 로드 실패: {e}")
+    @property
+    def ensemble_model(self) -> EnsembleCheatDetector:
+        """읽기 전용 모델 핸들 (재훈련 시 호스트가 교체)"""
+        return self.host.ensemble_model
+    
+    @property
+    def feature_buffer(self) -> RealTimeFeatureBuffer:
+        """(game_id, player_id) 로 키잉된 공유 특징 버퍼"""
+        return self.host.feature_buffer
     
-    async def analyze_player_ml(self, player_id: str, action_data: Dict[str, Any]) -> Optional[ModelPrediction]:
+    async def analyze_player_ml(
+        self, player_id: str, action_data: Dict[str, Any], game_id: Optional[str] = None
+    ) -> Optional[ModelPrediction]:
         """머신러닝 기반 플레이어 분석"""
-        # 행동 데이터를 버퍼에 추가
-        self.feature_buffer.add_action(player_id, action_data)
-        
-        # 특징 추출
-        features = self.feature_buffer.get_features(player_id)
-        if not features:
-            return None
-        
-        # 플레이어 데이터 가져오기
-        player_data = list(self.feature_buffer.player_buffers[player_id])
-        
-        # CNN용 시퀀스 데이터 생성
-        sequence_data = self.advanced_extractor.extract_cnn_features(player_data)
-        
-        # 앙상블 예측
-        try:
-            prediction = self.ensemble_model.predict(features, player_data, sequence_data)
-            return prediction
-        except Exception as e:
-            logger.error(f"ML 예측 중 오류: {e}")
-            return None
+        return await self.host.analyze(game_id or self.game_id, player_id, action_data)
+    
+    def get_player_features(self, player_id: str, game_id: Optional[str] = None) -> Optional[PlayerFeatures]:
+        return self.host.get_features(game_id or self.game_id, player_id)
+    
+    def buffered_actions(self, player_id: str, game_id: Optional[str] = None) -> Optional[int]:
+        return self.host.buffered_actions(game_id or self.game_id, player_id)
     
     def get_model_status(self) -> Dict[str, bool]:
         """모델 상태 확인"""
-        return {
-            'random_forest': self.ensemble_model.rf_model.is_trained,
-            'regression': self.ensemble_model.regression_model.is_trained,
-            'cnn': self.ensemble_model.cnn_model.is_trained
-        }
+        return self.host.get_model_status()
 
 class AutoMLTrainer:
     """자동 모델 재훈련 시스템"""
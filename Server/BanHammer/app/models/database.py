@@ -31,7 +31,8 @@ class PlayerAction(Base):
     action_type = Column(String(50), nullable=False)
     timestamp = Column(DateTime, default=func.now())
     value = Column(Float, default=0.0)
-    metadata = Column(Text)  # JSON string
+    # "metadata" 는 Declarative 예약어라 속성명만 바꾸고 컬럼명은 유지
+    action_metadata = Column("metadata", Text)  # JSON string
     
     # Relationships
     player = relationship("Player", back_populates="actions")
@@ -44,12 +45,12 @@ class PlayerAction(Base):
     )
     
     def get_metadata(self):
-        if self.metadata:
-            return json.loads(self.metadata)
+        if self.action_metadata:
+            return json.loads(self.action_metadata)
         return {}
     
     def set_metadata(self, data):
-        self.metadata = json.dumps(data) if data else None
+        self.action_metadata = json.dumps(data) if data else None
 
 class Violation(Base):
     __tablename__ = "violations"
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, Index, text
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, Text, Boolean, Index, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMPTZ
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
 from sqlalchemy.sql import func
 from datetime import datetime
+from typing import List
 import json
 
+# SQLAlchemy 2.0 의 postgresql 방언은 TIMESTAMPTZ 를 내보내지 않음
+TIMESTAMPTZ = TIMESTAMP(timezone=True)
+
 TimescaleBase = declarative_base()
 
 class PlayerActionTimeseries(TimescaleBase):
@@ -19,7 +23,10 @@ class PlayerActionTimeseries(TimescaleBase):
     player_id = Column(String(100), primary_key=True, nullable=False)
     action_type = Column(String(50), nullable=False)
     value = Column(Float, default=0.0)
-    metadata = Column(JSONB)
+    # "metadata" 는 Declarative 예약어라 속성명만 바꾸고 컬럼명은 유지
+    action_metadata = Column("metadata", JSONB)
+    # 같은 액션 타입의 직전 액션과의 간격(초), 적재 시 DB 트리거가 계산 (행동 프로필 연속 집계용)
+    interval_sec = Column(Float)
     
     # 성능 최적화 인덱스
     __table_args__ = (
@@ -64,14 +71,20 @@ class PlayerSummary(TimescaleBase):
     last_activity = Column(TIMESTAMPTZ, default=func.now())
     
     # 실시간 업데이트되는 요약 정보
+    # current_risk_score 는 risk_updated_at 시점 값 (읽기/쓰기 시 반감기 감쇠)
     current_risk_score = Column(Float, default=0.0)
+    risk_updated_at = Column(TIMESTAMPTZ, default=func.now())
+    # 일일 카운터는 counter_day(UTC) 버킷 기준, 날짜가 바뀌면 다음 갱신 때 0 부터 다시 집계
     total_actions_today = Column(Integer, default=0)
     total_violations_today = Column(Integer, default=0)
+    counter_day = Column(Date, server_default=text("((now() AT TIME ZONE 'UTC')::date)"))
     
     # 상태 정보
     is_banned = Column(Boolean, default=False)
     ban_reason = Column(Text)
     ban_timestamp = Column(TIMESTAMPTZ)
+    # 차단 상태를 마지막으로 바꾼 이벤트 시각 (이중 기록 재생 순서가 뒤바뀌어도 최신 상태 유지)
+    ban_updated_at = Column(TIMESTAMPTZ)
     
     # 업데이트 시간
     updated_at = Column(TIMESTAMPTZ, default=func.now(), onupdate=func.now())
@@ -92,10 +105,14 @@ class ActionTypeStats(TimescaleBase):
     )
 
 # TimescaleDB 연속 집계뷰를 위한 SQL
+# - 탐지기가 직접 읽으므로 real-time 집계(materialized_only = false)로 미구체화 구간까지 포함
+# - positive_*: 양수 값의 개수/합/제곱합 (버킷 합산으로 1시간 평균·표준편차 계산용)
+# - player_behavior_1hour: 행동 분석 API 용 플레이어별 시간 프로필
+#   value_bin 은 양수 값의 로그 스케일 구간 (옥타브당 8구간, 0 이하는 -1000) - 구간별 개수로 백분위 근사
 CONTINUOUS_AGGREGATES_SQL = """
 -- 1분 단위 액션 통계 연속 집계뷰
 CREATE MATERIALIZED VIEW IF NOT EXISTS action_stats_1min
-WITH (timescaledb.continuous) AS
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
 SELECT
     time_bucket('1 minute', time) AS bucket,
     action_type,
@@ -103,13 +120,16 @@ SELECT
     COUNT(*) as action_count,
     SUM(value) as total_value,
     AVG(value) as avg_value,
-    MAX(value) as max_value
+    MAX(value) as max_value,
+    SUM(CASE WHEN value > 0 THEN 1 ELSE 0 END) as positive_count,
+    SUM(CASE WHEN value > 0 THEN value ELSE 0 END) as positive_sum,
+    SUM(CASE WHEN value > 0 THEN value * value ELSE 0 END) as positive_sum_sq
 FROM player_actions_ts
 GROUP BY bucket, action_type, player_id;
 
 -- 1시간 단위 플레이어 활동 요약
 CREATE MATERIALIZED VIEW IF NOT EXISTS player_activity_1hour  
-WITH (timescaledb.continuous) AS
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
 SELECT
     time_bucket('1 hour', time) AS bucket,
     player_id,
@@ -119,25 +139,85 @@ SELECT
 FROM player_actions_ts
 GROUP BY bucket, player_id;
 
+-- 1시간 단위 플레이어 행동 프로필 (개수, 값 / 간격의 합·제곱합·최소·최대)
+CREATE MATERIALIZED VIEW IF NOT EXISTS player_behavior_1hour
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT
+    time_bucket('1 hour', time) AS bucket,
+    player_id,
+    action_type,
+    CASE WHEN value > 0 THEN floor(ln(value) * 8 / ln(2))::int ELSE -1000 END AS value_bin,
+    COUNT(*) as action_count,
+    SUM(value) as value_sum,
+    SUM(value * value) as value_sum_sq,
+    MIN(value) as value_min,
+    MAX(value) as value_max,
+    SUM(CASE WHEN interval_sec BETWEEN 0.1 AND 3600 THEN 1 ELSE 0 END) as interval_count,
+    SUM(CASE WHEN interval_sec BETWEEN 0.1 AND 3600 THEN interval_sec ELSE 0 END) as interval_sum,
+    SUM(CASE WHEN interval_sec BETWEEN 0.1 AND 3600 THEN interval_sec * interval_sec ELSE 0 END) as interval_sum_sq,
+    MIN(CASE WHEN interval_sec BETWEEN 0.1 AND 3600 THEN interval_sec END) as interval_min,
+    MAX(CASE WHEN interval_sec BETWEEN 0.1 AND 3600 THEN interval_sec END) as interval_max
+FROM player_actions_ts
+GROUP BY bucket, player_id, action_type, value_bin;
+
+-- 이전 버전에서 생성된 뷰도 real-time 집계로 전환
+ALTER MATERIALIZED VIEW player_activity_1hour SET (timescaledb.materialized_only = false);
+
 -- 실시간 업데이트 정책
 SELECT add_continuous_aggregate_policy('action_stats_1min',
     start_offset => INTERVAL '1 hour',
     end_offset => INTERVAL '1 minute',
-    schedule_interval => INTERVAL '1 minute');
+    schedule_interval => INTERVAL '1 minute',
+    if_not_exists => TRUE);
 
 SELECT add_continuous_aggregate_policy('player_activity_1hour',
     start_offset => INTERVAL '1 day', 
     end_offset => INTERVAL '1 hour',
-    schedule_interval => INTERVAL '1 hour');
+    schedule_interval => INTERVAL '1 hour',
+    if_not_exists => TRUE);
+
+SELECT add_continuous_aggregate_policy('player_behavior_1hour',
+    start_offset => INTERVAL '1 day',
+    end_offset => INTERVAL '1 hour',
+    schedule_interval => INTERVAL '30 minutes',
+    if_not_exists => TRUE);
+"""
+
+# 이전 스키마의 action_stats_1min(positive_* 컬럼 없음)은 컬럼 추가가 불가능하므로 재생성
+# (원시 데이터에서 다시 집계되므로 데이터 손실 없음)
+UPGRADE_CONTINUOUS_AGGREGATES_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM timescaledb_information.continuous_aggregates
+        WHERE view_name = 'action_stats_1min'
+    ) AND NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'action_stats_1min' AND column_name = 'positive_sum_sq'
+    ) THEN
+        DROP MATERIALIZED VIEW action_stats_1min;
+    END IF;
+END $$;
+"""
+
+# 이전 스키마 테이블에 컬럼 추가 (간격 / 감쇠 / 날짜 버킷 / 차단 상태 시각)
+UPGRADE_TABLES_SQL = """
+ALTER TABLE player_actions_ts
+    ADD COLUMN IF NOT EXISTS interval_sec DOUBLE PRECISION;
+
+ALTER TABLE player_summary
+    ADD COLUMN IF NOT EXISTS risk_updated_at TIMESTAMPTZ DEFAULT NOW(),
+    ADD COLUMN IF NOT EXISTS counter_day DATE DEFAULT ((NOW() AT TIME ZONE 'UTC')::date),
+    ADD COLUMN IF NOT EXISTS ban_updated_at TIMESTAMPTZ;
 """
 
 # 데이터 보존 정책
 RETENTION_POLICY_SQL = """
 -- 원시 액션 데이터는 30일 보관
-SELECT add_retention_policy('player_actions_ts', INTERVAL '30 days');
+SELECT add_retention_policy('player_actions_ts', INTERVAL '30 days', if_not_exists => TRUE);
 
 -- 위반 데이터는 1년 보관  
-SELECT add_retention_policy('violations_ts', INTERVAL '1 year');
+SELECT add_retention_policy('violations_ts', INTERVAL '1 year', if_not_exists => TRUE);
 
 -- 압축 정책 (7일 이후 데이터 압축)
 ALTER TABLE player_actions_ts SET (
@@ -146,37 +226,89 @@ ALTER TABLE player_actions_ts SET (
     timescaledb.compress_orderby = 'time'
 );
 
-SELECT add_compression_policy('player_actions_ts', INTERVAL '7 days');
+SELECT add_compression_policy('player_actions_ts', INTERVAL '7 days', if_not_exists => TRUE);
+"""
+
+HYPERTABLES_SQL = """
+SELECT create_hypertable('player_actions_ts', 'time',
+    chunk_time_interval => INTERVAL '1 day',
+    if_not_exists => TRUE);
+
+SELECT create_hypertable('violations_ts', 'time',
+    chunk_time_interval => INTERVAL '1 week',
+    if_not_exists => TRUE);
 """
 
+# 적재 시 interval_sec 계산 트리거 (COPY 포함, 모든 서버 프로세스 / 이중 기록 경로 공통)
+# - 같은 플레이어 / 액션 타입의 1시간 이내 직전 행을 idx_player_action_time 으로 한 번 조회
+#   (프로필은 1시간을 넘는 간격을 집계하지 않음)
+# - 같은 문장(COPY 배치) 안의 앞선 행은 보이지만, 다른 커넥션의 커밋 전 행은 보이지 않으므로
+#   같은 플레이어를 여러 프로세스가 동시에 적재하면 간격이 그 사이 행을 건너뛴 값이 될 수 있음
+# - 값이 이미 있는 행(이관 백필 등)은 그대로 둠
+# - 적재 버퍼 / 이중 기록은 같은 COPY 배치 안의 직전 행 간격을 미리 채우므로(fill_batch_intervals)
+#   조회는 (플레이어, 액션 타입)별 배치 첫 행에서만 발생
+ACTION_INTERVAL_TRIGGER_STATEMENTS = [
+    """
+CREATE OR REPLACE FUNCTION set_action_interval() RETURNS trigger AS $$
+BEGIN
+    IF NEW.interval_sec IS NULL THEN
+        SELECT EXTRACT(EPOCH FROM (NEW.time - p.time)) INTO NEW.interval_sec
+        FROM player_actions_ts p
+        WHERE p.player_id = NEW.player_id
+            AND p.action_type = NEW.action_type
+            AND p.time < NEW.time
+            AND p.time >= NEW.time - INTERVAL '1 hour'
+        ORDER BY p.time DESC
+        LIMIT 1;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+""",
+    "DROP TRIGGER IF EXISTS trg_action_interval ON player_actions_ts",
+    """
+CREATE TRIGGER trg_action_interval
+    BEFORE INSERT ON player_actions_ts
+    FOR EACH ROW EXECUTE FUNCTION set_action_interval()
+""",
+]
+
+
+def sql_statements(script: str) -> List[str]:
+    """스크립트를 세미콜론 기준 문장 목록으로 분리 (주석만 있는 조각 제외, $$ 블록이 없는 스크립트 전용)"""
+    return [
+        statement.strip() for statement in script.split(";")
+        if any(line.strip() and not line.strip().startswith("--") for line in statement.splitlines())
+    ]
+
+
 # 하이퍼테이블 생성 함수
 def create_hypertables(engine):
-    """TimescaleDB 하이퍼테이블 및 정책 생성"""
-    with engine.connect() as conn:
-        # 테이블 생성
-        TimescaleBase.metadata.create_all(engine)
-        
+    """
+    TimescaleDB 하이퍼테이블 및 정책 생성 (반복 실행해도 안전)
+
+    연속 집계뷰 생성(CREATE MATERIALIZED VIEW ... WITH (timescaledb.continuous))은 트랜잭션 블록 안에서
+    실행할 수 없으므로 AUTOCOMMIT 연결에서 문장 단위로 실행
+    """
+    # 테이블 생성
+    TimescaleBase.metadata.create_all(engine)
+
+    statements = [
+        *sql_statements(UPGRADE_TABLES_SQL),
         # 하이퍼테이블 변환
-        conn.execute(text("""
-            SELECT create_hypertable('player_actions_ts', 'time', 
-                chunk_time_interval => INTERVAL '1 day',
-                if_not_exists => TRUE);
-        """))
-        
-        conn.execute(text("""
-            SELECT create_hypertable('violations_ts', 'time',
-                chunk_time_interval => INTERVAL '1 week', 
-                if_not_exists => TRUE);
-        """))
-        
-        # 연속 집계뷰 생성
-        conn.execute(text(CONTINUOUS_AGGREGATES_SQL))
-        
-        # 데이터 보존 정책 적용
-        conn.execute(text(RETENTION_POLICY_SQL))
-        
-        conn.commit()
-        print("TimescaleDB 하이퍼테이블 및 정책 생성 완료")
+        *sql_statements(HYPERTABLES_SQL),
+        # 적재 시 interval_sec 계산 ($$ 본문이 있어 문장 목록으로 관리)
+        *ACTION_INTERVAL_TRIGGER_STATEMENTS,
+        # 연속 집계뷰 생성 (구버전 뷰는 재생성 - DO 블록은 한 문장)
+        UPGRADE_CONTINUOUS_AGGREGATES_SQL,
+        *sql_statements(CONTINUOUS_AGGREGATES_SQL),
+        # 데이터 보존 / 압축 정책
+        *sql_statements(RETENTION_POLICY_SQL),
+    ]
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+    print("TimescaleDB 하이퍼테이블 및 정책 생성 완료")
 
 def get_table_stats(engine):
     """테이블 통계 조회"""
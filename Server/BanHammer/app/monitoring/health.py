@@ -0,0 +1,207 @@
+"""
+백그라운드 헬스 프로브
+- 고정 주기로 SQL 엔진 / asyncpg 풀 / Redis 를 점검하고 결과를 캐시
+- /health 는 캐시된 결과만 반환 (요청마다 I/O 없음)
+- 프로브 지연시간과 커넥션 풀 포화도 포함
+"""
+
+import asyncio
+import time
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_probe_latency = metrics.gauge("banhammer_health_probe_latency_seconds", "Latency of the last health probe")
+_probe_up = metrics.gauge("banhammer_health_component_up", "1 if the component passed the last health probe")
+_pool_saturation = metrics.gauge("banhammer_pool_saturation_ratio", "Checked-out connections / pool capacity")
+
+STATUS_HEALTHY = "healthy"
+STATUS_DEGRADED = "degraded"
+STATUS_UNHEALTHY = "unhealthy"
+STATUS_DISABLED = "disabled"
+
+
+class HealthProber:
+    """
+    주기적 헬스 프로브
+    - interval: 프로브 주기 (초)
+    - timeout: 컴포넌트별 프로브 타임아웃 (초)
+    - 필수 컴포넌트(database) 실패 시 unhealthy, 선택 컴포넌트 실패 시 degraded
+    """
+
+    def __init__(self, interval: float = 5.0, timeout: float = 2.0):
+        self.interval = interval
+        self.timeout = timeout
+        self._result: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """프로브 태스크 시작 (첫 결과를 채운 뒤 반환)"""
+        if self._task is not None:
+            return
+        await self.probe_once()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.probe_once()
+            except Exception as e:
+                logger.error(f"헬스 프로브 실패: {e}")
+
+    def get_cached(self) -> Dict[str, Any]:
+        """캐시된 결과 (오래된 결과는 stale 표시)"""
+        if self._result is None:
+            return {"status": "starting", "stale": True, "components": {}}
+        age = time.time() - self._result["checked_at"]
+        result = dict(self._result)
+        result["age_seconds"] = round(age, 3)
+        result["stale"] = age > self.interval * 3
+        return result
+
+    async def probe_once(self) -> Dict[str, Any]:
+        """모든 컴포넌트를 동시에 프로브"""
+        database, timescale, redis_status = await asyncio.gather(
+            self._timed("database", self._probe_sql),
+            self._timed("timescaledb", self._probe_asyncpg),
+            self._timed("redis", self._probe_redis),
+        )
+        components = {
+            "database": database,
+            "timescaledb": timescale,
+            "redis": redis_status,
+        }
+
+        if database["status"] != STATUS_HEALTHY:
+            overall = STATUS_UNHEALTHY
+        elif any(c["status"] not in (STATUS_HEALTHY, STATUS_DISABLED) for c in components.values()):
+            overall = STATUS_DEGRADED
+        else:
+            overall = STATUS_HEALTHY
+
+        self._result = {
+            "status": overall,
+            "checked_at": time.time(),
+            "components": components,
+        }
+        return self._result
+
+    async def _timed(self, name: str, probe) -> Dict[str, Any]:
+        """타임아웃 + 지연시간 측정 래퍼"""
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(probe(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            result = {"status": STATUS_UNHEALTHY, "error": f"timeout after {self.timeout}s"}
+        except Exception as e:
+            result = {"status": STATUS_UNHEALTHY, "error": str(e)}
+
+        latency = time.perf_counter() - started
+        if result["status"] != STATUS_DISABLED:
+            result["latency_ms"] = round(latency * 1000, 2)
+            _probe_latency.set(latency, component=name)
+            _probe_up.set(1 if result["status"] == STATUS_HEALTHY else 0, component=name)
+        saturation = result.get("pool", {}).get("saturation")
+        if saturation is not None:
+            _pool_saturation.set(saturation, pool=name)
+        return result
+
+    async def _probe_sql(self) -> Dict[str, Any]:
+        """SQLAlchemy 엔진 (동기 드라이버이므로 스레드에서 실행)"""
+        from ..dependencies import get_sql_engine
+
+        engine = get_sql_engine()
+
+        def ping():
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        await asyncio.to_thread(ping)
+        return {"status": STATUS_HEALTHY, "pool": _sqlalchemy_pool_stats(engine.pool)}
+
+    async def _probe_asyncpg(self) -> Dict[str, Any]:
+        """TimescaleDB asyncpg 풀 (엔진이 초기화된 경우에만)"""
+        from .. import dependencies
+
+        ts_engine = dependencies._timescale_engine
+        pool = getattr(ts_engine, "connection_pool", None)
+        if pool is None:
+            return {"status": STATUS_DISABLED}
+
+        async with pool.acquire(timeout=self.timeout) as conn:
+            await conn.fetchval("SELECT 1")
+
+        size = pool.get_size()
+        idle = pool.get_idle_size()
+        max_size = pool.get_max_size()
+        return {
+            "status": STATUS_HEALTHY,
+            "pool": {
+                "size": size,
+                "idle": idle,
+                "in_use": size - idle,
+                "max_size": max_size,
+                "saturation": round((size - idle) / max_size, 4) if max_size else None,
+            },
+        }
+
+    async def _probe_redis(self) -> Dict[str, Any]:
+        from ..config import settings
+        from ..dependencies import get_redis_client
+
+        if not settings.redis_enabled:
+            return {"status": STATUS_DISABLED}
+        redis_client = await get_redis_client()
+        if redis_client is None:
+            return {"status": STATUS_UNHEALTHY, "error": "client unavailable"}
+        await redis_client.ping()
+        return {"status": STATUS_HEALTHY}
+
+
+def _sqlalchemy_pool_stats(pool) -> Dict[str, Any]:
+    """QueuePool 통계 (StaticPool 등 미지원 풀은 클래스명만)"""
+    stats: Dict[str, Any] = {"type": type(pool).__name__}
+    if not all(hasattr(pool, attr) for attr in ("size", "checkedout", "overflow")):
+        return stats
+    size = pool.size()
+    checked_out = pool.checkedout()
+    overflow = pool.overflow()
+    capacity = size + max(getattr(pool, "_max_overflow", 0), 0)
+    stats.update({
+        "size": size,
+        "checked_out": checked_out,
+        "overflow": overflow,
+        "saturation": round(checked_out / capacity, 4) if capacity else None,
+    })
+    return stats
+
+
+# 프로세스당 하나의 프로버
+_health_prober: Optional[HealthProber] = None
+
+
+def get_health_prober() -> HealthProber:
+    """헬스 프로버 인스턴스 반환"""
+    global _health_prober
+    if _health_prober is None:
+        from ..config import settings
+        _health_prober = HealthProber(
+            interval=settings.health_probe_interval_seconds,
+            timeout=settings.health_probe_timeout_seconds,
+        )
+    return _health_prober
@@ -0,0 +1,192 @@
+"""
+이벤트 루프 지연(lag) 모니터 + 블로킹 호출 탐지
+- 루프 내부 태스크: 주기적 sleep 의 지연(drift)으로 lag 측정 → 메트릭 노출
+- watchdog 스레드: 루프 하트비트가 임계값 이상 멈추면 루프 스레드의 스택 캡처
+- 같은 블로킹 지점은 rate limit 으로 로그 폭주 방지
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_lag_last = metrics.gauge("banhammer_event_loop_lag_seconds", "Most recent event loop lag")
+_lag_max = metrics.gauge("banhammer_event_loop_lag_max_seconds", "Max event loop lag over the recent window")
+_lag_p99 = metrics.gauge("banhammer_event_loop_lag_p99_seconds", "p99 event loop lag over the recent window")
+_blocked_total = metrics.counter("banhammer_event_loop_blocked_total", "Number of detected event loop stalls")
+
+
+class EventLoopMonitor:
+    """
+    이벤트 루프 지연 모니터
+    - interval: lag 측정 주기 (초)
+    - block_threshold: 이 시간 이상 루프가 멈추면 블로킹으로 판단하고 스택 캡처 (초)
+    - log_cooldown: 같은 스택 위치에 대한 로그 최소 간격 (초)
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        block_threshold: float = 0.1,
+        log_cooldown: float = 60.0,
+        window_size: int = 600
+    ):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.log_cooldown = log_cooldown
+
+        self._samples: Deque[float] = deque(maxlen=window_size)
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # 블로킹 위치별 마지막 로그 시각 / 발생 횟수
+        self._last_logged: Dict[str, float] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._recent_blocks: Deque[Dict] = deque(maxlen=20)
+
+    async def start(self):
+        """모니터 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._measure_loop())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="banhammer-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            f"이벤트 루프 모니터 시작 (interval={self.interval}s, threshold={self.block_threshold}s)"
+        )
+
+    async def stop(self):
+        """모니터 중지"""
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+    async def _measure_loop(self):
+        """sleep 지연으로 lag 측정"""
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            lag = max(0.0, now - expected)
+            self._samples.append(lag)
+            _lag_last.set(lag)
+
+    def _watch(self):
+        """루프가 멈춘 동안 루프 스레드의 스택을 캡처"""
+        check_every = max(self.block_threshold / 2, 0.01)
+        captured_for: Optional[float] = None
+
+        while not self._stop_event.wait(check_every):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled < self.block_threshold:
+                continue
+            # 하나의 정지 구간에서는 한 번만 캡처
+            if captured_for == heartbeat:
+                continue
+            captured_for = heartbeat
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            frame = None
+            _blocked_total.inc()
+            self._report_block(stalled, stack)
+
+    def _report_block(self, stalled: float, stack: traceback.StackSummary):
+        """블로킹 스택 로그 (위치별 rate limit)"""
+        # 가장 안쪽 애플리케이션 프레임을 블로킹 위치로 사용
+        location = "unknown"
+        for entry in reversed(stack):
+            if "site-packages" not in entry.filename and "asyncio" not in entry.filename:
+                location = f"{entry.filename}:{entry.lineno} ({entry.name})"
+                break
+
+        self._recent_blocks.append({
+            "detected_at": time.time(),
+            "stalled_seconds": round(stalled, 4),
+            "location": location,
+            "stack": [f"{e.filename}:{e.lineno} {e.name}" for e in stack[-15:]],
+        })
+
+        now = time.monotonic()
+        last = self._last_logged.get(location)
+        if last is not None and now - last < self.log_cooldown:
+            self._suppressed[location] = self._suppressed.get(location, 0) + 1
+            return
+
+        suppressed = self._suppressed.pop(location, 0)
+        self._last_logged[location] = now
+        logger.warning(
+            f"이벤트 루프 블로킹 감지: {stalled * 1000:.0f}ms 이상 정지, 위치={location}"
+            + (f" (직전 {suppressed}회 로그 생략)" if suppressed else "")
+            + "\n" + "".join(stack.format()[-15:])
+        )
+
+    def get_stats(self) -> Dict:
+        """현재 lag 통계"""
+        samples = sorted(self._samples)
+        if samples:
+            p50 = samples[len(samples) // 2]
+            p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+            max_lag = samples[-1]
+        else:
+            p50 = p99 = max_lag = 0.0
+        _lag_max.set(max_lag)
+        _lag_p99.set(p99)
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "block_threshold_seconds": self.block_threshold,
+            "window_samples": len(samples),
+            "lag_p50_ms": round(p50 * 1000, 2),
+            "lag_p99_ms": round(p99 * 1000, 2),
+            "lag_max_ms": round(max_lag * 1000, 2),
+            "blocked_total": int(_blocked_total.get()),
+            "recent_blocks": list(self._recent_blocks),
+        }
+
+
+# 프로세스당 하나의 모니터
+_loop_monitor: Optional[EventLoopMonitor] = None
+
+
+def get_loop_monitor() -> EventLoopMonitor:
+    """이벤트 루프 모니터 인스턴스 반환"""
+    global _loop_monitor
+    if _loop_monitor is None:
+        from ..config import settings
+        _loop_monitor = EventLoopMonitor(
+            interval=settings.loop_monitor_interval_ms / 1000.0,
+            block_threshold=settings.loop_block_threshold_ms / 1000.0,
+            log_cooldown=settings.loop_block_log_cooldown_seconds,
+        )
+        # 스크레이프 시점에 window 통계를 gauge 에 반영
+        metrics.register_collector(_loop_monitor.get_stats)
+    return _loop_monitor
@@ -0,0 +1,224 @@
+"""
+인메모리 구조체 메모리 사용량 추정
+- 플레이어 키 기반 구조체별 플레이어 수 / 추정 총 바이트 / 플레이어당 p50·p99 바이트
+- 전체 순회 대신 무작위 샘플 플레이어만 deep sizeof 로 측정 (이벤트 루프 점유 최소화)
+- 엔진들은 이미 생성된 경우에만 조회 (측정을 위해 엔진을 새로 만들지 않음)
+"""
+
+import asyncio
+import os
+import random
+import sys
+import logging
+from array import array
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_structure_bytes = metrics.gauge("banhammer_memory_structure_bytes", "Estimated bytes held by in-memory structure")
+_structure_players = metrics.gauge("banhammer_memory_structure_players", "Player count per in-memory structure")
+_structure_p99 = metrics.gauge("banhammer_memory_structure_bytes_per_player_p99", "p99 bytes per player per structure")
+_process_rss = metrics.gauge("banhammer_process_rss_bytes", "Process resident set size")
+
+_MAX_DEPTH = 12
+
+
+@dataclass
+class StructureReport:
+    """구조체별 메모리 리포트"""
+    structure: str
+    players: int
+    sampled: int
+    total_bytes: int
+    mean_bytes_per_player: float
+    p50_bytes_per_player: int
+    p99_bytes_per_player: int
+    max_bytes_per_player: int
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None, depth: int = 0) -> int:
+    """객체 그래프의 대략적인 바이트 크기 (공유 객체는 seen 으로 1회만 계산)"""
+    if seen is None:
+        seen = set()
+    obj_id = id(obj)
+    if obj_id in seen or depth > _MAX_DEPTH:
+        return 0
+    seen.add(obj_id)
+
+    # numpy 배열 등 버퍼 객체
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int) and not isinstance(obj, array):
+        return sys.getsizeof(obj, 0) + nbytes
+
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, array)) or obj is None:
+        return size
+
+    if isinstance(obj, Mapping):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen, depth + 1)
+            size += deep_sizeof(value, seen, depth + 1)
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        for item in obj:
+            size += deep_sizeof(item, seen, depth + 1)
+    else:
+        if hasattr(obj, "__dict__"):
+            size += deep_sizeof(vars(obj), seen, depth + 1)
+        for slot in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, slot):
+                size += deep_sizeof(getattr(obj, slot), seen, depth + 1)
+    return size
+
+
+def measure_mapping(name: str, mapping: Mapping, sample_size: int = 50) -> StructureReport:
+    """플레이어 ID → 데이터 매핑의 메모리 추정"""
+    players = len(mapping)
+    if players == 0:
+        return StructureReport(name, 0, 0, sys.getsizeof(mapping), 0.0, 0, 0, 0)
+
+    try:
+        keys = list(mapping.keys())
+    except RuntimeError:
+        # 측정 중 변경된 경우 (다른 스레드) - 다음 주기에 재측정
+        return StructureReport(name, players, 0, sys.getsizeof(mapping), 0.0, 0, 0, 0)
+
+    sampled_keys = random.sample(keys, min(sample_size, len(keys)))
+    sizes = []
+    for key in sampled_keys:
+        value = mapping.get(key)
+        if value is None:
+            continue
+        sizes.append(deep_sizeof(key) + deep_sizeof(value))
+
+    if not sizes:
+        return StructureReport(name, players, 0, sys.getsizeof(mapping), 0.0, 0, 0, 0)
+
+    sizes.sort()
+    mean = sum(sizes) / len(sizes)
+    return StructureReport(
+        structure=name,
+        players=players,
+        sampled=len(sizes),
+        total_bytes=int(sys.getsizeof(mapping) + mean * players),
+        mean_bytes_per_player=round(mean, 1),
+        p50_bytes_per_player=sizes[len(sizes) // 2],
+        p99_bytes_per_player=sizes[min(len(sizes) - 1, int(len(sizes) * 0.99))],
+        max_bytes_per_player=sizes[-1],
+    )
+
+
+def _ml_structures() -> Iterable[Tuple[str, Mapping]]:
+    """공유 ModelHost 의 플레이어별 구조체 (엔진 / ML API 가 모두 같은 호스트를 쓰므로 한 번만 집계)"""
+    # 모듈이 이미 import 된 경우에만 조회 (무거운 ML 의존성 로딩 방지)
+    host_module = sys.modules.get("app.ml.model_host")
+    host = getattr(host_module, "_model_host", None)
+    if host is None:
+        return
+    yield "ml.feature_buffer.player_buffers", host.feature_buffer.player_buffers
+    yield "ml.regression.player_residuals", host.ensemble_model.regression_model.player_residuals
+
+
+def iter_player_structures() -> Iterable[Tuple[str, Mapping]]:
+    """현재 프로세스에 생성되어 있는 플레이어별 구조체 목록"""
+    from .. import dependencies
+
+    legacy = dependencies._anti_cheat_engine
+    if legacy is not None:
+        yield "legacy.player_actions", legacy.player_actions
+        yield "legacy.violation_scores", legacy.violation_scores
+        yield "legacy.player_stats", legacy.player_stats
+
+    timescale = dependencies._timescale_engine
+    if timescale is not None:
+        yield "timescale.player_cache", timescale.player_cache.entries
+        if timescale.hot_window is not None:
+            yield "timescale.hot_window", timescale.hot_window.windows
+
+    hybrid = dependencies._hybrid_engine
+    if hybrid is not None:
+        yield "hybrid.memory_players", hybrid.memory_players
+
+    # 엔드포인트 모듈은 이미 import 된 경우에만 조회 (무거운 ML 의존성 로딩 방지)
+    universal_module = sys.modules.get("app.api.universal_endpoints")
+    if universal_module is not None:
+        universal = getattr(universal_module, "_universal_engine", None)
+        if universal is not None:
+            for game_id, game_actions in list(universal.player_actions.items()):
+                yield f"universal.player_actions[{game_id}]", game_actions
+            for game_id, game_scores in list(universal.violation_scores.items()):
+                yield f"universal.violation_scores[{game_id}]", game_scores
+
+        plugin_manager = getattr(universal_module, "_plugin_manager", None)
+        if plugin_manager is not None:
+            yield from _plugin_structures(plugin_manager)
+
+    yield from _ml_structures()
+
+
+def _plugin_structures(plugin_manager) -> Iterable[Tuple[str, Mapping]]:
+    """플러그인 인스턴스의 딕셔너리 속성 (플레이어 추적기)"""
+    registries = (
+        plugin_manager.detection_plugins,
+        plugin_manager.data_processor_plugins,
+        plugin_manager.notification_plugins,
+        plugin_manager.analytics_plugins,
+    )
+    for registry in registries:
+        for plugin_name, plugin in list(registry.items()):
+            for attr, value in list(vars(plugin).items()):
+                if attr in ("config", "metadata") or not isinstance(value, dict):
+                    continue
+                yield f"plugin.{plugin_name}.{attr}", value
+
+
+def read_process_rss() -> Optional[int]:
+    """현재 RSS (리눅스 /proc 기준, 불가 시 None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def build_memory_report(sample_size: int = 50) -> Dict[str, Any]:
+    """전체 메모리 리포트 생성 + 메트릭 갱신"""
+    reports: List[StructureReport] = []
+    for name, mapping in iter_player_structures():
+        try:
+            reports.append(measure_mapping(name, mapping, sample_size))
+        except Exception as e:
+            logger.warning(f"메모리 측정 실패 ({name}): {e}")
+
+    for report in reports:
+        _structure_bytes.set(report.total_bytes, structure=report.structure)
+        _structure_players.set(report.players, structure=report.structure)
+        _structure_p99.set(report.p99_bytes_per_player, structure=report.structure)
+
+    rss = read_process_rss()
+    if rss is not None:
+        _process_rss.set(rss)
+
+    tracked_bytes = sum(r.total_bytes for r in reports)
+    return {
+        "process_rss_bytes": rss,
+        "tracked_bytes": tracked_bytes,
+        "sample_size": sample_size,
+        "structures": [
+            asdict(r) for r in sorted(reports, key=lambda r: -r.total_bytes)
+        ],
+    }
+
+
+async def memory_report_task(interval_seconds: float, sample_size: int = 50):
+    """주기적으로 메모리 메트릭 갱신"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            build_memory_report(sample_size)
+        except Exception as e:
+            logger.error(f"메모리 리포트 실패: {e}")
@@ -0,0 +1,123 @@
+"""
+프로세스 내 경량 메트릭 레지스트리
+- gauge / counter (라벨 지원)
+- Prometheus text exposition 형식 출력
+- 수집 시점에 값을 채우는 collector 콜백 지원
+"""
+
+import threading
+import logging
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Metric:
+    """단일 메트릭 (라벨 조합별 값 보관)"""
+
+    def __init__(self, name: str, help_text: str, metric_type: str):
+        self.name = name
+        self.help_text = help_text
+        self.metric_type = metric_type
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> List[Tuple[LabelKey, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+
+class MetricsRegistry:
+    """메트릭 레지스트리"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name: str, help_text: str, metric_type: str) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = Metric(name, help_text, metric_type)
+                self._metrics[name] = metric
+            return metric
+
+    def gauge(self, name: str, help_text: str = "") -> Metric:
+        return self._get_or_create(name, help_text, "gauge")
+
+    def counter(self, name: str, help_text: str = "") -> Metric:
+        return self._get_or_create(name, help_text, "counter")
+
+    def register_collector(self, collector: Callable[[], None]):
+        """수집 직전에 호출되어 gauge 값을 갱신하는 콜백 등록"""
+        self._collectors.append(collector)
+
+    def _run_collectors(self):
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"메트릭 collector 실패: {e}")
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """JSON 응답용 스냅샷"""
+        self._run_collectors()
+        result = {}
+        for name, metric in sorted(self._metrics.items()):
+            result[name] = {
+                "type": metric.metric_type,
+                "values": [
+                    {"labels": dict(labels), "value": value}
+                    for labels, value in metric.samples()
+                ],
+            }
+        return result
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition 형식"""
+        self._run_collectors()
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            if metric.help_text:
+                lines.append(f"# HELP {name} {metric.help_text}")
+            lines.append(f"# TYPE {name} {metric.metric_type}")
+            for labels, value in metric.samples():
+                if labels:
+                    label_str = ",".join(
+                        f'{k}="{_escape(v)}"' for k, v in labels
+                    )
+                    lines.append(f"{name}{{{label_str}}} {value}")
+                else:
+                    lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# 전역 레지스트리
+metrics = MetricsRegistry()
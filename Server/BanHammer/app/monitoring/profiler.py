@@ -0,0 +1,207 @@
+"""
+라이브 워커용 통계적 샘플링 프로파일러
+- sys._current_frames() 기반 주기적 스택 샘플링 (별도 스레드)
+- collapsed stack (flamegraph.pl / speedscope 호환) 출력
+- 이벤트 루프 / executor 스레드 / 기타 스레드별 시간 분류
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 이벤트 루프가 I/O 대기 중일 때 머무는 함수들 (idle 로 분류)
+_IDLE_FUNCTIONS = {"select", "poll", "epoll", "kqueue"}
+_MAX_STACK_DEPTH = 64
+
+
+class ProfilerBusyError(RuntimeError):
+    """이미 다른 프로파일링이 실행 중"""
+
+
+@dataclass
+class ProfileResult:
+    """프로파일링 결과"""
+    duration_seconds: float
+    interval_seconds: float
+    total_samples: int
+    collapsed_stacks: Dict[str, int] = field(default_factory=dict)
+    thread_breakdown: Dict[str, int] = field(default_factory=dict)
+    sampler_cpu_seconds: float = 0.0
+
+    def to_collapsed_text(self) -> str:
+        """flamegraph.pl 입력 형식 ("frame;frame;frame count")"""
+        lines = [
+            f"{stack} {count}"
+            for stack, count in sorted(self.collapsed_stacks.items(), key=lambda x: -x[1])
+        ]
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self, top: int = 50) -> Dict:
+        total = max(self.total_samples, 1)
+        top_stacks = sorted(self.collapsed_stacks.items(), key=lambda x: -x[1])[:top]
+        return {
+            "duration_seconds": round(self.duration_seconds, 3),
+            "interval_ms": round(self.interval_seconds * 1000, 2),
+            "total_samples": self.total_samples,
+            "overhead_ratio": round(self.sampler_cpu_seconds / max(self.duration_seconds, 1e-9), 4),
+            "thread_breakdown": {
+                role: {"samples": count, "ratio": round(count / total, 4)}
+                for role, count in sorted(self.thread_breakdown.items(), key=lambda x: -x[1])
+            },
+            "top_stacks": [
+                {"stack": stack, "samples": count, "ratio": round(count / total, 4)}
+                for stack, count in top_stacks
+            ],
+        }
+
+
+class SamplingProfiler:
+    """
+    프로세스 내 샘플링 프로파일러
+    - 동시에 하나의 프로파일링만 허용 (ProfilerBusyError)
+    - 최대 실행 시간 / 최소 샘플링 간격 / 스택 깊이 제한으로 오버헤드 제한
+    """
+
+    def __init__(self, max_seconds: float = 60.0, min_interval: float = 0.005):
+        self.max_seconds = max_seconds
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._lock.locked()
+
+    async def profile(self, seconds: float, interval: float = 0.01) -> ProfileResult:
+        """현재 프로세스를 seconds 동안 샘플링"""
+        if seconds <= 0 or seconds > self.max_seconds:
+            raise ValueError(f"seconds must be in (0, {self.max_seconds}]")
+        interval = max(interval, self.min_interval)
+
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("Profiler is already running")
+
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            loop_thread_id = threading.get_ident()
+
+            def run():
+                try:
+                    result = self._sample(seconds, interval, loop_thread_id)
+                    loop.call_soon_threadsafe(_set_result, future, result)
+                except BaseException as e:  # 샘플러 스레드 예외를 호출자에게 전달
+                    loop.call_soon_threadsafe(_set_exception, future, e)
+
+            # executor 를 점유하지 않도록 전용 스레드 사용
+            sampler = threading.Thread(target=run, name="banhammer-profiler", daemon=True)
+            sampler.start()
+            result = await future
+            logger.info(
+                f"프로파일링 완료: {result.total_samples} samples, "
+                f"{len(result.collapsed_stacks)} unique stacks"
+            )
+            return result
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float, loop_thread_id: int) -> ProfileResult:
+        """샘플링 루프 (프로파일러 스레드에서 실행)"""
+        own_id = threading.get_ident()
+        stacks: Dict[str, int] = defaultdict(int)
+        breakdown: Dict[str, int] = defaultdict(int)
+        total = 0
+
+        cpu_start = time.thread_time()
+        started = time.perf_counter()
+        deadline = started + seconds
+        next_tick = started
+
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+
+            thread_names = {t.ident: t.name for t in threading.enumerate()}
+            current = sys._current_frames()
+            for thread_id, frame in current.items():
+                if thread_id == own_id:
+                    continue
+                frames = self._walk(frame)
+                role = self._classify(thread_id, thread_names.get(thread_id, ""), loop_thread_id, frames)
+                stacks[";".join([role] + frames)] += 1
+                breakdown[role] += 1
+                total += 1
+            # 프레임 참조를 오래 잡고 있지 않도록 즉시 해제
+            current = frame = None
+
+            next_tick += interval
+            sleep_for = next_tick - time.perf_counter()
+            if sleep_for > 0:
+                time.sleep(sleep_for)
+            else:
+                # 샘플링이 밀렸으면 따라잡지 않고 다음 틱으로 재설정 (오버헤드 제한)
+                next_tick = time.perf_counter()
+
+        return ProfileResult(
+            duration_seconds=time.perf_counter() - started,
+            interval_seconds=interval,
+            total_samples=total,
+            collapsed_stacks=dict(stacks),
+            thread_breakdown=dict(breakdown),
+            sampler_cpu_seconds=time.thread_time() - cpu_start,
+        )
+
+    @staticmethod
+    def _walk(frame) -> List[str]:
+        """바깥쪽 → 안쪽 순서의 프레임 이름 목록"""
+        names = []
+        while frame is not None and len(names) < _MAX_STACK_DEPTH:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        names.reverse()
+        return names
+
+    @staticmethod
+    def _classify(thread_id: int, thread_name: str, loop_thread_id: int, frames: List[str]) -> str:
+        """샘플을 이벤트 루프 / executor / 기타로 분류"""
+        if thread_id == loop_thread_id:
+            innermost = frames[-1].split(" ", 1)[0] if frames else ""
+            return "event_loop_idle" if innermost in _IDLE_FUNCTIONS else "event_loop"
+        if thread_name.startswith(("ThreadPoolExecutor", "asyncio_")):
+            return "executor"
+        return "other_thread"
+
+
+def _set_result(future: asyncio.Future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future, exc: BaseException):
+    if not future.done():
+        future.set_exception(exc)
+
+
+# 프로세스당 하나의 프로파일러
+_profiler: Optional[SamplingProfiler] = None
+
+
+def get_profiler() -> SamplingProfiler:
+    """프로파일러 인스턴스 반환"""
+    global _profiler
+    if _profiler is None:
+        from ..config import settings
+        _profiler = SamplingProfiler(
+            max_seconds=settings.profiler_max_seconds,
+            min_interval=settings.profiler_min_interval_ms / 1000.0,
+        )
+    return _profiler
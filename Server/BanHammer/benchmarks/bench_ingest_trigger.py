@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+player_actions_ts 적재 처리량 벤치마크 (interval_sec 트리거 비용)
+- no_trigger: 트리거 없이 COPY (interval_sec 미계산, 기준선)
+- trigger: 트리거가 모든 행의 직전 행을 조회
+- trigger_prefilled: 적재 경로와 같이 배치 안의 간격을 미리 채우고(fill_batch_intervals) 나머지만 트리거가 조회
+- 모드마다 별도 스키마에 같은 테이블 / 인덱스 / 트리거를 만들고 --seed-rows 만큼 미리 채운 뒤 측정
+- 플레이어 선택은 Zipf 분포 (--skew 가 클수록 소수 헤비 플레이어에 집중), 모드 순서를 바꿔 --repeat 회 반복한 중앙값
+- trigger 와 trigger_prefilled 의 interval_sec 결과가 같은지 확인
+
+사전 조건: 로컬 PostgreSQL (TimescaleDB 확장이 있으면 하이퍼테이블로 생성)
+
+사용법:
+    python benchmarks/bench_ingest_trigger.py --dsn postgresql://... --rows 200000 --players 5000 --skew 1.1 --batch-rows 1000
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import asyncpg
+
+import common
+from app.core.ingest_buffer import ACTION_COLUMNS, fill_batch_intervals
+from app.models.timescale_models import ACTION_INTERVAL_TRIGGER_STATEMENTS
+
+MODES = ("no_trigger", "trigger", "trigger_prefilled")
+ACTION_TYPES = ("click", "move", "attack", "purchase")
+
+
+def make_rows(count: int, players: int, skew: float, start: datetime):
+    """시각 순 액션 (플레이어 Zipf / 액션 타입 무작위, 평균 1ms 간격)"""
+    weights = [1.0 / (rank ** skew) for rank in range(1, players + 1)]
+    cum_weights = list(itertools.accumulate(weights))
+    player_ids = [f"p{i}" for i in range(players)]
+    rows = []
+    current = start
+    for player_id in random.choices(player_ids, cum_weights=cum_weights, k=count):
+        current += timedelta(microseconds=random.randint(1, 2000))
+        rows.append((current, player_id, random.choice(ACTION_TYPES), 1.0, None, None))
+    return rows
+
+
+async def setup_schema(conn: asyncpg.Connection, schema: str, trigger: bool):
+    await conn.execute(f"CREATE SCHEMA {schema}")
+    await conn.execute(f"SET search_path TO {schema}, public")
+    await conn.execute("""
+        CREATE TABLE player_actions_ts (
+            time TIMESTAMPTZ NOT NULL,
+            player_id TEXT NOT NULL,
+            action_type TEXT NOT NULL,
+            value DOUBLE PRECISION DEFAULT 0,
+            metadata JSONB,
+            interval_sec DOUBLE PRECISION
+        )
+    """)
+    try:
+        await conn.execute("SELECT create_hypertable('player_actions_ts', 'time', chunk_time_interval => INTERVAL '1 day')")
+    except asyncpg.PostgresError:
+        pass  # TimescaleDB 확장 없음 → 일반 테이블
+    await conn.execute("CREATE INDEX ON player_actions_ts (player_id, action_type, time)")
+    if trigger:
+        for statement in ACTION_INTERVAL_TRIGGER_STATEMENTS:
+            await conn.execute(statement)
+
+
+async def run_mode(conn: asyncpg.Connection, mode: str, seed, rows, batch_rows: int):
+    schema = f"bench_ingest_{uuid.uuid4().hex[:8]}"
+    await setup_schema(conn, schema, trigger=mode != "no_trigger")
+    try:
+        for offset in range(0, len(seed), batch_rows):
+            await conn.copy_records_to_table(
+                "player_actions_ts", records=seed[offset:offset + batch_rows], columns=ACTION_COLUMNS, schema_name=schema
+            )
+        await conn.execute("ANALYZE player_actions_ts")
+
+        latencies = []
+        started = time.perf_counter()
+        for offset in range(0, len(rows), batch_rows):
+            batch = rows[offset:offset + batch_rows]
+            if mode == "trigger_prefilled":
+                batch = fill_batch_intervals(batch)
+            batch_started = time.perf_counter()
+            await conn.copy_records_to_table("player_actions_ts", records=batch, columns=ACTION_COLUMNS, schema_name=schema)
+            latencies.append(time.perf_counter() - batch_started)
+        elapsed = time.perf_counter() - started
+
+        filled, total = await conn.fetchrow(
+            "SELECT COUNT(interval_sec), COALESCE(SUM(interval_sec), 0) FROM player_actions_ts WHERE time > $1",
+            seed[-1][0] if seed else datetime.min.replace(tzinfo=timezone.utc)
+        )
+    finally:
+        await conn.execute("SET search_path TO DEFAULT")
+        await conn.execute(f"DROP SCHEMA {schema} CASCADE")
+
+    result = common.summarize(mode, latencies, elapsed)
+    return result, len(rows) / elapsed, (filled, round(total, 3))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="interval_sec trigger ingest benchmark")
+    parser.add_argument("--dsn", default=common.DEFAULT_DSN)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--seed-rows", type=int, default=200000, help="측정 전 미리 채울 행 수 (인덱스 깊이)")
+    parser.add_argument("--players", type=int, default=5000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf 지수 (0 이면 균등)")
+    parser.add_argument("--batch-rows", type=int, default=1000, help="COPY 배치 크기 (ACTION_BATCH_ROWS)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    seed_rows = make_rows(args.seed_rows, args.players, args.skew, start)
+    rows = make_rows(args.rows, args.players, args.skew, seed_rows[-1][0] if seed_rows else start)
+    prefilled = sum(1 for record in fill_batch_intervals_all(rows, args.batch_rows) if record[5] is not None)
+
+    conn = await asyncpg.connect(args.dsn)
+    results = {mode: [] for mode in MODES}
+    throughput = {mode: [] for mode in MODES}
+    intervals = {}
+    try:
+        for round_index in range(args.repeat):
+            # 실행 순서에 따른 편향(캐시 / WAL)을 줄이기 위해 모드 순서를 회전
+            for mode in MODES[round_index % len(MODES):] + MODES[:round_index % len(MODES)]:
+                result, rows_per_sec, computed = await run_mode(conn, mode, seed_rows, rows, args.batch_rows)
+                results[mode].append(result)
+                throughput[mode].append(rows_per_sec)
+                intervals[mode] = computed
+    finally:
+        await conn.close()
+
+    median = {mode: statistics.median(values) for mode, values in throughput.items()}
+    print(
+        f"\n{args.rows} rows, {args.players} players (skew {args.skew}), batch {args.batch_rows}, "
+        f"배치 안에서 미리 채운 행 {prefilled / len(rows) * 100:.1f}% (배치 단위 지연, 마지막 반복)"
+    )
+    common.print_table([results[mode][-1] for mode in MODES])
+    for mode in MODES:
+        ratio = median[mode] / median["no_trigger"] if median["no_trigger"] else 0.0
+        print(f"  {mode:>18}: {median[mode]:,.0f} rows/s ({ratio:.2f}x, {args.repeat}회 중앙값), "
+              f"interval_sec 채운 행 {intervals[mode][0]}")
+    match = intervals["trigger"] == intervals["trigger_prefilled"]
+    print(f"trigger / trigger_prefilled interval_sec 일치: {match} {intervals['trigger']} {intervals['trigger_prefilled']}")
+
+
+def fill_batch_intervals_all(rows, batch_rows: int):
+    for offset in range(0, len(rows), batch_rows):
+        yield from fill_batch_intervals(rows[offset:offset + batch_rows])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+SQLite → TimescaleDB 마이그레이션 벤치마크
+- read: 원본 읽기 페이지 지연 (기존 ORDER BY timestamp LIMIT/OFFSET vs rowid 키셋) - TimescaleDB 불필요
+- insert: 배치 적재 방식 (executemany INSERT vs 바이너리 COPY) - 임시 테이블 사용
+- copy_workers: 실제 워커 풀(copy_all_chunks)로 청크 병렬 COPY 만 워커 수별 측정 - 일반 테이블, TimescaleDB 확장 불필요
+- migrate: 전체 마이그레이션(하이퍼테이블 / 검증 포함)을 워커 수별로 실행해 rows/sec 비교 - TimescaleDB 확장 필요
+
+⚠️ copy_workers / migrate 단계는 대상 DB 의 player_summary / player_actions_ts / violations_ts 를 삭제 후 재생성함 (벤치마크 전용 DB 사용)
+
+사용법:
+    python benchmarks/generate_sqlite_fixture.py --out bench_source.db --actions 5000000
+    python benchmarks/bench_migration.py --source bench_source.db --read-rows 1000000
+    python benchmarks/bench_migration.py --source bench_source.db --dsn postgresql://... --workers 1,2,4,8
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+
+import asyncpg
+
+import common
+from migrate_to_timescaledb import (
+    CREATE_CHUNK_TABLE_SQL, TABLE_SPECS, MigrationCheckpoint, SQLiteChunkReader, TimescaleMigration, _action_record,
+    plan_chunks
+)
+
+
+def bench_offset_reads(source: str, rows: int, page: int):
+    """기존 방식: ORDER BY timestamp LIMIT ? OFFSET ? (페이지가 깊어질수록 느려짐)"""
+    conn = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    latencies = []
+    started = time.perf_counter()
+    offset = 0
+    while offset < rows:
+        page_started = time.perf_counter()
+        batch = conn.execute("""
+            SELECT player_id, action_type, timestamp, value, metadata
+            FROM player_actions
+            ORDER BY timestamp
+            LIMIT ? OFFSET ?
+        """, (page, offset)).fetchall()
+        [_action_record(row) for row in batch]
+        latencies.append(time.perf_counter() - page_started)
+        if not batch:
+            break
+        offset += page
+    conn.close()
+    return common.summarize("offset_pages", latencies, time.perf_counter() - started), latencies
+
+
+def bench_keyset_reads(source: str, rows: int, page: int):
+    """새 방식: rowid 키셋 (페이지 깊이와 무관하게 일정)"""
+    reader = SQLiteChunkReader(source)
+    spec = TABLE_SPECS["actions"]
+    latencies = []
+    started = time.perf_counter()
+    last_rowid, read = 0, 0
+    while read < rows:
+        page_started = time.perf_counter()
+        records, last_rowid = reader.fetch_batch(spec, last_rowid, 2 ** 62, page)
+        latencies.append(time.perf_counter() - page_started)
+        if not records:
+            break
+        read += len(records)
+    reader.close()
+    return common.summarize("keyset_pages", latencies, time.perf_counter() - started), latencies
+
+
+async def bench_insert(dsn: str, source: str, rows: int, page: int):
+    """executemany INSERT vs copy_records_to_table (같은 레코드, 임시 테이블)"""
+    reader = SQLiteChunkReader(source)
+    records, _ = reader.fetch_batch(TABLE_SPECS["actions"], 0, 2 ** 62, rows)
+    reader.close()
+    columns = list(TABLE_SPECS["actions"].target_columns)
+
+    conn = await asyncpg.connect(dsn)
+    results = []
+    try:
+        await conn.execute("""
+            CREATE TEMP TABLE bench_actions (
+                time TIMESTAMPTZ NOT NULL, player_id TEXT NOT NULL, action_type TEXT NOT NULL,
+                value DOUBLE PRECISION, metadata JSONB
+            )
+        """)
+        for name in ("executemany", "copy"):
+            await conn.execute("TRUNCATE bench_actions")
+            latencies = []
+            started = time.perf_counter()
+            for i in range(0, len(records), page):
+                batch = records[i:i + page]
+                batch_started = time.perf_counter()
+                if name == "executemany":
+                    await conn.executemany(
+                        "INSERT INTO bench_actions (time, player_id, action_type, value, metadata) VALUES ($1, $2, $3, $4, $5)",
+                        batch
+                    )
+                else:
+                    await conn.copy_records_to_table("bench_actions", records=batch, columns=columns)
+                latencies.append(time.perf_counter() - batch_started)
+            elapsed = time.perf_counter() - started
+            result = common.summarize(f"{name}_batches", latencies, elapsed)
+            result["rows_per_sec"] = len(records) / elapsed if elapsed > 0 else 0.0
+            results.append(result)
+    finally:
+        await conn.close()
+    return results
+
+
+async def bench_copy_workers(dsn: str, source: str, workers: int, chunk_rows: int, batch_rows: int):
+    """청크 계획 → 워커 풀 병렬 COPY 만 (하이퍼테이블 / 집계뷰 / 검증 제외)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        migration = TimescaleMigration(
+            source, dsn,
+            workers=workers,
+            chunk_rows=chunk_rows,
+            batch_size=batch_rows,
+            checkpoint_path=os.path.join(tmp, "checkpoint.json"),
+            progress_interval=3600.0
+        )
+        conn = await asyncpg.connect(dsn)
+        try:
+            for table in ("player_actions_ts", "violations_ts", "player_summary", "migration_chunks"):
+                await conn.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
+            await migration.create_tables(conn)
+            await conn.execute(CREATE_CHUNK_TABLE_SQL)
+        finally:
+            await conn.close()
+
+        totals, chunks = await asyncio.to_thread(plan_chunks, source, migration.tables, chunk_rows)
+        migration.checkpoint = MigrationCheckpoint(
+            path=migration.checkpoint_path, source=source, totals=totals, chunks=chunks
+        )
+        started = time.perf_counter()
+        await migration.copy_all_chunks()
+        elapsed = time.perf_counter() - started
+        return migration.progress.rows_this_run, elapsed
+
+
+async def bench_migrate(dsn: str, source: str, workers: int, chunk_rows: int, batch_rows: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        migration = TimescaleMigration(
+            source, dsn,
+            workers=workers,
+            chunk_rows=chunk_rows,
+            batch_size=batch_rows,
+            checkpoint_path=os.path.join(tmp, "checkpoint.json"),
+            progress_interval=10.0
+        )
+        return await migration.run_migration(post_load=False, verify=True)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", required=True, help="generate_sqlite_fixture.py 로 만든 SQLite 파일")
+    parser.add_argument("--dsn", default=None, help="지정 시 insert / migrate 단계 실행")
+    parser.add_argument("--read-rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=10_000)
+    parser.add_argument("--insert-rows", type=int, default=200_000)
+    parser.add_argument("--workers", default="1,2,4,8", help="copy_workers / migrate 단계 워커 수 목록")
+    parser.add_argument("--chunk-rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    print(f"## read ({args.read_rows:,} rows, page={args.page:,})")
+    rows = []
+    for bench in (bench_offset_reads, bench_keyset_reads):
+        result, latencies = bench(args.source, args.read_rows, args.page)
+        result["first_page_ms"] = latencies[0] * 1000 if latencies else 0.0
+        result["last_page_ms"] = latencies[-1] * 1000 if latencies else 0.0
+        rows.append(result)
+    common.print_table(rows)
+    for result in rows:
+        # OFFSET 은 페이지가 깊어질수록 앞 행을 다시 건너뛰므로 마지막 페이지가 첫 페이지보다 훨씬 느림
+        print(f"  {result['name']}: 첫 페이지 {result['first_page_ms']:.1f} ms → 마지막 페이지 {result['last_page_ms']:.1f} ms")
+
+    if not args.dsn:
+        print("\n--dsn 미지정: insert / migrate 단계 생략")
+        return
+
+    print(f"\n## insert ({args.insert_rows:,} rows, batch={args.page:,})")
+    insert_results = await bench_insert(args.dsn, args.source, args.insert_rows, args.page)
+    common.print_table(insert_results)
+    for result in insert_results:
+        print(f"  {result['name']}: {result['rows_per_sec']:,.0f} rows/s")
+
+    worker_counts = [int(w) for w in args.workers.split(",")]
+    print(f"\n## copy_workers (chunk={args.chunk_rows:,} rows, batch={args.page:,}, 일반 테이블)")
+    baseline = None
+    for workers in worker_counts:
+        rows_copied, elapsed = await bench_copy_workers(args.dsn, args.source, workers, args.chunk_rows, args.page)
+        rate = rows_copied / elapsed if elapsed > 0 else 0.0
+        baseline = baseline or rate
+        print(f"  workers={workers}: {rows_copied:,} rows / {elapsed:.1f}s = {rate:,.0f} rows/s ({rate / baseline:.2f}x)")
+
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        has_timescale = await conn.fetchval("SELECT count(*) FROM pg_available_extensions WHERE name = 'timescaledb'")
+    finally:
+        await conn.close()
+    if not has_timescale:
+        print("\ntimescaledb 확장 없음: migrate 단계 생략")
+        return
+
+    print("\n## migrate (player_summary / player_actions_ts / violations_ts 재생성)")
+    for workers in worker_counts:
+        result = await bench_migrate(args.dsn, args.source, workers, args.chunk_rows, args.page)
+        print(
+            f"  workers={workers}: {result['rows_copied']:,} rows / {result['elapsed_seconds']:.1f}s "
+            f"= {result['rows_per_second']:,.0f} rows/s (verified={result['verified']})"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+ML 모델 호스트 벤치마크
+- engines: 기본 엔진 / 범용 엔진 / /api/ml 엔진을 한 프로세스에 만들 때 모델 로드 횟수, 소요 시간, RSS 증가량,
+  같은 플레이어의 특징 버퍼 공유 여부 (--root 로 이전 체크아웃과 비교 가능)
+- fork: N 개 워커를 fork 했을 때 워커 PSS 합계 (각 워커가 로드 vs 마스터 사전 로드 후 copy-on-write 공유)
+  Linux 전용 (/proc/<pid>/smaps_rollup), 현재 트리 전용
+
+사용법:
+    python benchmarks/bench_model_host.py --trees 200 --workers 4
+    git worktree add /tmp/banhammer-before <이전 커밋>
+    python benchmarks/bench_model_host.py --root /tmp/banhammer-before/Server/BanHammer --skip-fork
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import common
+
+# 훈련된 Random Forest 를 models/random_forest.pkl 로 저장 (CheatDetectionRandomForest.save_model 형식)
+FIXTURE_SCRIPT = r"""
+import sys, joblib, numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+from app.ml.models import CheatDetectionRandomForest
+trees, path = int(sys.argv[1]), sys.argv[2]
+feature_names = CheatDetectionRandomForest()._generate_feature_names()
+X = np.random.default_rng(0).random((20000, len(feature_names)))
+y = (X[:, 0] + X[:, 1] > 1).astype(int)
+model = RandomForestClassifier(n_estimators=trees, max_depth=None, random_state=0, n_jobs=-1).fit(X, y)
+model.n_jobs = None
+scaler = StandardScaler().fit(X)
+joblib.dump({'model': model, 'scaler': scaler, 'feature_names': feature_names, 'is_trained': True}, path)
+print('{}')
+"""
+
+ENGINES_SCRIPT = r"""
+import asyncio, json, time
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * 4096 / (1024 * 1024)
+
+from app.core.anti_cheat import AntiCheatEngine
+from app.core.universal_anti_cheat import UniversalAntiCheatEngine
+from app.api import ml_endpoints
+
+before = rss_mb()
+started = time.perf_counter()
+legacy = AntiCheatEngine(redis_client=None, enable_ml=True)
+universal = UniversalAntiCheatEngine(redis_client=None, enable_ml=True)
+ml_api = ml_endpoints.get_ml_engine()
+elapsed = time.perf_counter() - started
+after = rss_mb()
+
+engines = [legacy.ml_engine, universal.ml_engine, ml_api]
+action = {'player_id': 'p1', 'action_type': 'click', 'timestamp': 1.0, 'value': 1.0, 'metadata': {}}
+
+async def feed():
+    # 기본 엔진 경로로 넣은 액션이 /api/ml 에서도 보이는지
+    for i in range(5):
+        await legacy.ml_engine.analyze_player_ml('p1', dict(action, timestamp=float(i)))
+
+asyncio.run(feed())
+buffers = ml_api.feature_buffer.player_buffers
+seen_by_ml_api = max((len(b) for k, b in buffers.items() if k == 'p1' or (isinstance(k, tuple) and k[-1] == 'p1')), default=0)
+print(json.dumps({
+    'distinct_models': len({id(e.ensemble_model) for e in engines}),
+    'rf_trained': [e.ensemble_model.rf_model.is_trained for e in engines],
+    'elapsed': elapsed,
+    'rss_delta_mb': after - before,
+    'seen_by_ml_api': seen_by_ml_api,
+}))
+"""
+
+FORK_SCRIPT = r"""
+import json, os, signal, sys, time
+workers, preload = int(sys.argv[1]), sys.argv[2] == '1'
+
+def pss_mb(pid):
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Pss:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+from app.ml import model_host
+from app.ml.feature_engineering import PlayerFeatures
+if preload:
+    model_host.preload_model_host()
+
+children = []
+for _ in range(workers):
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        host = model_host.get_model_host()
+        host.ensemble_model.rf_model.predict(PlayerFeatures(player_id='p1'))
+        os.write(write_fd, b'1')
+        os.close(write_fd)
+        time.sleep(600)
+        os._exit(0)
+    os.close(write_fd)
+    children.append((pid, read_fd))
+
+for _, read_fd in children:
+    os.read(read_fd, 1)
+time.sleep(0.5)
+total = sum(pss_mb(pid) for pid, _ in children)
+for pid, _ in children:
+    os.kill(pid, signal.SIGKILL)
+    os.waitpid(pid, 0)
+print(json.dumps({'workers_pss_mb': total, 'master_pss_mb': pss_mb(os.getpid())}))
+"""
+
+
+def run_child(script: str, args, cwd: str, env: dict, timeout: float) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", script, *map(str, args)],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=timeout
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "child failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=common.PROJECT_ROOT, help="측정할 BanHammer 디렉터리")
+    parser.add_argument("--trees", type=int, default=200, help="픽스처 Random Forest 트리 수 (모델 크기)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4, help="fork 단계 워커 수")
+    parser.add_argument("--skip-fork", action="store_true")
+    parser.add_argument("--timeout", type=float, default=600.0)
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.root)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "models"))
+        model_path = os.path.join(tmp, "models", "random_forest.pkl")
+        # 모델 디렉터리는 작업 디렉터리의 models/ (ML_MODEL_DIR 기본값과 이전 버전의 고정 경로 모두 해당)
+        env = dict(
+            os.environ,
+            PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])),
+            DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            REDIS_ENABLED="false",
+            LOG_LEVEL="WARNING",
+        )
+
+        run_child(FIXTURE_SCRIPT, [args.trees, model_path], tmp, env, args.timeout)
+        print(f"fixture: {args.trees} trees, {os.path.getsize(model_path) / (1024 * 1024):.1f} MB")
+
+        print(f"\n## engines ({root})")
+        elapsed, rss = [], []
+        for index in range(args.runs):
+            result = run_child(ENGINES_SCRIPT, [], tmp, env, args.timeout)
+            elapsed.append(result["elapsed"])
+            rss.append(result["rss_delta_mb"])
+            print(
+                f"  run {index + 1}: 모델 로드 {result['distinct_models']}벌 (trained={result['rf_trained']}), "
+                f"{result['elapsed'] * 1000:.0f} ms, RSS +{result['rss_delta_mb']:.0f} MB, "
+                f"기본 엔진 액션 5개 중 /api/ml 버퍼에서 보인 수 = {result['seen_by_ml_api']}"
+            )
+        common.print_table([common.summarize("engine_init", elapsed, sum(elapsed))])
+        print(f"  RSS 증가 평균 {sum(rss) / len(rss):.0f} MB")
+
+        if args.skip_fork:
+            return
+        if not os.path.exists("/proc/self/smaps_rollup"):
+            print("\n/proc/<pid>/smaps_rollup 없음: fork 단계 생략")
+            return
+
+        print(f"\n## fork ({args.workers} workers, PSS 합계)")
+        for preload in (False, True):
+            result = run_child(FORK_SCRIPT, [args.workers, int(preload)], tmp, env, args.timeout)
+            label = "master preload (copy-on-write)" if preload else "worker 별 로드"
+            print(f"  {label}: 워커 PSS 합계 {result['workers_pss_mb']:.0f} MB (마스터 {result['master_pss_mb']:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
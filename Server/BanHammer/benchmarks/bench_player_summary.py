@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+player_summary 갱신 처리량 벤치마크 (편중된 플레이어 활동)
+- direct: 액션마다 INSERT ... ON CONFLICT DO UPDATE (기존 방식, 핫 로우 잠금 경합)
+- batched: SummaryDeltaBuffer 로 플레이어별 델타 누적 후 주기적 다중 행 UPSERT
+- 플레이어 선택은 Zipf 분포 (--skew 가 클수록 소수 헤비 플레이어에 집중)
+
+사전 조건: 로컬 TimescaleDB 에 player_summary 테이블이 생성되어 있어야 함
+
+사용법:
+    python benchmarks/bench_player_summary.py --dsn postgresql://... --actions 20000 --players 1000 --skew 1.2
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+import uuid
+from datetime import datetime
+
+import asyncpg
+
+import common
+from app.core.summary_buffer import SUMMARY_UPSERT_ONE_SQL, SummaryDeltaBuffer, half_life_seconds
+
+RISK_HALF_LIFE = half_life_seconds(24.0)
+
+
+def zipf_sampler(player_ids, skew: float):
+    """순위 기반 Zipf 가중치 샘플러"""
+    weights = [1.0 / (rank ** skew) for rank in range(1, len(player_ids) + 1)]
+    cum_weights = list(itertools.accumulate(weights))
+    return lambda: random.choices(player_ids, cum_weights=cum_weights)[0]
+
+
+def make_actions(player_ids, count: int, skew: float):
+    sample = zipf_sampler(player_ids, skew)
+    actions = []
+    for _ in range(count):
+        violated = random.random() < 0.05
+        actions.append((sample(), random.uniform(1.0, 4.0) if violated else 0.0, 1 if violated else 0))
+    return actions
+
+
+async def run_direct(pool: asyncpg.Pool, actions, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(player_id, risk_delta, violations):
+        async with semaphore:
+            started = time.perf_counter()
+            async with pool.acquire() as conn:
+                await conn.execute(
+                    SUMMARY_UPSERT_ONE_SQL, player_id, datetime.now(), risk_delta, 1, violations, RISK_HALF_LIFE
+                )
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(*a) for a in actions))
+    return common.summarize("direct", latencies, time.perf_counter() - started)
+
+
+async def run_batched(pool: asyncpg.Pool, actions, concurrency: int, flush_interval: float):
+    buffer = SummaryDeltaBuffer(pool, flush_interval=flush_interval, risk_half_life=RISK_HALF_LIFE)
+    buffer.start()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(player_id, risk_delta, violations):
+        async with semaphore:
+            started = time.perf_counter()
+            buffer.add(player_id, datetime.now(), risk_delta, violations)
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0)  # 다른 요청에 양보 (실제 요청 처리 흐름 모사)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(*a) for a in actions))
+    await buffer.close()  # 모든 델타가 DB 에 반영될 때까지 포함
+    result = common.summarize("batched", latencies, time.perf_counter() - started)
+    stats = buffer.get_stats()
+    print(f"batched: {stats['batches_flushed']} batches, {stats['rows_flushed']} rows, "
+          f"coalescing {stats['coalescing_ratio']}x")
+    return result
+
+
+async def verify(pool: asyncpg.Pool, prefix: str, actions):
+    """두 방식 모두 같은 총합을 만들었는지 확인"""
+    async with pool.acquire() as conn:
+        total = await conn.fetchval(
+            "SELECT COALESCE(SUM(total_actions_today), 0) FROM player_summary WHERE player_id LIKE $1",
+            prefix + "%"
+        )
+    return total == len(actions), total
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="player_summary update throughput benchmark")
+    parser.add_argument("--dsn", default=common.DEFAULT_DSN)
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--actions", type=int, default=20000)
+    parser.add_argument("--skew", type=float, default=1.2, help="Zipf 지수 (0 이면 균등)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--flush-interval-ms", type=int, default=1000)
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    pool = await asyncpg.create_pool(args.dsn, min_size=4, max_size=args.concurrency)
+    results = []
+    try:
+        for mode in ("direct", "batched"):
+            prefix = f"bench-summary-{run_id}-{mode}-"
+            player_ids = [f"{prefix}{i}" for i in range(args.players)]
+            actions = make_actions(player_ids, args.actions, args.skew)
+
+            if mode == "direct":
+                results.append(await run_direct(pool, actions, args.concurrency))
+            else:
+                results.append(await run_batched(pool, actions, args.concurrency, args.flush_interval_ms / 1000.0))
+
+            ok, total = await verify(pool, prefix, actions)
+            if not ok:
+                print(f"{mode}: total_actions_today 불일치 ({total} != {len(actions)})")
+    finally:
+        async with pool.acquire() as conn:
+            await conn.execute("DELETE FROM player_summary WHERE player_id LIKE $1", f"bench-summary-{run_id}-%")
+        await pool.close()
+
+    common.print_table(results)
+    if len(results) == 2 and results[0]["throughput_per_sec"] > 0:
+        print(f"\n처리량 개선: {results[1]['throughput_per_sec'] / results[0]['throughput_per_sec']:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+원시 테이블 vs 연속 집계뷰 탐지 쿼리 벤치마크
+- 헤비 플레이어의 최근 1시간 히스토리 크기를 늘려가며 빈도/이상치/활동 쿼리 지연시간 비교
+- raw: player_actions_ts 직접 스캔 (히스토리에 비례)
+- cagg: action_stats_1min / player_activity_1hour 버킷 조회 (히스토리와 무관하게 일정해야 함)
+
+사전 조건: 로컬 TimescaleDB 에 스키마와 연속 집계뷰가 생성되어 있어야 함
+
+사용법:
+    python benchmarks/bench_timescale_aggregates.py --dsn postgresql://... --sizes 100,1000,10000,100000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime
+
+import asyncpg
+
+import common
+
+ACTION_TYPE = "reward_collection"
+
+RAW_QUERIES = {
+    "rate": """
+        SELECT COUNT(*), COALESCE(SUM(value), 0)
+        FROM player_actions_ts
+        WHERE player_id = $1 AND action_type = $2 AND time >= NOW() - INTERVAL '1 minute'
+    """,
+    "anomaly": """
+        SELECT COUNT(*), AVG(value), STDDEV(value)
+        FROM player_actions_ts
+        WHERE player_id = $1 AND action_type = $2 AND value > 0 AND time >= NOW() - INTERVAL '1 hour'
+    """,
+    "activity": """
+        SELECT COUNT(DISTINCT date_trunc('hour', time))
+        FROM player_actions_ts
+        WHERE player_id = $1 AND time >= NOW() - INTERVAL '24 hours' AND $2::text IS NOT NULL
+    """,
+}
+
+CAGG_QUERIES = {
+    "rate": """
+        WITH w AS (
+            SELECT
+                time_bucket('1 minute', NOW()) AS current_bucket,
+                (1 - EXTRACT(EPOCH FROM (NOW() - time_bucket('1 minute', NOW()))) / 60.0)::float8 AS prev_weight
+        )
+        SELECT
+            COALESCE(SUM(CASE WHEN b.bucket = w.current_bucket THEN b.action_count
+                              ELSE b.action_count * w.prev_weight END), 0),
+            COALESCE(SUM(CASE WHEN b.bucket = w.current_bucket THEN b.total_value
+                              ELSE b.total_value * w.prev_weight END), 0)
+        FROM w
+        LEFT JOIN action_stats_1min b
+            ON b.player_id = $1 AND b.action_type = $2
+            AND b.bucket >= w.current_bucket - INTERVAL '1 minute'
+    """,
+    "anomaly": """
+        SELECT
+            SUM(positive_count),
+            SUM(positive_sum) / NULLIF(SUM(positive_count), 0),
+            SUM(positive_sum_sq)
+        FROM action_stats_1min
+        WHERE player_id = $1 AND action_type = $2
+            AND bucket >= time_bucket('1 minute', NOW() - INTERVAL '1 hour')
+    """,
+    "activity": """
+        SELECT COUNT(DISTINCT bucket)
+        FROM player_activity_1hour
+        WHERE player_id = $1 AND bucket >= time_bucket('1 hour', NOW() - INTERVAL '24 hours')
+            AND $2::text IS NOT NULL
+    """,
+}
+
+
+async def prefill(conn: asyncpg.Connection, player_id: str, rows: int):
+    """최근 1시간에 고르게 분포된 히스토리 적재 (time 은 PK 일부이므로 마이크로초 단위로 분산)"""
+    now = time.time()
+    records = [
+        (datetime.fromtimestamp(now - 3600 + i * 3600.0 / rows), player_id, ACTION_TYPE,
+         random.uniform(1, 100), None)
+        for i in range(rows)
+    ]
+    await conn.copy_records_to_table(
+        "player_actions_ts",
+        records=records,
+        columns=["time", "player_id", "action_type", "value", "metadata"]
+    )
+
+
+async def refresh_aggregates(dsn: str):
+    """히스토리 대부분을 구체화 (refresh_continuous_aggregate 는 트랜잭션 밖에서 실행)"""
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.execute("CALL refresh_continuous_aggregate('action_stats_1min', NOW() - INTERVAL '2 hours', NULL)")
+        await conn.execute("CALL refresh_continuous_aggregate('player_activity_1hour', NOW() - INTERVAL '1 day', NULL)")
+    finally:
+        await conn.close()
+
+
+async def time_query(conn: asyncpg.Connection, sql: str, player_id: str, iterations: int):
+    await conn.fetchrow(sql, player_id, ACTION_TYPE)  # 워밍업 (플랜 캐시)
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        await conn.fetchrow(sql, player_id, ACTION_TYPE)
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Raw table vs continuous aggregate detector query benchmark")
+    parser.add_argument("--dsn", default=common.DEFAULT_DSN)
+    parser.add_argument("--sizes", default="100,1000,10000,100000", help="최근 1시간 히스토리 행 수 (쉼표 구분)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--no-refresh", action="store_true", help="연속 집계 새로고침 생략 (real-time 보충 경로 측정)")
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    prefix = f"bench-agg-{run_id}-"
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    conn = await asyncpg.connect(args.dsn)
+    results = []
+    try:
+        for size in sizes:
+            player_id = f"{prefix}{size}"
+            await prefill(conn, player_id, size)
+            if not args.no_refresh:
+                await refresh_aggregates(args.dsn)
+
+            for name in RAW_QUERIES:
+                for source, queries in (("raw", RAW_QUERIES), ("cagg", CAGG_QUERIES)):
+                    latencies, elapsed = await time_query(conn, queries[name], player_id, args.iterations)
+                    results.append(common.summarize(f"{name}/{source}/{size}", latencies, elapsed))
+    finally:
+        await conn.execute("DELETE FROM player_actions_ts WHERE player_id LIKE $1", prefix + "%")
+        await conn.close()
+        if not args.no_refresh:
+            await refresh_aggregates(args.dsn)
+
+    common.print_table(results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+TimescaleAntiCheatEngine 탐지 경로 벤치마크
+- legacy: 저장 + 탐지기별 개별 쿼리 (5~6 라운드트립)
+- combined: 저장 + 전체 탐지기 입력을 단일 CTE 쿼리로 조회 (1 라운드트립)
+  (기본은 COPY 마이크로 배치 적재, --direct-insert 로 CTE 내 직접 INSERT)
+
+사전 조건: 로컬 TimescaleDB 에 스키마가 생성되어 있어야 함 (python manage.py init-db --timescale-only)
+
+사용법:
+    python benchmarks/bench_timescale_detection.py --dsn postgresql://... --actions 5000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime
+
+import common
+from app.core.timescale_anti_cheat import TimescaleAntiCheatEngine, PlayerAction
+
+ACTION_TYPES = ["reward_collection", "resource_gather", "combat", "trade", "purchase"]
+
+
+async def prefill_history(engine: TimescaleAntiCheatEngine, player_ids, rows_per_player: int):
+    """헤비 플레이어 시뮬레이션용 과거 1시간 히스토리 적재"""
+    if rows_per_player <= 0:
+        return
+    now = time.time()
+    records = []
+    for player_id in player_ids:
+        for i in range(rows_per_player):
+            ts = now - 3600 + (i * 3600.0 / rows_per_player)
+            records.append((
+                datetime.fromtimestamp(ts), player_id, random.choice(ACTION_TYPES),
+                random.uniform(1, 100), None
+            ))
+    async with engine.connection_pool.acquire() as conn:
+        await conn.copy_records_to_table(
+            "player_actions_ts",
+            records=records,
+            columns=["time", "player_id", "action_type", "value", "metadata"]
+        )
+
+
+async def run_mode(args, combined: bool, run_id: str):
+    mode = "combined" if combined else "legacy"
+    engine = TimescaleAntiCheatEngine(
+        db_url=args.dsn,
+        combined_detection=combined,
+        ingest_batching=not args.direct_insert
+    )
+    await engine.init_connection_pool()
+
+    prefix = f"bench-{run_id}-{mode}-"
+    player_ids = [f"{prefix}{i}" for i in range(args.players)]
+    await prefill_history(engine, player_ids, args.history)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one(i: int):
+        action = PlayerAction(
+            player_id=player_ids[i % len(player_ids)],
+            action_type=random.choice(ACTION_TYPES),
+            timestamp=time.time(),
+            value=random.uniform(1, 100),
+            metadata={"bench": True}
+        )
+        async with semaphore:
+            started = time.perf_counter()
+            await engine.analyze_action(action)
+            latencies.append(time.perf_counter() - started)
+
+    # 워밍업 (커넥션/플랜 캐시)
+    await asyncio.gather(*(one(i) for i in range(min(200, args.actions))))
+    latencies.clear()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.actions)))
+    elapsed = time.perf_counter() - started
+
+    # 정리 (배치 버퍼에 남은 행을 먼저 적재한 뒤 삭제)
+    if engine.ingest_buffer:
+        await engine.ingest_buffer.flush()
+    async with engine.connection_pool.acquire() as conn:
+        for table in ("player_actions_ts", "violations_ts", "player_summary"):
+            await conn.execute(f"DELETE FROM {table} WHERE player_id LIKE $1", prefix + "%")
+    await engine.close()
+
+    return common.summarize(mode, latencies, elapsed)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Timescale detection path benchmark")
+    parser.add_argument("--dsn", default=common.DEFAULT_DSN)
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--actions", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--history", type=int, default=500, help="플레이어당 사전 적재 행 수")
+    parser.add_argument("--mode", choices=["both", "legacy", "combined"], default="both")
+    parser.add_argument("--direct-insert", action="store_true", help="COPY 배치 적재 대신 직접 INSERT")
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    results = []
+    if args.mode in ("both", "legacy"):
+        results.append(await run_mode(args, combined=False, run_id=run_id))
+    if args.mode in ("both", "combined"):
+        results.append(await run_mode(args, combined=True, run_id=run_id))
+
+    common.print_table(results)
+    if len(results) == 2 and results[1]["p50_ms"] > 0:
+        print(f"\np50 개선: {results[0]['p50_ms'] / results[1]['p50_ms']:.2f}x, "
+              f"처리량 개선: {results[1]['throughput_per_sec'] / max(results[0]['throughput_per_sec'], 1e-9):.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
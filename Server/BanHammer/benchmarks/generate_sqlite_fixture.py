@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+마이그레이션 벤치마크용 SQLite 원본 생성 (기존 SQLAlchemy 스키마와 같은 테이블 / 인덱스)
+- players / player_actions / violations 를 지정한 행 수만큼 생성
+- 액션 시각은 기간 내에서 단조 증가 (실서비스처럼 rowid 순서 ≈ 시간 순서)
+- 같은 --seed 로 같은 파일 생성
+
+사용법:
+    python benchmarks/generate_sqlite_fixture.py --out bench_source.db --players 100000 --actions 5000000
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+SCHEMA_SQL = """
+CREATE TABLE players (
+    id VARCHAR NOT NULL PRIMARY KEY,
+    username VARCHAR(50) NOT NULL,
+    created_at DATETIME,
+    last_activity DATETIME,
+    risk_score FLOAT,
+    is_banned BOOLEAN,
+    ban_reason TEXT,
+    ban_timestamp DATETIME
+);
+CREATE TABLE player_actions (
+    id INTEGER NOT NULL PRIMARY KEY,
+    player_id VARCHAR NOT NULL REFERENCES players (id),
+    action_type VARCHAR(50) NOT NULL,
+    timestamp DATETIME,
+    value FLOAT,
+    metadata TEXT
+);
+CREATE INDEX idx_player_timestamp ON player_actions (player_id, timestamp);
+CREATE INDEX idx_action_type ON player_actions (action_type);
+CREATE INDEX idx_timestamp ON player_actions (timestamp);
+CREATE TABLE violations (
+    id INTEGER NOT NULL PRIMARY KEY,
+    player_id VARCHAR NOT NULL REFERENCES players (id),
+    violation_type VARCHAR(50) NOT NULL,
+    severity FLOAT NOT NULL,
+    timestamp DATETIME,
+    details TEXT,
+    resolved BOOLEAN,
+    reviewed_by VARCHAR(50),
+    review_timestamp DATETIME
+);
+CREATE INDEX idx_player_violation ON violations (player_id, timestamp);
+CREATE INDEX idx_violation_type ON violations (violation_type);
+CREATE INDEX idx_severity ON violations (severity);
+CREATE INDEX idx_unresolved ON violations (resolved, timestamp);
+"""
+
+ACTION_TYPES = ["reward_collection", "resource_gather", "level_progress", "purchase", "kill_monster", "use_skill"]
+VIOLATION_TYPES = ["rate_limit_exceeded", "suspicious_behavior", "anomaly_detected", "bot_detected"]
+INSERT_BATCH = 50_000
+
+
+def _timestamps(count: int, start: datetime, days: int, rng: random.Random):
+    """기간 안에서 단조 증가하는 시각 문자열"""
+    step = days * 86400 / max(count, 1)
+    current = start
+    for _ in range(count):
+        current += timedelta(seconds=rng.uniform(0, 2 * step))
+        yield current.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def generate(path: str, players: int, actions: int, violations: int, days: int, seed: int):
+    if os.path.exists(path):
+        os.remove(path)
+    rng = random.Random(seed)
+    start = datetime.now() - timedelta(days=days)
+
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_SQL)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+
+    player_ids = [f"player_{i:08d}" for i in range(players)]
+    created = start.strftime('%Y-%m-%d %H:%M:%S')
+    conn.executemany(
+        "INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (pid, f"user{i}", created, created, round(rng.random() * 10, 3), rng.random() < 0.01, None, None)
+            for i, pid in enumerate(player_ids)
+        )
+    )
+
+    def action_rows():
+        for timestamp in _timestamps(actions, start, days, rng):
+            metadata = json.dumps({"source": "bench", "level": rng.randint(1, 99)}) if rng.random() < 0.2 else None
+            yield (rng.choice(player_ids), rng.choice(ACTION_TYPES), timestamp, round(rng.expovariate(0.02), 3), metadata)
+
+    def violation_rows():
+        for timestamp in _timestamps(violations, start, days, rng):
+            details = json.dumps({"pattern": "bench", "score": rng.random()})
+            yield (rng.choice(player_ids), rng.choice(VIOLATION_TYPES), round(rng.uniform(0.5, 5.0), 2), timestamp, details, rng.random() < 0.3)
+
+    for sql, rows in (
+        ("INSERT INTO player_actions (player_id, action_type, timestamp, value, metadata) VALUES (?, ?, ?, ?, ?)", action_rows()),
+        ("INSERT INTO violations (player_id, violation_type, severity, timestamp, details, resolved) VALUES (?, ?, ?, ?, ?, ?)", violation_rows()),
+    ):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= INSERT_BATCH:
+                conn.executemany(sql, batch)
+                batch.clear()
+        if batch:
+            conn.executemany(sql, batch)
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default="bench_source.db")
+    parser.add_argument("--players", type=int, default=100_000)
+    parser.add_argument("--actions", type=int, default=5_000_000)
+    parser.add_argument("--violations", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    generate(args.out, args.players, args.actions, args.violations, args.days, args.seed)
+    size_mb = os.path.getsize(args.out) / 1024 / 1024
+    print(
+        f"{args.out}: players={args.players:,} actions={args.actions:,} violations={args.violations:,} "
+        f"({size_mb:,.1f} MB, {time.perf_counter() - started:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
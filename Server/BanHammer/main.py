@@ -1,16 +1,19 @@
 from fastapi import FastAPI, BackgroundTasks
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 import asyncio
 from contextlib import asynccontextmanager
 
 from app.api.endpoints import router
-from app.api.ml_endpoints import router as ml_router
-from app.api.universal_endpoints import router as universal_router
-from app.api.timescale_endpoints import router as timescale_router
+from app.api.admin_endpoints import router as admin_router
 from app.middleware import AntiCheatMiddleware, SecurityHeadersMiddleware, RequestLoggingMiddleware
 from app.config import settings
-from app.dependencies import get_anti_cheat_engine
+from app import dependencies
+from app.dependencies import get_anti_cheat_engine, get_prefilter, get_dual_writer, close_engines
+from app.monitoring.loop_monitor import get_loop_monitor
+from app.monitoring.memory import memory_report_task
+from app.monitoring.health import get_health_prober, STATUS_UNHEALTHY
 
 # Configure logging
 logging.basicConfig(
@@ -20,6 +23,11 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# gunicorn --preload: fork 전 마스터에서 모델 로드 → 워커들이 공유
+if settings.ml_preload_models:
+    from app.ml.model_host import preload_model_host
+    preload_model_host()
+
 # Background task for cleaning up old data
 async def cleanup_task():
     """Background task to clean up old anti-cheat data."""
@@ -27,6 +35,8 @@ async def cleanup_task():
         try:
             anti_cheat = await get_anti_cheat_engine()
             await anti_cheat.cleanup_old_data()
+            if dependencies._hybrid_engine is not None:
+                await dependencies._hybrid_engine.cleanup_old_data()
             logger.info("Completed anti-cheat data cleanup")
         except Exception as e:
             logger.error(f"Error in cleanup task: {e}")
@@ -42,15 +52,49 @@ async def lifespan(app: FastAPI):
     # Start background cleanup task
     cleanup_task_handle = asyncio.create_task(cleanup_task())
     
+    # Start event loop lag monitor
+    if settings.loop_monitor_enabled:
+        await get_loop_monitor().start()
+    
+    # Start periodic memory accounting
+    memory_task_handle = None
+    if settings.memory_report_interval_seconds > 0:
+        memory_task_handle = asyncio.create_task(memory_report_task(
+            settings.memory_report_interval_seconds,
+            settings.memory_report_sample_size
+        ))
+    
+    # Start background health probing
+    await get_health_prober().start()
+    
+    # Start ingress pre-filter banned-list sync
+    prefilter = get_prefilter()
+    if prefilter:
+        await prefilter.start()
+    
+    # Start TimescaleDB dual-write writer (replays any journal left by the previous run)
+    await get_dual_writer()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down BanHammer Anti-Cheat API")
-    cleanup_task_handle.cancel()
-    try:
-        await cleanup_task_handle
-    except asyncio.CancelledError:
-        pass
+    await get_health_prober().stop()
+    if prefilter:
+        await prefilter.stop()
+    if settings.loop_monitor_enabled:
+        await get_loop_monitor().stop()
+    for handle in (cleanup_task_handle, memory_task_handle):
+        if handle is None:
+            continue
+        handle.cancel()
+        try:
+            await handle
+        except asyncio.CancelledError:
+            pass
+    
+    # Flush buffered action writes and close DB pools
+    await close_engines()
 
 # Create FastAPI app
 app = FastAPI(
@@ -87,7 +131,7 @@ app.add_middleware(
     allow_origins=settings.allowed_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["Authorization", "Content-Type", "X-Player-ID"],
+    allow_headers=["Authorization", "Content-Type", "X-Player-ID", "X-Admin-Token"],
 )
 
 # Add custom middleware
@@ -99,11 +143,21 @@ app.add_middleware(SecurityHeadersMiddleware)
 if settings.rate_limiting_enabled:
     app.add_middleware(AntiCheatMiddleware, rate_limit_enabled=True)
 
-# Include API routes
+# Include API routes (optional engines per ENABLED_ENGINES; disabled ones are never imported or initialized)
 app.include_router(router, prefix="/api", tags=["anti-cheat"])
-app.include_router(ml_router, prefix="/api/ml", tags=["machine-learning"])
-app.include_router(universal_router, prefix="/api/universal", tags=["universal-anti-cheat"])
-app.include_router(timescale_router, prefix="/api/ts", tags=["timescale-anti-cheat"])
+if settings.engine_enabled("ml"):
+    from app.api.ml_endpoints import router as ml_router
+    app.include_router(ml_router, prefix="/api/ml", tags=["machine-learning"])
+if settings.engine_enabled("universal"):
+    from app.api.universal_endpoints import router as universal_router
+    app.include_router(universal_router, prefix="/api/universal", tags=["universal-anti-cheat"])
+if settings.engine_enabled("timescale"):
+    from app.api.timescale_endpoints import router as timescale_router
+    app.include_router(timescale_router, prefix="/api/ts", tags=["timescale-anti-cheat"])
+app.include_router(admin_router, prefix="/api/admin", tags=["admin"])
+if settings.engine_enabled("hybrid"):
+    from app.api.hybrid_endpoints import router as hybrid_router
+    app.include_router(hybrid_router, prefix="/api/hybrid", tags=["hybrid-anti-cheat"])
 
 @app.get("/", tags=["health"])
 async def root():
@@ -116,38 +170,24 @@ async def root():
 
 @app.get("/health", tags=["health"])
 async def health_check():
-    """Detailed health check with system status."""
-    try:
-        # Check database connectivity
-        from app.dependencies import SessionLocal
-        db = SessionLocal()
-        db.execute("SELECT 1")
-        db.close()
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
-    
-    try:
-        # Check Redis connectivity
-        from app.dependencies import get_redis_client
-        redis_client = await get_redis_client()
-        if redis_client:
-            await redis_client.ping()
-            redis_status = "healthy"
-        else:
-            redis_status = "disabled"
-    except Exception as e:
-        redis_status = f"error: {str(e)}"
+    """
+    Detailed health check with system status.
     
-    return {
+    Served from the background prober cache; no I/O is done per request.
+    """
+    result = get_health_prober().get_cached()
+    body = {
         "service": "BanHammer Anti-Cheat API",
         "version": settings.api_version,
-        "status": "healthy",
-        "components": {
-            "database": db_status,
-            "redis": redis_status,
-        }
+        **result
     }
+    status_code = 503 if result["status"] == STATUS_UNHEALTHY or result["stale"] else 200
+    return JSONResponse(content=body, status_code=status_code)
+
+@app.get("/livez", tags=["health"])
+async def liveness_check():
+    """Liveness check (process is up and the event loop is responsive)."""
+    return {"status": "alive"}
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+BanHammer 운영 명령
+
+사용법:
+    python manage.py init-db                 # 기존 DB 테이블 + TimescaleDB 하이퍼테이블 / 집계뷰 / 보존 정책
+    python manage.py init-db --legacy-only   # 기존 DB(DATABASE_URL) 만
+    python manage.py init-db --timescale-only
+
+서버는 시작 시 스키마를 만들지 않으므로 배포 / 업그레이드 때 한 번 실행합니다 (반복 실행해도 안전).
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+from app.config import settings
+from app.dependencies import create_sql_engine
+
+logger = logging.getLogger("manage")
+
+
+def init_legacy_db() -> None:
+    from app.models.database import Base
+
+    engine = create_sql_engine(settings.database_url)
+    try:
+        Base.metadata.create_all(bind=engine)
+    finally:
+        engine.dispose()
+
+
+def init_timescaledb() -> None:
+    from app.models.timescale_models import create_hypertables
+
+    engine = create_sql_engine(settings.timescaledb_url)
+    try:
+        create_hypertables(engine)
+    finally:
+        engine.dispose()
+
+
+def cmd_init_db(args: argparse.Namespace) -> int:
+    steps = []
+    if not args.timescale_only:
+        steps.append(("legacy", settings.database_url, init_legacy_db))
+    if not args.legacy_only:
+        steps.append(("timescale", settings.timescaledb_url, init_timescaledb))
+
+    failed = False
+    for name, url, step in steps:
+        started = time.perf_counter()
+        try:
+            step()
+            logger.info(f"✅ {name} 스키마 준비 완료 ({time.perf_counter() - started:.2f}s)")
+        except Exception as e:
+            failed = True
+            logger.error(f"❌ {name} 스키마 생성 실패 ({url.split('@')[-1]}): {e}")
+    return 1 if failed else 0
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="BanHammer 운영 명령")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init_db = commands.add_parser("init-db", help="DB 스키마 생성 (한 번 실행)")
+    scope = init_db.add_mutually_exclusive_group()
+    scope.add_argument("--legacy-only", action="store_true", help="기존 DB(DATABASE_URL) 만")
+    scope.add_argument("--timescale-only", action="store_true", help="TimescaleDB(TIMESCALEDB_URL) 만")
+    init_db.set_defaults(handler=cmd_init_db)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
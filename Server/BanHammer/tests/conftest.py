@@ -0,0 +1,12 @@
+"""
+테스트 공용 설정
+- tests/ 에서 실행해도 app 패키지를 import 할 수 있도록 프로젝트 루트를 sys.path 에 추가
+- 외부 서비스(DB / Redis) 없이 실행되는 순수 컴포넌트 단위 테스트만 둠
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
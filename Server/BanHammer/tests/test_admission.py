@@ -0,0 +1,84 @@
+"""커넥션 진입 제어: 요청 전체 기한을 쿼리 timeout 으로 전달"""
+
+import asyncio
+
+import pytest
+
+from app.core.admission import PoolAdmissionController, PoolSaturatedError
+
+
+class FakeConnection:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.timeouts = []
+
+    async def fetchval(self, query, *args, column=0, timeout=None):
+        self.timeouts.append(timeout)
+        await asyncio.wait_for(asyncio.sleep(self.delay), timeout)
+        return 1
+
+
+class FakePool:
+    def __init__(self, conn: FakeConnection):
+        self.conn = conn
+        self.released = 0
+
+    async def acquire(self, timeout=None):
+        return self.conn
+
+    async def release(self, conn):
+        self.released += 1
+
+
+def test_queries_receive_remaining_request_budget():
+    conn = FakeConnection()
+    admission = PoolAdmissionController(FakePool(conn), acquire_timeout=0.2, request_timeout=0.5)
+
+    async def scenario():
+        async with admission.acquire() as admitted:
+            await admitted.fetchval("SELECT 1")
+            await asyncio.sleep(0.1)
+            await admitted.fetchval("SELECT 1")
+
+    asyncio.run(scenario())
+    first, second = conn.timeouts
+    assert 0.4 < first <= 0.5
+    assert second < first - 0.09
+
+
+def test_slow_query_exceeds_deadline_and_releases_connection():
+    conn = FakeConnection(delay=1.0)
+    pool = FakePool(conn)
+    admission = PoolAdmissionController(pool, request_timeout=0.05)
+
+    async def scenario():
+        async with admission.acquire() as admitted:
+            await admitted.fetchval("SELECT pg_sleep(1)")
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(scenario())
+    assert pool.released == 1
+    assert admission.deadline_exceeded == 1
+
+
+def test_without_request_timeout_connection_is_unwrapped():
+    conn = FakeConnection()
+    admission = PoolAdmissionController(FakePool(conn))
+
+    async def scenario():
+        async with admission.acquire() as admitted:
+            assert admitted is conn
+
+    asyncio.run(scenario())
+
+
+def test_queue_full_rejects_without_waiting():
+    admission = PoolAdmissionController(FakePool(FakeConnection()), max_waiters=0)
+
+    async def scenario():
+        async with admission.acquire():
+            pass
+
+    with pytest.raises(PoolSaturatedError) as error:
+        asyncio.run(scenario())
+    assert error.value.reason == "queue_full"
@@ -0,0 +1,74 @@
+"""LRU + TTL 캐시: 축출 순서 / 만료 / 무효화 / 통계"""
+
+import pytest
+
+from app.core.cache import LRUTTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_evicts_least_recently_used():
+    cache = LRUTTLCache(max_size=2, ttl_seconds=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a 가 최근 사용
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_put_existing_key_refreshes_position_without_eviction():
+    cache = LRUTTLCache(max_size=2, ttl_seconds=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+
+    assert cache.get("a") == 10
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_entries_expire_by_default_and_per_item_ttl():
+    clock = FakeClock()
+    cache = LRUTTLCache(max_size=10, ttl_seconds=5.0, clock=clock)
+    cache.put("short", 1, ttl_seconds=1.0)
+    cache.put("default", 2)
+
+    clock.now = 1.0
+    assert cache.get("short", "missing") == "missing"
+    assert cache.get("default") == 2
+
+    clock.now = 5.0
+    assert cache.purge_expired() == 1
+    assert len(cache) == 0
+    assert cache.expirations == 2
+
+
+def test_invalidate_and_stats():
+    cache = LRUTTLCache(max_size=10, ttl_seconds=None, name="players")
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert cache.invalidate("a") is True
+    assert cache.invalidate("a") is False
+    assert cache.invalidate_many(["b", "missing"]) == 1
+    assert cache.get("a") is None
+
+    stats = cache.get_stats()
+    assert stats["name"] == "players"
+    assert stats["invalidations"] == 2
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (0, 1, 0.0)
+
+
+def test_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        LRUTTLCache(max_size=0)
@@ -0,0 +1,77 @@
+"""탐지기 스케줄러: 주기 / 액션 타입별 상태 / 스윕 결과 1회 판정"""
+
+from app.core.detector_scheduler import DetectorCadence, DetectorScheduler, parse_cadences
+
+
+def run_plan(scheduler, player_id, action_type, now):
+    plan = scheduler.plan(player_id, action_type, now=now)
+    due = {name for name in scheduler.cadences if plan.due(name)}
+    for name in due:
+        plan.ran(name)
+    return due
+
+
+def test_parse_cadences():
+    cadences = parse_cadences("timing=30s, sequence=5, activity=sweep")
+    assert cadences == {
+        "timing": DetectorCadence(every_seconds=30.0),
+        "sequence": DetectorCadence(every_n_actions=5),
+        "activity": DetectorCadence(sweep=True),
+    }
+    assert DetectorCadence.parse("always").describe() == "always"
+
+
+def test_every_n_actions_and_seconds():
+    scheduler = DetectorScheduler(parse_cadences("sequence=3,timing=10s"))
+
+    runs = [run_plan(scheduler, "p1", "click", 1000.0 + i) for i in range(7)]
+    # 첫 액션은 항상 실행, 이후 3 액션마다
+    assert [("sequence" in due) for due in runs] == [True, False, False, True, False, False, True]
+    # 10초 주기: 1000 에 실행 후 1006 까지는 생략
+    assert [("timing" in due) for due in runs] == [True] + [False] * 6
+    assert "timing" in run_plan(scheduler, "p1", "click", 1010.0)
+
+    stats = scheduler.get_stats()["detectors"]["sequence"]
+    assert stats["inline_runs"] + stats["skipped"] == 8
+
+
+def test_per_action_type_state_is_independent():
+    scheduler = DetectorScheduler(parse_cadences("timing=3,sequence=3"), per_action_type={"timing"})
+
+    assert run_plan(scheduler, "p1", "click", 1000.0) == {"timing", "sequence"}
+    assert run_plan(scheduler, "p1", "click", 1001.0) == set()
+    assert run_plan(scheduler, "p1", "click", 1002.0) == set()
+    # 다른 타입의 첫 액션은 타이밍이 새로 실행됨 (시퀀스는 플레이어 단위로 3번째 액션)
+    assert run_plan(scheduler, "p1", "move", 1002.5) == {"timing", "sequence"}
+    # move 실행이 click 의 카운트를 초기화하지 않으므로 click 3번째 액션에서 실행
+    assert run_plan(scheduler, "p1", "click", 1003.0) == {"timing"}
+
+def test_violations_tighten_cadence():
+    scheduler = DetectorScheduler(parse_cadences("sequence=8"), tighten_factor=4.0, hot_seconds=60.0)
+    run_plan(scheduler, "p1", "click", 1000.0)
+    scheduler.note_violations("p1", 5.0, now=1000.0)
+
+    runs = [run_plan(scheduler, "p1", "click", 1001.0 + i) for i in range(4)]
+    assert ["sequence" in due for due in runs] == [False, True, False, True]
+
+    # 축소 유지 시간이 지나면 원래 주기
+    runs = [run_plan(scheduler, "p1", "click", 1100.0 + i) for i in range(8)]
+    assert sum("sequence" in due for due in runs) == 1
+
+
+def test_sweep_result_is_judged_once():
+    scheduler = DetectorScheduler(parse_cadences("activity=sweep"))
+    assert run_plan(scheduler, "p1", "click", 1000.0) == {"activity"}
+
+    plan = scheduler.plan("p1", "click", now=1001.0)
+    assert not plan.due("activity")
+    assert plan.take_sweep_result("activity") is None
+
+    assert scheduler.take_sweep_candidates() == ["p1"]
+    scheduler.store_sweep_results("activity", {"p1": 20}, ["p1"], default=0, now=1060.0)
+    assert scheduler.take_sweep_candidates() == []
+
+    first = scheduler.plan("p1", "click", now=1061.0)
+    assert first.take_sweep_result("activity") == 20
+    second = scheduler.plan("p1", "click", now=1062.0)
+    assert second.take_sweep_result("activity") is None
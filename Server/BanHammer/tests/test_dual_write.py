@@ -0,0 +1,153 @@
+"""이중 기록 라이터: 플레이어 행 병합 / 워터마크 필터 / 저널 넘김·재생 (오프셋 재개, 잘린 줄)"""
+
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.dual_write import TimescaleDualWriter, _merge_player_rows
+
+WATERMARK = 1700000000.0
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.pool.tables.setdefault(table, []).extend(records)
+
+    async def executemany(self, sql, args):
+        self.pool.players.extend(args)
+
+
+class FakePool:
+    """fail_after 번째 배치부터 커넥션 획득 실패"""
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.acquired = 0
+        self.tables = {}
+        self.players = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        if self.fail_after is not None and self.acquired >= self.fail_after:
+            raise ConnectionRefusedError("db down")
+        self.acquired += 1
+        yield FakeConnection(self)
+
+    def action_seconds(self):
+        return [int(r[0].timestamp() - WATERMARK) for r in self.tables.get("player_actions_ts", [])]
+
+
+def make_writer(tmp_path, pool, **kwargs):
+    writer = TimescaleDualWriter("postgresql://unused", spill_path=str(tmp_path / "spill.jsonl"), **kwargs)
+    writer._pool = pool
+    writer.watermark = WATERMARK
+    return writer
+
+
+def test_merge_player_rows_keeps_newest_non_null_fields():
+    ban = ("p", 10.0, "p1", None, None, True, "speed hack")
+    risk = ("p", 20.0, "p1", "alice", 3.5, None, None)
+    expected = ("p", 20.0, "p1", "alice", 3.5, True, "speed hack")
+
+    assert _merge_player_rows(None, ban) == ban
+    # 도착 순서와 무관하게 이벤트 시각 기준
+    assert _merge_player_rows(ban, risk) == expected
+    assert _merge_player_rows(risk, ban) == expected
+
+    unban = ("p", 30.0, "p1", None, None, False, None)
+    assert _merge_player_rows(expected, unban)[5:] == (False, None)
+
+
+def test_rows_below_watermark_are_skipped_except_player_updates(tmp_path):
+    pool = FakePool()
+    writer = make_writer(tmp_path, pool)
+    writer.submit_action("p1", "click", WATERMARK - 1, 1.0, None)
+    writer.submit_action("p1", "click", WATERMARK + 1, 1.0, {"x": 1})
+    writer.submit_violation("p1", "speed", WATERMARK - 5, 0.5, None)
+    writer.submit_player("p1", WATERMARK - 1, risk_score=2.0)
+    writer.submit_player("p1", WATERMARK - 2, is_banned=True, ban_reason="bot")
+
+    asyncio.run(writer.drain())
+
+    assert pool.action_seconds() == [1]
+    assert pool.tables["player_actions_ts"][0][4] == '{"x": 1}'
+    assert "violations_ts" not in pool.tables
+    # 같은 배치의 플레이어 갱신은 필드별 최신 값으로 1행에 합쳐짐
+    assert len(pool.players) == 1
+    player_id, username, _, risk_score, is_banned, ban_reason, ban_timestamp = pool.players[0]
+    assert (player_id, risk_score, is_banned, ban_reason) == ("p1", 2.0, True, "bot")
+    assert ban_timestamp is not None
+    assert writer.rows_below_watermark == 2
+    assert writer.rows_written == 2
+
+
+def test_full_queue_spills_to_durable_journal_and_replays_after_queue(tmp_path):
+    pool = FakePool()
+    writer = make_writer(tmp_path, pool, max_queue_rows=2)
+    for second in range(4):
+        writer.submit_action("p1", "click", WATERMARK + second, 1.0, None)
+
+    # 넘긴 행은 drain 전에도 파일에 기록되어 있음
+    with open(writer.spill_path, encoding="utf-8") as f:
+        assert [json.loads(line)[1] - WATERMARK for line in f] == [2, 3]
+    assert writer.get_stats()["journal_rows"] == 2
+
+    asyncio.run(writer.drain())
+
+    assert pool.action_seconds() == [0, 1, 2, 3]
+    assert writer.get_stats()["journal_rows"] == 0
+    assert not os.path.exists(writer.spill_path)
+    assert not os.path.exists(writer.replay_path)
+
+
+def test_interrupted_replay_resumes_from_committed_offset(tmp_path):
+    pool = FakePool(fail_after=1)
+    writer = make_writer(tmp_path, pool, max_queue_rows=0, batch_rows=2)
+    for second in range(5):
+        writer.submit_action("p1", "click", WATERMARK + second, 1.0, None)
+
+    with pytest.raises(ConnectionRefusedError):
+        asyncio.run(writer.drain())
+    assert pool.action_seconds() == [0, 1]
+    assert os.path.exists(f"{writer.replay_path}.offset")
+
+    # 재시작한 라이터가 같은 저널을 이어서 재생 (이미 적재한 배치는 건너뜀)
+    pool.fail_after = None
+    restarted = make_writer(tmp_path, pool, batch_rows=2)
+    restarted._journal_rows = restarted._count_journal_rows()
+    assert restarted._journal_rows == 5
+
+    asyncio.run(restarted.drain())
+
+    assert pool.action_seconds() == [0, 1, 2, 3, 4]
+    assert restarted.get_stats()["journal_rows"] == 0
+    assert not os.path.exists(f"{restarted.replay_path}.offset")
+
+
+def test_truncated_last_journal_line_is_rejected_not_replayed(tmp_path):
+    pool = FakePool()
+    writer = make_writer(tmp_path, pool)
+    good = json.dumps(["a", WATERMARK + 1, "p1", "click", 1.0, None, None])
+    with open(writer.spill_path, "w", encoding="utf-8") as f:
+        f.write(good + "\n" + good[:10])
+    writer._journal_rows = writer._count_journal_rows()
+
+    asyncio.run(writer.drain())
+
+    assert pool.action_seconds() == [1]
+    assert writer.rows_rejected == 1
+    with open(writer.rejected_path, encoding="utf-8") as f:
+        rejected = json.loads(f.readline())
+    assert rejected["reason"] == "truncated journal line"
+    assert rejected["row"] == ["partial", good[:10]]
+    assert not os.path.exists(writer.replay_path)
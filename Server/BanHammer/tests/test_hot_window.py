@@ -0,0 +1,81 @@
+"""핫 윈도우 캐시: 동시 미스 공유 / 로드 취소 / 상한으로 잘린 구간 표시"""
+
+import asyncio
+
+import pytest
+
+from app.core.hot_window import HotWindowCache, PlayerWindow
+
+
+def test_concurrent_misses_share_one_load():
+    cache = HotWindowCache()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [(100.0, "click"), (100.0, "move"), (101.0, "click")]
+
+    async def scenario():
+        return await asyncio.gather(*(cache.ensure("p1", loader) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == [True] * 5
+    assert calls == 1
+    # 같은 시각의 서로 다른 액션도 모두 보관
+    assert len(cache.get("p1").times) == 3
+    assert cache.get_stats()["hydrations"] == 1
+
+
+def test_cancelled_load_releases_waiters():
+    cache = HotWindowCache()
+
+    async def scenario():
+        loading = asyncio.Event()
+
+        async def loader():
+            loading.set()
+            await asyncio.sleep(10)
+            return []
+
+        owner = asyncio.create_task(cache.ensure("p1", loader))
+        await loading.wait()
+        waiter = asyncio.create_task(cache.ensure("p1", loader))
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        # 기다리던 요청은 멈추지 않고 실패(SQL 경로)로 끝남
+        assert await asyncio.wait_for(waiter, timeout=1) is False
+        assert "p1" not in cache
+
+        # 다음 미스는 새로 로드
+        async def quick_loader():
+            return [(1.0, "click")]
+
+        assert await cache.ensure("p1", quick_loader) is True
+
+    asyncio.run(scenario())
+
+
+def test_failed_load_returns_false_without_window():
+    cache = HotWindowCache()
+
+    async def loader():
+        raise ConnectionError("db down")
+
+    assert asyncio.run(cache.ensure("p1", loader)) is False
+    assert "p1" not in cache
+    assert cache.get_stats()["hydration_failures"] == 1
+
+
+def test_window_cap_marks_dropped_range():
+    window = PlayerWindow()
+    for i in range(5):
+        window.add(1000.0 + i, "click", max_actions=3)
+
+    assert list(window.times) == [1002.0, 1003.0, 1004.0]
+    assert window.dropped_until == 1001.0
+    assert window.complete_since(1001.5)
+    assert not window.complete_since(1000.5)
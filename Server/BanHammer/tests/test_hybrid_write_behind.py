@@ -0,0 +1,42 @@
+"""하이브리드 엔진 write-behind → 기존 DB 저장 왕복"""
+
+import asyncio
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.anti_cheat import PlayerAction
+from app.core.hybrid_anti_cheat import HybridAntiCheatEngine
+from app.models.database import Base, PlayerAction as DBPlayerAction
+
+
+def make_session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def test_write_behind_round_trips_action_metadata():
+    session_factory = make_session_factory()
+    metadata = {"zone": "forest", "level": 25}
+
+    async def scenario():
+        engine = HybridAntiCheatEngine(session_factory=session_factory)
+        await engine.analyze_action(PlayerAction(
+            player_id="p1", action_type="resource_gather", timestamp=time.time(), value=3.0, metadata=metadata
+        ))
+        await engine.analyze_action(PlayerAction(
+            player_id="p1", action_type="resource_gather", timestamp=time.time(), value=1.0
+        ))
+        await engine.flush()
+
+    asyncio.run(scenario())
+
+    with session_factory() as db:
+        rows = db.query(DBPlayerAction).order_by(DBPlayerAction.id).all()
+    assert [row.get_metadata() for row in rows] == [metadata, {}]
+    assert rows[0].action_metadata is not None
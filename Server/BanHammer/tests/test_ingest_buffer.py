@@ -0,0 +1,96 @@
+"""액션 적재 버퍼: 커넥션 획득 실패 시 배치 보존 / 재시도 / 배치 내 interval_sec 계산"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.ingest_buffer import ActionIngestBuffer, fill_batch_intervals
+
+
+class FakeConnection:
+    def __init__(self):
+        self.rows = []
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.rows.extend(records)
+
+
+class FlakyPool:
+    """처음 failures 번은 커넥션 획득 실패"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.conn = FakeConnection()
+
+    @asynccontextmanager
+    async def acquire(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionRefusedError("db down")
+        yield self.conn
+
+
+def record(player_id: str, second: int):
+    return (datetime.fromtimestamp(1700000000 + second), player_id, "click", 1.0, None, None)
+
+
+def test_failed_acquire_requeues_batch_and_keeps_overlay():
+    pool = FlakyPool(failures=1)
+    buffer = ActionIngestBuffer(pool, max_batch_rows=2)
+
+    async def scenario():
+        for i in range(3):
+            await buffer.add(record("p1", i))
+
+        with pytest.raises(ConnectionRefusedError):
+            await buffer.flush()
+        # 유실 없이 순서 그대로 대기, 탐지 오버레이도 유지
+        assert buffer.pending_rows == 3
+        assert len(buffer.get_pending("p1")) == 3
+        assert buffer.rows_dropped == 0
+
+        await buffer.flush()
+
+    asyncio.run(scenario())
+    assert [row[:5] for row in pool.conn.rows] == [record("p1", i)[:5] for i in range(3)]
+    assert buffer.get_pending("p1") == []
+    assert buffer.get_stats()["write_errors"] == 1
+
+
+def test_backpressure_drops_oldest_rows_while_db_is_down():
+    pool = FlakyPool(failures=100)
+    buffer = ActionIngestBuffer(pool, max_batch_rows=10, max_pending_rows=3)
+
+    async def scenario():
+        for i in range(5):
+            await buffer.add(record("p1", i))
+
+    asyncio.run(scenario())
+    assert buffer.pending_rows == 3
+    assert [row[0] for row in buffer.get_pending("p1")] == [record("p1", i)[0] for i in (2, 3, 4)]
+    assert buffer.rows_dropped == 2
+    # 재시도 대기 중에는 요청마다 커넥션 획득을 시도하지 않음
+    assert pool.failures == 99
+
+
+def test_batch_intervals_are_filled_from_previous_row_of_same_key():
+    base = datetime(2024, 1, 1, 12, 0)
+
+    def action(player_id, action_type, seconds, interval=None):
+        return (base + timedelta(seconds=seconds), player_id, action_type, 1.0, None, interval)
+
+    batch = [
+        action("p1", "click", 5),
+        action("p1", "click", 2),       # 배치 순서가 아닌 시각 순으로 직전 행 판단
+        action("p1", "move", 3),
+        action("p2", "click", 4),
+        action("p1", "click", 5),       # 같은 시각 → 트리거 판단 (NULL 유지)
+        action("p1", "move", 3 + 7200), # 조회 범위(1시간) 초과 → NULL 유지
+        action("p1", "click", 9, 0.5),  # 이미 값이 있는 행은 그대로
+    ]
+
+    assert [row[5] for row in fill_batch_intervals(batch)] == [3.0, None, None, None, None, None, 0.5]
+    # 원본 행(탐지 오버레이와 공유)은 바뀌지 않음
+    assert [row[5] for row in batch] == [None] * 6 + [0.5]
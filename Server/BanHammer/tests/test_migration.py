@@ -0,0 +1,310 @@
+"""SQLite → TimescaleDB 마이그레이션: 시각 파싱 / 청크 계획 / 키셋 읽기 경계 / 체크포인트 저장·재개 / 검증 해시"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import migrate_to_timescaledb as migrate
+from migrate_to_timescaledb import (
+    Chunk, MigrationCheckpoint, SQLiteChunkReader, TABLE_SPECS, TimescaleMigration,
+    canonical_value, jsonb_text, parse_datetime, plan_chunks, record_bucket, row_hash
+)
+
+SCHEMA_SQL = """
+CREATE TABLE players (
+    id VARCHAR NOT NULL PRIMARY KEY, username VARCHAR(50) NOT NULL, created_at DATETIME, last_activity DATETIME,
+    risk_score FLOAT, is_banned BOOLEAN, ban_reason TEXT, ban_timestamp DATETIME
+);
+CREATE TABLE player_actions (
+    id INTEGER NOT NULL PRIMARY KEY, player_id VARCHAR NOT NULL, action_type VARCHAR(50) NOT NULL,
+    timestamp DATETIME, value FLOAT, metadata TEXT
+);
+CREATE TABLE violations (
+    id INTEGER NOT NULL PRIMARY KEY, player_id VARCHAR NOT NULL, violation_type VARCHAR(50) NOT NULL,
+    severity FLOAT NOT NULL, timestamp DATETIME, details TEXT, resolved BOOLEAN
+);
+"""
+
+
+def action_time(minute: int) -> str:
+    return f"2024-01-01 00:{minute:02d}:00.000000"
+
+
+@pytest.fixture
+def source(tmp_path):
+    """액션 20행 (rowid 1~23, 5 / 6 / 17 삭제로 간격 있음), 1분 간격"""
+    path = str(tmp_path / "source.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_SQL)
+    conn.executemany(
+        "INSERT INTO player_actions (id, player_id, action_type, timestamp, value, metadata) VALUES (?, ?, ?, ?, ?, ?)",
+        [(rowid, f"p{rowid % 3}", "click", action_time(rowid), float(rowid), json.dumps({"n": rowid}))
+         for rowid in range(1, 24)]
+    )
+    conn.execute("DELETE FROM player_actions WHERE id IN (5, 6, 17)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def read_chunk(reader, chunk, limit, before=None):
+    """청크를 키셋 배치로 끝까지 읽어 (rowid 대신) value 목록 반환"""
+    spec = TABLE_SPECS["actions"]
+    values, last_rowid = [], chunk.start_rowid
+    while True:
+        records, next_rowid = reader.fetch_batch(spec, last_rowid, chunk.end_rowid, limit, before)
+        if not records:
+            assert next_rowid == last_rowid
+            return values
+        assert next_rowid > last_rowid
+        values.extend(int(record[3]) for record in records)
+        last_rowid = next_rowid
+
+
+@pytest.mark.parametrize("text, fmt", [
+    ("2024-03-05 07:08:09.123456", "%Y-%m-%d %H:%M:%S.%f"),
+    ("2024-03-05 07:08:09.5", "%Y-%m-%d %H:%M:%S.%f"),
+    ("2024-03-05 07:08:09", "%Y-%m-%d %H:%M:%S"),
+    ("2024-03-05", "%Y-%m-%d"),
+])
+def test_parse_datetime_matches_strptime_formats(text, fmt):
+    assert parse_datetime(text) == datetime.strptime(text, fmt)
+
+
+def test_parse_datetime_unix_timestamp_and_invalid_values():
+    assert parse_datetime("1700000000") == datetime.fromtimestamp(1700000000)
+    before = datetime.now()
+    # 파싱할 수 없는 값은 현재 시각 (기존 동작 유지)
+    for text in ("2024-02-30 00:00:00", "2024-01-01T00:00:00", "garbage"):
+        assert parse_datetime(text) >= before
+
+
+def test_plan_chunks_covers_rowid_range_without_gaps(source):
+    totals, chunks = plan_chunks(source, ["actions", "violations"], chunk_rows=5)
+
+    assert totals == {"actions": 20, "violations": 0}
+    actions = [c for c in chunks.values() if c.table == "actions"]
+    assert [(c.start_rowid, c.end_rowid) for c in actions] == [(0, 5), (5, 10), (10, 15), (15, 20), (20, 23)]
+    assert all(c.last_rowid == c.start_rowid and not c.done for c in actions)
+    assert [c.chunk_id for c in actions][:2] == ["actions:00000", "actions:00001"]
+
+
+def test_keyset_batches_read_each_row_once_across_chunk_boundaries(source):
+    _, chunks = plan_chunks(source, ["actions"], chunk_rows=5)
+    reader = SQLiteChunkReader(source)
+    try:
+        values = [value for chunk in chunks.values() for value in read_chunk(reader, chunk, limit=2)]
+    finally:
+        reader.close()
+
+    assert values == [rowid for rowid in range(1, 24) if rowid not in (5, 6, 17)]
+
+
+def test_watermark_bound_limits_plan_and_reads(source):
+    before = action_time(12)  # 11분까지만 (12분 행은 제외)
+    totals, chunks = plan_chunks(source, ["actions"], chunk_rows=5, before=before)
+
+    assert totals == {"actions": 9}
+    assert max(c.end_rowid for c in chunks.values()) == 11
+    reader = SQLiteChunkReader(source)
+    try:
+        values = [value for chunk in chunks.values() for value in read_chunk(reader, chunk, limit=3, before=before)]
+        # 계획 범위 밖이라도 시각 조건으로 다시 거름
+        late = read_chunk(reader, Chunk("actions:x", "actions", 0, 23, 0), limit=100, before=before)
+    finally:
+        reader.close()
+    assert values == [1, 2, 3, 4, 7, 8, 9, 10, 11]
+    assert late == values
+
+
+def test_checkpoint_round_trip(tmp_path, source):
+    path = str(tmp_path / "checkpoint.json")
+    totals, chunks = plan_chunks(source, ["actions"], chunk_rows=10)
+    checkpoint = MigrationCheckpoint(path=path, source=source, totals=totals, chunks=chunks, watermark=1700000000.5)
+    first = next(iter(chunks.values()))
+    first.last_rowid, first.rows_copied, first.done = 10, 8, True
+    checkpoint.post_load_done = True
+    checkpoint.save()
+
+    loaded = MigrationCheckpoint.load(path)
+    assert loaded.source == source
+    assert loaded.totals == totals
+    assert loaded.chunks == chunks
+    assert loaded.watermark == 1700000000.5
+    assert loaded.post_load_done is True
+    assert [c.chunk_id for c in loaded.pending()] == ["actions:00001", "actions:00002"]
+
+
+def test_checkpoint_rejects_other_version(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    path.write_text(json.dumps({"version": migrate.CHECKPOINT_VERSION + 1}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        MigrationCheckpoint.load(str(path))
+
+
+def test_concurrent_checkpoint_saves_do_not_collide(tmp_path, source):
+    """주기 저장 스레드와 종료 시 저장이 겹쳐도 같은 임시 파일을 동시에 쓰지 않음"""
+    path = str(tmp_path / "checkpoint.json")
+    totals, chunks = plan_chunks(source, ["actions"], chunk_rows=2)
+    checkpoint = MigrationCheckpoint(path=path, source=source, totals=totals, chunks=chunks)
+    errors = []
+
+    def save_many():
+        try:
+            for _ in range(50):
+                checkpoint.save()
+        except Exception as e:  # os.replace 경합 시 FileNotFoundError
+            errors.append(e)
+
+    threads = [threading.Thread(target=save_many) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert MigrationCheckpoint.load(path).chunks == chunks
+
+
+class FakeTargetConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.closed = False
+
+    async def fetch(self, sql):
+        assert "migration_chunks" in sql
+        return self.rows
+
+    async def close(self):
+        self.closed = True
+
+
+def test_sync_checkpoint_prefers_target_progress(tmp_path, source, monkeypatch):
+    totals, chunks = plan_chunks(source, ["actions"], chunk_rows=5)
+    checkpoint = MigrationCheckpoint(path=str(tmp_path / "checkpoint.json"), source=source, totals=totals, chunks=chunks)
+    # 파일: 0번 완료, 1번 한 배치 앞섬(대상 DB 커밋 전 중단), 2번 진행 중(첫 배치 미커밋)
+    chunks["actions:00000"].last_rowid, chunks["actions:00000"].rows_copied, chunks["actions:00000"].done = 5, 4, True
+    chunks["actions:00001"].last_rowid, chunks["actions:00001"].rows_copied = 10, 4
+    chunks["actions:00002"].last_rowid, chunks["actions:00002"].rows_copied = 12, 2
+
+    target = FakeTargetConnection([
+        {"chunk_id": "actions:00000", "last_rowid": 5, "rows_copied": 4, "done": True},
+        {"chunk_id": "actions:00001", "last_rowid": 8, "rows_copied": 2, "done": False},
+    ])
+
+    async def connect(url):
+        return target
+
+    monkeypatch.setattr(migrate.asyncpg, "connect", connect)
+    migration = TimescaleMigration(source, "postgresql://unused", checkpoint_path=checkpoint.path)
+    migration.checkpoint = checkpoint
+    asyncio.run(migration.sync_checkpoint_from_target())
+
+    assert target.closed
+    progress = {c.chunk_id: (c.last_rowid, c.rows_copied, c.done) for c in checkpoint.chunks.values()}
+    assert progress["actions:00000"] == (5, 4, True)
+    assert progress["actions:00001"] == (8, 2, False)   # 대상 DB 기준으로 되돌림 (중복 적재 방지)
+    assert progress["actions:00002"] == (10, 0, False)  # 대상에 없으면 청크 처음부터
+    assert [c.chunk_id for c in checkpoint.pending()] == ["actions:00001", "actions:00002", "actions:00003", "actions:00004"]
+    # 동기화 결과는 체크포인트 파일에도 반영
+    assert MigrationCheckpoint.load(checkpoint.path).chunks == checkpoint.chunks
+
+
+# ---------------------------------------------------------------------------
+# 검증 해시 골든 값: 기대값은 PostgreSQL 16 (UTF8) 의 '...'::jsonb::text 와
+# target_hash_sql 출력 (naive 시각은 TZ=Asia/Seoul 로 asyncpg 적재)
+# ---------------------------------------------------------------------------
+
+KST = timezone(timedelta(hours=9))
+
+
+@pytest.fixture
+def seoul_tz(monkeypatch):
+    """naive 시각은 로컬 시각으로 해석되므로 골든 값 계산 동안 TZ 고정"""
+    monkeypatch.setenv("TZ", "Asia/Seoul")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize("source_json, expected", [
+    # 키: 길이 → 바이트 순 (중첩 dict 도 같은 규칙)
+    ('{"bbb": 1, "a": {"zz": [1, 2], "y": null, "xxx": true}, "cc": "x"}',
+     '{"a": {"y": null, "zz": [1, 2], "xxx": true}, "cc": "x", "bbb": 1}'),
+    # 비ASCII 키는 UTF-8 바이트 길이 기준
+    ('{"é": 1, "z": 2, "ab": 3, "한": 4, "aa": 5}', '{"z": 2, "aa": 5, "ab": 3, "é": 1, "한": 4}'),
+    # 지수 표기 / 음의 0 / 17자리 넘는 실수 / 큰 정수는 numeric 표기
+    ('{"big": 1e20, "small": 1.5e-07, "neg": -2.5e-10, "one": 1.0, "nz": -0.0, "x": 123456789.123456789, '
+     '"i": 12345678901234567890}',
+     '{"i": 12345678901234567890, "x": 123456789.123456789, "nz": 0.0, "big": 100000000000000000000, '
+     '"neg": -0.00000000025, "one": 1.0, "small": 0.00000015}'),
+    ('{"s": "한글 é \\t\\n\\" \\\\ / \\u001f 😀"}', '{"s": "한글 é \\t\\n\\" \\\\ / \\u001f 😀"}'),
+    ('[{"b": 1, "a": 2}, [], {}, "x", 3.14, false]', '[{"a": 2, "b": 1}, [], {}, "x", 3.14, false]'),
+    ('{"dup": 1, "dup": 2}', '{"dup": 2}'),
+])
+def test_json_canonical_value_matches_postgres_jsonb_output(source_json, expected):
+    assert canonical_value(source_json, "json") == expected
+
+
+def test_jsonb_text_formats_python_floats_as_numeric():
+    assert jsonb_text({"c": 1e16, "b": -0.0, "a": 1e-7}) == '{"a": 0.0000001, "b": 0.0, "c": 10000000000000000}'
+
+
+def test_canonical_value_per_kind(seoul_tz):
+    assert canonical_value(datetime(2024, 1, 1, 0, 0, 0, 1), "time") == "1704034800000001"  # naive = KST
+    assert canonical_value(datetime(2024, 1, 1, 23, 59, 59, 999999, tzinfo=KST), "time") == "1704121199999999"
+    assert canonical_value(datetime(1969, 12, 31, 23, 59, 59, 500000, tzinfo=timezone.utc), "time") == "-500000"
+    assert canonical_value(1.5, "float") == "3ff8000000000000"
+    assert canonical_value(-0.0, "float") == "8000000000000000"
+    assert canonical_value(7, "int") == "7"
+    assert canonical_value(True, "bool") == "true"
+    assert canonical_value("한", "text") == "한"
+    for kind in ("text", "int", "bool", "float", "json", "time"):
+        assert canonical_value(None, kind) == "\\N"
+
+
+ACTION_GOLDEN = [
+    ((datetime(2024, 1, 1, 0, 0, 0, 1), "p1", "click", 1.5,
+      '{"bbb": 1, "a": {"zz": [1, 2], "y": null, "xxx": true}, "cc": "x"}'), 19722, 0x2d0d2d44edabb119),
+    ((datetime(2024, 1, 1, 23, 59, 59, 999999, tzinfo=KST), "p1", "move", 1e-7,
+      '{"big": 1e20, "small": 1.5e-07, "nz": -0.0, "x": 123456789.123456789}'), 19723, 0xc772ae656fd0db86),
+    ((datetime(1969, 12, 31, 23, 59, 59, 500000, tzinfo=timezone.utc), "p2", "x", -0.0, None), -1, 0xe8c9ae932ddcb308),
+    ((datetime(2024, 3, 1, 9, 0, 0, tzinfo=timezone.utc), "p4", "z", 2.0, '{"é": 1, "z": 2, "ab": 3, "한": 4, "aa": 5}'),
+     19783, 0xae06e4a84d28dd2a),
+]
+
+
+@pytest.mark.parametrize("record, bucket, expected_hash", ACTION_GOLDEN)
+def test_action_row_hash_and_bucket_golden(seoul_tz, record, bucket, expected_hash):
+    spec = TABLE_SPECS["actions"]
+    assert record_bucket(spec, record) == bucket
+    assert row_hash(spec, record) == expected_hash
+
+
+def test_row_hash_ignores_json_number_spelling_postgres_normalizes(seoul_tz):
+    """대상 jsonb 가 같은 값으로 정규화하는 표기 차이(지수 / 음의 0)는 같은 해시"""
+    spec = TABLE_SPECS["actions"]
+    record = ACTION_GOLDEN[1][0]
+    respelled = record[:4] + ('{"x": 123456789.123456789, "nz": 0.0, "small": 0.00000015, "big": 100000000000000000000}',)
+    assert row_hash(spec, record) == row_hash(spec, respelled)
+    # float 로 반올림되면 달라지는 자릿수는 다른 값
+    rounded = record[:4] + ('{"big": 1e20, "small": 1.5e-07, "nz": -0.0, "x": 123456789.12345679}',)
+    assert row_hash(spec, record) != row_hash(spec, rounded)
+
+
+def test_player_row_hash_and_bucket_golden_with_null_columns(seoul_tz):
+    spec = TABLE_SPECS["players"]
+    player = ("p1", "앨리스", datetime(2024, 1, 1, 12), None, 3.25, 0, 0, True, None,
+              datetime(2024, 1, 2, tzinfo=timezone.utc))
+    empty = ("p한",) + (None,) * 9
+
+    assert record_bucket(spec, player) == 236
+    assert row_hash(spec, player) == 0xd25579ecafd82e9b
+    assert record_bucket(spec, empty) == 124
+    assert row_hash(spec, empty) == 0x7af697db519e7a83
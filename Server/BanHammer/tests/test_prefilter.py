@@ -0,0 +1,42 @@
+"""인그레스 사전 필터: 전역 차단 목록과 게임별(범용 API) 플레이어 구분"""
+
+from app.core.prefilter import REASON_BANNED, REASON_FLOOD, SOURCE_LEGACY, IngressPreFilter
+
+
+def test_global_ban_does_not_apply_to_universal_players():
+    prefilter = IngressPreFilter()
+    prefilter.mark_banned("p1", SOURCE_LEGACY)
+
+    assert prefilter.check("p1").reason == REASON_BANNED
+    assert prefilter.check("p1", game_id="rpg") is None
+
+
+def test_universal_ban_is_scoped_to_game():
+    prefilter = IngressPreFilter()
+    prefilter.mark_banned("p1", "universal", game_id="rpg")
+
+    verdict = prefilter.check("p1", game_id="rpg")
+    assert verdict.reason == REASON_BANNED
+    assert verdict.to_dict()["game_id"] == "rpg"
+    assert prefilter.check("p1", game_id="fps") is None
+    assert prefilter.check("p1") is None
+
+    prefilter.mark_unbanned("p1", "universal", game_id="rpg")
+    assert prefilter.check("p1", game_id="rpg") is None
+
+
+def test_flood_windows_are_per_game():
+    prefilter = IngressPreFilter(flood_max_actions=2, flood_window_seconds=1.0)
+
+    assert prefilter.check("p1", now=10.0, game_id="rpg") is None
+    assert prefilter.check("p1", now=10.1, game_id="rpg") is None
+    assert prefilter.check("p1", now=10.2, game_id="fps") is None
+    assert prefilter.check("p1", now=10.3) is None
+
+    verdict = prefilter.check("p1", now=10.4, game_id="rpg")
+    assert verdict.reason == REASON_FLOOD
+    assert abs(verdict.retry_after - 0.6) < 1e-9
+    assert prefilter.get_stats()["top_offenders"] == [{"game_id": "rpg", "player_id": "p1", "rejections": 1}]
+
+    # 윈도우가 지나면 다시 허용
+    assert prefilter.check("p1", now=11.0, game_id="rpg") is None
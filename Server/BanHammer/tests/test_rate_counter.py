@@ -0,0 +1,148 @@
+"""Redis 슬라이딩 윈도우 빈도 카운터: 키/인자 구성 / 반올림 / 실패 시 폴백과 쿨다운 / SQL 경로와 같은 값"""
+
+import asyncio
+import math
+import random
+
+import pytest
+
+from app.core import rate_counter
+from app.core.rate_counter import RedisRateCounter, SLIDING_WINDOW_LUA
+
+
+class FakeScript:
+    """register_script 가 돌려주는 호출 객체 대역 (Lua 대신 고정 응답)"""
+
+    def __init__(self, result=None, error: Exception = None):
+        self.result = result
+        self.error = error
+        self.calls = []
+
+    async def __call__(self, keys=None, args=None):
+        self.calls.append((keys, args))
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class FakeRedis:
+    def __init__(self, script: FakeScript):
+        self.script = script
+        self.registered = []
+
+    def register_script(self, source: str) -> FakeScript:
+        self.registered.append(source)
+        return self.script
+
+
+def test_record_builds_key_and_args_and_rounds_count():
+    script = FakeScript(result=["3.6", "12.5"])
+    redis = FakeRedis(script)
+    counter = RedisRateCounter(redis)
+
+    result = asyncio.run(counter.record("p1", "click", 125.0, 2.5))
+
+    assert result == (4, 12.5)
+    assert redis.registered == [SLIDING_WINDOW_LUA]
+    keys, args = script.calls[0]
+    assert keys == ["ts:rate:p1:click"]
+    assert args[0] == 2  # 125초 → 2분 버킷
+    assert args[1] == 2.5
+    assert args[3] == counter.ttl_seconds
+    assert counter.get_stats()["updates"] == 1
+
+
+def test_failure_returns_none_and_falls_back_during_cooldown(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_counter.time, "monotonic", lambda: now[0])
+    script = FakeScript(error=ConnectionError("down"))
+    counter = RedisRateCounter(FakeRedis(script), failure_cooldown=5.0)
+
+    assert asyncio.run(counter.record("p1", "click", 0.0, 1.0)) is None
+    assert counter.available is False
+
+    # 쿨다운 중에는 Redis 를 호출하지 않고 바로 폴백
+    now[0] = 104.0
+    assert asyncio.run(counter.record("p1", "click", 0.0, 1.0)) is None
+    assert len(script.calls) == 1
+
+    stats = counter.get_stats()
+    assert stats["failures"] == 1
+    assert stats["fallbacks"] == 2
+    assert stats["updates"] == 0
+
+
+def test_recovers_after_cooldown(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_counter.time, "monotonic", lambda: now[0])
+    script = FakeScript(error=ConnectionError("down"))
+    counter = RedisRateCounter(FakeRedis(script), failure_cooldown=5.0)
+
+    asyncio.run(counter.record("p1", "click", 0.0, 1.0))
+    script.error = None
+    script.result = ["1", "1"]
+    now[0] = 105.0
+
+    assert counter.available is True
+    assert asyncio.run(counter.record("p1", "click", 0.0, 1.0)) == (1, 1.0)
+    assert counter.get_stats()["updates"] == 1
+
+
+def lua_sliding_window(state: dict, action_minute: int, value: float, now: float):
+    """SLIDING_WINDOW_LUA 를 줄 단위로 옮긴 참조 구현 (state = Redis 해시)"""
+    now_minute = math.floor(now / 60)
+    minute = state.get("m", now_minute)
+    c, v, pc, pv = state.get("c", 0), state.get("v", 0), state.get("pc", 0), state.get("pv", 0)
+
+    if now_minute == minute + 1:
+        pc, pv, c, v = c, v, 0, 0
+    elif now_minute > minute + 1:
+        pc, pv, c, v = 0, 0, 0, 0
+
+    if action_minute >= now_minute:
+        c, v = c + 1, v + value
+    elif action_minute == now_minute - 1:
+        pc, pv = pc + 1, pv + value
+
+    state.update(m=now_minute, c=c, v=v, pc=pc, pv=pv)
+    weight = 1 - (now - now_minute * 60) / 60
+    return c + pc * weight, v + pv * weight
+
+
+def sql_sliding_window(actions, now: float):
+    """_RATE_WEIGHT_SQL + action_stats_1min 가중합을 Python 으로 계산 (현재 버킷 + 직전 버킷 × 남은 비율)"""
+    current_bucket = math.floor(now / 60) * 60
+    prev_weight = 1 - (now - current_bucket) / 60
+    count = total = 0.0
+    for timestamp, value in actions:
+        bucket = math.floor(timestamp / 60) * 60
+        if bucket < current_bucket - 60:
+            continue
+        weight = 1.0 if bucket == current_bucket else prev_weight
+        count += weight
+        total += value * weight
+    return count, total
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lua_window_matches_sql_weighted_buckets(seed):
+    """같은 액션 순서를 Lua(Redis) 경로와 SQL 경로로 계산하면 매 액션 후 횟수 / 합계가 같음
+    - 액션 시각은 서버 수신 시각이므로 호출 시각 이하 (분 경계를 걸친 지연 / 2분 넘는 지연 포함)
+    - 호출 간격은 같은 분 안 / 다음 분 / 여러 분 공백을 모두 포함
+    """
+    rng = random.Random(seed)
+    state, stored = {}, []
+    now = 1_700_000_000.0
+    for _ in range(500):
+        now += rng.choice([0.0, rng.uniform(0, 2), rng.uniform(0, 30), rng.uniform(60, 200)])
+        timestamp = now - rng.choice([0.0, rng.uniform(0, 1), rng.uniform(0, 70), rng.uniform(120, 180)])
+        value = rng.choice([1.0, rng.uniform(-5, 50)])
+
+        lua_count, lua_total = lua_sliding_window(state, int(timestamp // 60), value, now)
+        stored.append((timestamp, value))
+        sql_count, sql_total = sql_sliding_window(stored, now)
+
+        assert lua_count == pytest.approx(sql_count, rel=1e-9, abs=1e-9)
+        assert lua_total == pytest.approx(sql_total, rel=1e-9, abs=1e-9)
+        # record() 와 SQL 경로 모두 횟수는 반올림해 임계값과 비교
+        assert int(round(lua_count)) == int(round(sql_count))
@@ -0,0 +1,112 @@
+"""Redis 윈도우 지연 복원: 동시 요청 합치기 / 파이프라인 묶음 / 부정 캐시 / 장애"""
+
+import asyncio
+
+from app.core.rehydration import RedisWindowRehydrator
+from app.core.state_codec import ActionRecord, encode_action_record
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.keys = []
+
+    def lrange(self, key, start, end):
+        self.keys.append((key, start, end))
+
+    async def execute(self):
+        self.redis.pipelines.append([key for key, _, _ in self.keys])
+        await asyncio.sleep(self.redis.delay)
+        if self.redis.fail:
+            raise ConnectionError("redis down")
+        return [self.redis.lists.get(key, [])[start:end + 1] for key, start, end in self.keys]
+
+
+class FakeRedis:
+    def __init__(self, lists=None, delay=0.0, fail=False):
+        self.lists = lists or {}
+        self.delay = delay
+        self.fail = fail
+        self.pipelines = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def records(count):
+    # LPUSH 순서 (최신이 앞)
+    return [encode_action_record(ActionRecord(action_type="purchase", timestamp=float(i))) for i in reversed(range(count))]
+
+
+def test_concurrent_requests_share_one_pipeline():
+    redis = FakeRedis({"actions:p1": records(3), "actions:p2": records(1)}, delay=0.01)
+    rehydrator = RedisWindowRehydrator(redis, max_actions=2)
+
+    async def scenario():
+        return await asyncio.gather(
+            rehydrator.fetch("actions:p1"),
+            rehydrator.fetch("actions:p1"),
+            rehydrator.fetch("actions:p2"),
+        )
+
+    p1, p1_again, p2 = asyncio.run(scenario())
+    # 최신 max_actions 개를 오래된 순으로
+    assert [r.timestamp for r in p1] == [1.0, 2.0]
+    assert p1_again == p1
+    assert [r.timestamp for r in p2] == [0.0]
+    assert redis.pipelines == [["actions:p1", "actions:p2"]]
+    assert rehydrator.coalesced == 1
+
+
+def test_batches_are_split_by_batch_size():
+    redis = FakeRedis()
+    rehydrator = RedisWindowRehydrator(redis, batch_size=2)
+
+    async def scenario():
+        await asyncio.gather(*(rehydrator.fetch(f"k{i}") for i in range(5)))
+
+    asyncio.run(scenario())
+    assert [len(keys) for keys in redis.pipelines] == [2, 2, 1]
+
+
+def test_empty_keys_are_negatively_cached_until_forgotten():
+    redis = FakeRedis()
+    rehydrator = RedisWindowRehydrator(redis)
+
+    async def scenario():
+        assert await rehydrator.fetch("empty") == []
+        assert await rehydrator.fetch("empty") == []
+        rehydrator.forget("empty")
+        redis.lists["empty"] = records(1)
+        return await rehydrator.fetch("empty")
+
+    assert len(asyncio.run(scenario())) == 1
+    assert rehydrator.negative_hits == 1
+    assert len(redis.pipelines) == 2
+
+
+def test_redis_error_returns_empty_and_retries_next_time():
+    redis = FakeRedis({"k": records(1)}, fail=True)
+    rehydrator = RedisWindowRehydrator(redis)
+
+    async def scenario():
+        assert await rehydrator.fetch("k") == []
+        redis.fail = False
+        return await rehydrator.fetch("k")
+
+    assert len(asyncio.run(scenario())) == 1
+    assert rehydrator.errors == 1
+
+
+def test_cancelled_pipeline_releases_waiters():
+    redis = FakeRedis({"k": records(1)}, delay=10)
+    rehydrator = RedisWindowRehydrator(redis)
+
+    async def scenario():
+        waiter = asyncio.create_task(rehydrator.fetch("k"))
+        await asyncio.sleep(0.01)
+        for task in list(rehydrator._tasks):
+            task.cancel()
+        return await asyncio.wait_for(waiter, timeout=1)
+
+    assert asyncio.run(scenario()) == []
@@ -0,0 +1,85 @@
+"""위험도 반감기 감쇠 + 미반영 요약 델타 합산 / flush 취소 시 보존"""
+
+import asyncio
+import math
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+
+from app.core.summary_buffer import SummaryDeltaBuffer, decay_risk, decayed_risk_sql, half_life_seconds
+
+
+def test_half_life_setting_conversion():
+    assert half_life_seconds(24) == 24 * 3600.0
+    assert math.isinf(half_life_seconds(0))
+    assert math.isinf(half_life_seconds(-1))
+
+
+@pytest.mark.parametrize("elapsed_half_lives, expected", [(0, 80.0), (1, 40.0), (2, 20.0), (0.5, 80.0 / math.sqrt(2))])
+def test_decay_halves_per_half_life(elapsed_half_lives, expected):
+    half_life = half_life_seconds(6)
+    assert decay_risk(80.0, elapsed_half_lives * half_life, half_life) == pytest.approx(expected)
+
+
+def test_no_decay_without_half_life_or_elapsed_time():
+    assert decay_risk(50.0, 10 ** 9, math.inf) == 50.0
+    assert decay_risk(50.0, -5.0, 3600.0) == 50.0
+
+
+def test_long_idle_decays_to_zero_without_error():
+    assert decay_risk(100.0, 10 ** 7 * 3600.0, 3600.0) == 0.0
+
+
+def test_sql_expression_clamps_exponent():
+    sql = decayed_risk_sql("$2")
+    assert "power(0.5, LEAST(" in sql and ", 1000)" in sql
+    assert "$2::float8" in sql
+
+
+def test_pending_deltas_are_merged_for_reads():
+    buffer = SummaryDeltaBuffer(pool=None)
+    first, later = datetime(2024, 1, 1, 12, 0), datetime(2024, 1, 1, 12, 5)
+    buffer.add("p1", later, 2.5, 1)
+    buffer.add("p1", first, 1.0, 0)
+
+    pending = buffer.get_pending("p1")
+    assert (pending.actions, pending.violations, pending.risk_delta) == (2, 1, 3.5)
+    assert pending.last_activity == later
+    assert buffer.get_pending("p2") is None
+
+
+class BlockingPool:
+    """UPSERT 가 끝나지 않는 풀 (flush 도중 취소 재현)"""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    async def execute(self, *args):
+        self.started.set()
+        await asyncio.Event().wait()
+
+
+def test_cancelled_flush_requeues_inflight_deltas():
+    pool = BlockingPool()
+    buffer = SummaryDeltaBuffer(pool)
+    now = datetime(2024, 1, 1, 12, 0)
+
+    async def scenario():
+        buffer.add("p1", now, 2.0, 1)
+        task = asyncio.create_task(buffer.flush())
+        await pool.started.wait()
+        buffer.add("p1", now, 1.0, 0)  # 적재 중 추가된 델타
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    pending = buffer.get_pending("p1")
+    assert (pending.actions, pending.violations, pending.risk_delta) == (2, 1, 3.0)
+    assert buffer.get_stats()["inflight_players"] == 0
+    assert buffer.failed_batches == 0
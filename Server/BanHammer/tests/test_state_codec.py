@@ -0,0 +1,90 @@
+"""플레이어 상태 바이너리 코덱: 왕복 / 압축 / 이전 JSON 형식 / UTF-8 경계"""
+
+import json
+
+import pytest
+
+from app.core.state_codec import (
+    SNAPSHOT_ZLIB, ActionRecord, CodecError, PlayerSnapshot,
+    decode_action_record, decode_snapshot, encode_action_record, encode_snapshot
+)
+
+
+def make_snapshot(count: int = 3) -> PlayerSnapshot:
+    return PlayerSnapshot(
+        risk_score=12.5,
+        risk_updated_at=1700000000.25,
+        total_actions=count,
+        total_violations=2,
+        actions=[(1700000000.0 + i * 0.5, "kill_monster" if i % 2 else "커스텀_액션", float(i)) for i in range(count)]
+    )
+
+
+def test_snapshot_round_trip():
+    snapshot = make_snapshot()
+    assert decode_snapshot(encode_snapshot(snapshot)) == snapshot
+
+
+def test_large_snapshot_is_compressed():
+    snapshot = make_snapshot(500)
+    data = encode_snapshot(snapshot, compress_min_bytes=512)
+
+    assert data[0] == SNAPSHOT_ZLIB
+    assert len(data) < len(encode_snapshot(snapshot))
+    assert decode_snapshot(data) == snapshot
+
+
+def test_legacy_json_snapshot():
+    payload = {
+        "risk_score": 3.0,
+        "last_access": 1700000100.0,
+        "actions": [
+            {"timestamp": 1700000002.0, "action_type": "purchase", "value": 9.99},
+            {"timestamp": 1700000001.0, "action_type": "level_up", "value": None},
+        ],
+        "violations": [{"type": "speed_hack"}],
+    }
+    snapshot = decode_snapshot(json.dumps(payload).encode())
+
+    assert snapshot.risk_score == 3.0
+    assert snapshot.risk_updated_at == 1700000100.0
+    assert snapshot.total_violations == 1
+    assert snapshot.actions == [(1700000001.0, "level_up", 0.0), (1700000002.0, "purchase", 9.99)]
+
+
+def test_action_record_round_trip():
+    known = ActionRecord(action_type="purchase", timestamp=1700000000.5, value=4.0)
+    full = ActionRecord(
+        action_type="unregistered_type",
+        timestamp=1700000001.0,
+        value={"item": "sword", "count": 2},
+        metadata={"zone": "숲"},
+        session_id="s-1",
+        client_info={"os": "android"},
+    )
+    for record in (known, full):
+        assert decode_action_record(encode_action_record(record)) == record
+    # 알려진 타입은 1바이트 코드만 기록
+    assert len(encode_action_record(known)) == 19
+
+
+def test_legacy_json_action_record():
+    data = json.dumps({"action_type": "move", "timestamp": 1.5, "value": 2, "session_id": "s"}).encode()
+    assert decode_action_record(data) == ActionRecord(action_type="move", timestamp=1.5, value=2, session_id="s")
+
+
+def test_long_multibyte_text_is_cut_on_character_boundary():
+    long_type = "a" + "액" * 100  # 301 바이트, 255 바이트 위치가 문자 중간
+    record = ActionRecord(action_type=long_type, timestamp=1.0, session_id="é" * 200)
+    decoded = decode_action_record(encode_action_record(record))
+    assert decoded.action_type == "a" + "액" * 84
+    assert decoded.session_id == "é" * 127
+
+    snapshot = PlayerSnapshot(actions=[(1.0, long_type, 1.0)])
+    assert decode_snapshot(encode_snapshot(snapshot)).actions == [(1.0, "a" + "액" * 84, 1.0)]
+
+
+@pytest.mark.parametrize("data", [b"", b"\x09abc", b"\x01\x00", bytes((SNAPSHOT_ZLIB,)) + b"not zlib"])
+def test_corrupt_snapshot_raises_codec_error(data):
+    with pytest.raises(CodecError):
+        decode_snapshot(data)
@@ -0,0 +1,26 @@
+"""TimescaleDB 스키마 스크립트 문장 분리 (연속 집계뷰는 문장 단위로 실행해야 함)"""
+
+from app.models.timescale_models import CONTINUOUS_AGGREGATES_SQL, RETENTION_POLICY_SQL, sql_statements
+
+
+def test_sql_statements_skips_comment_only_fragments():
+    script = """
+    -- 첫 문장
+    SELECT 1;
+    -- 주석만 있는 조각;
+    SELECT 2;
+    """
+    assert sql_statements(script) == ["-- 첫 문장\n    SELECT 1", "SELECT 2"]
+
+
+def test_each_continuous_aggregate_is_its_own_statement():
+    statements = sql_statements(CONTINUOUS_AGGREGATES_SQL)
+    views = [s for s in statements if "CREATE MATERIALIZED VIEW" in s]
+
+    assert len(views) == CONTINUOUS_AGGREGATES_SQL.count("CREATE MATERIALIZED VIEW")
+    assert all(s.count("CREATE MATERIALIZED VIEW") == 1 for s in views)
+
+
+def test_policies_are_idempotent():
+    policies = [s for s in sql_statements(RETENTION_POLICY_SQL) if "add_" in s]
+    assert policies and all("if_not_exists => TRUE" in s for s in policies)